@@ -3,57 +3,128 @@ CLI entrypoint for orchestrator.
 
 Usage:
     python -m orchestrator run-pack <pack-slug>
+    python -m orchestrator resume-run <run-id>
+    python -m orchestrator validate-all
     python -m orchestrator api
 """
 
 import sys
 import typer
-from orchestrator.graph import run_pack_research
+from orchestrator.graph import resume_pack_research, run_pack_research
+from orchestrator.llm import describe_llm_usage, parse_budget_overrides, summarize_llm_calls
+from orchestrator.nodes.validation import describe_routing, parse_score_band, summarize_routing
 from orchestrator.puppeteer.loop import run_dynamic_orchestration
 from orchestrator.puppeteer.policy_base import PolicyMode
+from orchestrator.validate_all import SORT_KEYS, format_validation_table, run_validate_all
 
 app = typer.Typer(help="Harbor Agent Pack Research Orchestrator")
 
 
+def _print_run_summary(final_state: dict) -> None:
+    """Print a finished research run's scores, gates, LLM usage and outputs."""
+    print("\n" + "=" * 60)
+    print("Run Summary")
+    print("=" * 60)
+    print(f"Run ID: {final_state['run_id']}")
+    print(f"Pack Slug: {final_state['pack_slug']}")
+    print(f"\nScores:")
+    scores = final_state.get("scores", {})
+    print(f"  - Viability: {scores.get('viability', 'N/A')}")
+    print(f"  - Data Availability: {scores.get('data_availability', 'N/A')}")
+    print(f"  - ICP Clarity: {scores.get('icp_clarity', 'N/A')}")
+    print(f"\nGates:")
+    gate = final_state.get("gate", {})
+    print(f"  - Validation: {gate.get('validation', 'N/A')}")
+    print(f"  - Scoring: {gate.get('scoring', 'N/A')}")
+    llm_cache = final_state.get("llm_cache", {})
+    print(f"\nLLM Cache: {llm_cache.get('hits', 0)} hits, {llm_cache.get('misses', 0)} misses")
+    print(f"LLM Usage: {describe_llm_usage(summarize_llm_calls(final_state.get('llm_calls', [])))}")
+    routing = final_state.get("metrics", {}).get("validation")
+    if routing:
+        print(f"Validation Routing: {describe_routing(summarize_routing([routing]))}")
+    speculation = final_state.get("metrics", {}).get("speculation") or {}
+    if speculation.get("outcome") == "adopted":
+        print(f"Speculative Research: adopted ({speculation['head_start_seconds']:.1f}s head start)")
+    elif speculation.get("outcome") == "discarded":
+        print(f"Speculative Research: discarded ({speculation['wasted']['total_tokens']} tokens wasted)")
+    elif speculation.get("outcome") == "failed":
+        print(f"Speculative Research: failed ({speculation.get('error')}), regenerated")
+    
+    artifacts = final_state.get("artifacts", {})
+    report_path = artifacts.get("deep_dive_report_path")
+    if report_path:
+        print(f"\nDeep Dive Report: {report_path}")
+        reused = final_state.get("metrics", {}).get("deep_research", {}).get("reused")
+        if reused:
+            print(f"  - Sections reused from previous report: {reused}")
+    else:
+        print("\nDeep Dive Report: Not generated (scoring gate did not pass)")
+    
+    print(f"\nRun State: orchestrator/data/runs/{final_state['run_id']}.json")
+    print()
+
+
 @app.command()
 def run_pack(
     slug: str = typer.Argument(..., help="Pack slug (e.g., 'tax-assist')"),
+    write_through: bool = typer.Option(
+        False,
+        "--write-through",
+        help="Write each node's lifecycle update to packs.json immediately (old behaviour)",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Always call OpenAI instead of reusing cached responses for unchanged requests",
+    ),
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="Regenerate only the deep research sections whose inputs changed since the last report",
+    ),
 ):
     """
     Run the research pipeline for a pack.
     
     Example:
         python -m orchestrator run-pack tax-assist
+        python -m orchestrator run-pack tax-assist --write-through
+        python -m orchestrator run-pack tax-assist --no-cache
+        python -m orchestrator run-pack tax-assist --refresh
     """
     try:
-        final_state = run_pack_research(slug)
+        final_state = run_pack_research(
+            slug,
+            write_through=write_through or None,
+            use_cache=False if no_cache else None,
+            refresh=refresh,
+        )
         
-        # Print summary
-        print("\n" + "=" * 60)
-        print("Run Summary")
-        print("=" * 60)
-        print(f"Run ID: {final_state['run_id']}")
-        print(f"Pack Slug: {final_state['pack_slug']}")
-        print(f"\nScores:")
-        scores = final_state.get("scores", {})
-        print(f"  - Viability: {scores.get('viability', 'N/A')}")
-        print(f"  - Data Availability: {scores.get('data_availability', 'N/A')}")
-        print(f"  - ICP Clarity: {scores.get('icp_clarity', 'N/A')}")
-        print(f"\nGates:")
-        gate = final_state.get("gate", {})
-        print(f"  - Validation: {gate.get('validation', 'N/A')}")
-        print(f"  - Scoring: {gate.get('scoring', 'N/A')}")
+        _print_run_summary(final_state)
         
-        artifacts = final_state.get("artifacts", {})
-        report_path = artifacts.get("deep_dive_report_path")
-        if report_path:
-            print(f"\nDeep Dive Report: {report_path}")
-        else:
-            print("\nDeep Dive Report: Not generated (scoring gate did not pass)")
+    except ValueError as e:
+        typer.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+    except Exception as e:
+        typer.echo(f"❌ Unexpected error: {e}", err=True)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
         
-        print(f"\nRun State: orchestrator/data/runs/{final_state['run_id']}.json")
-        print()
         
+@app.command()
+def resume_run(
+    run_id: str = typer.Argument(..., help="Run ID of a failed or interrupted research run"),
+):
+    """
+    Resume a failed or interrupted research run from its last completed node.
+    
+    Example:
+        python -m orchestrator resume-run 3f2c9e4a-1b7d-4c55-9a0e-6d8f2b1c7e90
+    """
+    try:
+        final_state = resume_pack_research(run_id)
+        _print_run_summary(final_state)
     except ValueError as e:
         typer.echo(f"❌ Error: {e}", err=True)
         sys.exit(1)
@@ -64,11 +135,103 @@ def run_pack(
         sys.exit(1)
 
 
+@app.command()
+def validate_all(
+    stage: list[str] = typer.Option(["idea"], "--stage", help="Lifecycle stage to validate (repeatable)"),
+    concurrency: int = typer.Option(0, help="Packs validated at once (default: ORCHESTRATOR_VALIDATE_ALL_CONCURRENCY)"),
+    sort: str = typer.Option("viability", help=f"Sort column: {', '.join(SORT_KEYS)}"),
+    reverse: bool = typer.Option(False, "--reverse", help="Reverse the sort order"),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Always call OpenAI instead of reusing cached responses for unchanged requests",
+    ),
+    route: bool = typer.Option(
+        False,
+        "--route",
+        help="Score with the cheap triage model first, escalating only borderline viability scores",
+    ),
+    band: str = typer.Option(
+        "",
+        "--band",
+        help="Viability band that escalates with --route, e.g. '45-75' (default: ORCHESTRATOR_VALIDATION_ESCALATION_BAND)",
+    ),
+):
+    """
+    Validate and score every pack in a stage concurrently, saving all results in one write.
+    
+    Example:
+        python -m orchestrator validate-all
+        python -m orchestrator validate-all --stage idea --stage validation --concurrency 16
+        python -m orchestrator validate-all --sort data_availability --reverse
+        python -m orchestrator validate-all --route --band 50-70
+    """
+    if sort not in SORT_KEYS:
+        typer.echo(f"❌ Error: Invalid sort column '{sort}'. Must be one of: {', '.join(SORT_KEYS)}", err=True)
+        sys.exit(1)
+    
+    options: dict = {}
+    if no_cache:
+        options["llm_cache"] = False
+    if route:
+        options["validation_routing"] = True
+    try:
+        if band:
+            options["validation_escalation_band"] = list(parse_score_band(band))
+    except ValueError as e:
+        typer.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+    
+    try:
+        result = run_validate_all(
+            stages=stage,
+            concurrency=concurrency or None,
+            options=options or None,
+            sort_by=sort,
+            reverse=reverse,
+        )
+    except Exception as e:
+        typer.echo(f"❌ Unexpected error: {e}", err=True)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    
+    print("\n" + "=" * 60)
+    print("Validation Summary")
+    print("=" * 60)
+    if result["results"]:
+        print(format_validation_table(result["results"]))
+    else:
+        print(f"No packs in stage: {', '.join(result['stages'])}")
+    print()
+    print(f"Packs Updated: {len(result['updated'])} (one write)")
+    llm_cache = result["llm_cache"]
+    print(f"LLM Cache: {llm_cache.get('hits', 0)} hits, {llm_cache.get('misses', 0)} misses")
+    print(f"LLM Usage: {describe_llm_usage(result['llm_usage'])}")
+    if result["routing"]["routed"]:
+        print(f"Validation Routing: {describe_routing(result['routing'])}")
+    print(f"Elapsed: {result['seconds']:.1f}s with concurrency {result['concurrency']}")
+    print()
+    
+    if any(row.get("error") for row in result["results"]):
+        sys.exit(1)
+
+
 @app.command()
 def run_pack_dynamic(
     slug: str = typer.Argument(..., help="Pack slug (e.g., 'tax-assist')"),
     mode: str = typer.Option("rule", help="Policy mode: 'static', 'rule', or 'rl'"),
     max_steps: int = typer.Option(20, help="Maximum number of steps"),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Always call OpenAI instead of reusing cached responses for unchanged requests",
+    ),
+    budget: str = typer.Option(
+        "",
+        "--budget",
+        help="Override budget file limits, e.g. 'run.usd=2,pack.tokens=500000,day.usd=none'",
+    ),
 ):
     """
     Run dynamic Puppeteer-style orchestration for a pack.
@@ -76,16 +239,29 @@ def run_pack_dynamic(
     Example:
         python -m orchestrator run-pack-dynamic tax-assist --mode=rule
         python -m orchestrator run-pack-dynamic tax-assist --mode=rl --max-steps=30
+        python -m orchestrator run-pack-dynamic tax-assist --no-cache
+        python -m orchestrator run-pack-dynamic tax-assist --budget run.usd=2,run.tokens=100000
     """
     if mode not in ["static", "rule", "rl"]:
         typer.echo(f"❌ Error: Invalid mode '{mode}'. Must be 'static', 'rule', or 'rl'", err=True)
         sys.exit(1)
     
+    options: dict = {}
+    if no_cache:
+        options["llm_cache"] = False
+    try:
+        if budget:
+            options["budget"] = parse_budget_overrides(budget)
+    except ValueError as e:
+        typer.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+    
     try:
         result = run_dynamic_orchestration(
             pack_slug=slug,
             policy_mode=mode,  # type: ignore
-            max_steps=max_steps
+            max_steps=max_steps,
+            options=options or None,
         )
         
         # Print summary
@@ -98,6 +274,13 @@ def run_pack_dynamic(
         print(f"Steps Taken: {result['steps_taken']}")
         print(f"Final Reward: {result['final_reward']:.4f}")
         print(f"Success: {result['success']}")
+        llm_cache = result.get("llm_cache", {})
+        print(f"LLM Cache: {llm_cache.get('hits', 0)} hits, {llm_cache.get('misses', 0)} misses")
+        print(f"LLM Usage: {describe_llm_usage(result.get('llm_usage', {}))}")
+        if result.get("stop_reason"):
+            print(f"Stop Reason: {result['stop_reason']}")
+        if result.get("budget_exhausted"):
+            print(f"Budget: {result['budget_exhausted']['message']}")
         print(f"\nActions Taken:")
         for i, action in enumerate(result['actions'], 1):
             print(f"  {i}. {action}")
@@ -144,17 +327,68 @@ def api(
     )
 
 
+@app.command()
+def migrate_pack_store(
+    target: str = typer.Argument(..., help="Backend to migrate to: 'json', 'sqlite', 'sharded' or 'journal'"),
+    source: str = typer.Option("json", help="Backend to migrate from: 'json', 'sqlite', 'sharded' or 'journal'"),
+):
+    """
+    Copy all pack lifecycles from one pack store backend to another.
+    
+    packs.json is regenerated from the target afterwards, so migrating back
+    to 'json' exports the current data for the TypeScript side. Point
+    PACK_STORE_BACKEND at the target once done.
+    
+    Example:
+        python -m orchestrator migrate-pack-store sharded
+        python -m orchestrator migrate-pack-store json --source sharded
+    """
+    from orchestrator.config import PACK_CRM_PATH, pack_store_options
+    from orchestrator.store import make_pack_store, migrate_pack_store as copy_packs
+    
+    backends = ["json", "sqlite", "sharded", "journal"]
+    if source not in backends or target not in backends:
+        typer.echo(f"❌ Error: Backends must be one of {', '.join(backends)}", err=True)
+        sys.exit(1)
+    if source == target:
+        typer.echo("❌ Error: Source and target backends are the same", err=True)
+        sys.exit(1)
+    
+    typer.echo(f"Migrating pack store: {source} → {target}")
+    
+    try:
+        source_store = make_pack_store(source, PACK_CRM_PATH, pack_store_options(source))  # type: ignore[arg-type]
+        target_store = make_pack_store(target, PACK_CRM_PATH, pack_store_options(target))  # type: ignore[arg-type]
+        count = copy_packs(source_store, target_store)
+        source_store.close()
+        target_store.close()
+    except (FileNotFoundError, ValueError) as e:
+        typer.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
+    
+    typer.echo(f"✅ Migrated {count} packs to the {target} pack store")
+    if target != "json":
+        typer.echo(f"   Set PACK_STORE_BACKEND={target} to use it")
+
+
 @app.command()
 def generate_dynamic_runs(
     pack_slug: str = typer.Argument(..., help="Pack slug (e.g., 'tax-assist')"),
     mode: str = typer.Option("rule", help="Policy mode: 'static', 'rule', or 'rl'"),
     runs: int = typer.Option(20, help="Number of runs to generate"),
     max_steps: int = typer.Option(20, help="Maximum steps per run"),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Always call OpenAI instead of reusing cached responses for unchanged requests",
+    ),
 ):
     """
     Generate multiple dynamic orchestration runs to seed logs for RL training.
     
     This is useful for quickly generating training data without manual loops.
+    Unchanged validation / research requests are served from the LLM response
+    cache unless --no-cache is given.
     
     Example:
         python -m orchestrator generate-dynamic-runs tax-assist --mode rule --runs 20 --max-steps 20
@@ -169,15 +403,24 @@ def generate_dynamic_runs(
     
     successful_runs = 0
     failed_runs = 0
+    cache_hits = 0
+    cache_misses = 0
+    total_tokens = 0
     
     for i in range(runs):
         try:
             result = run_dynamic_orchestration(
                 pack_slug=pack_slug,
                 policy_mode=mode,  # type: ignore
-                max_steps=max_steps
+                max_steps=max_steps,
+                options={"llm_cache": False} if no_cache else None,
             )
             
+            llm_cache = result.get("llm_cache", {})
+            cache_hits += llm_cache.get("hits", 0)
+            cache_misses += llm_cache.get("misses", 0)
+            total_tokens += result.get("llm_usage", {}).get("total_tokens", 0)
+            
             if result.get("error"):
                 failed_runs += 1
                 typer.echo(f"  Run {i + 1}/{runs}: ❌ Failed - {result.get('error')}")
@@ -193,6 +436,8 @@ def generate_dynamic_runs(
     
     typer.echo()
     typer.echo(f"✅ Completed: {successful_runs} successful, {failed_runs} failed")
+    typer.echo(f"   LLM cache: {cache_hits} hits, {cache_misses} misses")
+    typer.echo(f"   LLM tokens: {total_tokens}")
     typer.echo(f"   Logs saved to orchestrator/data/logs/")
 
 
@@ -8,34 +8,67 @@ Provides REST endpoints for:
 - Revenue/sales data access
 """
 
+import asyncio
 import json
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Optional, List
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from openai import OpenAI
 
-from orchestrator.graph import run_pack_research
+from orchestrator import jsonio
+from orchestrator.graph import resume_pack_research, run_pack_research, warm_compiled_graph
 from orchestrator.config import (
     load_packs_json,
     save_packs_json,
-    get_pack_lifecycle,
+    get_pack_snapshot,
+    load_pack_snapshots,
     update_pack_lifecycle,
-    OPENAI_API_KEY,
+    get_pack_watcher,
+    get_llm_backend,
 )
+from orchestrator.llm import BudgetConfig, async_raw_create
+from orchestrator.nodes.validation import parse_score_band
 from orchestrator.state import save_run_state
 from orchestrator.puppeteer.loop import run_dynamic_orchestration
 from orchestrator.puppeteer.policy_base import PolicyMode
 from orchestrator.telemetry.rl_trainer import SimpleRLTrainer
+from orchestrator.validate_all import SORT_KEYS, run_validate_all
 
-# Initialize OpenAI client
-openai_client = OpenAI(api_key=OPENAI_API_KEY)
 
-app = FastAPI(title="Harbor Ops API", version="0.1.0")
+class JsonioResponse(JSONResponse):
+    """JSONResponse encoded through orchestrator.jsonio (same bytes, faster)."""
+    
+    def render(self, content: Any) -> bytes:
+        # Matches JSONResponse: compact separators, ensure_ascii=False, no NaN
+        return jsonio.dumps_bytes(content, allow_nan=False)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Watch the pack store for the app's lifetime, so change events are recorded
+    from boot, compile the research graph before the first run, and close the
+    pooled OpenAI connections on shutdown.
+    """
+    _attach_pack_watcher()
+    print(f"✅ Compiled research graph in {warm_compiled_graph() * 1000:.1f} ms")
+    yield
+    _detach_pack_watcher()
+    await get_llm_backend().aclose()
+
+
+app = FastAPI(
+    title="Harbor Ops API",
+    version="0.1.0",
+    default_response_class=JsonioResponse,
+    lifespan=lifespan,
+)
 
 # Enable CORS for local dev and production
 # Dev: frontend on localhost:8081, API on 127.0.0.1:8000
@@ -165,7 +198,8 @@ async def list_packs():
         CRM fields, and research status.
     """
     try:
-        packs = load_packs_json()
+        # Read-only: shared snapshots instead of a deep copy of every pack
+        packs = load_pack_snapshots()
         
         summaries = []
         for pack in packs:
@@ -196,6 +230,139 @@ async def list_packs():
         raise HTTPException(status_code=500, detail=f"Error loading packs: {str(e)}")
 
 
+# Longest a single long-poll request may wait for pack changes
+PACK_CHANGES_MAX_TIMEOUT = 60.0
+# Interval between keep-alive comments on the SSE stream
+PACK_CHANGES_KEEPALIVE = 15.0
+
+# Set (and replaced) on the event loop whenever the pack watcher publishes
+# events, so waiting requests don't tie up threadpool workers
+_pack_changes_signal: Optional[asyncio.Event] = None
+_pack_changes_listener = None
+
+
+def _signal_pack_changes() -> None:
+    """Wake every request waiting for pack changes (runs on the event loop)."""
+    global _pack_changes_signal
+    signal, _pack_changes_signal = _pack_changes_signal, asyncio.Event()
+    if signal is not None:
+        signal.set()
+
+
+def _attach_pack_watcher() -> None:
+    """Start the pack watcher and wake waiting requests on new events."""
+    global _pack_changes_signal, _pack_changes_listener
+    loop = asyncio.get_running_loop()
+    _pack_changes_signal = asyncio.Event()
+    
+    def on_pack_changes(events: list[dict]) -> None:
+        loop.call_soon_threadsafe(_signal_pack_changes)
+    
+    _pack_changes_listener = on_pack_changes
+    get_pack_watcher().add_listener(on_pack_changes)
+
+
+def _detach_pack_watcher() -> None:
+    """Remove this app's listener from the pack watcher."""
+    global _pack_changes_listener
+    if _pack_changes_listener is not None:
+        get_pack_watcher().remove_listener(_pack_changes_listener)
+        _pack_changes_listener = None
+
+
+async def _wait_for_pack_changes(since: int, timeout: float) -> tuple[list[dict], bool]:
+    """
+    Wait up to timeout seconds for change events after sequence number since.
+    
+    Returns:
+        (events, reset) as returned by ChangeFeed.since
+    """
+    feed = get_pack_watcher().feed
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        # Grab the signal before checking the feed so a publish in between
+        # can't be missed
+        signal = _pack_changes_signal or asyncio.Event()
+        events, reset = feed.since(since)
+        remaining = deadline - loop.time()
+        if events or reset or remaining <= 0:
+            return events, reset
+        try:
+            await asyncio.wait_for(signal.wait(), remaining)
+        except asyncio.TimeoutError:
+            pass
+
+
+@app.get("/api/packs/changes")
+async def get_pack_changes(since: Optional[int] = None, timeout: float = 25.0):
+    """
+    Long-poll for per-slug pack change events.
+    
+    Call without since to get the current cursor, then pass the returned
+    cursor back as since; the request returns as soon as there are newer
+    events, or with an empty list after timeout seconds.
+    
+    Args:
+        since: Cursor (sequence number) returned by the previous call
+        timeout: Seconds to wait for new events (capped at 60)
+    
+    Returns:
+        {"cursor": int, "events": [{"seq", "slug", "type", "version", "at"}],
+        "reset": bool}. type is "created", "updated" or "deleted". If reset is
+        true, events were missed: re-fetch GET /api/packs and continue from
+        cursor.
+    """
+    feed = get_pack_watcher().feed
+    if since is None:
+        return {"cursor": feed.latest, "events": [], "reset": False}
+    
+    timeout = min(max(timeout, 0.0), PACK_CHANGES_MAX_TIMEOUT)
+    events, reset = await _wait_for_pack_changes(since, timeout)
+    cursor = events[-1]["seq"] if events else (feed.latest if reset else since)
+    return {"cursor": cursor, "events": events, "reset": reset}
+
+
+@app.get("/api/packs/changes/stream")
+async def stream_pack_changes(request: Request, since: Optional[int] = None):
+    """
+    Stream pack change events as Server-Sent Events.
+    
+    Each event is sent as "pack-change" with the event's seq as its id, so
+    reconnecting EventSource clients resume via Last-Event-ID. A "reset"
+    event means events were missed and the client should re-fetch
+    GET /api/packs.
+    
+    Args:
+        since: Cursor to start after (default: Last-Event-ID, else now)
+    """
+    feed = get_pack_watcher().feed
+    last_event_id = request.headers.get("last-event-id")
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    
+    async def event_stream():
+        cursor = feed.latest if since is None else since
+        while not await request.is_disconnected():
+            events, reset = await _wait_for_pack_changes(cursor, PACK_CHANGES_KEEPALIVE)
+            if reset:
+                cursor = feed.latest
+                yield f"id: {cursor}\nevent: reset\ndata: {jsonio.dumps({'cursor': cursor})}\n\n"
+                continue
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+            for event in events:
+                cursor = event["seq"]
+                yield f"id: {cursor}\nevent: pack-change\ndata: {jsonio.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/api/packs/{slug}")
 async def get_pack(slug: str):
     """
@@ -210,7 +377,7 @@ async def get_pack(slug: str):
     Raises:
         404: If pack not found
     """
-    pack = get_pack_lifecycle(slug)
+    pack = get_pack_snapshot(slug)
     if pack is None:
         raise HTTPException(status_code=404, detail=f"Pack with slug '{slug}' not found")
     return pack
@@ -377,7 +544,7 @@ async def check_pack_updates(slug: str):
         404: If pack not found
     """
     # Verify pack exists
-    pack = get_pack_lifecycle(slug)
+    pack = get_pack_snapshot(slug)
     if pack is None:
         raise HTTPException(status_code=404, detail=f"Pack with slug '{slug}' not found")
     
@@ -418,12 +585,14 @@ async def check_pack_updates(slug: str):
 
 
 @app.post("/api/packs/{slug}/runs/research", response_model=ResearchRunResponse)
-async def run_research_pipeline(slug: str):
+async def run_research_pipeline(slug: str, refresh: bool = False):
     """
     Run the research pipeline for a pack.
     
     Args:
         slug: Pack slug identifier
+        refresh: Regenerate only the deep research sections whose inputs
+                 changed since the pack's latest report (?refresh=true)
         
     Returns:
         Research run response with runId, gate, and artifacts
@@ -433,13 +602,14 @@ async def run_research_pipeline(slug: str):
         500: If pipeline execution fails
     """
     # Verify pack exists
-    pack = get_pack_lifecycle(slug)
+    pack = get_pack_snapshot(slug)
     if pack is None:
         raise HTTPException(status_code=404, detail=f"Pack with slug '{slug}' not found")
     
     try:
-        # Run the research pipeline (synchronous for v0)
-        final_state = run_pack_research(slug)
+        # Run the synchronous pipeline in a worker thread so the event loop
+        # keeps serving the change feed and other requests meanwhile
+        final_state = await asyncio.to_thread(run_pack_research, slug, refresh=refresh)
         
         return ResearchRunResponse(
             runId=final_state["run_id"],
@@ -474,7 +644,7 @@ async def list_pack_runs(slug: str):
     for run_file in RUNS_DIR.glob("*.json"):
         try:
             with open(run_file, "r", encoding="utf-8") as f:
-                state = json.load(f)
+                state = jsonio.load(f)
             
             # Filter by pack_slug
             if state.get("pack_slug") == slug:
@@ -496,6 +666,74 @@ async def list_pack_runs(slug: str):
     return runs
 
 
+class ValidateAllRequest(BaseModel):
+    """Request model for bulk validation."""
+    stages: Optional[List[str]] = None  # defaults to ["idea"]
+    concurrency: Optional[int] = None
+    sort: Optional[str] = "viability"
+    reverse: Optional[bool] = False
+    useCache: Optional[bool] = True
+    # Tiered validation routing; None keeps ORCHESTRATOR_VALIDATION_ROUTING
+    route: Optional[bool] = None
+    band: Optional[str] = None  # e.g. "45-75"
+
+
+@app.post("/api/packs/validate-all")
+async def validate_all_packs(request: ValidateAllRequest):
+    """
+    Validate and score every pack in the given stages concurrently.
+    
+    All lifecycle updates are saved in one packs.json write.
+    
+    Args:
+        request: Stages to select packs from, concurrency limit, sort column,
+                 whether to use the LLM response cache and tiered routing
+    
+    Returns:
+        Summary with the sorted score table (results), updated slugs,
+        llm_cache / llm_usage / routing totals and elapsed seconds
+    
+    Raises:
+        400: If the sort column, concurrency or band is invalid
+        500: If validation fails
+    """
+    sort = request.sort or "viability"
+    if sort not in SORT_KEYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid sort: {sort}. Must be one of: {', '.join(SORT_KEYS)}"
+        )
+    if request.concurrency is not None and request.concurrency < 1:
+        raise HTTPException(status_code=400, detail="concurrency must be at least 1")
+    
+    options: dict = {}
+    if request.useCache is False:
+        options["llm_cache"] = False
+    if request.route is not None:
+        options["validation_routing"] = request.route
+    if request.band:
+        try:
+            options["validation_escalation_band"] = list(parse_score_band(request.band))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        # Packs are validated in worker threads; keep the event loop free meanwhile
+        return await asyncio.to_thread(
+            run_validate_all,
+            stages=request.stages or ["idea"],
+            concurrency=request.concurrency,
+            options=options or None,
+            sort_by=sort,
+            reverse=bool(request.reverse),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error validating packs: {str(e)}"
+        )
+
+
 # ============================================================================
 # Dynamic Orchestration Endpoints
 # ============================================================================
@@ -505,6 +743,8 @@ class DynamicRunRequest(BaseModel):
     """Request model for dynamic orchestration run."""
     policyMode: Optional[str] = "rule"  # "static", "rule", or "rl"
     maxSteps: Optional[int] = 20
+    # Budget limit overrides, e.g. {"run": {"usd": 2.0, "tokens": 100000}}
+    budget: Optional[dict] = None
 
 
 @app.post("/api/packs/{slug}/runs/dynamic")
@@ -514,17 +754,20 @@ async def run_dynamic_orchestration_endpoint(slug: str, request: DynamicRunReque
     
     Args:
         slug: Pack slug identifier
-        request: Dynamic run request with policyMode and maxSteps
+        request: Dynamic run request with policyMode, maxSteps and optional
+                 budget overrides
         
     Returns:
-        Run summary with actions, final_reward, steps_taken
+        Run summary with actions, final_reward, steps_taken, stop_reason
+        ("budget_exhausted" if the budget ran out)
         
     Raises:
         404: If pack not found
+        400: If policyMode or budget is invalid
         500: If orchestration fails
     """
     # Verify pack exists
-    pack = get_pack_lifecycle(slug)
+    pack = get_pack_snapshot(slug)
     if pack is None:
         raise HTTPException(status_code=404, detail=f"Pack with slug '{slug}' not found")
     
@@ -536,12 +779,23 @@ async def run_dynamic_orchestration_endpoint(slug: str, request: DynamicRunReque
             detail=f"Invalid policyMode: {policy_mode}. Must be 'static', 'rule', or 'rl'"
         )
     
+    # Validate budget overrides before starting the run
+    options = {}
+    if request.budget:
+        try:
+            BudgetConfig().with_overrides(request.budget)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        options["budget"] = request.budget
+    
     try:
-        # Run dynamic orchestration
-        result = run_dynamic_orchestration(
+        # Run dynamic orchestration in a worker thread (it blocks on LLM calls)
+        result = await asyncio.to_thread(
+            run_dynamic_orchestration,
             pack_slug=slug,
             policy_mode=policy_mode,  # type: ignore
-            max_steps=request.maxSteps or 20
+            max_steps=request.maxSteps or 20,
+            options=options or None,
         )
         
         return result
@@ -603,7 +857,7 @@ async def get_orchestrator_logs(limit: Optional[int] = 20):
             line = line.strip()
             if line:
                 try:
-                    logs.append(json.loads(line))
+                    logs.append(jsonio.loads(line))
                 except json.JSONDecodeError:
                     continue
         
@@ -639,11 +893,46 @@ async def get_run(run_id: str):
     
     try:
         with open(run_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+            return jsonio.load(f)
     except json.JSONDecodeError as e:
         raise HTTPException(status_code=500, detail=f"Error reading run file: {str(e)}")
 
 
+@app.post("/api/runs/{run_id}/resume", response_model=ResearchRunResponse)
+async def resume_research_run(run_id: str):
+    """
+    Resume a failed or interrupted research run from its last completed node.
+    
+    Args:
+        run_id: Run identifier (UUID)
+    
+    Returns:
+        Research run response with runId, gate, and artifacts
+    
+    Raises:
+        404: If the run has no checkpoint to resume (unknown, already
+             completed, or run checkpoints are disabled)
+        500: If pipeline execution fails again
+    """
+    try:
+        # The remaining nodes run in a worker thread; keep the event loop free meanwhile
+        final_state = await asyncio.to_thread(resume_pack_research, run_id)
+        
+        return ResearchRunResponse(
+            runId=final_state["run_id"],
+            packSlug=final_state["pack_slug"],
+            gate=final_state.get("gate", {}),
+            artifacts=final_state.get("artifacts", {}),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error resuming research run: {str(e)}"
+        )
+
+
 # ============================================================================
 # Revenue Endpoints
 # ============================================================================
@@ -663,7 +952,7 @@ async def get_revenue_summary():
     if MASTER_LEADS_JSON.exists():
         try:
             with open(MASTER_LEADS_JSON, "r", encoding="utf-8") as f:
-                leads_data = json.load(f)
+                leads_data = jsonio.load(f)
         except (json.JSONDecodeError, FileNotFoundError):
             pass
     
@@ -711,7 +1000,7 @@ async def get_revenue_summary():
     if SALES_JSON.exists():
         try:
             with open(SALES_JSON, "r", encoding="utf-8") as f:
-                sales_data = json.load(f).get("sales", [])
+                sales_data = jsonio.load(f).get("sales", [])
                 total_sales = len(sales_data)
         except (json.JSONDecodeError, FileNotFoundError):
             pass
@@ -772,7 +1061,7 @@ async def list_sales(limit: Optional[int] = 100, packSlug: Optional[str] = None)
     
     try:
         with open(SALES_JSON, "r", encoding="utf-8") as f:
-            data = json.load(f)
+            data = jsonio.load(f)
             sales = data.get("sales", [])
     except (json.JSONDecodeError, FileNotFoundError):
         return {"sales": []}
@@ -809,7 +1098,7 @@ async def record_sale(request: SaleRecordRequest):
     if SALES_JSON.exists():
         try:
             with open(SALES_JSON, "r", encoding="utf-8") as f:
-                data = json.load(f)
+                data = jsonio.load(f)
                 sales = data.get("sales", []) if isinstance(data, dict) else data
         except (json.JSONDecodeError, FileNotFoundError):
             sales = []
@@ -893,7 +1182,7 @@ def load_automations() -> List[dict]:
     
     try:
         with open(AUTOMATIONS_JSON, "r", encoding="utf-8") as f:
-            data = json.load(f)
+            data = jsonio.load(f)
             return data.get("automations", [])
     except (json.JSONDecodeError, FileNotFoundError):
         return []
@@ -1071,7 +1360,7 @@ async def get_revenue_leads(limit: Optional[int] = None):
     if MASTER_LEADS_JSON.exists():
         try:
             with open(MASTER_LEADS_JSON, "r", encoding="utf-8") as f:
-                leads_data = json.load(f)
+                leads_data = jsonio.load(f)
         except (json.JSONDecodeError, FileNotFoundError):
             pass
     
@@ -1187,12 +1476,27 @@ async def transcribe_audio(audio_file: UploadFile = File(...)):
             filename = "audio.webm"
         audio_file_obj.name = filename
         
-        # Transcribe using OpenAI Whisper
-        transcript = openai_client.audio.transcriptions.create(
-            model="whisper-1",
-            file=audio_file_obj,
-            language="en",  # Optional: specify language for better accuracy
-        )
+        # Transcribe using Whisper on the LLM backend's shared async client, so
+        # the event loop isn't blocked while the upload is processed; rate
+        # limits and transient errors are retried with backoff
+        backend = get_llm_backend()
+        transcriptions = backend.async_client().audio.transcriptions
+        
+        async def send():
+            audio_file_obj.seek(0)  # a retry re-uploads from the start
+            return await async_raw_create(
+                transcriptions,
+                backend.rate_limiter,
+                model="whisper-1",
+                file=audio_file_obj,
+                language="en",  # Optional: specify language for better accuracy
+            )
+        
+        async with backend.async_slot("whisper-1"):
+            if backend.rate_limiter is None:
+                transcript = await send()
+            else:
+                transcript = await backend.rate_limiter.async_call("whisper-1", 0, send)
         
         return {
             "text": transcript.text,
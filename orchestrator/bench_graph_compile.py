@@ -0,0 +1,129 @@
+"""
+Benchmark: building and compiling the LangGraph workflow per run vs once per process.
+
+Times build_graph().compile() on its own, then pushes the same research runs
+through the workflow twice against the fake LLM backend (zero latency by
+default, so graph overhead is not hidden behind LLM time): once compiling
+the graph for every run, as run_pack_research used to, and once through the
+shared get_compiled_graph(). Run checkpoints are turned off, so only the
+graph overhead differs. Packs, the research template and reports live in a
+temporary directory; run state files are removed afterwards.
+
+Usage:
+    python orchestrator/bench_graph_compile.py [--runs 200] [--packs 4] [--latency fixed:0]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator import config
+from orchestrator.graph import build_graph, get_compiled_graph
+from orchestrator.llm import FakeBackend
+from orchestrator.nodes import deep_research
+from orchestrator.state import new_run_state
+from orchestrator.store import make_pack_store
+
+TEMPLATE = "# ChatGPT Research Template\n\n" + "\n\n".join(
+    f"## {number}. {title}\nDescribe the {title.lower()} of [REGULATION]."
+    for number, title in enumerate(["Overview", "Audience", "Controls", "Evidence"], start=1)
+)
+
+RUNS_DIR = Path(__file__).resolve().parent / "data" / "runs"
+
+
+def build_packs(count: int) -> list[dict]:
+    """Idea-stage packs; some pass the scoring gate and get a report, the rest stop early."""
+    return [
+        {
+            "slug": f"bench-{i}",
+            "name": f"Bench Pack {i}",
+            "packNumber": i + 1,
+            "currentStage": "idea",
+            "metadata": {"regulationName": f"Regulation {i}", "targetAudience": ["Engineers"]},
+            "crm": {"ideaNotes": "notes", "icpSummary": "icp"},
+            "research": {},
+            "stages": {},
+        }
+        for i in range(count)
+    ]
+
+
+def time_runs(runs: int, slugs: list[str], app_for_run) -> tuple[float, list[str]]:
+    """Invoke the graph runs times (cycling through slugs); returns (wall seconds, run ids)."""
+    run_ids = []
+    started = time.perf_counter()
+    for i in range(runs):
+        slug = slugs[i % len(slugs)]
+        state = new_run_state(slug, {}, {"llm_cache": False, "lifecycle_write_through": False})
+        run_ids.append(state["run_id"])
+        with contextlib.redirect_stdout(io.StringIO()):
+            app_for_run().invoke(state)
+    return time.perf_counter() - started, run_ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200, help="research runs per mode")
+    parser.add_argument("--packs", type=int, default=4, help="packs the runs cycle through")
+    parser.add_argument("--compiles", type=int, default=50, help="build + compile repetitions timed on their own")
+    parser.add_argument("--latency", default="fixed:0", help="fake LLM latency distribution per call")
+    args = parser.parse_args()
+    config.RUN_CHECKPOINTS = False
+    
+    started = time.perf_counter()
+    for _ in range(args.compiles):
+        build_graph().compile()
+    compile_ms = (time.perf_counter() - started) / args.compiles * 1000
+    started = time.perf_counter()
+    for _ in range(args.compiles):
+        get_compiled_graph()
+    cached_ms = (time.perf_counter() - started) / args.compiles * 1000
+    print(f"📊 Graph construction: build_graph().compile() {compile_ms:.2f} ms, get_compiled_graph() {cached_ms:.4f} ms")
+    
+    original = (config._pack_store, config._llm_backend, deep_research.TEMPLATE_PATH, deep_research.RESEARCH_DIR)
+    run_ids: list[str] = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        packs = build_packs(args.packs)
+        packs_path = Path(tmp_dir) / "packs.json"
+        packs_path.write_text(json.dumps(packs, indent=2), encoding="utf-8")
+        deep_research.TEMPLATE_PATH = Path(tmp_dir) / "template.md"
+        deep_research.TEMPLATE_PATH.write_text(TEMPLATE, encoding="utf-8")
+        deep_research.RESEARCH_DIR = Path(tmp_dir) / "research"
+        config._pack_store = make_pack_store("json", packs_path, {})
+        config._llm_backend = FakeBackend(latency=args.latency, completion_tokens="fixed:200")
+        slugs = [pack["slug"] for pack in packs]
+        print(f"   {args.runs} runs over {args.packs} packs, fake LLM latency {args.latency}")
+        print()
+        
+        try:
+            results = {}
+            for name, app_for_run in [
+                ("compile per run", lambda: build_graph().compile()),
+                ("compiled once", get_compiled_graph),
+            ]:
+                wall, ids = time_runs(args.runs, slugs, app_for_run)
+                run_ids.extend(ids)
+                results[name] = wall
+        finally:
+            config._pack_store, config._llm_backend, deep_research.TEMPLATE_PATH, deep_research.RESEARCH_DIR = original
+            for run_id in run_ids:
+                (RUNS_DIR / f"{run_id}.json").unlink(missing_ok=True)
+    
+    print(f"{'mode':<20}{'wall (s)':>10}{'per run (ms)':>14}")
+    for name, wall in results.items():
+        print(f"{name:<20}{wall:>10.3f}{wall / args.runs * 1000:>14.2f}")
+    per_run, shared = results.values()
+    print(f"\nOverhead removed per run: {(per_run - shared) / args.runs * 1000:.2f} ms ({per_run / shared:.2f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Micro-benchmark for orchestrator.jsonio on a synthetic 10k-pack CRM.
+
+Builds a packs.json-shaped list by cloning the real packs with unique slugs,
+then times encode (packs.json format and compact JSONL format) and decode
+for every available backend against the stdlib baseline.
+
+Usage:
+    python orchestrator/bench_jsonio.py [--packs 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator import jsonio
+from orchestrator.store.base import clone_json
+
+PACKS_JSON_PATH = Path(__file__).resolve().parent.parent / "pack-crm" / "data" / "packs.json"
+
+
+def build_crm(num_packs: int) -> list[dict]:
+    """Clone the real packs into a synthetic CRM with num_packs entries."""
+    templates = json.loads(PACKS_JSON_PATH.read_text(encoding="utf-8"))
+    packs = []
+    for i in range(num_packs):
+        pack = clone_json(templates[i % len(templates)])
+        pack["slug"] = f"{pack.get('slug', 'pack')}-{i}"
+        pack["packNumber"] = i + 1
+        packs.append(pack)
+    return packs
+
+
+def best_of(repeat: int, fn) -> float:
+    """Best wall time of fn over repeat runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--packs", type=int, default=10000, help="Number of synthetic packs")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    args = parser.parse_args()
+    
+    packs = build_crm(args.packs)
+    pretty = json.dumps(packs, indent=2, ensure_ascii=False)
+    compact = json.dumps(packs, ensure_ascii=False, separators=(",", ":"))
+    size_mb = len(pretty.encode("utf-8")) / 1e6
+    
+    print(f"📊 jsonio benchmark: {args.packs} packs, {size_mb:.1f} MB as packs.json")
+    print(f"   encoder={jsonio.ENCODER} decoder={jsonio.DECODER} (best of {args.repeat})")
+    print()
+    
+    encoders = ["stdlib"] + [
+        name for name, module in (("orjson", jsonio.orjson), ("msgspec", jsonio.msgspec)) if module
+    ]
+    decoders = ["stdlib"] + (["msgspec"] if jsonio.msgspec else [])
+    configured = (jsonio.ENCODER, jsonio.DECODER)
+    
+    rows = []
+    try:
+        for name in encoders:
+            jsonio.ENCODER = name
+            assert jsonio.dumps(packs, indent=2) == pretty, f"{name}: pretty output differs"
+            assert jsonio.dumps(packs) == compact, f"{name}: compact output differs"
+            rows.append((f"encode indent=2 ({name})", best_of(args.repeat, lambda: jsonio.dumps(packs, indent=2))))
+            rows.append((f"encode compact  ({name})", best_of(args.repeat, lambda: jsonio.dumps(packs))))
+        for name in decoders:
+            jsonio.DECODER = name
+            rows.append((f"decode          ({name})", best_of(args.repeat, lambda: jsonio.loads(pretty))))
+    finally:
+        jsonio.ENCODER, jsonio.DECODER = configured
+    
+    baseline = {label.split("(")[0]: seconds for label, seconds in rows if "(stdlib)" in label}
+    print(f"{'operation':<28} {'time':>9} {'MB/s':>9} {'speedup':>8}")
+    for label, seconds in rows:
+        speedup = baseline[label.split("(")[0]] / seconds
+        print(f"{label:<28} {seconds * 1000:>7.1f}ms {size_mb / seconds:>9.1f} {speedup:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Benchmark: per-call OpenAI() clients vs the shared pooled client registry.
+
+Starts a local fake OpenAI server (chat completions only) and times the same
+sequence of chat completion calls made the old way, with a new OpenAI client
+per call as the nodes used to do, and through orchestrator.llm.ClientRegistry.
+Every new connection costs --handshake-ms on the server, standing in for
+the TCP + TLS setup a real api.openai.com connection pays.
+
+Usage:
+    python orchestrator/bench_openai_clients.py [--calls 50] [--threads 4] [--handshake-ms 20]
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from openai import OpenAI
+
+from orchestrator.llm import ClientRegistry
+
+
+class FakeOpenAIServer:
+    """
+    Minimal keep-alive HTTP server answering /v1/chat/completions.
+    
+    failures are (status, headers) error responses served, in order, before
+    any successful one; headers are added to every successful response.
+    """
+    
+    def __init__(
+        self,
+        handshake_delay: float = 0.0,
+        response_delay: float = 0.0,
+        failures: Optional[list[tuple[int, dict]]] = None,
+        headers: Optional[dict] = None,
+    ):
+        self.connections = 0
+        self.requests = 0
+        self.failures = list(failures or [])
+        self._lock = threading.Lock()
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+                time.sleep(handshake_delay)
+            
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with server._lock:
+                    server.requests += 1
+                    failure = server.failures.pop(0) if server.failures else None
+                time.sleep(response_delay)
+                if failure is not None:
+                    status, failure_headers = failure
+                    self._reply(status, {"error": {"message": "fake failure", "type": "fake"}}, failure_headers)
+                    return
+                self._reply(200, {
+                    "id": "chatcmpl-bench",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": request.get("model", "gpt-4"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "ok"},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6},
+                }, headers or {})
+            
+            def _reply(self, status: int, payload: dict, extra_headers: dict) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in extra_headers.items():
+                    self.send_header(name, str(value))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+    
+    def __enter__(self) -> "FakeOpenAIServer":
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+REQUEST = {"model": "gpt-4", "messages": [{"role": "user", "content": "ping"}], "temperature": 0.7}
+
+
+def run_calls(calls: int, threads: int, call) -> float:
+    """Make calls requests over threads workers; returns wall time in seconds."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: call(), range(calls)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=50, help="chat completions per mode")
+    parser.add_argument("--threads", type=int, default=4, help="concurrent callers")
+    parser.add_argument("--handshake-ms", type=float, default=20.0, help="simulated connection setup cost")
+    parser.add_argument("--response-ms", type=float, default=5.0, help="simulated server processing time")
+    args = parser.parse_args()
+    
+    handshake, response = args.handshake_ms / 1000, args.response_ms / 1000
+    print(
+        f"{args.calls} chat completions, {args.threads} threads, "
+        f"{args.handshake_ms:g} ms connection setup, {args.response_ms:g} ms per response"
+    )
+    print(f"{'mode':<28}{'wall (s)':>10}{'per call (ms)':>15}{'connections':>13}")
+    
+    results = {}
+    with FakeOpenAIServer(handshake, response) as server:
+        def per_call_client():
+            client = OpenAI(api_key="bench", base_url=server.base_url, max_retries=0)
+            try:
+                client.chat.completions.create(**REQUEST)
+            finally:
+                client.close()
+        
+        registry = ClientRegistry("bench", base_url=server.base_url, max_connections=args.threads)
+        
+        def shared_registry():
+            with registry.slot(REQUEST["model"]):
+                registry.client.chat.completions.create(**REQUEST)
+        
+        for name, call in [("new OpenAI() per call", per_call_client), ("shared ClientRegistry", shared_registry)]:
+            connections = server.connections
+            wall = run_calls(args.calls, args.threads, call)
+            results[name] = wall
+            print(
+                f"{name:<28}{wall:>10.3f}{wall / args.calls * 1000:>15.2f}"
+                f"{server.connections - connections:>13}"
+            )
+        registry.close()
+    
+    baseline, pooled = results.values()
+    print(f"\nSpeedup from connection reuse: {baseline / pooled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
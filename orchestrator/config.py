@@ -2,14 +2,46 @@
 Configuration and pack-crm integration helpers.
 
 Provides safe read/write access to pack-crm/data/packs.json.
+
+All public helpers go through a process-wide PackStore. The default "json"
+backend keeps the parsed packs plus a slug index in memory and only re-parses
+packs.json when the file changes on disk; PACK_STORE_BACKEND=sqlite switches
+to a SQLite system of record, PACK_STORE_BACKEND=sharded to one file per
+pack, both exporting packs.json for the TypeScript side, and
+PACK_STORE_BACKEND=journal to append-only patches compacted into packs.json.
+Writes are serialized across processes with an advisory file
+lock, so concurrent runs never lose each other's updates.
 """
 
-import json
 import os
+import sqlite3
+import threading
 from pathlib import Path
 from typing import Callable, Optional
 
 from dotenv import load_dotenv
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from orchestrator.llm import (
+    Budget,
+    BudgetConfig,
+    LLMBackend,
+    ResponseCache,
+    RetryPolicy,
+    SpendLedger,
+    load_budget_config,
+    make_llm_backend,
+    parse_model_limits,
+)
+from orchestrator.store import (
+    BatchUpdateResult,
+    ChangeFeed,
+    FrozenDict,
+    PackStore,
+    PackUpdaters,
+    PackWatcher,
+    make_pack_store,
+)
 
 # Load environment variables from .env file if it exists
 load_dotenv()
@@ -17,39 +49,380 @@ load_dotenv()
 # Path to pack-crm/data/packs.json relative to orchestrator folder
 PACK_CRM_PATH = Path(__file__).resolve().parent.parent / "pack-crm" / "data" / "packs.json"
 
-# OpenAI API key from environment
+# LLM backend every node calls through: "openai" (the real API) or "fake"
+# (deterministic local replies for load tests; see orchestrator.llm.fake)
+LLM_BACKEND = os.getenv("ORCHESTRATOR_LLM_BACKEND", "openai")
+
+# OpenAI API key from environment (only the "openai" backend needs one)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
+if not OPENAI_API_KEY and LLM_BACKEND == "openai":
     raise ValueError(
         "OPENAI_API_KEY environment variable is not set. "
         "Please set it in your .env file or environment."
     )
 
+# Shared OpenAI client pool (see orchestrator.llm.clients)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+OPENAI_POOL_MAX_CONNECTIONS = int(os.getenv("OPENAI_POOL_MAX_CONNECTIONS", "20"))
+OPENAI_POOL_MAX_KEEPALIVE = int(os.getenv("OPENAI_POOL_MAX_KEEPALIVE", "10"))
+OPENAI_POOL_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_POOL_KEEPALIVE_EXPIRY", "60"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "600"))
+# Per-model in-flight request limits, e.g. "gpt-4=4,whisper-1=2"; models not
+# listed get OPENAI_DEFAULT_CONCURRENCY (0 = unlimited)
+OPENAI_MODEL_CONCURRENCY = parse_model_limits(os.getenv("OPENAI_MODEL_CONCURRENCY", ""))
+OPENAI_DEFAULT_CONCURRENCY = int(os.getenv("OPENAI_DEFAULT_CONCURRENCY", "8"))
+# Initial per-model requests / tokens per minute, e.g. "gpt-4=500"; the
+# limits are resynced from each response's x-ratelimit-* headers
+OPENAI_RPM_LIMITS = parse_model_limits(os.getenv("OPENAI_RPM_LIMITS", ""))
+OPENAI_TPM_LIMITS = parse_model_limits(os.getenv("OPENAI_TPM_LIMITS", ""))
+# Retries of 429s, timeouts and 5xx responses (exponential backoff with jitter)
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+OPENAI_RETRY_BASE_DELAY = float(os.getenv("OPENAI_RETRY_BASE_DELAY", "1"))
+OPENAI_RETRY_MAX_DELAY = float(os.getenv("OPENAI_RETRY_MAX_DELAY", "60"))
+
+# Fake LLM backend: latency in seconds and markdown reply length in tokens,
+# as distributions ("fixed:0.2", "uniform:0.1:0.5", "normal:0.8:0.2" or
+# "lognormal:0.8:0.5"), plus a seed that varies every reply
+FAKE_LLM_LATENCY = os.getenv("ORCHESTRATOR_FAKE_LLM_LATENCY", "fixed:0")
+FAKE_LLM_COMPLETION_TOKENS = os.getenv("ORCHESTRATOR_FAKE_LLM_COMPLETION_TOKENS", "uniform:200:800")
+FAKE_LLM_SEED = int(os.getenv("ORCHESTRATOR_FAKE_LLM_SEED", "0"))
+
+# Commit lifecycle patches as soon as each node records them instead of once
+# per run in summary_node (see orchestrator.lifecycle)
+LIFECYCLE_WRITE_THROUGH = os.getenv("ORCHESTRATOR_LIFECYCLE_WRITE_THROUGH", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Stream the deep research report to disk as it is generated instead of
+# waiting for the whole completion (run option "research_streaming")
+RESEARCH_STREAMING = os.getenv("ORCHESTRATOR_RESEARCH_STREAMING", "1").lower() in ("1", "true", "yes")
+
+# Generate the research template's "## " sections as separate, concurrent
+# completions and assemble them in order (run option "research_sections");
+# when off, the whole report is one completion. At most
+# RESEARCH_SECTION_CONCURRENCY sections are generated at once (run option
+# "research_section_concurrency"), each capped at RESEARCH_SECTION_MAX_TOKENS
+RESEARCH_SECTIONS = os.getenv("ORCHESTRATOR_RESEARCH_SECTIONS", "1").lower() in ("1", "true", "yes")
+RESEARCH_SECTION_CONCURRENCY = int(os.getenv("ORCHESTRATOR_RESEARCH_SECTION_CONCURRENCY", "4"))
+RESEARCH_SECTION_MAX_TOKENS = int(os.getenv("ORCHESTRATOR_RESEARCH_SECTION_MAX_TOKENS", "3000"))
+
+# Tiered validation routing (run option "validation_routing"): when on,
+# VALIDATION_TRIAGE_MODEL scores each pack first and the request is escalated
+# to VALIDATION_MODEL only when its viability lands in
+# VALIDATION_ESCALATION_BAND ("low-high", inclusive; run option
+# "validation_escalation_band"), where the validation and scoring gates flip;
+# run options "validation_model" and "validation_triage_model" pick the models
+VALIDATION_MODEL = os.getenv("ORCHESTRATOR_VALIDATION_MODEL", "gpt-4")
+VALIDATION_ROUTING = os.getenv("ORCHESTRATOR_VALIDATION_ROUTING", "").lower() in ("1", "true", "yes")
+VALIDATION_TRIAGE_MODEL = os.getenv("ORCHESTRATOR_VALIDATION_TRIAGE_MODEL", "gpt-4o-mini")
+VALIDATION_ESCALATION_BAND = os.getenv("ORCHESTRATOR_VALIDATION_ESCALATION_BAND", "45-75")
+
+# Start deep research speculatively alongside validation when the pack's
+# lifecycle predicts a scoring pass (run option "research_speculation"):
+# its last scoring gate passed or its last score is at least
+# SPECULATION_MIN_SCORE. The speculative report is discarded if the gate
+# fails; cancelling waits up to SPECULATION_CANCEL_TIMEOUT seconds for it to stop
+RESEARCH_SPECULATION = os.getenv("ORCHESTRATOR_RESEARCH_SPECULATION", "1").lower() in ("1", "true", "yes")
+SPECULATION_MIN_SCORE = int(os.getenv("ORCHESTRATOR_SPECULATION_MIN_SCORE", "80"))
+SPECULATION_CANCEL_TIMEOUT = float(os.getenv("ORCHESTRATOR_SPECULATION_CANCEL_TIMEOUT", "30"))
+
+# Run checkpoints: the research graph saves each run's state after every node
+# to RUN_CHECKPOINT_PATH (keyed by run id), so a failed or interrupted run
+# resumes from its last completed node (resume-run). A run's checkpoints are
+# deleted once it completes
+RUN_CHECKPOINTS = os.getenv("ORCHESTRATOR_RUN_CHECKPOINTS", "1").lower() in ("1", "true", "yes")
+RUN_CHECKPOINT_PATH = Path(
+    os.getenv(
+        "ORCHESTRATOR_RUN_CHECKPOINT_PATH",
+        str(Path(__file__).resolve().parent / "data" / "checkpoints.sqlite3"),
+    )
+)
+
+# How many packs validate-all validates at once (on top of the per-model
+# OpenAI limits above)
+VALIDATE_ALL_CONCURRENCY = int(os.getenv("ORCHESTRATOR_VALIDATE_ALL_CONCURRENCY", "8"))
+
+# Pack store backend: "json" (packs.json is the system of record), "sqlite"
+# (SQLite database), "sharded" (one file per pack) or "journal" (packs.json
+# snapshot + patch journal); the latter three regenerate packs.json for the
+# TypeScript side
+PACK_STORE_BACKEND = os.getenv("PACK_STORE_BACKEND", "json")
+
+# SQLite backend settings
+PACK_STORE_SQLITE_PATH = Path(
+    os.getenv(
+        "PACK_STORE_SQLITE_PATH",
+        str(Path(__file__).resolve().parent / "data" / "packs.sqlite3"),
+    )
+)
+PACK_STORE_EXPORT_DELAY = float(os.getenv("PACK_STORE_EXPORT_DELAY", "0.5"))
+
+# Sharded backend settings
+PACK_STORE_SHARD_DIR = Path(
+    os.getenv("PACK_STORE_SHARD_DIR", str(PACK_CRM_PATH.with_name("packs")))
+)
+
+# Journal backend settings
+PACK_STORE_JOURNAL_PATH = Path(
+    os.getenv("PACK_STORE_JOURNAL_PATH", str(PACK_CRM_PATH.with_name("packs.journal.jsonl")))
+)
+PACK_STORE_COMPACT_BYTES = int(os.getenv("PACK_STORE_COMPACT_BYTES", str(1024 * 1024)))
+PACK_STORE_COMPACT_DELAY = float(os.getenv("PACK_STORE_COMPACT_DELAY", "5.0"))
+
+# Pack change feed settings: "auto" (inotify, falling back to polling),
+# "inotify" or "poll"
+PACK_WATCH_MODE = os.getenv("PACK_WATCH_MODE", "auto")
+PACK_WATCH_POLL_INTERVAL = float(os.getenv("PACK_WATCH_POLL_INTERVAL", "1.0"))
+PACK_WATCH_BUFFER_SIZE = int(os.getenv("PACK_WATCH_BUFFER_SIZE", "1000"))
+
+# LLM response cache (see orchestrator.llm.cache); a run can opt out with
+# options["llm_cache"] = False (--no-cache), single nodes with
+# ORCHESTRATOR_LLM_CACHE_SKIP_NODES (comma-separated, e.g. "deep_research")
+LLM_CACHE_ENABLED = os.getenv("ORCHESTRATOR_LLM_CACHE", "1").lower() in ("1", "true", "yes")
+LLM_CACHE_DIR = Path(
+    os.getenv(
+        "ORCHESTRATOR_LLM_CACHE_DIR",
+        str(Path(__file__).resolve().parent / "data" / "cache" / "llm"),
+    )
+)
+LLM_CACHE_MAX_BYTES = int(os.getenv("ORCHESTRATOR_LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Seconds; 0 keeps entries until they are evicted for space
+LLM_CACHE_TTL = float(os.getenv("ORCHESTRATOR_LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_SKIP_NODES = frozenset(
+    node.strip() for node in os.getenv("ORCHESTRATOR_LLM_CACHE_SKIP_NODES", "").split(",") if node.strip()
+)
+
+# LLM spend budget (see orchestrator.llm.budget): per-run, per-pack and
+# per-day token / USD limits from BUDGET_FILE (no file = no limits), which a
+# run can override with options["budget"] (--budget); the real cost of each
+# call is appended to BUDGET_LEDGER_PATH
+BUDGET_FILE = Path(
+    os.getenv("ORCHESTRATOR_BUDGET_FILE", str(Path(__file__).resolve().parent / "budget.json"))
+)
+BUDGET_LEDGER_PATH = Path(
+    os.getenv(
+        "ORCHESTRATOR_BUDGET_LEDGER",
+        str(Path(__file__).resolve().parent / "data" / "budget" / "ledger.jsonl"),
+    )
+)
+
+
+def pack_store_options(backend: str = PACK_STORE_BACKEND) -> dict:
+    """Backend-specific options for make_pack_store, from the environment."""
+    if backend == "sqlite":
+        return {"db_path": PACK_STORE_SQLITE_PATH, "export_delay": PACK_STORE_EXPORT_DELAY}
+    if backend == "sharded":
+        return {"shard_dir": PACK_STORE_SHARD_DIR, "export_delay": PACK_STORE_EXPORT_DELAY}
+    if backend == "journal":
+        return {
+            "journal_path": PACK_STORE_JOURNAL_PATH,
+            "compact_bytes": PACK_STORE_COMPACT_BYTES,
+            "compact_delay": PACK_STORE_COMPACT_DELAY,
+        }
+    return {}
+
+
+# Process-wide pack store
+_pack_store = make_pack_store(PACK_STORE_BACKEND, PACK_CRM_PATH, pack_store_options())  # type: ignore[arg-type]
+
+
+def get_pack_store() -> PackStore:
+    """
+    Get the process-wide pack store backing the helpers below.
+    
+    Returns:
+        Shared PackStore instance
+    """
+    return _pack_store
+
+
+# Process-wide pack watcher, started on first use
+_pack_watcher: Optional[PackWatcher] = None
+_pack_watcher_lock = threading.Lock()
+
+
+def get_pack_watcher() -> PackWatcher:
+    """
+    Get the process-wide pack watcher, starting it on first use.
+    
+    The watcher publishes per-slug change events for the shared pack store
+    (see orchestrator.store.watch), whoever made the change.
+    
+    Returns:
+        Running PackWatcher instance
+    """
+    global _pack_watcher
+    with _pack_watcher_lock:
+        if _pack_watcher is None:
+            watcher = PackWatcher(
+                _pack_store,
+                ChangeFeed(PACK_WATCH_BUFFER_SIZE),
+                mode=PACK_WATCH_MODE,  # type: ignore[arg-type]
+                poll_interval=PACK_WATCH_POLL_INTERVAL,
+            )
+            watcher.start()
+            _pack_watcher = watcher
+        return _pack_watcher
+
+
+def llm_backend_options(backend: str = LLM_BACKEND) -> dict:
+    """Backend-specific options for make_llm_backend, from the environment."""
+    limits = {
+        "model_limits": OPENAI_MODEL_CONCURRENCY,
+        "default_model_limit": OPENAI_DEFAULT_CONCURRENCY or None,
+    }
+    if backend == "fake":
+        return {
+            **limits,
+            "latency": FAKE_LLM_LATENCY,
+            "completion_tokens": FAKE_LLM_COMPLETION_TOKENS,
+            "seed": FAKE_LLM_SEED,
+        }
+    return {
+        **limits,
+        "api_key": OPENAI_API_KEY,
+        "base_url": OPENAI_BASE_URL,
+        "max_connections": OPENAI_POOL_MAX_CONNECTIONS,
+        "max_keepalive_connections": OPENAI_POOL_MAX_KEEPALIVE,
+        "keepalive_expiry": OPENAI_POOL_KEEPALIVE_EXPIRY,
+        "timeout": OPENAI_TIMEOUT,
+        "requests_per_minute": OPENAI_RPM_LIMITS,
+        "tokens_per_minute": OPENAI_TPM_LIMITS,
+        "retry_policy": RetryPolicy(OPENAI_MAX_RETRIES, OPENAI_RETRY_BASE_DELAY, OPENAI_RETRY_MAX_DELAY),
+    }
+
+
+# Process-wide LLM backend
+_llm_backend = make_llm_backend(LLM_BACKEND, llm_backend_options())  # type: ignore[arg-type]
+
+
+def get_llm_backend() -> LLMBackend:
+    """
+    Get the process-wide LLM backend (ORCHESTRATOR_LLM_BACKEND).
+    
+    All LLM calls go through its shared clients and per-model limits instead
+    of constructing OpenAI() per call; the "openai" backend (ClientRegistry)
+    also pools connections and paces and retries requests.
+    
+    Returns:
+        Shared LLMBackend instance
+    """
+    return _llm_backend
+
+
+# Process-wide LLM response cache, created on first use
+_llm_cache: Optional[ResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache(options: Optional[dict] = None, node: Optional[str] = None) -> Optional[ResponseCache]:
+    """
+    Get the LLM response cache to use for a run / node, if caching applies.
+    
+    Args:
+        options: Run options; options["llm_cache"] = False disables caching
+                 for the run, options["llm_cache_skip_nodes"] for listed nodes
+        node: Node making the call (checked against the skip lists)
+    
+    Returns:
+        Shared ResponseCache, or None if caching is disabled here
+    """
+    global _llm_cache
+    options = options or {}
+    if not options.get("llm_cache", LLM_CACHE_ENABLED):
+        return None
+    if node is not None and (
+        node in LLM_CACHE_SKIP_NODES or node in options.get("llm_cache_skip_nodes", ())
+    ):
+        return None
+    
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = ResponseCache(
+                LLM_CACHE_DIR,
+                max_bytes=LLM_CACHE_MAX_BYTES,
+                ttl_seconds=LLM_CACHE_TTL or None,
+            )
+        return _llm_cache
+
+
+# Process-wide run checkpointer, opened on first use
+_run_checkpointer: Optional[SqliteSaver] = None
+_run_checkpointer_lock = threading.Lock()
+
+
+def get_run_checkpointer() -> Optional[SqliteSaver]:
+    """
+    Get the checkpointer that persists research runs between nodes.
+    
+    The SQLite database is shared by every thread and process (WAL mode), so
+    a run started by the API can be resumed from the CLI and vice versa.
+    
+    Returns:
+        Shared SqliteSaver, or None if ORCHESTRATOR_RUN_CHECKPOINTS is off
+    """
+    global _run_checkpointer
+    if not RUN_CHECKPOINTS:
+        return None
+    
+    with _run_checkpointer_lock:
+        if _run_checkpointer is None:
+            RUN_CHECKPOINT_PATH.parent.mkdir(parents=True, exist_ok=True)
+            _run_checkpointer = SqliteSaver(sqlite3.connect(str(RUN_CHECKPOINT_PATH), check_same_thread=False))
+        return _run_checkpointer
+
+
+# Process-wide budget config and spend ledger, loaded on first use
+_budget_config: Optional[BudgetConfig] = None
+_spend_ledger: Optional[SpendLedger] = None
+_budget_lock = threading.Lock()
+
+
+def get_budget(options: Optional[dict] = None) -> Optional[Budget]:
+    """
+    Get the spend budget that applies to a run, if any.
+    
+    Args:
+        options: Run options; options["budget"] overrides the budget file's
+                 limits, e.g. {"run": {"usd": 2.0}}
+    
+    Returns:
+        Budget over the shared spend ledger, or None if no limit is set
+    
+    Raises:
+        ValueError: If the budget file or the overrides are malformed
+    """
+    global _budget_config, _spend_ledger
+    with _budget_lock:
+        if _budget_config is None:
+            _budget_config = load_budget_config(BUDGET_FILE)
+        if _spend_ledger is None:
+            _spend_ledger = SpendLedger(BUDGET_LEDGER_PATH)
+        budget_config, ledger = _budget_config, _spend_ledger
+    
+    budget_config = budget_config.with_overrides((options or {}).get("budget"))
+    if not budget_config.limited:
+        return None
+    return Budget(budget_config, ledger)
+
 
 def load_packs_json() -> list[dict]:
     """
     Load packs.json and return list of PackLifecycle dicts.
     
+    Served by the configured pack store (with the default JSON backend, from
+    an in-process cache that is only re-parsed when the file changes).
+    
     Returns:
-        List of pack dictionaries
+        List of pack dictionaries (independent copies, safe to mutate)
         
     Raises:
         FileNotFoundError: If packs.json doesn't exist
         json.JSONDecodeError: If JSON is invalid
     """
-    if not PACK_CRM_PATH.exists():
-        raise FileNotFoundError(
-            f"Pack CRM file not found: {PACK_CRM_PATH}\n"
-            "Please ensure pack-crm/data/packs.json exists."
-        )
-    
-    with open(PACK_CRM_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    if not isinstance(data, list):
-        raise ValueError(f"Expected list in packs.json, got {type(data)}")
-    
-    return data
+    return _pack_store.load_all()
 
 
 def save_packs_json(packs: list[dict]) -> None:
@@ -66,16 +439,7 @@ def save_packs_json(packs: list[dict]) -> None:
     Raises:
         IOError: If file cannot be written
     """
-    # Ensure directory exists
-    PACK_CRM_PATH.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Write JSON with consistent formatting
-    # Using indent=2 and ensure_ascii=False to match typical JSON formatting
-    # sort_keys=False preserves dictionary key order (Python 3.7+)
-    with open(PACK_CRM_PATH, "w", encoding="utf-8") as f:
-        json.dump(packs, f, indent=2, ensure_ascii=False, sort_keys=False)
-        # Add trailing newline for consistency with typical file formatting
-        f.write("\n")
+    _pack_store.save_all(packs)
     
     print(f"✅ Updated pack CRM: {PACK_CRM_PATH}")
 
@@ -88,16 +452,41 @@ def get_pack_lifecycle(slug: str) -> Optional[dict]:
         slug: Pack slug identifier
         
     Returns:
-        Pack dict if found, None otherwise
+        Pack dict if found (a deep copy, so mutations never leak into the
+        shared cache), None otherwise
+    """
+    return _pack_store.get(slug)
+
+
+def get_pack_snapshot(slug: str) -> Optional[FrozenDict]:
+    """
+    Get a read-only snapshot of a pack lifecycle by slug.
+    
+    Cheaper than get_pack_lifecycle: instead of a deep copy per call, every
+    reader shares the same immutable snapshot until the pack changes. Use it
+    wherever the pack is only read; derive a changed version with
+    orchestrator.store.PackBuilder, or get a mutable copy with thaw().
+    
+    Args:
+        slug: Pack slug identifier
+    
+    Returns:
+        FrozenDict snapshot if found, None otherwise
     """
-    packs = load_packs_json()
+    return _pack_store.snapshot(slug)
+
+
+def load_pack_snapshots() -> list[FrozenDict]:
+    """
+    Get read-only snapshots of all packs, in packs.json order.
     
-    for pack in packs:
-        if pack.get("slug") == slug:
-            # Return a copy to avoid accidental mutations
-            return pack.copy()
+    Returns:
+        List of shared FrozenDict snapshots (see get_pack_snapshot)
     
-    return None
+    Raises:
+        FileNotFoundError: If packs.json doesn't exist
+    """
+    return _pack_store.snapshot_all()
 
 
 def update_pack_lifecycle(slug: str, updater_fn: Callable[[dict], dict]) -> dict:
@@ -110,13 +499,13 @@ def update_pack_lifecycle(slug: str, updater_fn: Callable[[dict], dict]) -> dict
     (e.g., stages, crm.gateDecisionNotes, research artifacts) without dropping or
     reordering any existing fields.
     
-    This function:
-    1. Loads all packs
-    2. Finds the pack with the given slug
-    3. Calls updater_fn(pack_dict) which returns an updated pack_dict
-    4. Replaces that entry in the list
-    5. Saves back to packs.json
-    6. Returns the updated pack dict
+    This function (all under an exclusive cross-process file lock):
+    1. Looks up the pack by slug in the cached pack index
+    2. Calls updater_fn(pack_dict) on a private copy, which returns an updated pack_dict
+    3. Replaces that entry in the list
+    4. Atomically saves back to packs.json (refreshing the cache and bumping
+       the store version)
+    5. Returns the updated pack dict
     
     IMPORTANT: updater_fn must preserve unknown keys. It should only
     mutate relevant fields, preserving existing crm, stages, deployment, etc.
@@ -134,27 +523,69 @@ def update_pack_lifecycle(slug: str, updater_fn: Callable[[dict], dict]) -> dict
     Raises:
         ValueError: If pack with slug not found
     """
-    packs = load_packs_json()
+    updated_pack = _pack_store.update(slug, updater_fn)
     
-    # Find the pack
-    pack_index = None
-    for i, pack in enumerate(packs):
-        if pack.get("slug") == slug:
-            pack_index = i
-            break
+    print(f"✅ Updated pack CRM: {PACK_CRM_PATH}")
     
-    if pack_index is None:
-        raise ValueError(f"Pack with slug '{slug}' not found in packs.json")
+    return updated_pack
+
+
+def update_many_pack_lifecycles(updaters: PackUpdaters) -> BatchUpdateResult:
+    """
+    Update several pack lifecycles with a single load and a single save.
+    
+    Each updater follows the same key-preservation rules as
+    update_pack_lifecycle. The whole batch runs under one exclusive
+    cross-process lock. A pack that is missing, or whose updater raises, is
+    skipped and reported in the result's errors, and the rest of the batch
+    is still saved. To queue updates incrementally instead, use
+    get_pack_store().transaction().
     
-    # Get the pack and update it
-    original_pack = packs[pack_index]
-    updated_pack = updater_fn(original_pack.copy())
+    Args:
+        updaters: Mapping of slug -> updater function, or (slug, updater)
+                  pairs to run several updaters on one pack in order
     
-    # Replace in list
-    packs[pack_index] = updated_pack
+    Returns:
+        BatchUpdateResult with updated packs (slug -> pack dict) and
+        per-slug errors (slug -> exception)
+    """
+    result = _pack_store.update_many(updaters)
     
-    # Save back
-    save_packs_json(packs)
+    if result.updated:
+        print(f"✅ Updated {len(result.updated)} packs in pack CRM: {PACK_CRM_PATH}")
+    for slug, error in result.errors.items():
+        print(f"⚠️  Could not update pack '{slug}': {error}")
     
-    return updated_pack
+    return result
 
+
+def compare_and_swap_pack_lifecycle(
+    slug: str,
+    updater_fn: Callable[[dict], dict],
+    max_retries: int = 10,
+) -> dict:
+    """
+    Optimistic variant of update_pack_lifecycle.
+    
+    Runs updater_fn outside the file lock and only commits if the pack did not
+    change in the meantime; otherwise updater_fn is retried against the fresh
+    pack. updater_fn must be safe to call more than once and follows the same
+    key-preservation rules as update_pack_lifecycle.
+    
+    Args:
+        slug: Pack slug identifier
+        updater_fn: Function that takes a pack dict and returns an updated pack dict
+        max_retries: Maximum number of attempts before giving up
+        
+    Returns:
+        Updated pack dict
+        
+    Raises:
+        ValueError: If pack with slug not found
+        PackStoreConflictError: If every attempt lost to a concurrent writer
+    """
+    updated_pack = _pack_store.compare_and_swap(slug, updater_fn, max_retries=max_retries)
+    
+    print(f"✅ Updated pack CRM: {PACK_CRM_PATH}")
+    
+    return updated_pack
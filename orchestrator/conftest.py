@@ -0,0 +1,208 @@
+"""
+Shared pytest fixtures for the orchestrator tests.
+
+Tests that talk to an LLM install a ScriptedClient (or a FakeBackend) as
+the shared LLM backend instead of hand-rolling an OpenAI stand-in, and get
+the pack store, LLM response cache and research paths pointed at a
+temporary directory. Everything is installed with monkeypatch, so it is
+undone after each test even when the test fails.
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Iterable, Optional, Union
+
+import pytest
+
+# Allow importing orchestrator when pytest runs from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator import config
+from orchestrator.llm import LLMBackend, ResponseCache
+from orchestrator.nodes import deep_research
+from orchestrator.store import make_pack_store
+
+# What a reply function returns: the reply text, its streamed pieces (an
+# iterator may sleep or raise between pieces), or None to pass the request on
+# to the fallback client
+ReplyContent = Union[str, Iterable[str], None]
+
+
+def _usage(tokens: Optional[dict]) -> Optional[SimpleNamespace]:
+    """An OpenAI usage object from prompt/completion(/cached) token counts."""
+    if tokens is None:
+        return None
+    prompt = tokens.get("prompt_tokens", 0)
+    completion = tokens.get("completion_tokens", 0)
+    usage = SimpleNamespace(prompt_tokens=prompt, completion_tokens=completion, total_tokens=prompt + completion)
+    if "cached_tokens" in tokens:
+        usage.prompt_tokens_details = SimpleNamespace(cached_tokens=tokens["cached_tokens"])
+    return usage
+
+
+class ScriptedClient:
+    """
+    Stands in for OpenAI(): answers chat completions through a reply function.
+    
+    Streamed requests get one chunk per piece of the reply, then a usage
+    chunk if asked for with stream_options; other requests get the joined
+    text. Every request is recorded, and the number of requests in progress
+    (streams count until they end) is tracked for concurrency checks.
+    """
+    
+    def __init__(
+        self,
+        reply: Callable[[dict], ReplyContent],
+        usage: Union[dict, Callable[[dict], Optional[dict]], None] = None,
+        model: Optional[str] = None,
+        fallback: Any = None,
+    ):
+        """
+        Initialize the client.
+        
+        Args:
+            reply: request -> reply content (see ReplyContent); may raise to
+                   fail the call
+            usage: Token counts for every reply, or request -> token counts
+                   (prompt_tokens, completion_tokens, optional cached_tokens);
+                   None for replies without usage
+            model: Model reported in replies (default: the requested model)
+            fallback: Client that answers requests reply returns None for
+        """
+        self.reply = reply
+        self.usage = usage
+        self.model = model
+        self.fallback = fallback
+        self.requests: list[dict] = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+    
+    @property
+    def calls(self) -> int:
+        """Number of requests answered (fallback requests included)."""
+        return len(self.requests)
+    
+    def _enter(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+    
+    def _exit(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+    
+    def create(self, **request) -> Any:
+        """client.chat.completions.create"""
+        with self._lock:
+            self.requests.append(request)
+        self._enter()
+        try:
+            content = self.reply(request)
+            if content is None:
+                return self.fallback.chat.completions.create(**request)
+            model = self.model or request["model"]
+            usage = self.usage(request) if callable(self.usage) else self.usage
+            if request.get("stream"):
+                include_usage = bool((request.get("stream_options") or {}).get("include_usage"))
+                return self._stream(content, model, _usage(usage) if include_usage else None)
+            if not isinstance(content, str):
+                content = "".join(content)
+            return SimpleNamespace(
+                model=model,
+                choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason="stop")],
+                usage=_usage(usage),
+            )
+        finally:
+            self._exit()
+    
+    def _stream(self, content: ReplyContent, model: str, usage: Optional[SimpleNamespace]):
+        self._enter()
+        try:
+            for piece in [content] if isinstance(content, str) else content:
+                yield SimpleNamespace(
+                    model=model,
+                    choices=[SimpleNamespace(delta=SimpleNamespace(content=piece), finish_reason=None)],
+                    usage=None,
+                )
+            yield SimpleNamespace(
+                model=model,
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=None), finish_reason="stop")],
+                usage=None,
+            )
+            if usage is not None:
+                yield SimpleNamespace(model=model, choices=[], usage=usage)
+        finally:
+            self._exit()
+
+
+def validation_reply(viability: int, data_availability: int, icp_clarity: int, rationale: str = "ok") -> str:
+    """A validation node JSON reply with the given scores."""
+    return json.dumps({
+        "viability": viability,
+        "data_availability": data_availability,
+        "icp_clarity": icp_clarity,
+        "rationale": rationale,
+    })
+
+
+@pytest.fixture
+def llm_backend(monkeypatch):
+    """
+    Install an LLM client or backend as the shared LLM backend.
+    
+    Call it with a ScriptedClient (or any OpenAI-compatible client), which
+    runs without concurrency or rate limits, or with an LLMBackend such as
+    FakeBackend; it returns its argument.
+    """
+    def install(client_or_backend):
+        backend = client_or_backend
+        if not isinstance(backend, LLMBackend):
+            backend = SimpleNamespace(client=client_or_backend, limiter=None, rate_limiter=None)
+        monkeypatch.setattr(config, "_llm_backend", backend)
+        return client_or_backend
+    return install
+
+
+@pytest.fixture
+def pack_store(monkeypatch, tmp_path):
+    """
+    Install a JSON pack store over a temporary packs.json.
+    
+    Call it with the packs to write; it returns the packs.json path.
+    """
+    def install(packs: list[dict]) -> Path:
+        packs_path = tmp_path / "packs.json"
+        packs_path.write_text(json.dumps(packs, indent=2), encoding="utf-8")
+        store = make_pack_store("json", packs_path, {})
+        monkeypatch.setattr(config, "_pack_store", store)
+        return packs_path
+    return install
+
+
+@pytest.fixture
+def llm_cache(monkeypatch, tmp_path) -> ResponseCache:
+    """Install an empty LLM response cache in a temporary directory."""
+    cache = ResponseCache(tmp_path / "llm-cache")
+    monkeypatch.setattr(config, "_llm_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def research_paths(monkeypatch, tmp_path):
+    """
+    Point deep research at a temporary template and report directory.
+    
+    Call it with the template text; it returns the report directory.
+    """
+    def install(template: str) -> Path:
+        template_path = tmp_path / "template.md"
+        template_path.write_text(template, encoding="utf-8")
+        monkeypatch.setattr(deep_research, "TEMPLATE_PATH", template_path)
+        monkeypatch.setattr(deep_research, "RESEARCH_DIR", tmp_path / "research")
+        return deep_research.RESEARCH_DIR
+    return install
@@ -1,20 +1,37 @@
 """
 LangGraph workflow definition for pack research pipeline.
 
-Defines the graph: intake -> validation -> scoring_gate -> deep_research -> summary
-with conditional branching for deep_research (only if scoring gate passes).
+Defines the graph: intake -> speculate_research -> validation -> scoring_gate
+-> deep_research -> summary with conditional branching for deep_research (only
+if scoring gate passes). speculate_research starts the report on a worker
+thread when the pack is predicted to pass, so it runs alongside validation;
+deep_research adopts it, or summary discards it if the gate fails.
+
+The graph is compiled once per process (get_compiled_graph) and reused by
+every run; it is only rebuilt when the node set changes. With run
+checkpoints on, each run's state is saved after every node, so a failed or
+interrupted run can continue from its last completed node
+(resume_pack_research).
 """
 
+import threading
+import time
+from typing import Any, Callable, Optional
+
 from langgraph.graph import StateGraph, END
 from orchestrator.state import State, new_run_state
-from orchestrator.config import get_pack_lifecycle
+from orchestrator.config import get_pack_snapshot, get_run_checkpointer
+from orchestrator.lifecycle import commit_lifecycle_patches
+from orchestrator.llm import describe_llm_usage, summarize_llm_calls
 from orchestrator.nodes import (
     intake_node,
     validation_node,
     scoring_gate_node,
+    speculative_research_node,
     deep_research_node,
     summary_node,
 )
+from orchestrator.nodes.deep_research import clear_unfinished_report, discard_speculative_research
 
 
 def should_run_deep_research(state: State) -> str:
@@ -35,12 +52,30 @@ def should_run_deep_research(state: State) -> str:
         return "skip"
 
 
-def build_graph() -> StateGraph:
+def graph_nodes() -> dict[str, Callable[[State], State]]:
+    """
+    The workflow's nodes by graph node name.
+    
+    Read from this module's globals on every call, so replacing a node
+    function (e.g. in a test) changes the node set and recompiles the graph.
+    """
+    return {
+        "intake": intake_node,
+        "speculate_research": speculative_research_node,
+        "validation": validation_node,
+        "scoring_gate": scoring_gate_node,
+        "deep_research": deep_research_node,
+        "summary": summary_node,
+    }
+
+
+def build_graph(nodes: Optional[dict[str, Callable[[State], State]]] = None) -> StateGraph:
     """
     Build the LangGraph workflow graph.
     
     Graph structure:
     - intake_node
+    - speculative_research_node (starts deep research early if a pass is predicted)
     - validation_node
     - scoring_gate_node
     - conditional: should_run_deep_research
@@ -48,22 +83,25 @@ def build_graph() -> StateGraph:
       - if "skip": summary_node (direct)
     - summary_node
     
+    Args:
+        nodes: Node functions by name (defaults to graph_nodes())
+    
     Returns:
         Configured StateGraph
     """
+    nodes = nodes or graph_nodes()
+    
     # Create graph
     workflow = StateGraph(State)
     
     # Add nodes
-    workflow.add_node("intake", intake_node)
-    workflow.add_node("validation", validation_node)
-    workflow.add_node("scoring_gate", scoring_gate_node)
-    workflow.add_node("deep_research", deep_research_node)
-    workflow.add_node("summary", summary_node)
+    for name, node in nodes.items():
+        workflow.add_node(name, node)
     
     # Define edges
     workflow.set_entry_point("intake")
-    workflow.add_edge("intake", "validation")
+    workflow.add_edge("intake", "speculate_research")
+    workflow.add_edge("speculate_research", "validation")
     workflow.add_edge("validation", "scoring_gate")
     
     # Conditional edge: only run deep_research if scoring gate passes
@@ -85,18 +123,140 @@ def build_graph() -> StateGraph:
     return workflow
 
 
-def run_pack_research(pack_slug: str) -> State:
+# Compiled graph shared by every run in the process, and the node set and
+# checkpointer it was built with
+_compiled_graph: Optional[Any] = None
+_compiled_graph_key: Optional[tuple] = None
+_compiled_graph_lock = threading.Lock()
+
+
+def get_compiled_graph() -> Any:
+    """
+    Get the compiled workflow graph, compiling it on first use.
+    
+    The compiled graph holds no per-run state, so one instance serves every
+    run, including concurrent ones. With run checkpoints on it is compiled
+    with the run checkpointer, so it must be invoked with run_config(run_id).
+    It is recompiled only when graph_nodes() returns a different node set or
+    the checkpointer changes.
+    
+    Returns:
+        Compiled LangGraph app (call .invoke(state, run_config(run_id)))
+    """
+    global _compiled_graph, _compiled_graph_key
+    nodes = graph_nodes()
+    checkpointer = get_run_checkpointer()
+    key = (tuple(nodes.items()), checkpointer)
+    with _compiled_graph_lock:
+        if _compiled_graph is None or _compiled_graph_key != key:
+            _compiled_graph = build_graph(nodes).compile(checkpointer=checkpointer)
+            _compiled_graph_key = key
+        return _compiled_graph
+
+
+def run_config(run_id: str) -> dict:
+    """LangGraph config for a run; its checkpoints are keyed by run id (the thread id)."""
+    return {"configurable": {"thread_id": run_id}}
+
+
+def warm_compiled_graph() -> float:
+    """
+    Compile the workflow graph ahead of the first run (e.g. at API startup).
+    
+    Returns:
+        Seconds spent (close to zero if it was already compiled)
+    """
+    started = time.perf_counter()
+    get_compiled_graph()
+    return time.perf_counter() - started
+
+
+def _run_graph(graph_input: Optional[State], state: State) -> State:
+    """
+    Run a research run on the shared compiled graph, or resume it.
+    
+    A failed run must not leave a speculative report running, and the
+    lifecycle updates of the nodes that completed (e.g. the validation and
+    scoring results) are committed to packs.json before the error
+    propagates, whether or not the run is ever resumed. With run
+    checkpoints on, a failed run keeps its checkpoints for
+    resume_pack_research; its last checkpoint is updated with the committed
+    patches and the discarded speculation's usage, so a resumed run does
+    not apply the patches twice. A completed run's checkpoints are deleted.
+    
+    Args:
+        graph_input: Initial state, or None to continue from the run's last checkpoint
+        state: The run's state (initial or checkpointed)
+    
+    Returns:
+        Final state after graph execution
+    """
+    run_id = state["run_id"]
+    # Compiled once per process (see get_compiled_graph)
+    app = get_compiled_graph()
+    
+    # The state after each completed node, so a failed run still has the last one
+    last_state = state
+    try:
+        for last_state in app.stream(graph_input, run_config(run_id), stream_mode="values"):
+            pass
+        final_state = last_state
+    except BaseException:
+        discarded = discard_speculative_research(last_state)
+        committed = commit_lifecycle_patches(last_state) is not None
+        if committed:
+            print(f"💾 Run {run_id} failed; committed the lifecycle updates of its completed nodes")
+        if app.checkpointer is not None:
+            if committed or discarded:
+                app.update_state(run_config(run_id), last_state)
+            print(f"💾 Run {run_id} checkpointed; resume with: python -m orchestrator resume-run {run_id}")
+        raise
+    if app.checkpointer is not None:
+        app.checkpointer.delete_thread(run_id)
+    
+    print()
+    print("=" * 60)
+    print("Pipeline Complete")
+    print("=" * 60)
+    print(f"Run ID: {final_state['run_id']}")
+    print(f"Pack: {final_state['pack_slug']}")
+    print(f"Scoring Gate: {final_state['gate'].get('scoring', 'N/A')}")
+    llm_cache = final_state.get("llm_cache", {})
+    print(f"LLM Cache: {llm_cache.get('hits', 0)} hits, {llm_cache.get('misses', 0)} misses")
+    print(f"LLM Usage: {describe_llm_usage(summarize_llm_calls(final_state.get('llm_calls', [])))}")
+    
+    if final_state["artifacts"].get("deep_dive_report_path"):
+        print(f"Report: {final_state['artifacts']['deep_dive_report_path']}")
+    
+    print()
+    
+    return final_state
+
+
+def run_pack_research(
+    pack_slug: str,
+    write_through: Optional[bool] = None,
+    use_cache: Optional[bool] = None,
+    refresh: bool = False,
+) -> State:
     """
     Run the complete pack research pipeline for a given pack.
     
     Steps:
     1. Load pack lifecycle to build initial snapshot
     2. Create initial state
-    3. Run the graph
+    3. Run the shared compiled graph (lifecycle updates are committed once, in summary_node),
+       checkpointing the state after every node
     4. Return final state
     
     Args:
         pack_slug: Pack slug identifier
+        write_through: Commit each node's lifecycle update immediately instead
+                       of once per run (defaults to ORCHESTRATOR_LIFECYCLE_WRITE_THROUGH)
+        use_cache: Serve unchanged LLM requests from the response cache
+                   (defaults to ORCHESTRATOR_LLM_CACHE)
+        refresh: Regenerate only the deep research sections whose inputs
+                 changed since the pack's latest report, reusing the rest
         
     Returns:
         Final state after graph execution
@@ -104,8 +264,8 @@ def run_pack_research(pack_slug: str) -> State:
     Raises:
         ValueError: If pack not found
     """
-    # Load pack lifecycle once to build snapshot
-    pack_lifecycle = get_pack_lifecycle(pack_slug)
+    # Load pack lifecycle once to build snapshot (read-only, shared)
+    pack_lifecycle = get_pack_snapshot(pack_slug)
     
     if pack_lifecycle is None:
         raise ValueError(
@@ -113,31 +273,57 @@ def run_pack_research(pack_slug: str) -> State:
         )
     
     # Create initial state
-    initial_state = new_run_state(pack_slug, pack_lifecycle)
+    options = {}
+    if write_through is not None:
+        options["lifecycle_write_through"] = write_through
+    if use_cache is not None:
+        options["llm_cache"] = use_cache
+    if refresh:
+        options["research_refresh"] = True
+    initial_state = new_run_state(pack_slug, pack_lifecycle, options)
     
     print(f"🚀 Starting research pipeline for pack: {pack_slug}")
     print(f"   Run ID: {initial_state['run_id']}")
     print()
     
-    # Build and compile graph
-    graph = build_graph()
-    app = graph.compile()
+    return _run_graph(initial_state, initial_state)
+
+
+def resume_pack_research(run_id: str) -> State:
+    """
+    Resume a failed or interrupted research run from its last completed node.
     
-    # Run the graph
-    final_state = app.invoke(initial_state)
+    The run continues from its last checkpoint with the options it was
+    started with. Nodes that completed before the failure are not run again,
+    so their LLM calls are not paid for twice. A speculative report does not
+    survive the attempt that started it: its leftover files are deleted and
+    deep_research generates the report if the gate passes.
     
-    print()
-    print("=" * 60)
-    print("Pipeline Complete")
-    print("=" * 60)
-    print(f"Run ID: {final_state['run_id']}")
-    print(f"Pack: {pack_slug}")
-    print(f"Scoring Gate: {final_state['gate'].get('scoring', 'N/A')}")
+    Args:
+        run_id: Run ID of a run that failed or whose process died
     
-    if final_state["artifacts"].get("deep_dive_report_path"):
-        print(f"Report: {final_state['artifacts']['deep_dive_report_path']}")
+    Returns:
+        Final state after graph execution
     
+    Raises:
+        ValueError: If run checkpoints are off, or the run has no checkpoint
+                    to resume (unknown run ID, or the run already completed)
+    """
+    app = get_compiled_graph()
+    if app.checkpointer is None:
+        raise ValueError("Run checkpoints are disabled (ORCHESTRATOR_RUN_CHECKPOINTS=0)")
+    
+    checkpoint = app.get_state(run_config(run_id))
+    if not checkpoint.next:
+        raise ValueError(
+            f"Run '{run_id}' has no checkpoint to resume (unknown run ID, or the run already completed)"
+        )
+    state = checkpoint.values
+    
+    print(f"🔁 Resuming research pipeline for pack: {state['pack_slug']}")
+    print(f"   Run ID: {run_id}")
+    print(f"   Next: {', '.join(checkpoint.next)}")
     print()
     
-    return final_state
-
+    clear_unfinished_report(state)
+    return _run_graph(None, state)
@@ -0,0 +1,239 @@
+"""
+Central JSON codec for the orchestrator.
+
+Uses orjson (or msgspec) when installed and falls back to the stdlib json
+module otherwise. Every helper produces exactly the bytes its documented
+stdlib equivalent would, so switching backends never changes packs.json
+or run state files:
+
+- dumps(obj, indent=2) == json.dumps(obj, indent=2, ensure_ascii=False)
+- dumps(obj)           == json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+The fast encoders format a few values differently from stdlib: floats that
+stdlib writes in exponent form (|x| < 1e-4 or >= 1e16), NaN and Infinity
+(which they write as null), integers wider than 64 bits, non-str dict keys
+and subclasses of the JSON types (other than read-only containers registered
+with register_container_types). Such documents are detected up front and
+encoded with stdlib instead.
+
+Decoding uses msgspec when installed. orjson is not used for decoding: it
+silently turns integers wider than 64 bits into floats. Whenever the fast
+decoder rejects input (e.g. NaN literals), stdlib gets to decide, so loads
+accepts exactly what json.loads accepts.
+
+Set ORCHESTRATOR_JSON_BACKEND to "orjson", "msgspec" or "stdlib" to force an
+encoder (default "auto": orjson, then msgspec, then stdlib); "stdlib" also
+forces the stdlib decoder.
+"""
+
+import json
+import os
+from typing import IO, Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional accelerator
+    msgspec = None
+
+JSONDecodeError = json.JSONDecodeError
+
+# Integer range both fast encoders handle (int64 min .. uint64 max)
+_MIN_INT = -(2 ** 63)
+_MAX_INT = 2 ** 64 - 1
+
+# Container types the fast path accepts. Subclasses are only added through
+# register_container_types, for types that every backend encodes exactly
+# like the base type
+_DICT_TYPES: set[type] = {dict}
+_LIST_TYPES: set[type] = {list, tuple}
+
+
+def register_container_types(dict_type: Optional[type] = None, list_type: Optional[type] = None) -> None:
+    """
+    Let the fast encoders handle a dict or list subclass.
+    
+    Only register subclasses that add no state and don't override how items
+    are stored or iterated (e.g. read-only containers), since the fast
+    encoders read the underlying dict/list directly.
+    
+    Args:
+        dict_type: dict subclass to accept
+        list_type: list subclass to accept
+    """
+    if dict_type is not None:
+        _DICT_TYPES.add(dict_type)
+    if list_type is not None:
+        _LIST_TYPES.add(list_type)
+
+
+def _select_encoder(name: str) -> str:
+    """Resolve ORCHESTRATOR_JSON_BACKEND to an available encoder."""
+    if name == "auto":
+        if orjson is not None:
+            return "orjson"
+        if msgspec is not None:
+            return "msgspec"
+        return "stdlib"
+    if name == "orjson" and orjson is None:
+        raise ImportError("ORCHESTRATOR_JSON_BACKEND=orjson but orjson is not installed")
+    if name == "msgspec" and msgspec is None:
+        raise ImportError("ORCHESTRATOR_JSON_BACKEND=msgspec but msgspec is not installed")
+    if name not in ("orjson", "msgspec", "stdlib"):
+        raise ValueError(f"Unknown JSON backend: {name}")
+    return name
+
+
+ENCODER = _select_encoder(os.getenv("ORCHESTRATOR_JSON_BACKEND", "auto").lower())
+DECODER = "msgspec" if msgspec is not None and ENCODER != "stdlib" else "stdlib"
+
+if msgspec is not None:
+    _msgspec_encoder = msgspec.json.Encoder()
+    _msgspec_decoder = msgspec.json.Decoder()
+
+
+def fast_path_safe(obj: Any) -> bool:
+    """
+    Check whether the fast encoders format obj exactly like stdlib json.
+    
+    Args:
+        obj: Value to encode
+    
+    Returns:
+        True if obj only contains plain JSON types whose formatting is
+        identical across backends
+    """
+    stack = [obj]
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        value = pop()
+        kind = type(value)
+        if kind is str or value is None or kind is bool:
+            continue
+        if kind in _DICT_TYPES:
+            for key in value:
+                if type(key) is not str:
+                    return False
+            extend(value.values())
+        elif kind in _LIST_TYPES:
+            extend(value)
+        elif kind is int:
+            if not _MIN_INT <= value <= _MAX_INT:
+                return False
+        elif kind is float:
+            # Also rejects NaN (all comparisons False) and +/-Infinity
+            if value != 0.0 and not 1e-4 <= abs(value) < 1e16:
+                return False
+        else:
+            return False
+    return True
+
+
+def _fast_encode(obj: Any, indent: Optional[int]) -> Optional[bytes]:
+    """Encode with the fast backend, or return None if stdlib must be used."""
+    if ENCODER == "stdlib" or indent not in (None, 2) or not fast_path_safe(obj):
+        return None
+    
+    try:
+        if ENCODER == "orjson":
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent == 2 else 0)
+        encoded = _msgspec_encoder.encode(obj)
+        return msgspec.json.format(encoded, indent=2) if indent == 2 else encoded
+    except (TypeError, ValueError):
+        # e.g. strings containing lone surrogates, which stdlib can still write
+        return None
+
+
+def _stdlib_dumps(obj: Any, indent: Optional[int], allow_nan: bool) -> str:
+    """The stdlib call each fast path must match."""
+    if indent is None:
+        return json.dumps(obj, ensure_ascii=False, allow_nan=allow_nan, separators=(",", ":"))
+    return json.dumps(obj, indent=indent, ensure_ascii=False, allow_nan=allow_nan)
+
+
+def dumps(obj: Any, indent: Optional[int] = None, allow_nan: bool = True) -> str:
+    """
+    Serialize obj to a JSON string.
+    
+    Args:
+        obj: Value to serialize
+        indent: 2 for pretty output (packs.json / run state format), None for
+                compact output (JSONL records, API responses)
+        allow_nan: Write NaN/Infinity as stdlib does (False raises ValueError)
+    
+    Returns:
+        JSON text, byte-identical to json.dumps(obj, indent=2,
+        ensure_ascii=False) or json.dumps(obj, ensure_ascii=False,
+        separators=(",", ":"))
+    
+    Raises:
+        TypeError: If obj contains values JSON can't represent
+        ValueError: If allow_nan is False and obj contains NaN or Infinity
+    """
+    encoded = _fast_encode(obj, indent)
+    if encoded is not None:
+        return encoded.decode("utf-8")
+    return _stdlib_dumps(obj, indent, allow_nan)
+
+
+def dumps_bytes(obj: Any, indent: Optional[int] = None, allow_nan: bool = True) -> bytes:
+    """
+    Serialize obj to UTF-8 JSON bytes (same formatting as dumps).
+    
+    Raises:
+        TypeError: If obj contains values JSON can't represent
+        ValueError: If allow_nan is False and obj contains NaN or Infinity
+    """
+    encoded = _fast_encode(obj, indent)
+    if encoded is not None:
+        return encoded
+    return _stdlib_dumps(obj, indent, allow_nan).encode("utf-8")
+
+
+def dump(obj: Any, fp: IO[str], indent: Optional[int] = None) -> None:
+    """
+    Serialize obj to a text file (same formatting as dumps).
+    
+    Raises:
+        TypeError: If obj contains values JSON can't represent
+    """
+    fp.write(dumps(obj, indent=indent))
+
+
+def loads(data: str | bytes) -> Any:
+    """
+    Parse JSON text.
+    
+    Args:
+        data: JSON document as str or UTF-8 bytes
+    
+    Returns:
+        Parsed value (same result as json.loads)
+    
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON
+    """
+    if DECODER == "msgspec":
+        try:
+            return _msgspec_decoder.decode(data)
+        except msgspec.DecodeError:
+            pass
+    # Either stdlib is the decoder, or msgspec rejected something json.loads
+    # accepts (NaN, Infinity, ...) or that is truly invalid, in which case
+    # json.loads raises the usual error
+    return json.loads(data)
+
+
+def load(fp: IO[str] | IO[bytes]) -> Any:
+    """
+    Parse JSON from a file object.
+    
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    return loads(fp.read())
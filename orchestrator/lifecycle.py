@@ -0,0 +1,175 @@
+"""
+Run-scoped lifecycle patch buffer.
+
+Nodes describe their pack lifecycle mutations as small JSON-serializable ops
+recorded on the graph State (state["lifecycle_patches"]) instead of rewriting
+pack-crm/data/packs.json themselves. summary_node then applies every buffered
+patch in one atomic update_pack_lifecycle call, so a run rewrites the CRM file
+once instead of once per node.
+
+Set state["options"]["lifecycle_write_through"] (or the
+ORCHESTRATOR_LIFECYCLE_WRITE_THROUGH env var) to commit each patch as soon as
+it is recorded, which restores the old per-node write behaviour.
+
+Ops address fields with dotted paths relative to the pack dict, e.g.
+"stages.validation.status". Missing intermediate dicts are created, and
+existing keys keep their position, so unknown keys and key order survive.
+"""
+
+from typing import Any, Optional
+
+from orchestrator.config import LIFECYCLE_WRITE_THROUGH, update_many_pack_lifecycles, update_pack_lifecycle
+from orchestrator.state import State
+from orchestrator.store import BatchUpdateResult
+
+
+def set_op(path: str, value: Any) -> dict:
+    """Op that sets path to value."""
+    return {"op": "set", "path": path, "value": value}
+
+
+def set_default_op(path: str, value: Any) -> dict:
+    """Op that sets path to value only if it is currently missing or empty."""
+    return {"op": "set_default", "path": path, "value": value}
+
+
+def append_unique_op(path: str, value: Any) -> dict:
+    """Op that appends value to the list at path unless already present."""
+    return {"op": "append_unique", "path": path, "value": value}
+
+
+def _parent_for(pack: dict, path: str) -> tuple[dict, str]:
+    """
+    Walk to the dict holding the last path segment, creating dicts as needed.
+    
+    Returns:
+        Tuple of (parent dict, final key)
+    """
+    *parents, key = path.split(".")
+    node = pack
+    for part in parents:
+        child = node.get(part)
+        if not isinstance(child, dict):
+            child = {}
+            node[part] = child
+        node = child
+    return node, key
+
+
+def apply_lifecycle_ops(pack: dict, ops: list[dict]) -> dict:
+    """
+    Apply lifecycle ops to a pack dict in place.
+    
+    Args:
+        pack: Pack lifecycle dict
+        ops: List of ops built with set_op / set_default_op / append_unique_op
+        
+    Returns:
+        The same pack dict, updated
+        
+    Raises:
+        ValueError: If an op type is unknown
+    """
+    for op in ops:
+        parent, key = _parent_for(pack, op["path"])
+        kind = op["op"]
+        value = op["value"]
+        
+        if kind == "set":
+            parent[key] = value
+        elif kind == "set_default":
+            if not parent.get(key):
+                parent[key] = value
+        elif kind == "append_unique":
+            items = parent.get(key)
+            if not isinstance(items, list):
+                items = []
+            if value not in items:
+                items.append(value)
+            parent[key] = items
+        else:
+            raise ValueError(f"Unknown lifecycle op: {kind}")
+    
+    return pack
+
+
+def _write_through_enabled(state: State) -> bool:
+    """Check whether patches should be committed as soon as they are recorded."""
+    options = state.get("options") or {}
+    return bool(options.get("lifecycle_write_through", LIFECYCLE_WRITE_THROUGH))
+
+
+def record_lifecycle_patch(state: State, node: str, ops: list[dict]) -> None:
+    """
+    Buffer a node's lifecycle mutations on the run state.
+    
+    In write-through mode the patch is committed immediately instead.
+    
+    Args:
+        state: Current graph state
+        node: Name of the node recording the patch (kept for auditing)
+        ops: Lifecycle ops to apply to the pack
+    """
+    state.setdefault("lifecycle_patches", []).append({"node": node, "ops": ops})
+    
+    if _write_through_enabled(state):
+        commit_lifecycle_patches(state)
+
+
+def _patches_updater(patches: list[dict]):
+    """Pack updater applying buffered patches in order."""
+    def updater(pack: dict) -> dict:
+        for patch in patches:
+            apply_lifecycle_ops(pack, patch["ops"])
+        return pack
+    
+    return updater
+
+
+def commit_lifecycle_patches(state: State) -> Optional[dict]:
+    """
+    Apply all buffered patches to packs.json in a single atomic update.
+    
+    Args:
+        state: Current graph state
+        
+    Returns:
+        Updated pack dict, or None if there was nothing to commit
+    """
+    patches = state.get("lifecycle_patches") or []
+    if not patches:
+        return None
+    
+    updated_pack = update_pack_lifecycle(state["pack_slug"], _patches_updater(patches))
+    
+    # Keep an audit trail of what this run changed, without re-applying it
+    state.setdefault("committed_lifecycle_patches", []).extend(patches)
+    state["lifecycle_patches"] = []
+    
+    return updated_pack
+
+
+def commit_many_lifecycle_patches(states: list[State]) -> BatchUpdateResult:
+    """
+    Apply the buffered patches of several runs (one per pack) in one packs.json write.
+    
+    Args:
+        states: Run states, each for a different pack
+    
+    Returns:
+        BatchUpdateResult; packs that could not be updated keep their
+        patches buffered and are listed in its errors
+    """
+    pending = [state for state in states if state.get("lifecycle_patches")]
+    if not pending:
+        return BatchUpdateResult()
+    result = update_many_pack_lifecycles(
+        [(state["pack_slug"], _patches_updater(state["lifecycle_patches"])) for state in pending]
+    )
+    
+    for state in pending:
+        if state["pack_slug"] in result.updated:
+            state.setdefault("committed_lifecycle_patches", []).extend(state["lifecycle_patches"])
+            state["lifecycle_patches"] = []
+    
+    return result
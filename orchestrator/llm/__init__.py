@@ -0,0 +1,90 @@
+"""
+LLM call helpers for orchestrator nodes.
+
+- cache: content-addressed on-disk cache of chat completion responses
+- backends: the LLMBackend interface every call goes through, and its factory
+- clients: shared pooled OpenAI clients with per-model in-flight limits
+  (the "openai" backend)
+- fake: deterministic local replies with simulated latency (the "fake" backend)
+- completion: chat completion calls (plain or streamed) that go through the
+  cache and count hits/misses in run state
+- usage: per-call token and latency records (run state llm_calls)
+- budget: per-run / per-pack / per-day spend limits and the spend ledger
+- ratelimit: shared request / token rate limits and retries with backoff
+"""
+
+from orchestrator.llm.backends import LLMBackend, LLMBackendName, make_llm_backend
+from orchestrator.llm.budget import (
+    Budget,
+    BudgetConfig,
+    BudgetExhausted,
+    BudgetGuard,
+    SpendLedger,
+    estimate_prompt_tokens,
+    load_budget_config,
+    parse_budget_overrides,
+)
+from orchestrator.llm.cache import ResponseCache, cache_key
+from orchestrator.llm.clients import ClientRegistry, ModelConcurrencyLimiter, parse_model_limits
+from orchestrator.llm.completion import (
+    CompletionResult,
+    chat_completion,
+    merge_llm_stats,
+    new_cache_stats,
+    node_chat_completion,
+    node_stream_chat_completion,
+    record_cache_lookup,
+    stream_chat_completion,
+)
+from orchestrator.llm.fake import Distribution, FakeBackend, parse_distribution
+from orchestrator.llm.ratelimit import (
+    RateLimiter,
+    RetryPolicy,
+    TokenBucket,
+    async_raw_create,
+    is_retryable,
+    raw_create,
+    retry_after_seconds,
+)
+from orchestrator.llm.usage import describe_llm_usage, record_llm_call, summarize_llm_calls, usage_dict
+
+__all__ = [
+    "LLMBackend",
+    "LLMBackendName",
+    "make_llm_backend",
+    "Budget",
+    "BudgetConfig",
+    "BudgetExhausted",
+    "BudgetGuard",
+    "SpendLedger",
+    "estimate_prompt_tokens",
+    "load_budget_config",
+    "parse_budget_overrides",
+    "ResponseCache",
+    "cache_key",
+    "ClientRegistry",
+    "ModelConcurrencyLimiter",
+    "parse_model_limits",
+    "CompletionResult",
+    "chat_completion",
+    "merge_llm_stats",
+    "new_cache_stats",
+    "node_chat_completion",
+    "node_stream_chat_completion",
+    "record_cache_lookup",
+    "stream_chat_completion",
+    "Distribution",
+    "FakeBackend",
+    "parse_distribution",
+    "RateLimiter",
+    "RetryPolicy",
+    "TokenBucket",
+    "async_raw_create",
+    "is_retryable",
+    "raw_create",
+    "retry_after_seconds",
+    "describe_llm_usage",
+    "record_llm_call",
+    "summarize_llm_calls",
+    "usage_dict",
+]
@@ -0,0 +1,95 @@
+"""
+LLM backend interface and factory.
+
+Every LLM call site gets its clients from the process-wide backend returned
+by orchestrator.config.get_llm_backend(), never from openai.OpenAI()
+directly. A backend hands out OpenAI-compatible clients (chat.completions
+and audio.transcriptions) along with the per-model limits that apply to
+them, so the response cache, budgets and usage accounting in
+orchestrator.llm.completion work the same on every backend.
+
+ORCHESTRATOR_LLM_BACKEND selects it: "openai" (ClientRegistry, the real
+API) or "fake" (FakeBackend, deterministic local replies for load tests).
+"""
+
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Literal, Optional
+
+from orchestrator.llm.ratelimit import RateLimiter
+
+if TYPE_CHECKING:
+    from orchestrator.llm.clients import ModelConcurrencyLimiter
+
+LLMBackendName = Literal["openai", "fake"]
+
+
+class LLMBackend(ABC):
+    """
+    Source of OpenAI-compatible clients for every LLM call.
+    
+    limiter caps in-flight requests per model and rate_limiter paces and
+    retries them; either may be None when the backend has no such limits.
+    """
+    
+    name: str = ""
+    limiter: Optional["ModelConcurrencyLimiter"] = None
+    rate_limiter: Optional[RateLimiter] = None
+    
+    @property
+    @abstractmethod
+    def client(self) -> Any:
+        """Shared sync client, used from any thread."""
+        pass
+    
+    @abstractmethod
+    def async_client(self) -> Any:
+        """
+        Shared async client for the running event loop.
+        
+        Raises:
+            RuntimeError: If called outside a running event loop
+        """
+        pass
+    
+    def slot(self, model: str):
+        """Context manager holding an in-flight slot for model (a no-op without a limiter)."""
+        return self.limiter.slot(model) if self.limiter is not None else nullcontext()
+    
+    def async_slot(self, model: str):
+        """Async context manager holding an in-flight slot for model."""
+        return self.limiter.async_slot(model) if self.limiter is not None else nullcontext()
+    
+    def close(self) -> None:
+        """Release the sync client's resources (no-op by default)."""
+        pass
+    
+    async def aclose(self) -> None:
+        """Release the running event loop's async client resources (no-op by default)."""
+        pass
+
+
+def make_llm_backend(backend: LLMBackendName, options: Optional[dict] = None) -> LLMBackend:
+    """
+    Factory function to create an LLM backend.
+    
+    Args:
+        backend: "openai" or "fake"
+        options: Keyword arguments for the backend's constructor
+                 (ClientRegistry or FakeBackend)
+    
+    Returns:
+        LLMBackend instance
+    
+    Raises:
+        ValueError: If backend is not recognized
+    """
+    options = options or {}
+    if backend == "openai":
+        from orchestrator.llm.clients import ClientRegistry
+        return ClientRegistry(**options)
+    elif backend == "fake":
+        from orchestrator.llm.fake import FakeBackend
+        return FakeBackend(**options)
+    else:
+        raise ValueError(f"Unknown LLM backend: {backend}")
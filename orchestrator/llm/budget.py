@@ -0,0 +1,526 @@
+"""
+LLM spend budgets: per-run, per-pack and per-day token and dollar limits.
+
+Limits come from a JSON budget file (see budget.example.json) and can be
+overridden per run (options["budget"], e.g. from --budget). Before each
+uncached LLM call, Budget.guard() estimates the prompt tokens and admits
+the call against the spend recorded so far plus the calls still in flight:
+if the request's worst case does not fit it is downgraded to a cheaper
+model (the file's "downgrade" map) or given a smaller max_tokens, and if
+even that does not fit, BudgetExhausted is raised. What each call actually
+cost, from the usage OpenAI reports, is appended to a JSONL spend ledger
+that every process shares.
+
+Scopes: "run" is one run's spend, "pack" all spend on a pack in the
+ledger, and "day" all spend in the current UTC day.
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+SCOPES = ("run", "pack", "day")
+
+# USD per million (prompt, completion) tokens; models match by longest prefix,
+# so "gpt-4-0613" is priced as "gpt-4"
+MODEL_PRICES: dict[str, tuple[float, float]] = {
+    "gpt-4": (30.0, 60.0),
+    "gpt-4-32k": (60.0, 120.0),
+    "gpt-4-turbo": (10.0, 30.0),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-3.5-turbo": (0.5, 1.5),
+}
+
+# Unknown models are priced like gpt-4, so an estimate never undercounts
+DEFAULT_PRICE = MODEL_PRICES["gpt-4"]
+
+# Prompt tokens served from OpenAI's prompt cache are billed at half price
+CACHED_PROMPT_DISCOUNT = 0.5
+
+# Completion tokens assumed for requests that do not set max_tokens
+DEFAULT_MAX_TOKENS = 4096
+
+
+class BudgetExhausted(Exception):
+    """Raised when an LLM call does not fit the remaining budget, even downgraded."""
+    
+    def __init__(self, scope: str, message: str):
+        super().__init__(message)
+        self.scope = scope
+
+
+@dataclass(frozen=True)
+class ScopeLimit:
+    """Token and USD limits for one scope (None = unlimited)."""
+    tokens: Optional[int] = None
+    usd: Optional[float] = None
+
+
+def _limit_value(scope: str, name: str, value: Any) -> Optional[float]:
+    """Validate one limit from the budget file or an override."""
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ValueError(f"Invalid budget limit {scope}.{name}={value!r} (expected a number >= 0 or null)")
+    return int(value) if name == "tokens" else float(value)
+
+
+@dataclass(frozen=True)
+class BudgetConfig:
+    """Budget limits plus the model downgrade map and price table."""
+    limits: dict = field(default_factory=dict)  # scope -> ScopeLimit
+    downgrade: dict = field(default_factory=dict)  # model -> cheaper model
+    prices: dict = field(default_factory=lambda: dict(MODEL_PRICES))
+    # Smallest max_tokens a call may be shortened to before it is refused
+    min_completion_tokens: int = 256
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "BudgetConfig":
+        """
+        Build a config from the budget file's JSON.
+        
+        Args:
+            data: {"limits": {"run": {"tokens": N, "usd": X}, ...},
+                   "downgrade": {model: cheaper_model}, "prices":
+                   {model: [prompt_usd, completion_usd] per million tokens},
+                   "min_completion_tokens": N}
+        
+        Returns:
+            BudgetConfig (prices extend MODEL_PRICES)
+        
+        Raises:
+            ValueError: If a scope, limit or price is malformed
+        """
+        unknown = set(data) - {"limits", "downgrade", "prices", "min_completion_tokens"}
+        if unknown:
+            raise ValueError(f"Unknown budget settings: {', '.join(sorted(unknown))}")
+        prices = dict(MODEL_PRICES)
+        for model, price in (data.get("prices") or {}).items():
+            if not isinstance(price, (list, tuple)) or len(price) != 2:
+                raise ValueError(f"Invalid price for {model}: {price!r} (expected [prompt, completion])")
+            prices[model] = (float(price[0]), float(price[1]))
+        return cls(
+            downgrade=dict(data.get("downgrade") or {}),
+            prices=prices,
+            min_completion_tokens=int(data.get("min_completion_tokens", 256)),
+        ).with_overrides(data.get("limits"))
+    
+    def with_overrides(self, overrides: Optional[dict]) -> "BudgetConfig":
+        """
+        Return a copy with some limits replaced.
+        
+        Args:
+            overrides: {"run": {"usd": 2.0}, "day": {"tokens": None}, ...};
+                       None (explicitly) removes a limit
+        
+        Returns:
+            New BudgetConfig
+        
+        Raises:
+            ValueError: If a scope or limit name is unknown, or a value is invalid
+        """
+        if not overrides:
+            return self
+        limits = dict(self.limits)
+        for scope, values in overrides.items():
+            if scope not in SCOPES or not isinstance(values, dict):
+                raise ValueError(f"Invalid budget scope '{scope}' (expected one of {', '.join(SCOPES)})")
+            current = limits.get(scope, ScopeLimit())
+            for name, value in values.items():
+                if name not in ("tokens", "usd"):
+                    raise ValueError(f"Invalid budget limit '{scope}.{name}' (expected tokens or usd)")
+                current = replace(current, **{name: _limit_value(scope, name, value)})
+            limits[scope] = current
+        return replace(self, limits=limits)
+    
+    @property
+    def limited(self) -> bool:
+        """Whether any limit is set."""
+        return any(limit.tokens is not None or limit.usd is not None for limit in self.limits.values())
+    
+    def price(self, model: str) -> tuple[float, float]:
+        """USD per million (prompt, completion) tokens for model (longest prefix match)."""
+        matches = [name for name in self.prices if model.startswith(name)]
+        return self.prices[max(matches, key=len)] if matches else DEFAULT_PRICE
+    
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+        """USD cost of a call's tokens."""
+        prompt_price, completion_price = self.price(model)
+        billed_prompt = prompt_tokens - cached_tokens * CACHED_PROMPT_DISCOUNT
+        return (billed_prompt * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def load_budget_config(path: Path) -> BudgetConfig:
+    """
+    Load the budget file.
+    
+    Args:
+        path: JSON budget file
+    
+    Returns:
+        BudgetConfig (without limits if the file does not exist)
+    
+    Raises:
+        ValueError: If the file is not valid JSON or a setting is malformed
+    """
+    if not path.exists():
+        return BudgetConfig()
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid budget file {path}: {e}") from e
+    return BudgetConfig.from_dict(data)
+
+
+def parse_budget_overrides(text: str) -> dict:
+    """
+    Parse budget overrides, e.g. "run.usd=2,day.tokens=500000,pack.usd=none".
+    
+    Args:
+        text: Comma-separated scope.limit=value pairs (blank entries are ignored)
+    
+    Returns:
+        Overrides for BudgetConfig.with_overrides
+    
+    Raises:
+        ValueError: If an entry is malformed
+    """
+    overrides: dict = {}
+    for entry in text.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, sep, value = entry.partition("=")
+        scope, dot, limit = name.strip().partition(".")
+        if not sep or not dot:
+            raise ValueError(f"Invalid budget override '{entry}' (expected scope.limit=value, e.g. run.usd=2)")
+        value = value.strip()
+        try:
+            number = None if value.lower() == "none" else float(value)
+        except ValueError:
+            raise ValueError(f"Invalid budget override '{entry}' (value must be a number or none)") from None
+        overrides.setdefault(scope, {})[limit] = number
+    # Validate scopes and limits now rather than at the first LLM call
+    BudgetConfig().with_overrides(overrides)
+    return overrides
+
+
+def estimate_prompt_tokens(messages: list[dict]) -> int:
+    """
+    Estimate a chat request's prompt tokens without a tokenizer.
+    
+    Uses ~4 characters per token plus OpenAI's per-message overhead, which
+    is close for English prose; the real count is settled from the usage
+    OpenAI reports.
+    
+    Args:
+        messages: Chat messages
+    
+    Returns:
+        Estimated prompt tokens
+    """
+    return 3 + sum(4 + len(str(message.get("content") or "")) // 4 for message in messages)
+
+
+def _today() -> str:
+    """Current UTC day, e.g. "2025-01-31"."""
+    return datetime.utcnow().date().isoformat()
+
+
+class SpendLedger:
+    """
+    Append-only JSONL record of LLM spend, totalled per run, pack and day.
+    
+    Totals are kept in memory and topped up from the file's new lines
+    before each check, so spend recorded by other processes counts too.
+    Calls admitted but not yet settled are held as in-memory reservations.
+    """
+    
+    def __init__(self, path: Path):
+        """
+        Initialize the ledger.
+        
+        Args:
+            path: JSONL file (created on first record)
+        """
+        self.path = Path(path)
+        # Held while admitting a call, so concurrent calls see each other's reservations
+        self.lock = threading.RLock()
+        self._offset = 0
+        self._spent: dict[tuple[str, str], list] = {}
+        self._reserved: dict[tuple[str, str], list] = {}
+    
+    @staticmethod
+    def _keys(run_id: str, pack_slug: str, day: str) -> list[tuple[str, str]]:
+        return [("run", run_id), ("pack", pack_slug), ("day", day)]
+    
+    @staticmethod
+    def _add(totals: dict, keys: list[tuple[str, str]], tokens: float, usd: float) -> None:
+        for key in keys:
+            total = totals.setdefault(key, [0, 0.0])
+            total[0] += tokens
+            total[1] += usd
+    
+    def _refresh(self) -> None:
+        """Add entries appended since the last read (by any process) to the totals."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        # A line still being written by another process is picked up next time
+        complete = data[:data.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            keys = self._keys(entry["run_id"], entry["pack_slug"], entry["at"][:10])
+            self._add(self._spent, keys, entry["total_tokens"], entry["usd"])
+        self._offset += len(complete)
+    
+    def spent(self, run_id: str, pack_slug: str, day: Optional[str] = None) -> dict[str, tuple[int, float]]:
+        """
+        Spend so far per scope, including calls still in flight.
+        
+        Args:
+            run_id: Run identifier
+            pack_slug: Pack slug
+            day: UTC day (default: today)
+        
+        Returns:
+            scope -> (tokens, usd)
+        """
+        keys = self._keys(run_id, pack_slug, day or _today())
+        with self.lock:
+            self._refresh()
+            totals = {}
+            for scope, key in zip(SCOPES, keys):
+                spent = self._spent.get((scope, key[1]), [0, 0.0])
+                reserved = self._reserved.get((scope, key[1]), [0, 0.0])
+                totals[scope] = (spent[0] + reserved[0], spent[1] + reserved[1])
+            return totals
+    
+    def reserve(self, run_id: str, pack_slug: str, tokens: int, usd: float) -> tuple:
+        """
+        Hold an admitted call's worst case until it is settled.
+        
+        Returns:
+            Reservation to pass to release()
+        """
+        reservation = (self._keys(run_id, pack_slug, _today()), tokens, usd)
+        with self.lock:
+            self._add(self._reserved, *reservation)
+        return reservation
+    
+    def release(self, reservation: tuple) -> None:
+        """Drop a reservation (the call finished or never happened)."""
+        keys, tokens, usd = reservation
+        with self.lock:
+            self._add(self._reserved, keys, -tokens, -usd)
+    
+    def record(self, entry: dict) -> None:
+        """
+        Append a settled call to the ledger.
+        
+        Args:
+            entry: at, run_id, pack_slug, node, model, the token counts and usd
+        """
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # One O_APPEND write per entry, so concurrent processes never interleave lines
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode("utf-8"))
+            finally:
+                os.close(fd)
+            self._refresh()
+
+
+class Budget:
+    """A budget config applied to the shared spend ledger."""
+    
+    def __init__(self, config: BudgetConfig, ledger: SpendLedger):
+        self.config = config
+        self.ledger = ledger
+    
+    def _room(self, run_id: str, pack_slug: str) -> dict[str, tuple[float, float]]:
+        """Tokens and USD left per limited scope."""
+        spent = self.ledger.spent(run_id, pack_slug)
+        room = {}
+        for scope in SCOPES:
+            limit = self.config.limits.get(scope)
+            if limit is None:
+                continue
+            tokens = float("inf") if limit.tokens is None else limit.tokens - spent[scope][0]
+            usd = float("inf") if limit.usd is None else limit.usd - spent[scope][1]
+            room[scope] = (tokens, usd)
+        return room
+    
+    def _affordable(self, model: str, prompt_tokens: int, tokens_left: float, usd_left: float) -> float:
+        """Completion tokens that fit after the prompt, by token and USD room."""
+        prompt_price, completion_price = self.config.price(model)
+        by_usd = (usd_left * 1_000_000 - prompt_tokens * prompt_price) / completion_price
+        return min(tokens_left - prompt_tokens, by_usd)
+    
+    def admit(self, run_id: str, pack_slug: str, request: dict) -> tuple[dict, tuple]:
+        """
+        Admit a request against the remaining budget, downgrading it if needed.
+        
+        Tries the request as is, then with the downgrade model, then with
+        max_tokens lowered to what still fits (cheapest model first, down to
+        min_completion_tokens).
+        
+        Args:
+            run_id: Run identifier
+            pack_slug: Pack slug
+            request: Chat completion request
+        
+        Returns:
+            (request to send, possibly changed; ledger reservation)
+        
+        Raises:
+            BudgetExhausted: If the request does not fit any scope's remaining budget
+        """
+        model = request["model"]
+        prompt_tokens = estimate_prompt_tokens(request.get("messages", []))
+        max_tokens = request.get("max_tokens") or DEFAULT_MAX_TOKENS
+        models = [model] + ([self.config.downgrade[model]] if model in self.config.downgrade else [])
+        
+        with self.ledger.lock:
+            room = self._room(run_id, pack_slug)
+            
+            def affordable(candidate: str) -> float:
+                return min(
+                    [self._affordable(candidate, prompt_tokens, *left) for left in room.values()],
+                    default=float("inf"),
+                )
+            
+            admitted = None
+            for candidate in models:
+                if affordable(candidate) >= max_tokens:
+                    admitted = {**request, "model": candidate}
+                    break
+            else:
+                candidate = models[-1]
+                completion_tokens = int(affordable(candidate))
+                if completion_tokens >= self.config.min_completion_tokens:
+                    admitted = {**request, "model": candidate, "max_tokens": completion_tokens}
+            
+            if admitted is None:
+                # Report the scope that binds hardest for the cheapest model
+                scope = min(
+                    room,
+                    key=lambda name: self._affordable(models[-1], prompt_tokens, *room[name]),
+                )
+                limit = self.config.limits[scope]
+                limits = [f"{limit.tokens} tokens"] if limit.tokens is not None else []
+                limits += [f"${limit.usd:.2f}"] if limit.usd is not None else []
+                raise BudgetExhausted(
+                    scope,
+                    f"{scope} budget of {' / '.join(limits)} exhausted; "
+                    f"~{prompt_tokens} prompt tokens for {model} do not fit",
+                )
+            
+            completion_tokens = admitted.get("max_tokens") or DEFAULT_MAX_TOKENS
+            reservation = self.ledger.reserve(
+                run_id,
+                pack_slug,
+                prompt_tokens + completion_tokens,
+                self.config.cost(admitted["model"], prompt_tokens, completion_tokens),
+            )
+        return (request if admitted == request else admitted), reservation
+    
+    def guard(self, run_id: str, pack_slug: str, node: str) -> "BudgetGuard":
+        """A guard for one LLM call made by node (see BudgetGuard)."""
+        return BudgetGuard(self, run_id, pack_slug, node)
+
+
+class BudgetGuard:
+    """
+    Admits one LLM call and settles its real cost in the ledger.
+    
+    chat_completion() calls admit() after a cache miss, then settle() with
+    the result, or cancel() if the call failed or the admitted request
+    turned out to be cached.
+    """
+    
+    def __init__(self, budget: Budget, run_id: str, pack_slug: str, node: str):
+        self.budget = budget
+        self.run_id = run_id
+        self.pack_slug = pack_slug
+        self.node = node
+        self._reservation: Optional[tuple] = None
+    
+    def admit(self, request: dict) -> dict:
+        """
+        Admit the request (see Budget.admit).
+        
+        Returns:
+            The request to send (the same object if unchanged)
+        
+        Raises:
+            BudgetExhausted: If the call does not fit the budget
+        """
+        admitted, self._reservation = self.budget.admit(self.run_id, self.pack_slug, request)
+        if admitted["model"] != request["model"]:
+            print(f"💸 Budget: {self.node} call downgraded from {request['model']} to {admitted['model']}")
+        if admitted.get("max_tokens") != request.get("max_tokens"):
+            print(
+                f"💸 Budget: {self.node} call limited to {admitted['max_tokens']} completion tokens "
+                f"(requested {request.get('max_tokens') or 'default'})"
+            )
+        return admitted
+    
+    def cancel(self) -> None:
+        """Release the reservation without recording spend."""
+        if self._reservation is not None:
+            self.budget.ledger.release(self._reservation)
+            self._reservation = None
+    
+    def settle(self, model: str, result: Any) -> dict:
+        """
+        Record the call's cost in the ledger and release its reservation.
+        
+        Args:
+            model: Model the request was sent to
+            result: The call's CompletionResult; without usage, the
+                    reserved worst case is recorded
+        
+        Returns:
+            The ledger entry
+        """
+        usage = result.usage or {}
+        if usage.get("total_tokens") is None:
+            _, tokens, usd = self._reservation or ((), 0, 0.0)
+            counts = {"prompt_tokens": tokens, "completion_tokens": 0, "cached_tokens": 0, "total_tokens": tokens}
+        else:
+            counts = {
+                "prompt_tokens": usage.get("prompt_tokens") or 0,
+                "completion_tokens": usage.get("completion_tokens") or 0,
+                "cached_tokens": usage.get("cached_tokens") or 0,
+                "total_tokens": usage["total_tokens"],
+            }
+            usd = self.budget.config.cost(
+                model, counts["prompt_tokens"], counts["completion_tokens"], counts["cached_tokens"]
+            )
+        entry = {
+            "at": datetime.utcnow().isoformat() + "Z",
+            "run_id": self.run_id,
+            "pack_slug": self.pack_slug,
+            "node": self.node,
+            "model": result.model or model,
+            **counts,
+            "usd": round(usd, 6),
+        }
+        # Under one lock, so the call is never counted twice (or not at all)
+        with self.budget.ledger.lock:
+            self.budget.ledger.record(entry)
+            self.cancel()
+        return entry
@@ -0,0 +1,213 @@
+"""
+Content-addressed on-disk cache for chat completion responses.
+
+Entries are keyed by a SHA-256 of the request fields that determine the
+response (model, messages, temperature, max_tokens, response_format) and
+stored one JSON file per entry under orchestrator/data/cache/llm/, fanned out
+by the first two hex digits of the key. A hit refreshes the file's mtime, so
+size-based eviction drops the least recently used entries first; entries
+older than the TTL are treated as misses and removed.
+
+Writes go through write-to-temp + rename, so concurrent runs sharing the
+cache directory only ever read complete entries.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from orchestrator import jsonio
+from orchestrator.store.base import atomic_write_text
+
+# Request fields that go into the cache key; anything else (timeouts,
+# streaming, client options) doesn't change the response
+KEY_FIELDS = ("model", "messages", "temperature", "max_tokens", "response_format")
+
+# Bump when the entry layout changes so old entries are ignored
+_FORMAT_VERSION = 1
+
+
+def cache_key(request: dict) -> str:
+    """
+    Compute the content address of a chat completion request.
+    
+    Args:
+        request: Keyword arguments for chat.completions.create
+    
+    Returns:
+        Hex SHA-256 digest of the canonical JSON of the key fields
+    """
+    fields = {name: request.get(name) for name in KEY_FIELDS}
+    # Sorted keys, so dict ordering in the request doesn't split the cache
+    canonical = json.dumps(fields, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    LRU, TTL-bounded cache of chat completion responses on disk.
+    
+    Safe to share between threads and processes: each entry is its own file,
+    written atomically. The size total used for eviction is tracked in
+    memory and re-measured from disk whenever it crosses max_bytes, so other
+    processes' writes are accounted for at the next eviction.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+    ):
+        """
+        Initialize the cache (the directory is created on first write).
+        
+        Args:
+            cache_dir: Directory holding the entries
+            max_bytes: Total entry size to stay under; least recently used
+                       entries are evicted first
+            ttl_seconds: Maximum entry age, or None to never expire
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+    
+    def _entry_path(self, key: str) -> Path:
+        """Path of the entry file for key."""
+        return self.cache_dir / key[:2] / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Cache key from cache_key()
+        
+        Returns:
+            Cached response dict, or None on a miss (absent, expired or unreadable)
+        """
+        path = self._entry_path(key)
+        try:
+            entry = jsonio.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            entry = None
+        
+        if (
+            not isinstance(entry, dict)
+            or entry.get("version") != _FORMAT_VERSION
+            or entry.get("key") != key
+        ):
+            self._count(hit=False)
+            return None
+        
+        if self.ttl_seconds is not None and time.time() - entry.get("created", 0) > self.ttl_seconds:
+            self._remove(path)
+            self._count(hit=False)
+            return None
+        
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count(hit=True)
+        return entry["response"]
+    
+    def put(self, key: str, response: dict, request: Optional[dict] = None) -> None:
+        """
+        Store a response, evicting least recently used entries if needed.
+        
+        Args:
+            key: Cache key from cache_key()
+            response: JSON-compatible response to cache
+            request: Original request, kept in the entry for inspection
+        """
+        entry = {
+            "version": _FORMAT_VERSION,
+            "key": key,
+            "created": time.time(),
+            "model": (request or {}).get("model"),
+            "response": response,
+        }
+        text = jsonio.dumps(entry)
+        path = self._entry_path(key)
+        atomic_write_text(path, text)
+        
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(text.encode("utf-8"))
+                over = self._total_bytes > self.max_bytes
+            else:
+                over = True
+        if over:
+            self.evict()
+    
+    def evict(self) -> int:
+        """
+        Remove expired entries, then least recently used ones until under max_bytes.
+        
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        now = time.time()
+        for mtime, size, path in entries:
+            # mtime is never older than the entry's creation time, so an
+            # mtime past the TTL means the entry has expired
+            expired = self.ttl_seconds is not None and now - mtime > self.ttl_seconds
+            if not expired and total <= self.max_bytes:
+                break
+            if self._remove(path):
+                total -= size
+                removed += 1
+        
+        with self._lock:
+            self._total_bytes = total
+        return removed
+    
+    def clear(self) -> None:
+        """Remove every entry."""
+        for path in self.cache_dir.glob("*/*.json"):
+            self._remove(path)
+        with self._lock:
+            self._total_bytes = 0
+    
+    def stats(self) -> dict[str, int]:
+        """Hit and miss counts since this cache object was created."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+    
+    def _count(self, hit: bool) -> None:
+        """Record a lookup outcome."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+    
+    @staticmethod
+    def _remove(path: Path) -> bool:
+        """Delete an entry file, ignoring races with other processes."""
+        try:
+            path.unlink()
+            return True
+        except OSError:
+            return False
@@ -0,0 +1,244 @@
+"""
+Process-wide OpenAI client registry.
+
+Every OpenAI call site shares the clients held here instead of constructing
+OpenAI() per call, so requests reuse keep-alive connections from one pooled
+HTTP client rather than paying connection (and TLS) setup each time. The
+registry also caps how many requests per model may be in flight at once,
+across threads and event loops alike, and holds the shared rate limiter
+that paces and retries them (see orchestrator.llm.ratelimit).
+
+Sync callers use registry.client and registry.slot(model); async callers
+use registry.async_client() and registry.async_slot(model).
+"""
+
+import asyncio
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, Mapping, Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+from orchestrator.llm.backends import LLMBackend
+from orchestrator.llm.ratelimit import RateLimiter, RetryPolicy
+
+
+def parse_model_limits(text: str) -> dict[str, int]:
+    """
+    Parse per-model limits, e.g. "gpt-4=4,whisper-1=2".
+    
+    Args:
+        text: Comma-separated model=limit pairs (blank entries are ignored)
+    
+    Returns:
+        model -> limit (e.g. maximum in-flight requests)
+    
+    Raises:
+        ValueError: If an entry is malformed or a limit is not a positive integer
+    """
+    limits = {}
+    for entry in text.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        model, sep, value = entry.partition("=")
+        if not sep or not model.strip() or not value.strip().isdigit() or int(value) < 1:
+            raise ValueError(f"Invalid model limit '{entry}' (expected model=N, N >= 1)")
+        limits[model.strip()] = int(value)
+    return limits
+
+
+class ModelConcurrencyLimiter:
+    """
+    Per-model cap on in-flight requests, shared by sync and async callers.
+    
+    Counts live behind one condition variable, so a limit holds across all
+    threads and event loops in the process. Async callers wait for a slot in
+    a worker thread only when the model is saturated.
+    """
+    
+    def __init__(self, limits: Optional[Mapping[str, int]] = None, default_limit: Optional[int] = None):
+        """
+        Initialize the limiter.
+        
+        Args:
+            limits: model -> maximum in-flight requests
+            default_limit: Limit for models not in limits (None = unlimited)
+        """
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self._in_flight: dict[str, int] = {}
+        self._condition = threading.Condition()
+    
+    def limit_for(self, model: str) -> Optional[int]:
+        """Maximum in-flight requests for model, or None if unlimited."""
+        return self.limits.get(model, self.default_limit)
+    
+    def in_flight(self, model: str) -> int:
+        """Requests currently holding a slot for model."""
+        with self._condition:
+            return self._in_flight.get(model, 0)
+    
+    def acquire(self, model: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a slot for model.
+        
+        Args:
+            model: Model name
+            timeout: Seconds to wait, or None to wait indefinitely
+        
+        Returns:
+            True once a slot is held, False if the timeout expired
+        """
+        limit = self.limit_for(model)
+        with self._condition:
+            if limit is not None and not self._condition.wait_for(
+                lambda: self._in_flight.get(model, 0) < limit, timeout
+            ):
+                return False
+            self._in_flight[model] = self._in_flight.get(model, 0) + 1
+            return True
+    
+    def release(self, model: str) -> None:
+        """Give back a slot taken with acquire()."""
+        with self._condition:
+            self._in_flight[model] -= 1
+            self._condition.notify_all()
+    
+    @contextmanager
+    def slot(self, model: str) -> Iterator[None]:
+        """Hold a slot for model for the duration of the block."""
+        self.acquire(model)
+        try:
+            yield
+        finally:
+            self.release(model)
+    
+    @asynccontextmanager
+    async def async_slot(self, model: str) -> AsyncIterator[None]:
+        """Async variant of slot(); doesn't block the event loop while waiting."""
+        if not self.acquire(model, timeout=0):
+            waiter = asyncio.ensure_future(asyncio.to_thread(self.acquire, model))
+            try:
+                await asyncio.shield(waiter)
+            except asyncio.CancelledError:
+                # The worker thread still gets its slot eventually; hand it back
+                waiter.add_done_callback(lambda _: self.release(model))
+                raise
+        try:
+            yield
+        finally:
+            self.release(model)
+
+
+class ClientRegistry(LLMBackend):
+    """
+    The "openai" LLM backend: pooled OpenAI clients plus model limits.
+    
+    The registry owns the clients, the per-model concurrency limits and the
+    rate limiter. The sync client is created on first use and shared by all
+    threads. Async clients are created per event loop, because pooled async
+    connections are bound to the loop that opened them. The clients' own
+    retries are off; rate_limiter retries instead, pausing every caller of a
+    rate-limited model.
+    """
+    
+    name = "openai"
+    
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: Optional[str] = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 60.0,
+        timeout: float = 600.0,
+        model_limits: Optional[Mapping[str, int]] = None,
+        default_model_limit: Optional[int] = None,
+        requests_per_minute: Optional[Mapping[str, int]] = None,
+        tokens_per_minute: Optional[Mapping[str, int]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        """
+        Initialize the registry (clients are created on first use).
+        
+        Args:
+            api_key: OpenAI API key
+            base_url: API base URL (None = the SDK default / OPENAI_BASE_URL)
+            max_connections: Connection pool size per client
+            max_keepalive_connections: Idle connections kept open per client
+            keepalive_expiry: Seconds an idle connection is kept open
+            timeout: Request timeout in seconds
+            model_limits: model -> maximum in-flight requests
+            default_model_limit: Limit for other models (None = unlimited)
+            requests_per_minute: model -> initial RPM limit
+            tokens_per_minute: model -> initial TPM limit
+            retry_policy: Backoff for 429s, timeouts and 5xx responses
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.pool_limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.limiter = ModelConcurrencyLimiter(model_limits, default_model_limit)
+        self.rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute, retry_policy)
+        self._lock = threading.Lock()
+        self._client: Optional[OpenAI] = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+            weakref.WeakKeyDictionary()
+        )
+    
+    @property
+    def client(self) -> OpenAI:
+        """Shared sync client backed by a keep-alive connection pool."""
+        with self._lock:
+            if self._client is None:
+                self._client = OpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    timeout=self.timeout,
+                    max_retries=0,
+                    http_client=DefaultHttpxClient(limits=self.pool_limits, timeout=self.timeout),
+                )
+            return self._client
+    
+    def async_client(self) -> AsyncOpenAI:
+        """
+        Shared async client for the running event loop.
+        
+        Raises:
+            RuntimeError: If called outside a running event loop
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = AsyncOpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    timeout=self.timeout,
+                    max_retries=0,
+                    http_client=DefaultAsyncHttpxClient(limits=self.pool_limits, timeout=self.timeout),
+                )
+                self._async_clients[loop] = client
+            return client
+    
+    def close(self) -> None:
+        """Close the sync client's connections (it is recreated on next use)."""
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+    
+    async def aclose(self) -> None:
+        """Close the running event loop's async client connections."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.close()
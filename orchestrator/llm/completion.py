@@ -0,0 +1,399 @@
+"""
+Chat completion calls with optional response caching.
+
+Nodes call node_chat_completion() instead of client.chat.completions.create
+directly: it uses the shared pooled client (see orchestrator.llm.clients),
+consults the response cache configured for the node (see
+orchestrator.config.get_llm_cache) and records the hit or miss in the run
+state's llm_cache counters, and appends the call's token usage and wall
+time to the run state's llm_calls (see orchestrator.llm.usage). When a
+spend budget is configured (see orchestrator.llm.budget), each uncached
+call is admitted against it first and its cost recorded in the ledger.
+Uncached calls are paced by the shared rate limiter, which retries rate
+limits, timeouts and server errors (see orchestrator.llm.ratelimit).
+node_stream_chat_completion() does the same for streamed completions,
+handing each text delta to a callback as it arrives.
+"""
+
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Optional
+
+from orchestrator.llm.budget import DEFAULT_MAX_TOKENS, BudgetGuard, estimate_prompt_tokens
+from orchestrator.llm.cache import ResponseCache, cache_key
+from orchestrator.llm.clients import ModelConcurrencyLimiter
+from orchestrator.llm.ratelimit import RateLimiter, raw_create
+from orchestrator.llm.usage import record_llm_call, usage_dict
+
+
+@dataclass
+class CompletionResult:
+    """The parts of a chat completion response the orchestrator uses."""
+    content: Optional[str]
+    model: Optional[str] = None
+    finish_reason: Optional[str] = None
+    usage: dict = field(default_factory=dict)
+    cached: bool = False
+    # Seconds from the request to the first content token / the last one
+    first_token_seconds: Optional[float] = None
+    total_seconds: Optional[float] = None
+    
+    @classmethod
+    def from_response(cls, response: Any) -> "CompletionResult":
+        """
+        Extract a result from an OpenAI ChatCompletion object.
+        
+        Args:
+            response: Return value of client.chat.completions.create
+        
+        Returns:
+            CompletionResult for the first choice
+        """
+        choice = response.choices[0]
+        usage = getattr(response, "usage", None)
+        return cls(
+            content=choice.message.content,
+            model=getattr(response, "model", None),
+            finish_reason=getattr(choice, "finish_reason", None),
+            usage=usage_dict(usage),
+        )
+    
+    def to_cache(self) -> dict:
+        """JSON-compatible form stored in the response cache."""
+        data = asdict(self)
+        for name in ("cached", "first_token_seconds", "total_seconds"):
+            data.pop(name)
+        return data
+
+
+def _slot(limiter: Optional[ModelConcurrencyLimiter], model: str):
+    """In-flight slot for model, or a no-op without a limiter."""
+    return limiter.slot(model) if limiter is not None else nullcontext()
+
+
+def _create(client: Any, rate_limiter: Optional[RateLimiter], request: dict, **extra) -> Any:
+    """
+    client.chat.completions.create(**request, **extra), paced and retried by rate_limiter.
+    
+    The call is charged one request plus its estimated prompt tokens and
+    max_tokens. Only the create call is retried, never a stream in progress.
+    """
+    completions = client.chat.completions
+    if rate_limiter is None:
+        return completions.create(**request, **extra)
+    model = request["model"]
+    tokens = estimate_prompt_tokens(request.get("messages", [])) + (request.get("max_tokens") or DEFAULT_MAX_TOKENS)
+    return rate_limiter.call(model, tokens, lambda: raw_create(completions, rate_limiter, **request, **extra))
+
+
+def _admit(
+    guard: Optional[BudgetGuard],
+    cache: Optional[ResponseCache],
+    request: dict,
+) -> tuple[dict, Optional[str], Optional[dict]]:
+    """
+    Admit a cache miss against the budget.
+    
+    Returns:
+        (request to send, its cache key, cache hit for a downgraded request
+        or None); the guard's reservation is released on a hit
+    """
+    key = cache_key(request) if cache is not None else None
+    if guard is None:
+        return request, key, None
+    admitted = guard.admit(request)
+    if admitted is request or cache is None:
+        return admitted, key, None
+    # A downgraded request may itself be cached, which costs nothing
+    key = cache_key(admitted)
+    hit = cache.get(key)
+    if hit is not None:
+        guard.cancel()
+    return admitted, key, hit
+
+
+def chat_completion(
+    client: Any,
+    cache: Optional[ResponseCache] = None,
+    limiter: Optional[ModelConcurrencyLimiter] = None,
+    guard: Optional[BudgetGuard] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    **request,
+) -> CompletionResult:
+    """
+    Run a chat completion, serving it from cache when possible.
+    
+    Args:
+        client: OpenAI client
+        cache: Response cache to consult and fill, or None to always call the API
+        limiter: Per-model in-flight limits to respect (cache hits skip it)
+        guard: Budget guard that admits (and may downgrade) a cache miss and
+               records its cost, or None
+        rate_limiter: Rate limiter that paces the call and retries transient
+                      errors, or None to call once
+        **request: Keyword arguments for client.chat.completions.create
+    
+    Returns:
+        CompletionResult (cached=True if served from the cache)
+    
+    Raises:
+        BudgetExhausted: If the guard refuses the call
+    """
+    started = time.monotonic()
+    if cache is not None:
+        hit = cache.get(cache_key(request))
+        if hit is not None:
+            return CompletionResult(**hit, cached=True, total_seconds=time.monotonic() - started)
+    request, key, hit = _admit(guard, cache, request)
+    if hit is not None:
+        return CompletionResult(**hit, cached=True, total_seconds=time.monotonic() - started)
+    
+    try:
+        with _slot(limiter, request["model"]):
+            response = _create(client, rate_limiter, request)
+    except BaseException:
+        if guard is not None:
+            guard.cancel()
+        raise
+    result = CompletionResult.from_response(response)
+    result.total_seconds = time.monotonic() - started
+    if guard is not None:
+        guard.settle(request["model"], result)
+    
+    # Empty responses are worth retrying, so they're never cached
+    if cache is not None and result.content:
+        cache.put(key, result.to_cache(), request)
+    return result
+
+
+def stream_chat_completion(
+    client: Any,
+    on_delta: Callable[[str], None],
+    cache: Optional[ResponseCache] = None,
+    limiter: Optional[ModelConcurrencyLimiter] = None,
+    guard: Optional[BudgetGuard] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    **request,
+) -> CompletionResult:
+    """
+    Run a streamed chat completion, passing each content delta to on_delta.
+    
+    The text is not accumulated unless a cache is given (it needs the full
+    response to store it), so a long completion can go straight to disk. A
+    cache hit is delivered to on_delta in one piece. Streamed and
+    non-streamed requests share cache entries.
+    
+    Args:
+        client: OpenAI client
+        on_delta: Called with each piece of content text, in order
+        cache: Response cache to consult and fill, or None to always call the API
+        limiter: Per-model in-flight limits to respect (held for the whole stream)
+        guard: Budget guard that admits (and may downgrade) a cache miss and
+               records its cost, or None
+        rate_limiter: Rate limiter that paces the call and retries transient
+                      errors before the stream starts, or None to call once
+        **request: Keyword arguments for client.chat.completions.create
+                   (stream options are added here)
+    
+    Returns:
+        CompletionResult with content=None (the text went to on_delta), plus
+        usage and first-token / total timings
+    
+    Raises:
+        BudgetExhausted: If the guard refuses the call
+        Whatever the client raises, including mid-stream; deltas delivered
+        before the error have already been passed to on_delta
+    """
+    started = time.monotonic()
+    
+    def from_cache(hit: dict) -> CompletionResult:
+        result = CompletionResult(**hit, cached=True)
+        if result.content:
+            on_delta(result.content)
+        result.content = None
+        result.first_token_seconds = result.total_seconds = time.monotonic() - started
+        return result
+    
+    if cache is not None:
+        hit = cache.get(cache_key(request))
+        if hit is not None:
+            return from_cache(hit)
+    request, key, hit = _admit(guard, cache, request)
+    if hit is not None:
+        return from_cache(hit)
+    
+    result = CompletionResult(content=None)
+    parts: Optional[list[str]] = [] if cache is not None else None
+    stream = None
+    try:
+        with _slot(limiter, request["model"]):
+            stream = _create(
+                client,
+                rate_limiter,
+                request,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            for chunk in stream:
+                result.model = getattr(chunk, "model", None) or result.model
+                if getattr(chunk, "usage", None) is not None:
+                    result.usage = usage_dict(chunk.usage)
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                text = choice.delta.content
+                if text:
+                    if result.first_token_seconds is None:
+                        result.first_token_seconds = time.monotonic() - started
+                    on_delta(text)
+                    if parts is not None:
+                        parts.append(text)
+                if choice.finish_reason:
+                    result.finish_reason = choice.finish_reason
+    except BaseException:
+        # Close the connection so the provider stops generating (and billing)
+        if stream is not None and hasattr(stream, "close"):
+            stream.close()
+        # A stream dropped after content arrived was still billed, but its
+        # usage never came; the reserved worst case is recorded instead
+        if guard is not None and result.first_token_seconds is not None:
+            guard.settle(request["model"], result)
+        elif guard is not None:
+            guard.cancel()
+        raise
+    result.total_seconds = time.monotonic() - started
+    if guard is not None:
+        guard.settle(request["model"], result)
+    
+    if cache is not None and parts:
+        cache.put(key, {**result.to_cache(), "content": "".join(parts)}, request)
+    return result
+
+
+def new_cache_stats() -> dict:
+    """Empty llm_cache counters for a run state."""
+    return {"hits": 0, "misses": 0, "nodes": {}}
+
+
+def record_cache_lookup(state: dict, node: str, hit: bool) -> None:
+    """
+    Count a cache hit or miss in state["llm_cache"], overall and per node.
+    
+    Args:
+        state: Run state (a State, or the puppeteer run context)
+        node: Node that made the call
+        hit: Whether the response came from the cache
+    """
+    stats = state.setdefault("llm_cache", new_cache_stats())
+    outcome = "hits" if hit else "misses"
+    stats[outcome] = stats.get(outcome, 0) + 1
+    node_stats = stats.setdefault("nodes", {}).setdefault(node, {"hits": 0, "misses": 0})
+    node_stats[outcome] += 1
+
+
+def merge_llm_stats(state: dict, other: dict) -> None:
+    """
+    Add another state's llm_cache counters and llm_calls to state.
+    
+    Used when LLM calls run in worker threads against scratch states, so
+    the run state itself is only ever updated from one thread.
+    
+    Args:
+        state: Run state to update
+        other: Scratch state the calls were recorded in
+    """
+    other_stats = other.get("llm_cache")
+    if other_stats:
+        stats = state.setdefault("llm_cache", new_cache_stats())
+        for outcome in ("hits", "misses"):
+            stats[outcome] = stats.get(outcome, 0) + other_stats.get(outcome, 0)
+        for node, counts in other_stats.get("nodes", {}).items():
+            node_stats = stats.setdefault("nodes", {}).setdefault(node, {"hits": 0, "misses": 0})
+            for outcome in ("hits", "misses"):
+                node_stats[outcome] += counts.get(outcome, 0)
+    state.setdefault("llm_calls", []).extend(other.get("llm_calls", []))
+
+
+def _budget_guard(state: dict, node: str) -> Optional[BudgetGuard]:
+    """Budget guard for a node's call, or None when no budget applies to the run."""
+    from orchestrator.config import get_budget
+    
+    budget = get_budget(state.get("options"))
+    if budget is None:
+        return None
+    return budget.guard(state.get("run_id", ""), state.get("pack_slug", ""), node)
+
+
+def node_chat_completion(state: dict, node: str, **request) -> CompletionResult:
+    """
+    Run a node's chat completion on the LLM backend, through the cache configured for it.
+    
+    The cache is skipped when disabled globally, for the run
+    (options["llm_cache"] = False, e.g. --no-cache) or for this node
+    (ORCHESTRATOR_LLM_CACHE_SKIP_NODES / options["llm_cache_skip_nodes"]).
+    
+    Args:
+        state: Run state; its options select the cache, its llm_cache
+               counters record the outcome and llm_calls the usage
+        node: Node name, e.g. "validation"
+        **request: Keyword arguments for client.chat.completions.create
+    
+    Returns:
+        CompletionResult
+    
+    Raises:
+        BudgetExhausted: If the call does not fit the run's budget
+    """
+    from orchestrator.config import get_llm_backend, get_llm_cache
+    
+    backend = get_llm_backend()
+    cache = get_llm_cache(state.get("options"), node)
+    result = chat_completion(
+        backend.client, cache, backend.limiter, _budget_guard(state, node), backend.rate_limiter, **request
+    )
+    if cache is not None:
+        record_cache_lookup(state, node, result.cached)
+    record_llm_call(state, node, result)
+    return result
+
+
+def node_stream_chat_completion(
+    state: dict,
+    node: str,
+    on_delta: Callable[[str], None],
+    **request,
+) -> CompletionResult:
+    """
+    Streaming variant of node_chat_completion (see stream_chat_completion).
+    
+    Args:
+        state: Run state; its options select the cache, its llm_cache
+               counters record the outcome and llm_calls the usage
+        node: Node name, e.g. "deep_research"
+        on_delta: Called with each piece of content text, in order
+        **request: Keyword arguments for client.chat.completions.create
+    
+    Returns:
+        CompletionResult with content=None
+    
+    Raises:
+        BudgetExhausted: If the call does not fit the run's budget
+    """
+    from orchestrator.config import get_llm_backend, get_llm_cache
+    
+    backend = get_llm_backend()
+    cache = get_llm_cache(state.get("options"), node)
+    result = stream_chat_completion(
+        backend.client,
+        on_delta,
+        cache,
+        backend.limiter,
+        _budget_guard(state, node),
+        backend.rate_limiter,
+        **request,
+    )
+    if cache is not None:
+        record_cache_lookup(state, node, result.cached)
+    record_llm_call(state, node, result)
+    return result
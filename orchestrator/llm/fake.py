@@ -0,0 +1,380 @@
+"""
+Deterministic local LLM backend for load testing ("fake").
+
+FakeBackend answers chat completions and transcriptions without touching
+the network, so the pipeline, the Puppeteer loop and the API can be run
+thousands of times to measure orchestration overhead on its own. Each
+reply is derived from the request and the seed, so the same request always
+gets the same content, token counts and latency:
+
+- JSON-mode requests (response_format json_object) get an object with the
+  keys listed in the prompt's JSON format. A "<0-100 integer>" placeholder
+  becomes an integer in that range, any other placeholder a sentence. This
+  makes the reply a valid validation assessment.
+- Other requests get markdown shaped like the prompt. A "Write only the
+  **X** section" prompt gets that one section. A prompt with "## " template
+  headings gets all of them followed by an executive summary. Anything
+  else, or a prompt asking for a reply "without a heading" (such as the
+  executive summary of a section-by-section report), gets plain paragraphs.
+
+Latency and completion length come from distributions such as "fixed:0.2",
+"uniform:0.1:0.5", "normal:0.8:0.2" or "lognormal:0.8:0.5" (median, sigma).
+Responses are the OpenAI SDK's own ChatCompletion / ChatCompletionChunk /
+Transcription types.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Iterator, Mapping, Optional
+
+from openai.types.audio import Transcription
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from orchestrator.llm.backends import LLMBackend
+from orchestrator.llm.budget import estimate_prompt_tokens
+from orchestrator.llm.cache import cache_key
+from orchestrator.llm.clients import ModelConcurrencyLimiter
+
+DISTRIBUTION_KINDS = ("fixed", "uniform", "normal", "lognormal")
+
+# Share of a streamed reply's latency spent before the first token
+FIRST_TOKEN_SHARE = 0.25
+
+# Characters per streamed chunk
+STREAM_CHUNK_CHARS = 64
+
+WORDS = (
+    "audit", "automation", "compliance", "control", "data", "engineering",
+    "evidence", "framework", "guidance", "implementation", "policy", "process",
+    "readiness", "requirement", "review", "risk", "standard", "team",
+    "template", "toolkit", "workflow",
+)
+
+_JSON_FIELD = re.compile(r'"(\w+)"\s*:\s*"?<([^>\n]*)>"?')
+_RANGE = re.compile(r"(\d+)\s*-\s*(\d+)")
+_SECTION_ONLY = re.compile(r"Write only the \*\*(.+?)\*\* section")
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """A non-negative random quantity, e.g. seconds of latency or a token count."""
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+    
+    def sample(self, rng: random.Random) -> float:
+        """Draw one value (never negative)."""
+        if self.kind == "uniform":
+            value = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            value = rng.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            value = self.a * math.exp(rng.gauss(0.0, self.b))
+        else:
+            value = self.a
+        return max(0.0, value)
+
+
+def parse_distribution(text: str) -> Distribution:
+    """
+    Parse a distribution, e.g. "fixed:0.2", "uniform:0.1:0.5" or a bare "0.2".
+    
+    Args:
+        text: "fixed:X", "uniform:LOW:HIGH", "normal:MEAN:STDDEV" or
+              "lognormal:MEDIAN:SIGMA"
+    
+    Returns:
+        Distribution
+    
+    Raises:
+        ValueError: If text is malformed
+    """
+    kind, *params = [part.strip() for part in text.strip().split(":")]
+    if not params:
+        kind, params = "fixed", [kind]
+    try:
+        values = [float(param) for param in params]
+    except ValueError:
+        values = []
+    if kind not in DISTRIBUTION_KINDS or len(values) != (1 if kind == "fixed" else 2):
+        raise ValueError(
+            f"Invalid distribution '{text}' (expected fixed:X, uniform:LOW:HIGH, "
+            "normal:MEAN:STDDEV or lognormal:MEDIAN:SIGMA)"
+        )
+    return Distribution(kind, *values)
+
+
+@dataclass
+class FakeReply:
+    """A generated chat completion before it is shaped into SDK objects."""
+    content: str
+    prompt_tokens: int
+    completion_tokens: int
+    finish_reason: str
+    latency: float
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraphs(rng: random.Random, tokens: int) -> str:
+    """Filler paragraphs of about tokens tokens (4 characters each)."""
+    sentences: list[str] = []
+    length = 0
+    while length < tokens * 4 or not sentences:
+        sentences.append(_sentence(rng))
+        length += len(sentences[-1]) + 1
+    return "\n\n".join(" ".join(sentences[i:i + 4]) for i in range(0, len(sentences), 4))
+
+
+def _template_headings(prompt: str) -> list[str]:
+    """The prompt's "## " headings outside fenced code blocks."""
+    headings = []
+    in_fence = False
+    for line in prompt.split("\n"):
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        elif not in_fence and line.startswith("## "):
+            headings.append(line[3:].strip())
+    return headings
+
+
+def _json_reply(rng: random.Random, prompt: str) -> str:
+    reply: dict[str, Any] = {}
+    for name, placeholder in _JSON_FIELD.findall(prompt):
+        bounds = _RANGE.search(placeholder)
+        if bounds and "integer" in placeholder:
+            reply[name] = rng.randint(int(bounds.group(1)), int(bounds.group(2)))
+        else:
+            reply[name] = " ".join(_sentence(rng) for _ in range(2))
+    return json.dumps(reply, indent=2)
+
+
+def _markdown_reply(rng: random.Random, prompt: str, tokens: int) -> str:
+    section = _SECTION_ONLY.search(prompt)
+    if section:
+        return f"## {section.group(1)}\n\n{_paragraphs(rng, tokens)}"
+    headings = [] if "without a heading" in prompt else _template_headings(prompt)
+    if not headings:
+        return _paragraphs(rng, tokens)
+    headings.append("Executive Summary")
+    share = max(1, tokens // len(headings))
+    return "\n\n".join(f"## {heading}\n\n{_paragraphs(rng, share)}" for heading in headings)
+
+
+class FakeCompletions:
+    """client.chat.completions for FakeBackend's sync client."""
+    
+    def __init__(self, backend: "FakeBackend"):
+        self._backend = backend
+    
+    def create(self, stream: bool = False, stream_options: Optional[dict] = None, **request) -> Any:
+        """Return a ChatCompletion, or an iterator of ChatCompletionChunks for stream=True."""
+        reply = self._backend.reply(request)
+        if not stream:
+            time.sleep(reply.latency)
+            return self._backend.completion(request, reply)
+        return self._stream(request, reply, bool((stream_options or {}).get("include_usage")))
+    
+    def _stream(self, request: dict, reply: FakeReply, include_usage: bool) -> Iterator[ChatCompletionChunk]:
+        chunks = self._backend.chunks(request, reply, include_usage)
+        time.sleep(reply.latency * FIRST_TOKEN_SHARE)
+        gap = reply.latency * (1 - FIRST_TOKEN_SHARE) / max(1, len(chunks) - 1)
+        for i, chunk in enumerate(chunks):
+            if i and gap:
+                time.sleep(gap)
+            yield chunk
+
+
+class AsyncFakeCompletions(FakeCompletions):
+    """client.chat.completions for FakeBackend's async client."""
+    
+    async def create(self, stream: bool = False, stream_options: Optional[dict] = None, **request) -> Any:
+        """Async variant of FakeCompletions.create (streams are async iterators)."""
+        reply = self._backend.reply(request)
+        if not stream:
+            await asyncio.sleep(reply.latency)
+            return self._backend.completion(request, reply)
+        return self._async_stream(request, reply, bool((stream_options or {}).get("include_usage")))
+    
+    async def _async_stream(
+        self,
+        request: dict,
+        reply: FakeReply,
+        include_usage: bool,
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        chunks = self._backend.chunks(request, reply, include_usage)
+        await asyncio.sleep(reply.latency * FIRST_TOKEN_SHARE)
+        gap = reply.latency * (1 - FIRST_TOKEN_SHARE) / max(1, len(chunks) - 1)
+        for i, chunk in enumerate(chunks):
+            if i and gap:
+                await asyncio.sleep(gap)
+            yield chunk
+
+
+class FakeTranscriptions:
+    """client.audio.transcriptions for FakeBackend's async client."""
+    
+    def __init__(self, backend: "FakeBackend"):
+        self._backend = backend
+    
+    async def create(self, model: str, file: Any, **kwargs) -> Transcription:
+        """Transcribe the upload into deterministic filler text."""
+        audio = file.read() if hasattr(file, "read") else bytes(file)
+        rng = self._backend.rng(f"{model}:{hashlib.sha256(audio).hexdigest()}")
+        await asyncio.sleep(self._backend.latency.sample(rng))
+        return Transcription(text=" ".join(_sentence(rng) for _ in range(3)))
+
+
+class FakeClient:
+    """OpenAI-compatible client serving FakeBackend replies."""
+    
+    def __init__(self, backend: "FakeBackend", asynchronous: bool = False):
+        completions = AsyncFakeCompletions(backend) if asynchronous else FakeCompletions(backend)
+        self.chat = SimpleNamespace(completions=completions)
+        self.audio = SimpleNamespace(transcriptions=FakeTranscriptions(backend))
+
+
+class FakeBackend(LLMBackend):
+    """
+    The "fake" LLM backend: deterministic local replies with simulated latency.
+    
+    The per-model in-flight limits apply as they do for OpenAI, so load tests
+    exercise the same queuing; there are no rate limits or retries.
+    """
+    
+    name = "fake"
+    
+    def __init__(
+        self,
+        latency: Distribution | str = "fixed:0",
+        completion_tokens: Distribution | str = "uniform:200:800",
+        seed: int = 0,
+        model_limits: Optional[Mapping[str, int]] = None,
+        default_model_limit: Optional[int] = None,
+    ):
+        """
+        Initialize the backend.
+        
+        Args:
+            latency: Seconds per call (the whole reply; streams spend
+                     FIRST_TOKEN_SHARE of it before the first token)
+            completion_tokens: Length of markdown replies, capped at the
+                               request's max_tokens (finish_reason "length")
+            seed: Varies every reply; the same seed and request always
+                  produce the same reply
+            model_limits: model -> maximum in-flight requests
+            default_model_limit: Limit for other models (None = unlimited)
+        """
+        self.latency = parse_distribution(latency) if isinstance(latency, str) else latency
+        self.completion_tokens = (
+            parse_distribution(completion_tokens) if isinstance(completion_tokens, str) else completion_tokens
+        )
+        self.seed = seed
+        self.limiter = ModelConcurrencyLimiter(model_limits, default_model_limit)
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._client = FakeClient(self)
+        self._async_client = FakeClient(self, asynchronous=True)
+    
+    @property
+    def client(self) -> FakeClient:
+        """Shared sync client."""
+        return self._client
+    
+    def async_client(self) -> FakeClient:
+        """
+        Shared async client.
+        
+        Raises:
+            RuntimeError: If called outside a running event loop
+        """
+        asyncio.get_running_loop()
+        return self._async_client
+    
+    def rng(self, key: str) -> random.Random:
+        """Random generator for one request, seeded by the backend seed and key."""
+        return random.Random(f"{self.seed}:{key}")
+    
+    def reply(self, request: dict) -> FakeReply:
+        """
+        Generate the reply to a chat completion request.
+        
+        Args:
+            request: Keyword arguments for chat.completions.create
+        
+        Returns:
+            FakeReply (the same for the same request and seed)
+        """
+        with self._lock:
+            self.calls += 1
+        rng = self.rng(cache_key(request))
+        messages = request.get("messages", [])
+        prompt = str(messages[-1].get("content", "")) if messages else ""
+        latency = self.latency.sample(rng)
+        tokens = int(self.completion_tokens.sample(rng))
+        max_tokens = request.get("max_tokens")
+        finish_reason = "stop"
+        if max_tokens is not None and tokens > max_tokens:
+            tokens, finish_reason = max_tokens, "length"
+        
+        if (request.get("response_format") or {}).get("type") == "json_object":
+            content = _json_reply(rng, prompt)
+            tokens, finish_reason = len(content) // 4 + 1, "stop"
+        else:
+            content = _markdown_reply(rng, prompt, tokens)
+        return FakeReply(content, estimate_prompt_tokens(messages), max(1, tokens), finish_reason, latency)
+    
+    @staticmethod
+    def _usage(reply: FakeReply) -> dict:
+        return {
+            "prompt_tokens": reply.prompt_tokens,
+            "completion_tokens": reply.completion_tokens,
+            "total_tokens": reply.prompt_tokens + reply.completion_tokens,
+        }
+    
+    def completion(self, request: dict, reply: FakeReply) -> ChatCompletion:
+        """The reply as a ChatCompletion."""
+        return ChatCompletion.model_validate({
+            "id": f"chatcmpl-fake-{self.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": reply.content},
+                "finish_reason": reply.finish_reason,
+            }],
+            "usage": self._usage(reply),
+        })
+    
+    def chunks(self, request: dict, reply: FakeReply, include_usage: bool) -> list[ChatCompletionChunk]:
+        """The reply as streamed ChatCompletionChunks (usage last if requested)."""
+        base = {
+            "id": f"chatcmpl-fake-{self.calls}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": request.get("model", "fake"),
+        }
+        pieces = [
+            reply.content[i:i + STREAM_CHUNK_CHARS]
+            for i in range(0, len(reply.content), STREAM_CHUNK_CHARS)
+        ]
+        chunks = [
+            {**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+            for piece in pieces
+        ]
+        chunks.append({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": reply.finish_reason}]})
+        if include_usage:
+            chunks.append({**base, "choices": [], "usage": self._usage(reply)})
+        return [ChatCompletionChunk.model_validate(chunk) for chunk in chunks]
@@ -0,0 +1,358 @@
+"""
+Client-side rate limiting and retries for OpenAI calls.
+
+RateLimiter keeps two token buckets per model, one for requests per minute
+and one for tokens per minute. A call waits until both have room for it:
+one request, plus its estimated prompt tokens and max_tokens. The buckets
+start from configured limits (OPENAI_RPM_LIMITS / OPENAI_TPM_LIMITS) or
+unlimited, and are resynced from the x-ratelimit-* headers of every
+response. Calls therefore run at the provider's actual ceiling, and all
+threads and event loops share it.
+
+RateLimiter.call() / async_call() also retry rate limits (429), timeouts,
+connection errors and 5xx responses with exponential backoff and full
+jitter. A retry-after header wins over the backoff, and it pauses every
+caller of that model, not just the one that was refused. The OpenAI SDK's
+own retries are switched off in favour of this layer.
+"""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Mapping, Optional, TypeVar
+
+import openai
+
+T = TypeVar("T")
+
+# Longest single wait between bucket checks, so header updates are picked up
+MAX_WAIT_SLICE = 5.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    """Numeric header value, or None if absent or malformed."""
+    value = headers.get(name)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def parse_reset_duration(text: Optional[str]) -> Optional[float]:
+    """
+    Parse an x-ratelimit-reset-* duration, e.g. "1s", "6m0s" or "20ms".
+    
+    Returns:
+        Seconds, or None if absent or malformed
+    """
+    if not text:
+        return None
+    parts = _DURATION_PART.findall(text)
+    if not parts or "".join(value + unit for value, unit in parts) != text.strip():
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(value) * scale[unit] for value, unit in parts)
+
+
+def retry_after_seconds(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Seconds to wait from retry-after-ms / retry-after headers (None if absent).
+    
+    HTTP-date retry-after values are ignored in favour of the backoff.
+    """
+    if not headers:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * scale)
+        except ValueError:
+            continue
+    return None
+
+
+def exhausted_reset_seconds(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Seconds until an exhausted rate limit resets, from x-ratelimit-* headers.
+    
+    Returns:
+        The longest x-ratelimit-reset-{requests,tokens} among the kinds with
+        nothing remaining, or None if neither is exhausted
+    """
+    if not headers:
+        return None
+    resets = [
+        parse_reset_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+        for kind in ("requests", "tokens")
+        if _header_number(headers, f"x-ratelimit-remaining-{kind}") == 0
+    ]
+    resets = [reset for reset in resets if reset is not None]
+    return max(resets) if resets else None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether an OpenAI error is worth retrying.
+    
+    Rate limits, timeouts, connection errors, 408 / 409 and 5xx responses
+    are; an exhausted quota (429 insufficient_quota) and other 4xx are not.
+    """
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        if getattr(error, "code", None) == "insufficient_quota":
+            return False
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+    max_retries: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    
+    def delay(self, attempt: int, error: BaseException) -> float:
+        """
+        Seconds to wait before retry number attempt (0-based).
+        
+        retry-after from the error's response wins, then the reset time of
+        an exhausted x-ratelimit-* limit (plus jitter); otherwise a random
+        delay up to base_delay * 2**attempt. Capped at max_delay.
+        """
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        retry_after = retry_after_seconds(headers)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        reset = exhausted_reset_seconds(headers)
+        if reset is not None:
+            return min(reset + random.uniform(0, self.base_delay), self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class TokenBucket:
+    """Continuously refilled bucket of capacity units per minute."""
+    
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+    
+    @property
+    def rate(self) -> float:
+        """Units refilled per second."""
+        return self.capacity / 60.0
+    
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def wait_for(self, amount: float) -> float:
+        """Seconds until amount (capped at capacity) is available."""
+        amount = min(amount, self.capacity)
+        if self.level >= amount or self.rate <= 0:
+            return 0.0
+        return (amount - self.level) / self.rate
+    
+    def sync(self, limit: Optional[float], remaining: Optional[float], now: float) -> None:
+        """Adopt the provider's limit and remaining count from response headers."""
+        if limit is not None and limit > 0:
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.level = min(self.capacity, float(remaining))
+        self.updated = now
+
+
+class RateLimiter:
+    """
+    Per-model request and token buckets shared by sync and async callers.
+    
+    Buckets exist only for models with a configured limit or after the
+    first response carrying x-ratelimit-* headers; until then calls are not
+    throttled.
+    """
+    
+    def __init__(
+        self,
+        requests_per_minute: Optional[Mapping[str, int]] = None,
+        tokens_per_minute: Optional[Mapping[str, int]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        """
+        Initialize the limiter.
+        
+        Args:
+            requests_per_minute: model -> initial RPM limit
+            tokens_per_minute: model -> initial TPM limit
+            retry_policy: Backoff settings (default RetryPolicy())
+        """
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._lock = threading.Lock()
+        self._requests = {model: TokenBucket(limit) for model, limit in (requests_per_minute or {}).items()}
+        self._tokens = {model: TokenBucket(limit) for model, limit in (tokens_per_minute or {}).items()}
+        self._paused_until: dict[str, float] = {}
+    
+    def _reserve(self, model: str, tokens: int) -> float:
+        """Take one request and tokens for model if available; else seconds to wait."""
+        now = time.monotonic()
+        with self._lock:
+            wait = self._paused_until.get(model, 0.0) - now
+            buckets = [(self._requests.get(model), 1), (self._tokens.get(model), tokens)]
+            for bucket, amount in buckets:
+                if bucket is not None:
+                    bucket.refill(now)
+                    wait = max(wait, bucket.wait_for(amount))
+            if wait > 0:
+                return wait
+            for bucket, amount in buckets:
+                if bucket is not None:
+                    bucket.level -= min(amount, bucket.capacity)
+            return 0.0
+    
+    def acquire(self, model: str, tokens: int = 0) -> float:
+        """
+        Block until model has room for one request of tokens.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            wait = self._reserve(model, tokens)
+            if wait <= 0:
+                return waited
+            wait = min(wait, MAX_WAIT_SLICE)
+            time.sleep(wait)
+            waited += wait
+    
+    async def async_acquire(self, model: str, tokens: int = 0) -> float:
+        """Async variant of acquire(); sleeps without blocking the event loop."""
+        waited = 0.0
+        while True:
+            wait = self._reserve(model, tokens)
+            if wait <= 0:
+                return waited
+            wait = min(wait, MAX_WAIT_SLICE)
+            await asyncio.sleep(wait)
+            waited += wait
+    
+    def observe(self, model: str, headers: Optional[Mapping[str, str]]) -> None:
+        """
+        Resync model's buckets from a response's x-ratelimit-* headers.
+        
+        Args:
+            model: Model the request was for
+            headers: Response headers (ignored if they carry no rate limits)
+        """
+        if not headers:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for kind, buckets in (("requests", self._requests), ("tokens", self._tokens)):
+                limit = _header_number(headers, f"x-ratelimit-limit-{kind}")
+                remaining = _header_number(headers, f"x-ratelimit-remaining-{kind}")
+                if limit is None and remaining is None:
+                    continue
+                bucket = buckets.get(model)
+                if bucket is None:
+                    if limit is None:
+                        continue
+                    bucket = buckets[model] = TokenBucket(limit)
+                bucket.sync(limit, remaining, now)
+    
+    def pause(self, model: str, seconds: float) -> None:
+        """Hold every caller of model for seconds (e.g. after a 429 with retry-after)."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._paused_until[model] = max(self._paused_until.get(model, 0.0), until)
+    
+    def _backoff(self, model: str, attempt: int, error: BaseException) -> float:
+        """Seconds to wait before retrying error, or raise it if it is final."""
+        if attempt >= self.retry_policy.max_retries or not is_retryable(error):
+            raise error
+        delay = self.retry_policy.delay(attempt, error)
+        response = getattr(error, "response", None)
+        if getattr(error, "status_code", None) == 429:
+            self.observe(model, getattr(response, "headers", None))
+            self.pause(model, delay)
+        print(
+            f"🔁 OpenAI {model}: {type(error).__name__}, retrying in {delay:.1f}s "
+            f"({attempt + 1}/{self.retry_policy.max_retries})"
+        )
+        return delay
+    
+    def call(self, model: str, tokens: int, send: Callable[[], T]) -> T:
+        """
+        Send a request under the model's rate limits, retrying transient errors.
+        
+        Args:
+            model: Model the request is for
+            tokens: Estimated tokens (prompt + max_tokens) it will use
+            send: Makes the request; called again for each retry
+        
+        Returns:
+            send()'s result
+        
+        Raises:
+            The last error, once it is not retryable or retries run out
+        """
+        attempt = 0
+        while True:
+            self.acquire(model, tokens)
+            try:
+                return send()
+            except Exception as e:
+                time.sleep(self._backoff(model, attempt, e))
+                attempt += 1
+    
+    async def async_call(self, model: str, tokens: int, send: Callable[[], Awaitable[T]]) -> T:
+        """Async variant of call(); send returns an awaitable."""
+        attempt = 0
+        while True:
+            await self.async_acquire(model, tokens)
+            try:
+                return await send()
+            except Exception as e:
+                await asyncio.sleep(self._backoff(model, attempt, e))
+                attempt += 1
+
+
+def raw_create(resource: Any, limiter: Optional[RateLimiter], **kwargs) -> Any:
+    """
+    Call resource.create, feeding the response's rate limit headers to limiter.
+    
+    Goes through resource.with_raw_response when there is one (clients
+    standing in for OpenAI may not have it).
+    
+    Args:
+        resource: SDK resource, e.g. client.chat.completions
+        limiter: RateLimiter to update, or None
+        **kwargs: Arguments for resource.create, including model
+    
+    Returns:
+        The parsed response (a Stream for stream=True)
+    """
+    raw = getattr(resource, "with_raw_response", None)
+    if limiter is None or raw is None:
+        return resource.create(**kwargs)
+    response = raw.create(**kwargs)
+    limiter.observe(kwargs["model"], response.headers)
+    return response.parse()
+
+
+async def async_raw_create(resource: Any, limiter: Optional[RateLimiter], **kwargs) -> Any:
+    """Async variant of raw_create() for async SDK resources."""
+    raw = getattr(resource, "with_raw_response", None)
+    if limiter is None or raw is None:
+        return await resource.create(**kwargs)
+    response = await raw.create(**kwargs)
+    limiter.observe(kwargs["model"], response.headers)
+    return response.parse()
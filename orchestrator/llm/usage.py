@@ -0,0 +1,93 @@
+"""
+Token and latency accounting for LLM calls.
+
+Every node LLM call appends a record to the run state's llm_calls list:
+the node, model, prompt / completion / cached prompt tokens and wall time.
+Cache hits are recorded with zero tokens, since nothing was spent on them.
+summarize_llm_calls() totals a list of records, e.g. one puppeteer step's
+calls for steps.jsonl and the step reward.
+"""
+
+from typing import Any, Optional
+
+USAGE_FIELDS = ("prompt_tokens", "completion_tokens", "cached_tokens", "total_tokens")
+
+
+def usage_dict(usage: Any) -> dict:
+    """
+    Token counts from an OpenAI usage object ({} if absent).
+    
+    Args:
+        usage: response.usage (or the final chunk's usage when streaming)
+    
+    Returns:
+        prompt_tokens, completion_tokens, total_tokens and cached_tokens
+        (prompt tokens served from OpenAI's prompt cache)
+    """
+    if usage is None:
+        return {}
+    counts = {
+        name: getattr(usage, name, None)
+        for name in ("prompt_tokens", "completion_tokens", "total_tokens")
+    }
+    details = getattr(usage, "prompt_tokens_details", None)
+    counts["cached_tokens"] = getattr(details, "cached_tokens", None) or 0
+    return counts
+
+
+def _seconds(value: Optional[float]) -> Optional[float]:
+    """Round a duration for the run state (None stays None)."""
+    return round(value, 3) if value is not None else None
+
+
+def record_llm_call(state: dict, node: str, result: Any) -> dict:
+    """
+    Append one LLM call's usage and timing to state["llm_calls"].
+    
+    Args:
+        state: Run state (a State, or the puppeteer run context)
+        node: Node that made the call
+        result: The call's CompletionResult
+    
+    Returns:
+        The appended record
+    """
+    usage = {} if result.cached else result.usage
+    record = {
+        "node": node,
+        "model": result.model,
+        "cached": result.cached,
+        **{name: usage.get(name) or 0 for name in USAGE_FIELDS},
+        "seconds": _seconds(result.total_seconds),
+        "first_token_seconds": _seconds(result.first_token_seconds),
+        "finish_reason": result.finish_reason,
+    }
+    state.setdefault("llm_calls", []).append(record)
+    return record
+
+
+def summarize_llm_calls(calls: list[dict]) -> dict:
+    """
+    Total the usage of a list of llm_calls records.
+    
+    Args:
+        calls: Records from record_llm_call
+    
+    Returns:
+        Dict with calls, cache_hits, the USAGE_FIELDS token totals and
+        seconds (summed wall time; concurrent calls overlap)
+    """
+    summary = {"calls": len(calls), "cache_hits": sum(1 for call in calls if call.get("cached"))}
+    for name in USAGE_FIELDS:
+        summary[name] = sum(call.get(name) or 0 for call in calls)
+    summary["seconds"] = round(sum(call.get("seconds") or 0 for call in calls), 3)
+    return summary
+
+
+def describe_llm_usage(summary: dict) -> str:
+    """One-line description of a summarize_llm_calls() result for CLI output."""
+    return (
+        f"{summary.get('calls', 0)} calls, {summary.get('total_tokens', 0)} tokens "
+        f"({summary.get('prompt_tokens', 0)} prompt, {summary.get('completion_tokens', 0)} completion, "
+        f"{summary.get('cached_tokens', 0)} cached), {summary.get('seconds', 0):.1f}s"
+    )
@@ -5,13 +5,14 @@ Orchestrator nodes for LangGraph workflow.
 from .intake import intake_node
 from .validation import validation_node
 from .scoring_gate import scoring_gate_node
-from .deep_research import deep_research_node
+from .deep_research import deep_research_node, speculative_research_node
 from .summary import summary_node
 
 __all__ = [
     "intake_node",
     "validation_node",
     "scoring_gate_node",
+    "speculative_research_node",
     "deep_research_node",
     "summary_node",
 ]
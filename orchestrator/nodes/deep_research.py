@@ -1,58 +1,807 @@
 """
 Deep research node: Generate comprehensive research report using OpenAI.
+
+Every research prompt leads with the static instructions and template text
+and ends with the pack's context, so requests for different packs share a
+byte-identical prefix that the provider's automatic prompt caching reuses
+(cached prompt tokens are recorded per call in llm_calls).
+
+When the pack's lifecycle predicts a scoring pass, speculative_research_node
+starts the report on a worker thread alongside validation (see
+orchestrator.speculation); deep_research_node adopts it if the gate passes
+and summary_node discards it (discard_speculative_research) if not.
 """
 
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from orchestrator.config import OPENAI_API_KEY, get_pack_lifecycle, update_pack_lifecycle
+from typing import Optional
+from orchestrator import jsonio
+from orchestrator.config import (
+    RESEARCH_SECTION_CONCURRENCY,
+    RESEARCH_SECTION_MAX_TOKENS,
+    RESEARCH_SECTIONS,
+    RESEARCH_SPECULATION,
+    RESEARCH_STREAMING,
+    SPECULATION_CANCEL_TIMEOUT,
+    get_pack_snapshot,
+)
+from orchestrator.lifecycle import append_unique_op, record_lifecycle_patch, set_default_op, set_op
+from orchestrator.llm import (
+    CompletionResult,
+    cache_key,
+    estimate_prompt_tokens,
+    node_chat_completion,
+    merge_llm_stats,
+    new_cache_stats,
+    node_stream_chat_completion,
+    record_llm_call,
+    summarize_llm_calls,
+)
+from orchestrator.speculation import (
+    LinkedEvent,
+    SpeculationCancelled,
+    check_cancelled,
+    predict_scoring_pass,
+    start_speculation,
+    take_speculation,
+)
 from orchestrator.state import State
-from openai import OpenAI
+from orchestrator.store.base import atomic_write_text
 
+# Research template and the directory reports are saved to
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent.parent / "pack-process" / "CHATGPT_RESEARCH_TEMPLATE.md"
+RESEARCH_DIR = Path(__file__).resolve().parent.parent.parent / "pack-crm" / "research"
 
-def deep_research_node(state: State) -> State:
+SYSTEM_PROMPT = (
+    "You are an expert research assistant specializing in compliance, regulations, "
+    "and engineering toolkits. Provide comprehensive, accurate, and actionable content."
+)
+
+# Opens every research prompt's user message, ahead of the static instructions
+RESEARCH_PREAMBLE = (
+    "You are an AI research assistant for Harbor Agent, creating comprehensive "
+    "compliance and readiness documentation."
+)
+
+ADDITIONAL_NOTES = """# Additional Notes
+- This research will be used to create a Harbor Agent compliance pack
+- Focus on engineering and developer-ready content
+- Make content AI-copilot friendly (for Cursor, GitHub Copilot, etc.)
+- Provide actionable, practical guidance
+- Include code examples and templates where relevant"""
+
+# Characters of each generated section shown to the executive summary call
+SUMMARY_EXCERPT_CHARS = 800
+
+# Template sections mentioning any of these get the pack's target audience,
+# ICP summary and price in their prompt; the others don't, so editing those
+# fields only changes (and, in refresh mode, regenerates) the sections using them
+AUDIENCE_KEYWORDS = (
+    "audience",
+    "icp",
+    "buyer",
+    "persona",
+    "customer",
+    "market",
+    "pricing",
+    "price",
+    "sales",
+    "positioning",
+)
+
+
+@dataclass
+class TemplateSection:
+    """One "## " section of the research template."""
+    title: str
+    text: str
+    
+    @property
+    def uses_audience(self) -> bool:
+        """Whether the section's prompt needs the pack's audience fields."""
+        text = self.text.lower()
+        return any(keyword in text for keyword in AUDIENCE_KEYWORDS)
+
+
+def pack_inputs(pack_slug: str, pack_lifecycle: dict) -> dict:
     """
-    Deep research node: Generate comprehensive research report.
+    The pack fields the research prompts are built from.
     
-    Only runs if gate.scoring == "pass".
+    Args:
+        pack_slug: Pack slug identifier
+        pack_lifecycle: PackLifecycle dict (or snapshot)
     
-    Reads:
-    - pack-process/CHATGPT_RESEARCH_TEMPLATE.md
-    - Pack lifecycle for metadata
+    Returns:
+        Dict with packSlug, packName, packNumber, regulationName,
+        targetAudience, price (cents) and icpSummary
+    """
+    metadata = pack_lifecycle.get("metadata", {})
+    crm = pack_lifecycle.get("crm", {})
+    return {
+        "packSlug": pack_slug,
+        "packName": pack_lifecycle.get("name", "Unknown Pack"),
+        "packNumber": pack_lifecycle.get("packNumber", "?"),
+        "regulationName": metadata.get("regulationName", "Unknown regulation"),
+        "targetAudience": metadata.get("targetAudience", []),
+        "price": metadata.get("price", 0),
+        "icpSummary": crm.get("icpSummary", "No ICP summary provided"),
+    }
+
+
+def research_context(inputs: dict, include_audience: bool = True, stage: Optional[str] = None) -> str:
+    """
+    Pack metadata and research context that closes every research prompt.
     
-    Generates:
-    - Deep dive report saved to pack-crm/research/{pack_slug}-{run_id}-deep-dive.md
-    - Updates pack lifecycle with research completion status
+    Args:
+        inputs: Pack fields from pack_inputs()
+        include_audience: Include target audience, ICP summary and price
+        stage: Pack's current stage to include, if any
+    
+    Returns:
+        Markdown context block
+    """
+    target_audience = inputs["targetAudience"]
+    price = inputs["price"]
+    price_dollars = price / 100 if price else 0
+    
+    fields = [
+        f'  "packSlug": "{inputs["packSlug"]}"',
+        f'  "packName": "{inputs["packName"]}"',
+        f'  "packNumber": {inputs["packNumber"]}',
+        f'  "regulationName": "{inputs["regulationName"]}"',
+    ]
+    if include_audience:
+        fields.append(f'  "targetAudience": {target_audience}')
+    if stage is not None:
+        fields.append(f'  "currentStage": "{stage}"')
+    if include_audience:
+        fields.append(f'  "price": "${price_dollars:.2f}"')
+    metadata_json = ",\n".join(fields)
+    
+    context = f"""# Pack Metadata
+```json
+{{
+{metadata_json}
+}}
+```
+
+# Research Context
+You are conducting deep-dive research for the **{inputs["packName"]}** (Pack #{inputs["packNumber"]}).
+
+**Regulation/Standard:** {inputs["regulationName"]}"""
+    
+    if include_audience:
+        context += f"""
+
+**Target Audience:**
+{chr(10).join(f"- {audience}" for audience in target_audience) if target_audience else "- Not specified"}
+
+**ICP Summary:**
+{inputs["icpSummary"]}"""
+    return context
+
+
+def split_template(template_text: str) -> tuple[str, list[TemplateSection]]:
+    """
+    Split the research template on its "## " headings.
+    
+    Headings inside fenced code blocks are left alone.
     
     Args:
-        state: Current graph state
+        template_text: Research template markdown
+    
+    Returns:
+        (text before the first section, sections in template order)
+    """
+    preamble: list[str] = []
+    sections: list[list[str]] = []
+    in_fence = False
+    for line in template_text.split("\n"):
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        if not in_fence and line.startswith("## "):
+            sections.append([line])
+        elif sections:
+            sections[-1].append(line)
+        else:
+            preamble.append(line)
+    return "\n".join(preamble).strip(), [
+        TemplateSection(title=lines[0][3:].strip(), text="\n".join(lines).strip())
+        for lines in sections
+    ]
+
+
+def _request(instructions: str, context: str, max_tokens: int) -> dict:
+    """
+    Chat completion request for a deep research prompt.
+    
+    Args:
+        instructions: Static instructions and template text (the same for
+                      every pack), placed first
+        context: Pack-specific context, placed last
+        max_tokens: Completion limit
+    
+    Returns:
+        Chat completion request
+    """
+    prompt = f"{RESEARCH_PREAMBLE}\n\n{instructions}\n\n---\n\n{context}"
+    return {
+        "model": "gpt-4",
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.7,
+        "max_tokens": max_tokens,
+    }
+
+
+def section_request(inputs: dict, sections: list[TemplateSection], index: int) -> dict:
+    """
+    Request generating one template section.
+    
+    The prompt carries the pack context and the report outline, so each
+    section stays in scope without seeing the others' output. It depends
+    only on the pack fields the section uses and the template, so its
+    cache_key() doubles as the section's input fingerprint.
+    
+    Args:
+        inputs: Pack fields from pack_inputs()
+        sections: All template sections
+        index: Section to generate
+    
+    Returns:
+        Chat completion request
+    """
+    section = sections[index]
+    outline = "\n".join(f"- {other.title}" for other in sections)
+    instructions = f"""# Instructions
+You are writing one section of a deep-dive research report for the pack described at the end. The full report covers these sections, each written separately:
+{outline}
+
+Write only the **{section.title}** section, following its template below. Replace all placeholders with specific information about the pack's regulation/standard. Start with the heading `## {section.title}` and do not write other sections or an executive summary.
+
+---
+
+{section.text}
+
+---
+
+{ADDITIONAL_NOTES}"""
+    context = research_context(inputs, include_audience=section.uses_audience)
+    return _request(instructions, context, max_tokens=RESEARCH_SECTION_MAX_TOKENS)
+
+
+def summary_request(inputs: dict, sections: list[TemplateSection], contents: list[str]) -> dict:
+    """
+    Request writing the executive summary from excerpts of the generated sections.
+    
+    Args:
+        inputs: Pack fields from pack_inputs()
+        sections: All template sections
+        contents: Generated text of each section, in order
+    
+    Returns:
+        Chat completion request
+    """
+    excerpts = "\n\n".join(
+        f"### {section.title}\n{content[:SUMMARY_EXCERPT_CHARS].strip()}"
+        for section, content in zip(sections, contents)
+    )
+    instructions = """# Instructions
+At the end are the pack's context and excerpts from each section of its deep-dive research report. Write a 1-2 paragraph executive summary of the report that can be used as a deep_dive_summary. Reply with the summary paragraphs only, without a heading."""
+    return _request(instructions, f"{research_context(inputs)}\n\n---\n\n{excerpts}", max_tokens=500)
+
+
+def report_request(inputs: dict, template_text: str, stage: str) -> dict:
+    """
+    Request generating the whole report from the template in one completion.
+    
+    Args:
+        inputs: Pack fields from pack_inputs()
+        template_text: Research template markdown
+        stage: Pack's current stage
+    
+    Returns:
+        Chat completion request
+    """
+    instructions = f"""# Instructions
+Please use the following research template to conduct comprehensive research and produce all necessary content for the pack described at the end. Replace all placeholders in the template with specific information about the pack's regulation/standard.
+
+---
+
+{template_text}
+
+---
+
+{ADDITIONAL_NOTES}
+
+Please provide complete output for all 16 sections of the template, tailored specifically to the pack's regulation/standard.
+
+After the full report, please provide a 1-2 paragraph executive summary that can be used as a deep_dive_summary."""
+    context = f"""{research_context(inputs, stage=stage)}
+
+Write the report for **{inputs["regulationName"]}**."""
+    return _request(instructions, context, max_tokens=8000)  # Allow for long research reports
+
+
+def _section_text(section: TemplateSection, content: Optional[str]) -> str:
+    """Generated section text, given the template heading if the model left it out."""
+    content = (content or "").strip()
+    if not content.startswith("#"):
+        content = f"## {section.title}\n\n{content}".rstrip()
+    return content
+
+
+def _scratch_state(state: State) -> dict:
+    """
+    State for a worker thread's LLM calls.
+    
+    Cache counters and usage go to the scratch state, so workers never
+    update the run state concurrently; the caller merges them (merge_llm_stats).
+    """
+    return {
+        "run_id": state["run_id"],
+        "pack_slug": state["pack_slug"],
+        "options": state["options"],
+        "llm_cache": new_cache_stats(),
+        "llm_calls": [],
+    }
+    
+
+def _stream_completion(
+    state: dict,
+    request: dict,
+    on_delta,
+    cancel: Optional[threading.Event] = None,
+) -> CompletionResult:
+    """
+    Stream a deep research completion, stopping at the next delta once cancel is set.
+    
+    A stream cancelled after content arrived was still billed, but its usage
+    never came; it is recorded in llm_calls with estimated tokens and
+    finish_reason "cancelled".
+    
+    Raises:
+        SpeculationCancelled: If cancel was set
+    """
+    streamed = 0
+    
+    def deliver(text: str) -> None:
+        nonlocal streamed
+        check_cancelled(cancel)
+        streamed += len(text)
+        on_delta(text)
+    
+    check_cancelled(cancel)
+    try:
+        return node_stream_chat_completion(state, "deep_research", deliver, **request)
+    except SpeculationCancelled:
+        if streamed:
+            prompt_tokens = estimate_prompt_tokens(request["messages"])
+            completion_tokens = streamed // 4
+            record_llm_call(state, "deep_research", CompletionResult(
+                content=None,
+                model=request["model"],
+                finish_reason="cancelled",
+                usage={
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            ))
+        raise
+
+
+def _research_completion(
+    state: dict,
+    request: dict,
+    cancel: Optional[threading.Event] = None,
+) -> CompletionResult:
+    """
+    Run a deep research completion.
+    
+    Calls given a cancel event (speculative work, report sections) are
+    streamed so that setting it stops them at the next delta; the text is
+    collected into the result's content.
+    """
+    if cancel is None:
+        return node_chat_completion(state, "deep_research", **request)
+    parts: list[str] = []
+    completion = _stream_completion(state, request, parts.append, cancel)
+    completion.content = "".join(parts)
+    return completion
+
+
+def _section_completion(scratch: dict, request: dict, stop: threading.Event) -> CompletionResult:
+    """
+    Run one section's completion in a worker thread, recording into its scratch state.
+    
+    A failure sets stop, so the other sections in flight stop at their next
+    delta instead of running (and spending) to completion.
+    """
+    try:
+        return _research_completion(scratch, request, stop)
+    except SpeculationCancelled:
+        raise
+    except BaseException:
+        stop.set()
+        raise
+
+
+class SummaryScanner:
+    """
+    Picks the executive summary out of a report fed to it piece by piece.
+    
+    Collects up to max_lines non-empty lines following a heading that
+    mentions "summary" together with "executive" or "deep_dive". Only the
+    current line is buffered, so the report never has to be held in memory.
+    """
+    
+    def __init__(self, max_lines: int = 5):
+        """
+        Initialize the scanner.
         
+        Args:
+            max_lines: Maximum number of summary lines to collect
+        """
+        self.max_lines = max_lines
+        self.lines: list[str] = []
+        self._in_summary = False
+        self._pending = ""
+    
+    def feed(self, text: str) -> None:
+        """Scan the next piece of report text."""
+        if len(self.lines) >= self.max_lines:
+            return
+        *complete, self._pending = (self._pending + text).split("\n")
+        for line in complete:
+            self._scan(line)
+    
+    def finish(self) -> Optional[str]:
+        """
+        Scan the final unterminated line.
+        
+        Returns:
+            The summary lines joined by spaces, or None if no summary was found
+        """
+        if self._pending:
+            self._scan(self._pending)
+            self._pending = ""
+        return " ".join(self.lines) or None
+    
+    def _scan(self, line: str) -> None:
+        """Process one complete line."""
+        if len(self.lines) >= self.max_lines:
+            return
+        lower = line.lower()
+        if "summary" in lower and ("executive" in lower or "deep_dive" in lower):
+            self._in_summary = True
+            return
+        if self._in_summary and line.strip():
+            self.lines.append(line.strip())
+
+
+def _round(seconds: Optional[float]) -> Optional[float]:
+    """Round a duration for the run state (None stays None)."""
+    return round(seconds, 3) if seconds is not None else None
+
+
+def write_report(
+    state: State,
+    request: dict,
+    report_path: Path,
+    summary_scanner: SummaryScanner,
+    streaming: bool,
+    cancel: Optional[threading.Event] = None,
+) -> CompletionResult:
+    """
+    Generate the research report and save it to report_path.
+    
+    When streaming, deltas are appended to report_path + ".partial" as they
+    arrive (line-buffered, so the file is readable up to the last full line)
+    and the file is renamed to report_path once the completion finishes. If
+    generation fails partway, the .partial file is left behind with what was
+    generated so far, and the error propagates.
+    
+    Args:
+        state: Current graph state (for cache options and counters)
+        request: Chat completion request
+        report_path: Final report path
+        summary_scanner: Fed the report text as it is produced
+        streaming: Stream to disk instead of waiting for the whole completion
+        cancel: Speculation cancel event; once set, generation stops at the
+                next delta with SpeculationCancelled (the .partial file is
+                left for the caller to discard)
+    
     Returns:
-        Updated state with artifacts.deep_dive_report_path and notes.deep_dive_summary
+        CompletionResult with timings (content is None when streaming)
     """
-    gate_scoring = state["gate"].get("scoring")
+    if not streaming:
+        print("🤖 Deep Research: Calling OpenAI for comprehensive research report...")
+        completion = _research_completion(state, request, cancel)
+        summary_scanner.feed(completion.content)
+        
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(completion.content)
+        return completion
     
-    # Only proceed if scoring gate passed
-    if gate_scoring != "pass":
-        print(f"⏭️  Deep Research: Skipping (scoring gate: {gate_scoring})")
-        return state
+    partial_path = report_path.with_name(f"{report_path.name}.partial")
+    print(f"🤖 Deep Research: Streaming OpenAI research report to {partial_path}...")
+    
+    try:
+        with open(partial_path, "w", encoding="utf-8", buffering=1) as f:
+            def write_delta(text: str) -> None:
+                f.write(text)
+                summary_scanner.feed(text)
+            
+            completion = _stream_completion(state, request, write_delta, cancel)
+            f.flush()
+            os.fsync(f.fileno())
+    except SpeculationCancelled:
+        raise
+    except Exception:
+        print(f"⚠️  Deep Research: Generation failed; partial report kept at {partial_path}")
+        raise
+    
+    os.replace(partial_path, report_path)
+    return completion
+
+
+def section_manifest_path(report_path: Path) -> Path:
+    """Path of the section manifest stored next to a report."""
+    return report_path.with_name(f"{report_path.name}.sections.json")
+
+
+def _sha256(text: str) -> str:
+    """Hex SHA-256 of text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def load_report_sections(report_path: Path) -> dict[str, str]:
+    """
+    Read the reusable sections of a sectioned report.
+    
+    The manifest next to the report records each section's input
+    fingerprint and where its text sits in the report. Sections whose text
+    no longer matches the recorded hash are left out, so they are
+    regenerated; a hand edit that changes a section's length shifts, and so
+    invalidates, every section after it too.
+    
+    Args:
+        report_path: Report written by write_section_report
+    
+    Returns:
+        fingerprint -> section text ({} if the report or manifest is missing)
+    """
+    manifest_path = section_manifest_path(report_path)
+    if not manifest_path.exists() or not report_path.exists():
+        return {}
+    
+    manifest = jsonio.loads(manifest_path.read_text(encoding="utf-8"))
+    # newline="" keeps offsets exact when a section contains "\r\n"
+    with open(report_path, "r", encoding="utf-8", newline="") as f:
+        report = f.read()
+    sections = {}
+    for entry in manifest.get("sections", []):
+        text = report[entry["start"]:entry["end"]]
+        if _sha256(text) == entry["sha256"]:
+            sections[entry["fingerprint"]] = text
+    return sections
+
+
+def latest_section_report(pack_lifecycle: dict) -> Optional[Path]:
+    """
+    Most recent research report of a pack that has a section manifest.
+    
+    Args:
+        pack_lifecycle: PackLifecycle dict (or snapshot)
+    
+    Returns:
+        Report path, or None if no sectioned report exists
+    """
+    artifacts = pack_lifecycle.get("research", {}).get("researchArtifacts", [])
+    for artifact in reversed(artifacts):
+        report_path = Path(artifact)
+        if section_manifest_path(report_path).exists() and report_path.exists():
+            return report_path
+    return None
+
+
+def write_section_report(
+    state: State,
+    inputs: dict,
+    title: str,
+    sections: list[TemplateSection],
+    report_path: Path,
+    summary_scanner: SummaryScanner,
+    concurrency: int,
+    previous: Optional[dict[str, str]] = None,
+    cancel: Optional[threading.Event] = None,
+) -> tuple[list[Optional[CompletionResult]], Optional[CompletionResult]]:
+    """
+    Generate the report section by section and save it to report_path.
+    
+    Sections are generated concurrently, at most concurrency at a time (the
+    shared client's per-model limits still apply), and appended to
+    report_path + ".partial" in template order as soon as every earlier
+    section is done. A final short call writes the executive summary from
+    excerpts of the sections; it is appended under "## Executive Summary"
+    and fed to summary_scanner. The file is renamed to report_path once
+    complete, and a manifest of each section's input fingerprint and
+    position is saved next to it (see load_report_sections). Sections are
+    streamed so they can be stopped: if one fails, the sections not yet
+    started are cancelled, the ones in flight stop at their next delta and
+    their usage is merged, the .partial file keeps the sections written so
+    far, and the error propagates.
+    
+    Sections (and the summary) whose fingerprint appears in previous are
+    copied from it verbatim instead of being generated.
+    
+    Args:
+        state: Current graph state (for cache options and counters)
+        inputs: Pack fields from pack_inputs()
+        title: Report heading
+        sections: Template sections to generate
+        report_path: Final report path
+        summary_scanner: Fed the executive summary section
+        concurrency: Maximum sections generated at once
+        previous: fingerprint -> text of reusable sections, from load_report_sections()
+        cancel: Speculation cancel event; once set, every section stops at
+                its next delta and SpeculationCancelled is raised after the
+                workers have stopped and their usage has been merged
     
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    Returns:
+        (section completions in template order, executive summary completion),
+        with None for each part reused from previous
+    """
+    previous = previous or {}
+    requests = [section_request(inputs, sections, index) for index in range(len(sections))]
+    fingerprints = [cache_key(request) for request in requests]
+    reused = sum(fingerprint in previous for fingerprint in fingerprints)
+    
+    partial_path = report_path.with_name(f"{report_path.name}.partial")
+    print(
+        f"🤖 Deep Research: Generating {len(sections) - reused} sections "
+        f"({concurrency} at a time, {reused} reused) into {partial_path}..."
+    )
+    
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="deep-research")
+    scratches = [_scratch_state(state) for _ in requests]
+    merged: set[int] = set()
+    # Set when any part fails; workers also stop once the speculation is cancelled
+    stop = LinkedEvent(cancel)
+    futures: list[Optional[Future]] = []
+    try:
+        futures = [
+            None if fingerprint in previous else pool.submit(_section_completion, scratch, request, stop)
+            for request, fingerprint, scratch in zip(requests, fingerprints, scratches)
+        ]
+        completions: list[Optional[CompletionResult]] = []
+        contents: list[str] = []
+        entries: list[dict] = []
+        with open(partial_path, "w", encoding="utf-8", newline="") as f:
+            position = f.write(f"{title}\n")
+            
+            def write_part(part_title: str, fingerprint: str, text: str) -> None:
+                nonlocal position
+                start = position + f.write("\n")
+                position = start + f.write(text)
+                position += f.write("\n")
+                f.flush()
+                entries.append({
+                    "title": part_title,
+                    "fingerprint": fingerprint,
+                    "start": start,
+                    "end": start + len(text),
+                    "sha256": _sha256(text),
+                })
+            
+            for index, (section, fingerprint, future) in enumerate(zip(sections, fingerprints, futures)):
+                if future is None:
+                    completion, text = None, previous[fingerprint]
+                else:
+                    completion = future.result()
+                    merge_llm_stats(state, scratches[index])
+                    merged.add(index)
+                    if completion.finish_reason == "length":
+                        print(f"⚠️  Deep Research: Section '{section.title}' hit max_tokens and may be cut short")
+                    text = _section_text(section, completion.content)
+                write_part(section.title, fingerprint, text)
+                completions.append(completion)
+                contents.append(text)
+            
+            request = summary_request(inputs, sections, contents)
+            fingerprint = cache_key(request)
+            if fingerprint in previous:
+                summary_completion, summary_section = None, previous[fingerprint]
+            else:
+                summary_completion = _research_completion(state, request, cancel)
+                summary_section = f"## Executive Summary\n\n{(summary_completion.content or '').strip()}"
+            summary_scanner.feed(summary_section)
+            write_part("Executive Summary", fingerprint, summary_section)
+            os.fsync(f.fileno())
+    except BaseException as e:
+        # Stop every worker, then count what the stopped sections spent
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+        for index, scratch in enumerate(scratches):
+            if index not in merged:
+                merge_llm_stats(state, scratch)
+        if isinstance(e, SpeculationCancelled) and (cancel is None or not cancel.is_set()):
+            # Stopped because another section failed: raise that section's error
+            for future in futures:
+                error = future.exception() if future is not None and not future.cancelled() else None
+                if error is not None and not isinstance(error, SpeculationCancelled):
+                    e = error
+                    break
+        if not isinstance(e, SpeculationCancelled):
+            print(f"⚠️  Deep Research: Generation failed; partial report kept at {partial_path}")
+        raise e
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    
+    os.replace(partial_path, report_path)
+    atomic_write_text(
+        section_manifest_path(report_path),
+        jsonio.dumps({"version": 1, "report": report_path.name, "sections": entries}, indent=2),
+    )
+    return completions, summary_completion
+
+
+def report_path_for(pack_slug: str, run_id: str) -> Path:
+    """Deep dive report path for a run: RESEARCH_DIR/{pack_slug}-{run_id}-deep-dive.md."""
+    return RESEARCH_DIR / f"{pack_slug}-{run_id}-deep-dive.md"
+
+
+def generate_research(state: dict, cancel: Optional[threading.Event] = None) -> dict:
+    """
+    Generate the deep dive report for a run (without touching its gates or lifecycle).
+    
+    Reads:
+    - pack-process/CHATGPT_RESEARCH_TEMPLATE.md
+    - Pack lifecycle for metadata
+    
+    The report is saved to report_path_for(pack_slug, run_id) (written to a
+    .partial file first). By default each "## " section of the template is
+    generated concurrently (see write_section_report); with
+    options.research_sections / ORCHESTRATOR_RESEARCH_SECTIONS off, the
+    report is one completion, streamed unless options.research_streaming /
+    ORCHESTRATOR_RESEARCH_STREAMING is off (speculative reports always
+    stream, so that they can be cancelled). With options.research_refresh,
+    sections whose inputs are unchanged since the pack's latest sectioned
+    report are copied from it instead of regenerated.
+    
+    Args:
+        state: Run state, or a speculation's scratch state (run_id,
+               pack_slug and options; LLM stats are recorded in it)
+        cancel: Speculation cancel event (see write_report)
+        
+    Returns:
+        Dict with report_path, summary (the executive summary) and metrics
+        (generation timings, per section in sections mode)
     
+    Raises:
+        ValueError: If the pack is not found
+        FileNotFoundError: If the research template is missing
+        SpeculationCancelled: If cancel was set
+    """
     pack_slug = state["pack_slug"]
     run_id = state["run_id"]
-    pack_snapshot = state["pack_snapshot"]
     
     # Load fresh pack lifecycle to get latest state
-    pack_lifecycle = get_pack_lifecycle(pack_slug)
+    pack_lifecycle = get_pack_snapshot(pack_slug)
     if not pack_lifecycle:
         raise ValueError(f"Pack '{pack_slug}' not found")
     
     # Read research template
-    template_path = (
-        Path(__file__).resolve().parent.parent.parent
-        / "pack-process"
-        / "CHATGPT_RESEARCH_TEMPLATE.md"
-    )
+    template_path = TEMPLATE_PATH
     
     if not template_path.exists():
         raise FileNotFoundError(
@@ -64,178 +813,293 @@ def deep_research_node(state: State) -> State:
         template_text = f.read()
     
     # Extract pack metadata
-    metadata = pack_lifecycle.get("metadata", {})
-    crm = pack_lifecycle.get("crm", {})
+    inputs = pack_inputs(pack_slug, pack_lifecycle)
+    regulation_name = inputs["regulationName"]
     
-    regulation_name = metadata.get("regulationName", "Unknown regulation")
-    target_audience = metadata.get("targetAudience", [])
-    price = metadata.get("price", 0)
-    price_dollars = price / 100 if price else 0
+    report_path = report_path_for(pack_slug, run_id)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
     
-    icp_summary = crm.get("icpSummary", "No ICP summary provided")
-    pack_name = pack_lifecycle.get("name", "Unknown Pack")
-    pack_number = pack_lifecycle.get("packNumber", "?")
+    # Extract summary if it's at the end (look for "executive summary" or similar),
+    # scanning the report line by line as it is produced
+    summary_scanner = SummaryScanner()
+    options = state["options"]
+    _, sections = split_template(template_text)
     
-    # Build deep dive prompt
-    prompt = f"""You are an AI research assistant for Harbor Agent, creating comprehensive compliance and readiness documentation.
-
-# Pack Metadata
-```json
-{{
-  "packSlug": "{pack_slug}",
-  "packName": "{pack_name}",
-  "packNumber": {pack_number},
-  "regulationName": "{regulation_name}",
-  "targetAudience": {target_audience},
-  "currentStage": "{pack_lifecycle.get('currentStage', 'unknown')}",
-  "price": "${price_dollars:.2f}"
-}}
-```
+    if sections and options.get("research_sections", RESEARCH_SECTIONS):
+        concurrency = int(options.get("research_section_concurrency", RESEARCH_SECTION_CONCURRENCY))
+        concurrency = max(1, min(concurrency, len(sections)))
+        
+        # Refresh: reuse the sections of the latest report whose inputs are unchanged
+        previous_report = None
+        previous: dict[str, str] = {}
+        if options.get("research_refresh", False):
+            previous_report = latest_section_report(pack_lifecycle)
+            if previous_report is None:
+                print("⚠️  Deep Research: No previous sectioned report to refresh; generating all sections")
+            else:
+                print(f"🔁 Deep Research: Refreshing {previous_report}")
+                previous = load_report_sections(previous_report)
+        
+        started = time.monotonic()
+        section_completions, summary_completion = write_section_report(
+            state,
+            inputs,
+            f"# {inputs['packName']}: {regulation_name} Deep Dive",
+            sections,
+            report_path,
+            summary_scanner,
+            concurrency,
+            previous,
+            cancel,
+        )
+        generated = [
+            completion
+            for completion in [*section_completions, summary_completion]
+            if completion is not None
+        ]
+        deep_research_metrics = {
+            "mode": "sections",
+            "streamed": False,
+            "cached": bool(generated) and all(completion.cached for completion in generated),
+            "first_token_seconds": None,
+            "generation_seconds": _round(time.monotonic() - started),
+            "concurrency": concurrency,
+            "refreshed_from": str(previous_report) if previous_report else None,
+            "reused": sum(completion is None for completion in section_completions),
+            "sections": [
+                {
+                    "title": section.title,
+                    "reused": completion is None,
+                    "cached": completion.cached if completion else False,
+                    "finish_reason": completion.finish_reason if completion else None,
+                    "seconds": _round(completion.total_seconds) if completion else None,
+                }
+                for section, completion in zip(sections, section_completions)
+            ],
+            "summary_seconds": _round(summary_completion.total_seconds) if summary_completion else None,
+        }
+    else:
+        # Build deep dive prompt (static template first, pack context last)
+        request = report_request(inputs, template_text, pack_lifecycle.get("currentStage", "unknown"))
+        streaming = options.get("research_streaming", RESEARCH_STREAMING) or cancel is not None
+        
+        # Call OpenAI (served from the LLM response cache for unchanged packs)
+        completion = write_report(state, request, report_path, summary_scanner, streaming, cancel)
+        deep_research_metrics = {
+            "mode": "single",
+            "streamed": bool(streaming),
+            "cached": completion.cached,
+            "first_token_seconds": _round(completion.first_token_seconds),
+            "generation_seconds": _round(completion.total_seconds),
+        }
+    
+    if deep_research_metrics["cached"]:
+        print("♻️  Deep Research: Used cached OpenAI response")
+    
+    summary = summary_scanner.finish() or "Deep dive research completed. See full report for details."
+    return {"report_path": report_path, "summary": summary, "metrics": deep_research_metrics}
 
-# Research Context
-You are conducting deep-dive research for the **{pack_name}** (Pack #{pack_number}).
 
-**Regulation/Standard:** {regulation_name}
+def _discard_report(report_path: Path) -> None:
+    """Delete a discarded report, its .partial file and its section manifest."""
+    for path in (
+        report_path,
+        report_path.with_name(f"{report_path.name}.partial"),
+        section_manifest_path(report_path),
+    ):
+        path.unlink(missing_ok=True)
 
-**Target Audience:**
-{chr(10).join(f"- {audience}" for audience in target_audience) if target_audience else "- Not specified"}
 
-**ICP Summary:**
-{icp_summary}
+def speculative_research_node(state: State) -> State:
+    """
+    Speculative research node: Start deep research ahead of validation.
+    
+    When options.research_speculation / ORCHESTRATOR_RESEARCH_SPECULATION is
+    on and the pack's lifecycle predicts a scoring pass (see
+    predict_scoring_pass), generate_research starts on a worker thread, so
+    that validation's latency overlaps the report instead of preceding it.
+    deep_research_node adopts it and discard_speculative_research cancels it.
+    
+    Sets:
+    - metrics.speculation: started, reason
+    
+    Args:
+        state: Current graph state
+    
+    Returns:
+        Updated state
+    """
+    if not state["options"].get("research_speculation", RESEARCH_SPECULATION):
+        return state
+    
+    reason = predict_scoring_pass(state["pack_snapshot"])
+    state["metrics"]["speculation"] = {"started": reason is not None, "reason": reason}
+    if reason is None:
+        print("⏭️  Deep Research: Not speculating (no scoring pass predicted)")
+        return state
+    
+    print(f"🤖 Deep Research: Starting speculatively alongside validation ({reason})")
+    start_speculation(state["run_id"], "deep_research", generate_research, _scratch_state(state))
+    return state
 
-# Instructions
-Please use the following research template to conduct comprehensive research and produce all necessary content for this pack. Replace all placeholders in the template with specific information about **{regulation_name}**.
 
----
+def discard_speculative_research(state: State) -> bool:
+    """
+    Cancel a run's unadopted speculative report and discard its output.
+    
+    Waits up to ORCHESTRATOR_SPECULATION_CANCEL_TIMEOUT seconds for the
+    speculation to stop, then deletes its report files and merges its LLM
+    stats into the run state: every speculative call counts as wasted, in
+    metrics.speculation.wasted (summarize_llm_calls totals; cancelled
+    streams are estimated). A no-op when nothing was speculated.
+    
+    Args:
+        state: Current graph state
+    
+    Returns:
+        True if a speculative report was discarded
+    """
+    speculation = take_speculation(state["run_id"], "deep_research")
+    if speculation is None:
+        return False
+    
+    stopped = speculation.cancel(SPECULATION_CANCEL_TIMEOUT)
+    if not stopped:
+        print(
+            f"⚠️  Deep Research: Speculative report still running after "
+            f"{SPECULATION_CANCEL_TIMEOUT:.0f}s; its usage is not counted"
+        )
+    else:
+        _discard_report(report_path_for(state["pack_slug"], state["run_id"]))
+        merge_llm_stats(state, speculation.scratch)
+    
+    wasted = summarize_llm_calls(speculation.scratch["llm_calls"] if stopped else [])
+    state["metrics"].setdefault("speculation", {}).update({
+        "outcome": "discarded",
+        "seconds": _round(speculation.seconds()),
+        "wasted": wasted,
+    })
+    print(f"🗑️  Deep Research: Discarded speculative report ({wasted['total_tokens']} tokens wasted)")
+    return True
 
-{template_text}
 
----
+def clear_unfinished_report(state: State) -> None:
+    """
+    Delete the report files of a run whose report was never completed.
+    
+    Called before resuming a run: a speculative report, or one whose
+    generation failed, cannot be adopted by the resumed run and would
+    otherwise be left behind.
+    
+    Args:
+        state: The run's checkpointed state
+    """
+    if not state["artifacts"].get("deep_dive_report_path"):
+        _discard_report(report_path_for(state["pack_slug"], state["run_id"]))
 
-# Additional Notes
-- This research will be used to create a Harbor Agent compliance pack
-- Focus on engineering and developer-ready content
-- Make content AI-copilot friendly (for Cursor, GitHub Copilot, etc.)
-- Provide actionable, practical guidance
-- Include code examples and templates where relevant
 
-Please provide complete output for all 16 sections of the template, tailored specifically to **{regulation_name}**.
+def _adopt_speculation(state: State) -> Optional[dict]:
+    """
+    The run's speculative report, if one was started and finished.
+    
+    Returns:
+        generate_research's result, or None to generate the report now
+        (no speculation, or it failed)
+    """
+    speculation = take_speculation(state["run_id"], "deep_research")
+    if speculation is None:
+        return None
+    
+    head_start = speculation.seconds()
+    try:
+        result = speculation.result()
+    except Exception as e:
+        merge_llm_stats(state, speculation.scratch)
+        print(f"⚠️  Deep Research: Speculative report failed ({e}); generating it now")
+        state["metrics"].setdefault("speculation", {}).update({"outcome": "failed", "error": str(e)})
+        return None
+    
+    merge_llm_stats(state, speculation.scratch)
+    state["metrics"].setdefault("speculation", {}).update({
+        "outcome": "adopted",
+        "seconds": _round(speculation.seconds()),
+        # Generation time that overlapped the earlier nodes
+        "head_start_seconds": _round(head_start),
+    })
+    print(f"♻️  Deep Research: Using speculative report ({head_start:.2f}s head start)")
+    return result
 
-After the full report, please provide a 1-2 paragraph executive summary that can be used as a deep_dive_summary."""
 
-    print("🤖 Deep Research: Calling OpenAI for comprehensive research report...")
-    
-    # Call OpenAI
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are an expert research assistant specializing in compliance, regulations, "
-                    "and engineering toolkits. Provide comprehensive, accurate, and actionable content."
-                )
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        temperature=0.7,
-        max_tokens=8000  # Allow for long research reports
-    )
+def deep_research_node(state: State) -> State:
+    """
+    Deep research node: Generate comprehensive research report.
     
-    report_content = response.choices[0].message.content
-    
-    # Extract summary if it's at the end (look for "executive summary" or similar)
-    # For now, we'll use a simple approach: ask for summary in a follow-up if needed
-    # Or extract from the report content
-    summary = "Deep dive research completed. See full report for details."
-    
-    # Try to extract summary from report if it contains one
-    if "executive summary" in report_content.lower() or "summary" in report_content.lower():
-        # Look for summary section
-        lines = report_content.split("\n")
-        summary_lines = []
-        in_summary = False
-        for line in lines:
-            if "summary" in line.lower() and ("executive" in line.lower() or "deep_dive" in line.lower()):
-                in_summary = True
-                continue
-            if in_summary and line.strip():
-                summary_lines.append(line.strip())
-                if len(summary_lines) >= 5:  # Limit summary length
-                    break
-        
-        if summary_lines:
-            summary = " ".join(summary_lines)
+    Only runs if gate.scoring == "pass". Adopts the report started by
+    speculative_research_node if there is one; otherwise generates it now
+    (see generate_research).
+    
+    Sets:
+    - artifacts.deep_dive_report_path: pack-crm/research/{pack_slug}-{run_id}-deep-dive.md
+    - notes.deep_dive_summary
+    - metrics.deep_research: generation timings (per section in sections mode)
+    - metrics.speculation: outcome and head start, when speculated
+    - Records pack lifecycle patch with research completion status
+      (committed by summary_node)
+    
+    Args:
+        state: Current graph state
     
-    # Save report
-    research_dir = Path(__file__).resolve().parent.parent.parent / "pack-crm" / "research"
-    research_dir.mkdir(parents=True, exist_ok=True)
+    Returns:
+        Updated state with artifacts.deep_dive_report_path and notes.deep_dive_summary
+    """
+    gate_scoring = state["gate"].get("scoring")
     
-    report_filename = f"{pack_slug}-{run_id}-deep-dive.md"
-    report_path = research_dir / report_filename
+    # Only proceed if scoring gate passed
+    if gate_scoring != "pass":
+        print(f"⏭️  Deep Research: Skipping (scoring gate: {gate_scoring})")
+        discard_speculative_research(state)
+        return state
     
-    with open(report_path, "w", encoding="utf-8") as f:
-        f.write(report_content)
+    research = _adopt_speculation(state) or generate_research(state)
+    report_path = research["report_path"]
+    summary = research["summary"]
+    state["metrics"]["deep_research"] = research["metrics"]
     
     # Update state
     state["artifacts"]["deep_dive_report_path"] = str(report_path)
     state["notes"]["deep_dive_summary"] = summary
     
-    # Update pack lifecycle
+    # Record pack lifecycle patch
     now = datetime.utcnow().isoformat() + "Z"
     
-    def update_pack(pack: dict) -> dict:
-        # Update research
-        research = pack.get("research", {})
-        research["researchCompleted"] = True
-        
-        # Add report to artifacts
-        artifacts = research.get("researchArtifacts", [])
-        if str(report_path) not in artifacts:
-            artifacts.append(str(report_path))
-        research["researchArtifacts"] = artifacts
-        pack["research"] = research
-        
-        # Update deep_dive stage
-        stages = pack.get("stages", {})
-        deep_dive_stage = stages.get("deep_dive", {})
-        deep_dive_stage["status"] = "completed"
-        if not deep_dive_stage.get("startedAt"):
-            deep_dive_stage["startedAt"] = now
-        deep_dive_stage["completedAt"] = now
-        
-        # Add report to stage artifacts
-        stage_artifacts = deep_dive_stage.get("researchArtifacts", [])
-        if str(report_path) not in stage_artifacts:
-            stage_artifacts.append(str(report_path))
-        deep_dive_stage["researchArtifacts"] = stage_artifacts
-        stages["deep_dive"] = deep_dive_stage
-        pack["stages"] = stages
-        
-        # Update current stage if needed
-        if pack.get("currentStage") != "deep_dive":
-            pack["currentStage"] = "deep_dive"
-        
+    record_lifecycle_patch(state, "deep_research", [
+        # Update research and add report to artifacts
+        set_op("research.researchCompleted", True),
+        append_unique_op("research.researchArtifacts", str(report_path)),
+        # Update deep_dive stage and add report to stage artifacts
+        set_op("stages.deep_dive.status", "completed"),
+        set_default_op("stages.deep_dive.startedAt", now),
+        set_op("stages.deep_dive.completedAt", now),
+        append_unique_op("stages.deep_dive.researchArtifacts", str(report_path)),
+        # Update current stage
+        set_op("currentStage", "deep_dive"),
         # Update CRM gate decision notes
-        crm = pack.get("crm", {})
-        gate_notes = crm.get("gateDecisionNotes", {})
-        gate_notes["deep_dive"] = summary
-        crm["gateDecisionNotes"] = gate_notes
-        pack["crm"] = crm
-        
+        set_op("crm.gateDecisionNotes.deep_dive", summary),
         # Update metadata timestamp
-        metadata = pack.get("metadata", {})
-        metadata["updatedAt"] = now
-        pack["metadata"] = metadata
-        
-        return pack
-    
-    update_pack_lifecycle(pack_slug, update_pack)
+        set_op("metadata.updatedAt", now),
+    ])
     
     print(f"✅ Deep Research: Report saved to {report_path}")
+    metrics = state["metrics"]["deep_research"]
+    if metrics["first_token_seconds"] is not None:
+        print(f"   Time to first token: {metrics['first_token_seconds']:.2f}s")
+    print(f"   Generation time: {metrics['generation_seconds']:.2f}s")
+    if metrics["mode"] == "sections":
+        slowest = max((section["seconds"] or 0 for section in metrics["sections"]), default=0)
+        print(
+            f"   Sections: {len(metrics['sections'])} ({metrics['concurrency']} at a time, "
+            f"slowest {slowest:.2f}s, {metrics['reused']} reused)"
+        )
     print(f"   Summary: {summary[:100]}...")
     
     return state
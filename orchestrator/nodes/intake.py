@@ -2,7 +2,7 @@
 Intake node: Load pack lifecycle and initialize state.
 """
 
-from orchestrator.config import get_pack_lifecycle
+from orchestrator.config import get_pack_snapshot
 from orchestrator.state import State
 
 
@@ -24,8 +24,9 @@ def intake_node(state: State) -> State:
     if not pack_slug:
         raise ValueError("pack_slug is required in state")
     
-    # Load pack lifecycle
-    pack_lifecycle = get_pack_lifecycle(pack_slug)
+    # Load pack lifecycle (read-only snapshot; nodes record changes as
+    # lifecycle patches instead of mutating it)
+    pack_lifecycle = get_pack_snapshot(pack_slug)
     
     if pack_lifecycle is None:
         raise ValueError(
@@ -3,10 +3,29 @@ Scoring gate node: Apply deterministic rules to determine if pack passes scoring
 """
 
 from datetime import datetime
-from orchestrator.config import update_pack_lifecycle
+from orchestrator.lifecycle import record_lifecycle_patch, set_default_op, set_op
 from orchestrator.state import State
 
 
+def scoring_outcome(viability: int, data_availability: int) -> str:
+    """
+    Scoring gate outcome for a pair of scores (see scoring_gate_node for the rules).
+    
+    Args:
+        viability: Viability score (0-100)
+        data_availability: Data availability score (0-100)
+    
+    Returns:
+        "pass", "soft_fail_retry" or "hard_fail"
+    """
+    if viability >= 70 and data_availability >= 60:
+        return "pass"
+    elif viability >= 50:
+        return "soft_fail_retry"
+    else:
+        return "hard_fail"
+
+
 def scoring_gate_node(state: State) -> State:
     """
     Scoring gate node: Apply rules to determine scoring gate outcome.
@@ -16,7 +35,7 @@ def scoring_gate_node(state: State) -> State:
     - Else if viability >= 50: gate.scoring = "soft_fail_retry"
     - Else: gate.scoring = "hard_fail"
     
-    Updates pack lifecycle:
+    Records pack lifecycle patch (committed by summary_node):
     - stages.scoring.status = "completed"
     - crm.gateDecisionNotes.scoring
     
@@ -27,7 +46,6 @@ def scoring_gate_node(state: State) -> State:
         Updated state with gate.scoring set
     """
     scores = state["scores"]
-    pack_slug = state["pack_slug"]
     
     viability = scores.get("viability")
     data_availability = scores.get("data_availability")
@@ -36,20 +54,18 @@ def scoring_gate_node(state: State) -> State:
         raise ValueError("Viability and data_availability scores must be set before scoring gate")
     
     # Apply deterministic rules
-    if viability >= 70 and data_availability >= 60:
-        gate_outcome = "pass"
+    gate_outcome = scoring_outcome(viability, data_availability)
+    if gate_outcome == "pass":
         rationale = (
             f"Passed scoring gate with viability {viability} and data availability {data_availability}. "
             "Scores meet thresholds for proceeding to deep research."
         )
-    elif viability >= 50:
-        gate_outcome = "soft_fail_retry"
+    elif gate_outcome == "soft_fail_retry":
         rationale = (
             f"Soft fail: Viability {viability} is moderate but data availability {data_availability} "
             "is below threshold. May retry after improving data sources or refining idea."
         )
     else:
-        gate_outcome = "hard_fail"
         rationale = (
             f"Hard fail: Viability {viability} is below threshold. "
             "Pack idea needs significant refinement before proceeding."
@@ -58,37 +74,21 @@ def scoring_gate_node(state: State) -> State:
     state["gate"]["scoring"] = gate_outcome
     state["notes"]["scoring_rationale"] = rationale
     
-    # Update pack lifecycle
+    # Record pack lifecycle patch
     now = datetime.utcnow().isoformat() + "Z"
     
-    def update_pack(pack: dict) -> dict:
+    record_lifecycle_patch(state, "scoring_gate", [
         # Update scoring stage
-        stages = pack.get("stages", {})
-        scoring_stage = stages.get("scoring", {})
-        scoring_stage["status"] = "completed"
-        scoring_stage["score"] = viability  # Store viability as the primary score
-        scoring_stage["gate"] = "pass" if gate_outcome == "pass" else "fail"
-        if not scoring_stage.get("startedAt"):
-            scoring_stage["startedAt"] = now
-        scoring_stage["completedAt"] = now
-        stages["scoring"] = scoring_stage
-        pack["stages"] = stages
-        
+        set_op("stages.scoring.status", "completed"),
+        set_op("stages.scoring.score", viability),  # Store viability as the primary score
+        set_op("stages.scoring.gate", "pass" if gate_outcome == "pass" else "fail"),
+        set_default_op("stages.scoring.startedAt", now),
+        set_op("stages.scoring.completedAt", now),
         # Update CRM gate decision notes
-        crm = pack.get("crm", {})
-        gate_notes = crm.get("gateDecisionNotes", {})
-        gate_notes["scoring"] = rationale
-        crm["gateDecisionNotes"] = gate_notes
-        pack["crm"] = crm
-        
+        set_op("crm.gateDecisionNotes.scoring", rationale),
         # Update metadata timestamp
-        metadata = pack.get("metadata", {})
-        metadata["updatedAt"] = now
-        pack["metadata"] = metadata
-        
-        return pack
-    
-    update_pack_lifecycle(pack_slug, update_pack)
+        set_op("metadata.updatedAt", now),
+    ])
     
     print(f"✅ Scoring Gate: {gate_outcome.upper()}")
     print(f"   Rationale: {rationale}")
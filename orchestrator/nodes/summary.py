@@ -1,23 +1,33 @@
 """
-Summary node: Save run state and generate final summary.
+Summary node: Commit lifecycle updates, save run state and generate final summary.
 """
 
+from orchestrator.lifecycle import commit_lifecycle_patches
+from orchestrator.nodes.deep_research import discard_speculative_research
 from orchestrator.state import State, save_run_state
 
 
 def summary_node(state: State) -> State:
     """
-    Summary node: Save run state to JSON file.
+    Summary node: Commit buffered lifecycle patches and save run state to JSON file.
+    
+    All pack lifecycle updates recorded by earlier nodes are applied to
+    packs.json here in one atomic write. A speculative research report that
+    deep_research_node did not adopt (the scoring gate failed) is cancelled
+    and discarded first, so its wasted tokens are saved with the run.
     
     Args:
         state: Current graph state
         
     Returns:
-        State (unchanged, but persisted)
+        State (lifecycle patches committed, state persisted)
     """
+    discard_speculative_research(state)
+    
+    commit_lifecycle_patches(state)
+    
     save_run_state(state)
     
     print(f"✅ Summary: Run {state['run_id']} completed")
     
     return state
-
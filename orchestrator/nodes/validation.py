@@ -1,40 +1,94 @@
 """
 Validation node: Use OpenAI to assess pack viability.
+
+The prompt leads with the static evaluation instructions and ends with the
+pack's details, so every pack's request shares one byte-identical prefix
+for the provider's automatic prompt caching.
+
+With tiered routing on (ORCHESTRATOR_VALIDATION_ROUTING / run option
+"validation_routing"), a cheap triage model scores the pack first and the
+request is escalated to the validation model only when the triage
+viability lands in the escalation band, where the validation and scoring
+gates flip. Both models' scores, latency and cost are recorded in
+metrics.validation so their agreement and the savings can be measured.
 """
 
 import json
 from datetime import datetime
-from orchestrator.config import OPENAI_API_KEY, update_pack_lifecycle
+from typing import Any, Sequence
+from orchestrator.config import (
+    VALIDATION_ESCALATION_BAND,
+    VALIDATION_MODEL,
+    VALIDATION_ROUTING,
+    VALIDATION_TRIAGE_MODEL,
+)
+from orchestrator.lifecycle import record_lifecycle_patch, set_default_op, set_op
+from orchestrator.llm import BudgetConfig, CompletionResult, node_chat_completion
+from orchestrator.nodes.scoring_gate import scoring_outcome
 from orchestrator.state import State
-from openai import OpenAI
 
+SYSTEM_PROMPT = (
+    "You are an expert at evaluating business ideas and compliance pack concepts. "
+    "Provide accurate, thoughtful assessments with clear reasoning."
+)
 
-def validation_node(state: State) -> State:
+INSTRUCTIONS = """You are an AI research assistant evaluating a Harbor Agent compliance pack idea.
+
+Please evaluate the pack idea described at the end and provide:
+1. Viability Score (0-100): How viable is this pack idea? Consider market need, clarity of value proposition, and feasibility.
+2. Data Availability Score (0-100): How readily available is the information needed to create this pack? Consider regulation documentation, research sources, and existing knowledge.
+3. ICP Clarity Score (0-100): How clear and well-defined is the target audience? Consider specificity, accessibility, and market size.
+
+Provide your response in the following JSON format:
+{
+  "viability": <0-100 integer>,
+  "data_availability": <0-100 integer>,
+  "icp_clarity": <0-100 integer>,
+  "rationale": "<2-3 sentence explanation of the scores>"
+}"""
+
+
+# Default price table, for the cost of each routed call
+PRICES = BudgetConfig()
+
+# Viability needed to pass the validation gate
+PASS_VIABILITY = 60
+
+
+def parse_score_band(value: Any) -> tuple[int, int]:
     """
-    Validation node: Use OpenAI to produce viability assessment.
-    
-    Sets:
-    - scores.viability (0-100)
-    - scores.data_availability (0-100)
-    - scores.icp_clarity (0-100)
-    - notes.validation_rationale
-    
-    Updates pack lifecycle:
-    - stages.validation.status = "completed"
-    - crm.gateDecisionNotes.validation
+    Parse an escalation band.
     
     Args:
-        state: Current graph state
-        
+        value: "low-high" (e.g. "45-75") or a [low, high] pair, inclusive
+    
     Returns:
-        Updated state with scores and notes
+        (low, high)
+    
+    Raises:
+        ValueError: If the band is malformed or out of 0-100
     """
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    parts = value.split("-") if isinstance(value, str) else list(value)
+    try:
+        low, high = (int(str(part).strip()) for part in parts)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid escalation band: {value!r} (expected 'low-high')")
+    if not 0 <= low <= high <= 100:
+        raise ValueError(f"Invalid escalation band: {value!r} (expected 0 <= low <= high <= 100)")
+    return low, high
+
+
+def validation_request(pack_snapshot: dict, model: str = VALIDATION_MODEL) -> dict:
+    """
+    Chat completion request assessing a pack idea.
     
-    pack_snapshot = state["pack_snapshot"]
-    pack_slug = state["pack_slug"]
+    Args:
+        pack_snapshot: Pack lifecycle snapshot
+        model: Model to ask
     
-    # Extract relevant fields
+    Returns:
+        Chat completion request (static instructions first, pack details last)
+    """
     crm = pack_snapshot.get("crm", {})
     metadata = pack_snapshot.get("metadata", {})
     
@@ -43,8 +97,9 @@ def validation_node(state: State) -> State:
     regulation_name = metadata.get("regulationName", "Unknown regulation")
     target_audience = metadata.get("targetAudience", [])
     
-    # Build validation prompt
-    prompt = f"""You are an AI research assistant evaluating a Harbor Agent compliance pack idea.
+    prompt = f"""{INSTRUCTIONS}
+
+---
 
 Pack Information:
 - Regulation/Standard: {regulation_name}
@@ -54,42 +109,175 @@ Idea Notes:
 {idea_notes}
 
 ICP Summary:
-{icp_summary}
+{icp_summary}"""
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.7,
+        "response_format": {"type": "json_object"},
+    }
 
-Please evaluate this pack idea and provide:
-1. Viability Score (0-100): How viable is this pack idea? Consider market need, clarity of value proposition, and feasibility.
-2. Data Availability Score (0-100): How readily available is the information needed to create this pack? Consider regulation documentation, research sources, and existing knowledge.
-3. ICP Clarity Score (0-100): How clear and well-defined is the target audience? Consider specificity, accessibility, and market size.
 
-Provide your response in the following JSON format:
-{{
-  "viability": <0-100 integer>,
-  "data_availability": <0-100 integer>,
-  "icp_clarity": <0-100 integer>,
-  "rationale": "<2-3 sentence explanation of the scores>"
-}}"""
+def _assess(state: State, request: dict) -> tuple[CompletionResult, dict]:
+    """Run one validation request and parse its JSON scores."""
+    completion = node_chat_completion(state, "validation", **request)
+    if completion.cached:
+        print(f"♻️  Validation: Using cached {request['model']} response")
+    return completion, json.loads(completion.content)
 
-    print("🤖 Validation: Calling OpenAI for viability assessment...")
+
+def _scores(result: dict) -> dict:
+    """The three integer scores of a parsed validation reply."""
+    return {name: int(result.get(name, 0)) for name in ("viability", "data_availability", "icp_clarity")}
+
+
+def _tier_record(model: str, completion: CompletionResult, scores: dict) -> dict:
+    """Scores, gate decisions, latency and cost of one routed call for metrics.validation."""
+    usage = {} if completion.cached else completion.usage
+    model = completion.model or model
+    return {
+        "model": model,
+        "cached": completion.cached,
+        "scores": scores,
+        "validation": "pass" if scores["viability"] >= PASS_VIABILITY else "fail",
+        "scoring": scoring_outcome(scores["viability"], scores["data_availability"]),
+        "seconds": round(completion.total_seconds, 3) if completion.total_seconds is not None else None,
+        "usd": round(PRICES.cost(
+            model,
+            usage.get("prompt_tokens") or 0,
+            usage.get("completion_tokens") or 0,
+            usage.get("cached_tokens") or 0,
+        ), 6),
+    }
+
+
+def routed_validation(state: State, band: Sequence[int]) -> dict:
+    """
+    Score a pack with the triage model, escalating borderline viability scores.
     
-    # Call OpenAI
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {
-                "role": "system",
-                "content": "You are an expert at evaluating business ideas and compliance pack concepts. Provide accurate, thoughtful assessments with clear reasoning."
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        temperature=0.7,
-        response_format={"type": "json_object"}
+    Records metrics.validation: the band, whether the request escalated,
+    each tier's scores, gate decisions, seconds and usd, whether the two
+    tiers agreed on both gates (escalated requests only) and, for requests
+    answered by triage alone, the estimated usd saved (the validation
+    model's price for the same tokens, minus what triage cost).
+    
+    Args:
+        state: Current graph state (metrics.validation is set)
+        band: Inclusive (low, high) viability band that escalates
+    
+    Returns:
+        The parsed reply whose scores are used
+    """
+    options = state.get("options") or {}
+    triage_model = options.get("validation_triage_model", VALIDATION_TRIAGE_MODEL)
+    model = options.get("validation_model", VALIDATION_MODEL)
+    low, high = band
+    
+    completion, result = _assess(state, validation_request(state["pack_snapshot"], triage_model))
+    triage = _tier_record(triage_model, completion, _scores(result))
+    escalated = low <= triage["scores"]["viability"] <= high
+    metrics = {"routed": True, "band": [low, high], "escalated": escalated, "triage": triage}
+    
+    if escalated:
+        print(f"🔁 Validation: Viability {triage['scores']['viability']} is borderline, escalating to {model}...")
+        completion, result = _assess(state, validation_request(state["pack_snapshot"], model))
+        escalation = _tier_record(model, completion, _scores(result))
+        metrics["escalation"] = escalation
+        metrics["agreed"] = (
+            triage["validation"] == escalation["validation"] and triage["scoring"] == escalation["scoring"]
+        )
+        metrics["saved_usd"] = 0.0
+    else:
+        usage = {} if completion.cached else completion.usage
+        avoided = PRICES.cost(
+            model,
+            usage.get("prompt_tokens") or 0,
+            usage.get("completion_tokens") or 0,
+            usage.get("cached_tokens") or 0,
+        )
+        metrics["escalation"] = None
+        metrics["agreed"] = None
+        metrics["saved_usd"] = round(max(avoided - triage["usd"], 0.0), 6)
+    
+    state["metrics"]["validation"] = metrics
+    return result
+
+
+def summarize_routing(metrics: list[dict]) -> dict:
+    """
+    Total metrics.validation records from routed validations.
+    
+    Args:
+        metrics: metrics.validation of each run (unrouted ones are skipped)
+    
+    Returns:
+        Dict with routed, escalated, compared (escalated with both replies)
+        and agreed counts, agreement_rate (None before any comparison), and
+        usd (spent on both tiers) and saved_usd totals
+    """
+    routed = [record for record in metrics if record and record.get("routed")]
+    compared = [record for record in routed if record.get("agreed") is not None]
+    agreed = sum(1 for record in compared if record["agreed"])
+    usd = sum(
+        record["triage"]["usd"] + ((record.get("escalation") or {}).get("usd") or 0)
+        for record in routed
+    )
+    return {
+        "routed": len(routed),
+        "escalated": sum(1 for record in routed if record.get("escalated")),
+        "compared": len(compared),
+        "agreed": agreed,
+        "agreement_rate": round(agreed / len(compared), 3) if compared else None,
+        "usd": round(usd, 6),
+        "saved_usd": round(sum(record.get("saved_usd") or 0 for record in routed), 6),
+    }
+
+
+def describe_routing(summary: dict) -> str:
+    """One-line description of a summarize_routing() result for CLI output."""
+    agreement = summary.get("agreement_rate")
+    return (
+        f"{summary.get('escalated', 0)}/{summary.get('routed', 0)} escalated, "
+        f"tiers agreed on {summary.get('agreed', 0)}/{summary.get('compared', 0)}"
+        f"{f' ({agreement:.0%})' if agreement is not None else ''}, "
+        f"${summary.get('usd', 0):.4f} spent, ~${summary.get('saved_usd', 0):.4f} saved"
     )
+
+
+def validation_node(state: State) -> State:
+    """
+    Validation node: Use OpenAI to produce viability assessment.
+    
+    Sets:
+    - scores.viability (0-100)
+    - scores.data_availability (0-100)
+    - scores.icp_clarity (0-100)
+    - notes.validation_rationale
+    - metrics.validation (tiered routing only, see routed_validation)
+    
+    Records pack lifecycle patch (committed by summary_node):
+    - stages.validation.status = "completed"
+    - crm.gateDecisionNotes.validation
+    
+    Args:
+        state: Current graph state
+        
+    Returns:
+        Updated state with scores and notes
+    """
+    print("🤖 Validation: Calling OpenAI for viability assessment...")
     
-    # Parse response
-    result = json.loads(response.choices[0].message.content)
+    # Call OpenAI (served from the LLM response cache for unchanged packs)
+    options = state.get("options") or {}
+    if options.get("validation_routing", VALIDATION_ROUTING):
+        band = parse_score_band(options.get("validation_escalation_band", VALIDATION_ESCALATION_BAND))
+        result = routed_validation(state, band)
+    else:
+        model = options.get("validation_model", VALIDATION_MODEL)
+        _, result = _assess(state, validation_request(state["pack_snapshot"], model))
     
     viability = int(result.get("viability", 0))
     data_availability = int(result.get("data_availability", 0))
@@ -104,42 +292,27 @@ Provide your response in the following JSON format:
     
     # Determine validation gate
     # Simple rule: pass if viability >= 60
-    validation_gate = "pass" if viability >= 60 else "fail"
+    validation_gate = "pass" if viability >= PASS_VIABILITY else "fail"
     state["gate"]["validation"] = validation_gate
     
-    # Update pack lifecycle
+    # Record pack lifecycle patch
     now = datetime.utcnow().isoformat() + "Z"
+    gate_note = (
+        f"Validation {'passed' if validation_gate == 'pass' else 'failed'}. "
+        f"Scores: Viability={viability}, Data Availability={data_availability}, "
+        f"ICP Clarity={icp_clarity}. {rationale}"
+    )
     
-    def update_pack(pack: dict) -> dict:
+    record_lifecycle_patch(state, "validation", [
         # Update validation stage
-        stages = pack.get("stages", {})
-        validation_stage = stages.get("validation", {})
-        validation_stage["status"] = "completed"
-        if not validation_stage.get("startedAt"):
-            validation_stage["startedAt"] = now
-        validation_stage["completedAt"] = now
-        stages["validation"] = validation_stage
-        pack["stages"] = stages
-        
+        set_op("stages.validation.status", "completed"),
+        set_default_op("stages.validation.startedAt", now),
+        set_op("stages.validation.completedAt", now),
         # Update CRM gate decision notes
-        crm = pack.get("crm", {})
-        gate_notes = crm.get("gateDecisionNotes", {})
-        gate_notes["validation"] = (
-            f"Validation {'passed' if validation_gate == 'pass' else 'failed'}. "
-            f"Scores: Viability={viability}, Data Availability={data_availability}, "
-            f"ICP Clarity={icp_clarity}. {rationale}"
-        )
-        crm["gateDecisionNotes"] = gate_notes
-        pack["crm"] = crm
-        
+        set_op("crm.gateDecisionNotes.validation", gate_note),
         # Update metadata timestamp
-        metadata = pack.get("metadata", {})
-        metadata["updatedAt"] = now
-        pack["metadata"] = metadata
-        
-        return pack
-    
-    update_pack_lifecycle(pack_slug, update_pack)
+        set_op("metadata.updatedAt", now),
+    ])
     
     print(f"✅ Validation: Scores - Viability={viability}, Data={data_availability}, ICP={icp_clarity}")
     print(f"   Gate: {validation_gate.upper()}")
@@ -10,7 +10,10 @@ from orchestrator.nodes.intake import intake_node
 from orchestrator.nodes.validation import validation_node
 from orchestrator.nodes.scoring_gate import scoring_gate_node
 from orchestrator.nodes.deep_research import deep_research_node
+from orchestrator.lifecycle import commit_lifecycle_patches
+from orchestrator.llm import new_cache_stats, summarize_llm_calls
 from orchestrator.state import State
+from orchestrator.store import PackBuilder, freeze
 
 
 class StepExecutor:
@@ -18,7 +21,12 @@ class StepExecutor:
     Executes agent actions by calling corresponding Harbor nodes.
     
     Maps AgentAction enum values to actual Harbor node functions.
-    Returns updated pack lifecycle, run context, and tokens used.
+    Returns updated pack lifecycle, run context, and tokens used, as
+    reported by OpenAI for the step's LLM calls (run_context["llm_calls"]).
+    
+    Pack lifecycles are treated as immutable snapshots: no-op steps hand the
+    same snapshot back, and stub steps derive a new version with PackBuilder,
+    which shares every unchanged subtree with the previous one.
     """
     
     def __init__(self):
@@ -36,12 +44,15 @@ class StepExecutor:
         
         Args:
             action: Agent action to execute
-            pack_lifecycle: Current pack lifecycle dict
+            pack_lifecycle: Current pack lifecycle (snapshot or plain dict; never modified)
             run_context: Current run context dict
             
         Returns:
-            Tuple of (updated_pack_lifecycle, updated_run_context, tokens_used)
+            Tuple of (updated_pack_lifecycle, updated_run_context, tokens_used),
+            where updated_pack_lifecycle is an immutable snapshot and
+            tokens_used totals the step's LLM calls (0 for cache hits)
         """
+        pack_lifecycle = freeze(pack_lifecycle)
         pack_slug = pack_lifecycle.get("slug", "")
         run_id = run_context.get("run_id", "")
         
@@ -50,99 +61,88 @@ class StepExecutor:
         harbor_state: State = {
             "run_id": run_id,
             "pack_slug": pack_slug,
-            "pack_snapshot": pack_lifecycle.copy(),
+            "pack_snapshot": pack_lifecycle,
             "scores": run_context.get("scores", {}),
             "gate": run_context.get("gate", {}),
             "artifacts": run_context.get("artifacts", {}),
             "notes": run_context.get("notes", {}),
+            "options": run_context.get("options", {}),
+            "lifecycle_patches": [],
+            "committed_lifecycle_patches": [],
+            "llm_cache": run_context.get("llm_cache") or new_cache_stats(),
+            "llm_calls": list(run_context.get("llm_calls", [])),
+            "metrics": run_context.get("metrics", {}),
         }
-        
-        tokens_used = 0
+        calls_before = len(harbor_state["llm_calls"])
         
         # Map action to Harbor node
         if action == AgentAction.INTAKE:
             # Intake just loads the pack, which we already have
             # But we can call it to ensure state is properly initialized
             harbor_state = intake_node(harbor_state)
-            updated_pack = harbor_state["pack_snapshot"]
+            updated_pack = freeze(harbor_state["pack_snapshot"])
         
         elif action == AgentAction.RESEARCH:
             # Research = deep research node
             harbor_state = deep_research_node(harbor_state)
-            updated_pack = harbor_state["pack_snapshot"]
-            # Estimate tokens (deep research uses GPT-4 with max_tokens=8000)
-            tokens_used = 8000  # Rough estimate
+            # Commit the node's lifecycle patch (there is no summary node here)
+            updated_pack = freeze(commit_lifecycle_patches(harbor_state) or harbor_state["pack_snapshot"])
         
         elif action == AgentAction.EVALUATE:
             # Evaluate = validation + scoring gate
             harbor_state = validation_node(harbor_state)
-            tokens_used += 2000  # Rough estimate for validation
             harbor_state = scoring_gate_node(harbor_state)
-            updated_pack = harbor_state["pack_snapshot"]
+            # Commit validation + scoring patches in one write
+            updated_pack = freeze(commit_lifecycle_patches(harbor_state) or harbor_state["pack_snapshot"])
         
         elif action == AgentAction.ICP_ANALYSIS:
             # ICP analysis - stub for now
             # Could be a future node that analyzes ICP from research
             print(f"⏭️  ICP Analysis: Stub implementation (no-op)")
-            updated_pack = pack_lifecycle.copy()
-            tokens_used = 0
+            updated_pack = pack_lifecycle
         
         elif action == AgentAction.DESIGN_SPEC:
             # Design spec - stub for now
             print(f"⏭️  Design Spec: Stub implementation (no-op)")
-            updated_pack = pack_lifecycle.copy()
-            tokens_used = 0
+            updated_pack = pack_lifecycle
         
         elif action == AgentAction.BUILD_CODE:
             # Build code - stub for now
             print(f"⏭️  Build Code: Stub implementation (no-op)")
-            updated_pack = pack_lifecycle.copy()
             # Mark in metadata that build was attempted
-            if "metadata" not in updated_pack:
-                updated_pack["metadata"] = {}
-            updated_pack["metadata"]["build_attempted"] = True
-            tokens_used = 0
+            updated_pack = PackBuilder(pack_lifecycle).set(("metadata", "build_attempted"), True).build()
         
         elif action == AgentAction.TEST:
             # Test - stub for now
             print(f"⏭️  Test: Stub implementation (no-op)")
-            updated_pack = pack_lifecycle.copy()
-            if "metadata" not in updated_pack:
-                updated_pack["metadata"] = {}
-            updated_pack["metadata"]["tests_run"] = True
-            tokens_used = 0
+            updated_pack = PackBuilder(pack_lifecycle).set(("metadata", "tests_run"), True).build()
         
         elif action == AgentAction.DEPLOY:
             # Deploy - stub for now
             print(f"⏭️  Deploy: Stub implementation (no-op)")
-            updated_pack = pack_lifecycle.copy()
-            if "deployment" not in updated_pack:
-                updated_pack["deployment"] = {}
-            updated_pack["deployment"]["frontendDeployed"] = True
-            tokens_used = 0
+            updated_pack = PackBuilder(pack_lifecycle).set(("deployment", "frontendDeployed"), True).build()
         
         elif action == AgentAction.PUBLISH:
             # Publish - stub for now
             print(f"⏭️  Publish: Stub implementation (no-op)")
-            updated_pack = pack_lifecycle.copy()
-            if "stages" not in updated_pack:
-                updated_pack["stages"] = {}
-            if "published" not in updated_pack["stages"]:
-                updated_pack["stages"]["published"] = {}
-            updated_pack["stages"]["published"]["status"] = "completed"
-            updated_pack["currentStage"] = "published"
-            tokens_used = 0
+            updated_pack = (
+                PackBuilder(pack_lifecycle)
+                .set(("stages", "published", "status"), "completed")
+                .set("currentStage", "published")
+                .build()
+            )
         
         elif action == AgentAction.STOP:
             # Stop - no-op
-            updated_pack = pack_lifecycle.copy()
-            tokens_used = 0
+            updated_pack = pack_lifecycle
         
         else:
             # Unknown action - no-op
             print(f"⚠️  Unknown action: {action}, skipping")
-            updated_pack = pack_lifecycle.copy()
-            tokens_used = 0
+            updated_pack = pack_lifecycle
+        
+        # Real usage of the LLM calls this step made
+        tokens_used = summarize_llm_calls(harbor_state["llm_calls"][calls_before:])["total_tokens"]
         
         # Update run context with new state
         updated_run_context = run_context.copy()
@@ -151,6 +151,9 @@ class StepExecutor:
             "gate": harbor_state.get("gate", {}),
             "artifacts": harbor_state.get("artifacts", {}),
             "notes": harbor_state.get("notes", {}),
+            "llm_cache": harbor_state["llm_cache"],
+            "llm_calls": harbor_state["llm_calls"],
+            "metrics": harbor_state["metrics"],
             "tokens_used": run_context.get("tokens_used", 0) + tokens_used,
         })
         
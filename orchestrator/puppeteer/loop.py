@@ -5,12 +5,16 @@ This module coordinates the execution of the dynamic orchestration loop,
 integrating policy, executor, telemetry, and state management.
 """
 
+import time
 import uuid
+from typing import Optional
 from orchestrator.puppeteer.actions import AgentAction, is_terminal
 from orchestrator.puppeteer.state_adapter import harbor_pack_to_task_state, update_states_from_action
 from orchestrator.puppeteer.policy_base import PolicyMode, make_policy
 from orchestrator.puppeteer.executor import StepExecutor
-from orchestrator.config import get_pack_lifecycle, update_pack_lifecycle
+from orchestrator.llm import BudgetExhausted, new_cache_stats, summarize_llm_calls
+from orchestrator.store import thaw
+from orchestrator.config import get_pack_snapshot, update_pack_lifecycle
 from orchestrator.telemetry.logger import OrchestratorLogger
 from orchestrator.telemetry.reward import compute_step_reward, compute_episode_reward, default_reward_config
 
@@ -18,7 +22,8 @@ from orchestrator.telemetry.reward import compute_step_reward, compute_episode_r
 def run_dynamic_orchestration(
     pack_slug: str,
     policy_mode: PolicyMode = "rule",
-    max_steps: int = 20
+    max_steps: int = 20,
+    options: Optional[dict] = None,
 ) -> dict:
     """
     Run dynamic orchestration for a pack.
@@ -34,6 +39,9 @@ def run_dynamic_orchestration(
         pack_slug: Pack slug identifier
         policy_mode: Policy mode ("static", "rule", or "rl")
         max_steps: Maximum number of steps to execute
+        options: Optional run options passed to Harbor nodes
+                 (e.g. {"llm_cache": False} to bypass the LLM response cache,
+                 {"budget": {"run": {"usd": 2.0}}} to override spend limits)
         
     Returns:
         Run summary dict with:
@@ -43,14 +51,18 @@ def run_dynamic_orchestration(
         - actions: list of action names
         - final_reward
         - steps_taken
+        - llm_cache: LLM response cache hit/miss counts
+        - llm_usage: real token usage and LLM time totals (see summarize_llm_calls)
+        - stop_reason: "terminal_action", "max_steps" or "budget_exhausted"
+        - budget_exhausted: scope and message (only if the budget ran out)
         - success: bool
         - error: str (if failed)
     """
     # Initialize run
     run_id = str(uuid.uuid4())
     
-    # Load pack lifecycle
-    pack_lifecycle = get_pack_lifecycle(pack_slug)
+    # Load pack lifecycle (read-only snapshot; steps derive new versions)
+    pack_lifecycle = get_pack_snapshot(pack_slug)
     if pack_lifecycle is None:
         return {
             "run_id": run_id,
@@ -72,6 +84,10 @@ def run_dynamic_orchestration(
         "gate": {},
         "artifacts": {},
         "notes": {},
+        "options": dict(options or {}),
+        "llm_cache": new_cache_stats(),
+        "llm_calls": [],
+        "metrics": {},
     }
     
     # Initialize state
@@ -85,6 +101,8 @@ def run_dynamic_orchestration(
     
     # Track actions taken
     actions_taken: list[str] = []
+    stop_reason = "max_steps"
+    budget_exhausted: Optional[dict] = None
     
     try:
         # Start run logging
@@ -101,14 +119,31 @@ def run_dynamic_orchestration(
             # Check if terminal
             if is_terminal(action):
                 print(f"✅ Terminal action reached: {action.value}")
+                stop_reason = "terminal_action"
                 break
             
             # Execute action
             state_before = state
+            step_started = time.monotonic()
             try:
                 updated_pack, updated_run_context, tokens_used = executor.execute(
                     action, pack_lifecycle, run_context
                 )
+            except BudgetExhausted as e:
+                # Out of budget: end the run here, keeping what earlier steps did
+                print(f"⚠️  Budget exhausted during {action.value}: {e}")
+                logger.log_step(
+                    run_id,
+                    step_index,
+                    action,
+                    state,
+                    tokens_used=0,
+                    local_reward=0.0,
+                    duration_seconds=round(time.monotonic() - step_started, 3),
+                )
+                stop_reason = "budget_exhausted"
+                budget_exhausted = {"scope": e.scope, "message": str(e)}
+                break
             except Exception as e:
                 print(f"❌ Error executing action {action.value}: {e}")
                 # Log error and break
@@ -129,12 +164,18 @@ def run_dynamic_orchestration(
                 updated_run_context
             )
             
+            # The step's real LLM usage, as reported by OpenAI
+            step_usage = summarize_llm_calls(
+                updated_run_context["llm_calls"][len(run_context["llm_calls"]):]
+            )
+            
             # Compute step reward
             step_reward = compute_step_reward(
                 state_before,
                 state_after,
                 tokens_used,
-                reward_config
+                reward_config,
+                step_usage,
             )
             
             # Log step
@@ -145,6 +186,8 @@ def run_dynamic_orchestration(
                 state_after,
                 tokens_used,
                 step_reward,
+                llm_usage=step_usage,
+                duration_seconds=round(time.monotonic() - step_started, 3),
             )
             
             # Update for next iteration
@@ -160,6 +203,9 @@ def run_dynamic_orchestration(
             "actions": actions_taken,
             "steps_taken": len(actions_taken),
             "tokens_used": run_context.get("tokens_used", 0),
+            "llm_cache": run_context["llm_cache"],
+            "llm_usage": summarize_llm_calls(run_context["llm_calls"]),
+            "stop_reason": stop_reason,
             "final_state": {
                 "current_stage": state.current_stage,
                 "has_research": state.has_research,
@@ -168,6 +214,9 @@ def run_dynamic_orchestration(
             },
         }
         
+        if budget_exhausted is not None:
+            run_summary["budget_exhausted"] = budget_exhausted
+        
         final_reward = compute_episode_reward(run_summary, reward_config)
         run_summary["final_reward"] = final_reward
         
@@ -180,7 +229,18 @@ def run_dynamic_orchestration(
         run_summary["success"] = success
         
         # End run logging
-        logger.end_run(run_id, final_reward, success, len(actions_taken))
+        logger.end_run(
+            run_id,
+            final_reward,
+            success,
+            len(actions_taken),
+            extra={
+                "llm_cache": run_context["llm_cache"],
+                "llm_usage": run_summary["llm_usage"],
+                "stop_reason": stop_reason,
+                **({"budget_exhausted": budget_exhausted} if budget_exhausted is not None else {}),
+            },
+        )
         
         # Persist updated pack lifecycle
         # Use update_pack_lifecycle to preserve structure
@@ -189,7 +249,7 @@ def run_dynamic_orchestration(
             # This preserves all existing keys
             for key, value in pack_lifecycle.items():
                 if key not in ["slug", "packNumber"]:  # Don't overwrite identifiers
-                    pack[key] = value
+                    pack[key] = thaw(value)
             return pack
         
         try:
@@ -210,7 +270,11 @@ def run_dynamic_orchestration(
             final_reward=-1.0,
             success=False,
             steps_taken=len(actions_taken),
-            extra={"error": error_msg},
+            extra={
+                "error": error_msg,
+                "llm_cache": run_context["llm_cache"],
+                "llm_usage": summarize_llm_calls(run_context["llm_calls"]),
+            },
         )
         
         return {
@@ -220,6 +284,8 @@ def run_dynamic_orchestration(
             "actions": actions_taken,
             "final_reward": -1.0,
             "steps_taken": len(actions_taken),
+            "llm_cache": run_context["llm_cache"],
+            "llm_usage": summarize_llm_calls(run_context["llm_calls"]),
             "success": False,
             "error": error_msg,
         }
@@ -5,9 +5,9 @@ This policy uses a simple feature-based approach with preference scores
 stored in weights.json. The actual learning is done by the RL trainer.
 """
 
-import json
 from pathlib import Path
 from typing import Any
+from orchestrator import jsonio
 from orchestrator.puppeteer.actions import AgentAction, list_all_actions
 from orchestrator.puppeteer.policy_base import PuppeteerPolicy
 from orchestrator.puppeteer.policy_rule_based import RuleBasedPolicy
@@ -109,7 +109,7 @@ class RLPolicy:
         
         try:
             with open(self.weights_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+                data = jsonio.load(f)
             
             # Validate structure
             if not isinstance(data, dict):
@@ -127,7 +127,7 @@ class RLPolicy:
                     weights[bucket_key][action_name] = action_scores.get(action_name, 0.0)
             
             return weights
-        except (json.JSONDecodeError, IOError):
+        except (jsonio.JSONDecodeError, IOError):
             return self._initialize_default_weights()
     
     def _initialize_default_weights(self) -> dict[str, dict[str, float]]:
@@ -214,7 +214,7 @@ class RLPolicy:
         self.weights_path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(self.weights_path, "w", encoding="utf-8") as f:
-            json.dump(self.weights, f, indent=2, ensure_ascii=False)
+            jsonio.dump(self.weights, f, indent=2)
         
         print(f"✅ Saved RL weights to {self.weights_path}")
 
@@ -0,0 +1,201 @@
+"""
+Speculative node execution.
+
+A node on the critical path can be started early on a worker thread, before
+the gate that decides whether it should run at all has been evaluated. The
+graph later either adopts the result (the gate passed) or cancels the work
+and discards it (it did not). Speculations are kept in a process-wide
+registry keyed by run id and node, never in the run state, which must stay
+JSON-serializable.
+
+Cancellation is cooperative: the work polls its threading.Event (e.g. on
+every streamed delta) and raises SpeculationCancelled.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+from orchestrator.config import SPECULATION_MIN_SCORE
+
+
+class SpeculationCancelled(Exception):
+    """Raised inside speculative work once its speculation has been cancelled."""
+    pass
+
+
+def check_cancelled(cancel: Optional[threading.Event]) -> None:
+    """
+    Raise SpeculationCancelled if cancel is set.
+    
+    Args:
+        cancel: The speculation's cancel event, or None for regular work
+    
+    Raises:
+        SpeculationCancelled: If cancel is set
+    """
+    if cancel is not None and cancel.is_set():
+        raise SpeculationCancelled()
+
+
+class LinkedEvent(threading.Event):
+    """
+    An event that also reads as set once its parent event is set.
+    
+    Lets a group of workers be stopped on its own (set()) or together with
+    an enclosing speculation (the parent). Only is_set() follows the parent;
+    wait() does not.
+    """
+    
+    def __init__(self, parent: Optional[threading.Event] = None):
+        super().__init__()
+        self.parent = parent
+    
+    def is_set(self) -> bool:
+        return super().is_set() or (self.parent is not None and self.parent.is_set())
+
+
+class Speculation:
+    """
+    One node's work running ahead of its gate on a daemon thread.
+    
+    The work gets a scratch state (so it never touches the run state while
+    other nodes update it) and the cancel event; the caller merges the
+    scratch state's LLM stats once the work is adopted or discarded.
+    """
+    
+    def __init__(
+        self,
+        run_id: str,
+        node: str,
+        work: Callable[[dict, threading.Event], Any],
+        scratch: dict,
+    ):
+        self.run_id = run_id
+        self.node = node
+        self.scratch = scratch
+        self.cancel_event = threading.Event()
+        self.future: Future = Future()
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(work,),
+            name=f"speculate-{node}",
+            daemon=True,
+        )
+    
+    def _run(self, work: Callable[[dict, threading.Event], Any]) -> None:
+        try:
+            self.future.set_result(work(self.scratch, self.cancel_event))
+        except BaseException as e:
+            self.future.set_exception(e)
+        finally:
+            self.finished = time.monotonic()
+    
+    def start(self) -> "Speculation":
+        """Start the work on its thread."""
+        self._thread.start()
+        return self
+    
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for the work's result.
+        
+        Raises:
+            Whatever the work raised (SpeculationCancelled once cancelled)
+            TimeoutError: If it is still running after timeout seconds
+        """
+        return self.future.result(timeout)
+    
+    def cancel(self, timeout: Optional[float] = None) -> bool:
+        """
+        Cancel the work and wait for it to stop.
+        
+        Args:
+            timeout: Seconds to wait for the work to notice (None waits)
+        
+        Returns:
+            True if the work has stopped, False if it is still running
+        """
+        self.cancel_event.set()
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+    
+    def seconds(self) -> float:
+        """Seconds the work ran (so far, if still running)."""
+        return (self.finished or time.monotonic()) - self.started
+
+
+_speculations: dict[tuple[str, str], Speculation] = {}
+_speculations_lock = threading.Lock()
+
+
+def start_speculation(
+    run_id: str,
+    node: str,
+    work: Callable[[dict, threading.Event], Any],
+    scratch: dict,
+) -> Speculation:
+    """
+    Start node's work for a run speculatively.
+    
+    Args:
+        run_id: Run the speculation belongs to
+        node: Node whose work it is, e.g. "deep_research"
+        work: Called as work(scratch, cancel_event) on a worker thread
+        scratch: State the work reads and records LLM stats into
+    
+    Returns:
+        The started Speculation
+    
+    Raises:
+        ValueError: If the run already has a speculation for node
+    """
+    with _speculations_lock:
+        if (run_id, node) in _speculations:
+            raise ValueError(f"Run {run_id} is already speculating on {node}")
+        speculation = Speculation(run_id, node, work, scratch)
+        _speculations[(run_id, node)] = speculation
+    return speculation.start()
+
+
+def take_speculation(run_id: str, node: str) -> Optional[Speculation]:
+    """
+    Remove and return a run's speculation for node, if one was started.
+    
+    Args:
+        run_id: Run id
+        node: Node name
+    
+    Returns:
+        The Speculation (the caller adopts or cancels it), or None
+    """
+    with _speculations_lock:
+        return _speculations.pop((run_id, node), None)
+
+
+def predict_scoring_pass(pack_snapshot: dict, min_score: Optional[int] = None) -> Optional[str]:
+    """
+    Predict from a pack's lifecycle whether it will pass the scoring gate.
+    
+    A pack whose last scoring gate passed, or whose last scoring score
+    (viability) is at least min_score, is predicted to pass again.
+    
+    Args:
+        pack_snapshot: Pack lifecycle snapshot
+        min_score: Score that predicts a pass (defaults to
+                   ORCHESTRATOR_SPECULATION_MIN_SCORE)
+    
+    Returns:
+        Why a pass is predicted, or None if it is not
+    """
+    min_score = SPECULATION_MIN_SCORE if min_score is None else min_score
+    scoring = (pack_snapshot.get("stages") or {}).get("scoring") or {}
+    if scoring.get("gate") == "pass":
+        return "stages.scoring.gate is pass"
+    score = scoring.get("score")
+    if isinstance(score, (int, float)) and score >= min_score:
+        return f"stages.scoring.score {score} >= {min_score}"
+    return None
@@ -4,13 +4,15 @@ Orchestrator state model for LangGraph workflow.
 Defines the state structure for a single orchestrator run.
 """
 
-import json
 import uuid
 from pathlib import Path
 from typing import TypedDict, Optional
 
 from pydantic import BaseModel, Field
 
+from orchestrator import jsonio
+from orchestrator.llm import new_cache_stats
+
 
 class Scores(BaseModel):
     """Scoring metrics for pack validation."""
@@ -46,15 +48,27 @@ class State(TypedDict):
     gate: dict
     artifacts: dict
     notes: dict
-
-
-def new_run_state(pack_slug: str, pack_snapshot: dict) -> State:
+    options: dict
+    lifecycle_patches: list
+    committed_lifecycle_patches: list
+    llm_cache: dict
+    llm_calls: list
+    metrics: dict
+
+
+def new_run_state(
+    pack_slug: str,
+    pack_snapshot: dict,
+    options: Optional[dict] = None,
+) -> State:
     """
     Create a new run state with initial values.
     
     Args:
         pack_slug: The pack slug identifier
         pack_snapshot: Snapshot of PackLifecycle dict at start
+        options: Optional run options (e.g. {"lifecycle_write_through": True},
+                 {"llm_cache": False})
         
     Returns:
         Initial State dict
@@ -82,6 +96,16 @@ def new_run_state(pack_slug: str, pack_snapshot: dict) -> State:
             "scoring_rationale": None,
             "deep_dive_summary": None,
         },
+        "options": dict(options or {}),
+        # Pending pack lifecycle ops, committed once by summary_node
+        "lifecycle_patches": [],
+        "committed_lifecycle_patches": [],
+        # LLM response cache hits/misses, overall and per node
+        "llm_cache": new_cache_stats(),
+        # Token usage and wall time of each LLM call (see orchestrator.llm.usage)
+        "llm_calls": [],
+        # Per-node timings, e.g. metrics.deep_research.first_token_seconds
+        "metrics": {},
     }
 
 
@@ -103,7 +127,7 @@ def save_run_state(state: State, runs_dir: Optional[Path] = None) -> None:
     output_file = runs_dir / f"{run_id}.json"
     
     with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2, ensure_ascii=False)
+        jsonio.dump(state, f, indent=2)
     
     print(f"✅ Run state saved to: {output_file}")
 
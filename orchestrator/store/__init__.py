@@ -0,0 +1,55 @@
+"""
+Pack store backends for pack-crm lifecycle data.
+
+The orchestrator reads and writes pack lifecycles through a process-wide store
+(see orchestrator.config) instead of re-parsing pack-crm/data/packs.json on
+every call. Backends:
+- "json": cached, slug-indexed packs.json (default)
+- "sqlite": WAL-mode SQLite database with debounced packs.json export
+- "sharded": one file per pack under pack-crm/data/packs/, with per-pack locks
+- "journal": packs.json snapshot plus an append-only JSON Patch journal
+
+Readers that don't need a mutable copy can use snapshot() / snapshot_all(),
+which hand out shared immutable packs (orchestrator.store.snapshot).
+PackWatcher (orchestrator.store.watch) turns changes to any backend's files
+into per-slug change events.
+"""
+
+from orchestrator.store.base import (
+    BatchUpdateResult,
+    PackStore,
+    PackStoreBackend,
+    PackStoreConflictError,
+    PackTransaction,
+    PackUpdaters,
+    clone_json,
+    make_pack_store,
+)
+from orchestrator.store.json_store import JsonPackStore
+from orchestrator.store.jsonpatch import apply_json_patch, make_json_patch
+from orchestrator.store.migrate import migrate_pack_store
+from orchestrator.store.snapshot import FrozenDict, FrozenList, PackBuilder, freeze, thaw
+from orchestrator.store.watch import ChangeFeed, PackWatcher, diff_packs
+
+__all__ = [
+    "BatchUpdateResult",
+    "PackStore",
+    "PackStoreBackend",
+    "PackStoreConflictError",
+    "PackTransaction",
+    "PackUpdaters",
+    "clone_json",
+    "make_pack_store",
+    "JsonPackStore",
+    "apply_json_patch",
+    "make_json_patch",
+    "migrate_pack_store",
+    "FrozenDict",
+    "FrozenList",
+    "PackBuilder",
+    "freeze",
+    "thaw",
+    "ChangeFeed",
+    "PackWatcher",
+    "diff_packs",
+]
@@ -0,0 +1,524 @@
+"""
+Base pack store interface, shared helpers and backend factory.
+
+A pack store owns the system of record for pack lifecycles on the Python
+side. Every backend must keep pack-crm/data/packs.json byte-compatible with
+what the TypeScript side (pack-crm/src/store.ts) reads.
+"""
+
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Literal, Mapping, Optional
+
+from orchestrator import jsonio
+from orchestrator.store.snapshot import FrozenDict, freeze
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+PackStoreBackend = Literal["json", "sqlite", "sharded", "journal"]
+
+PackUpdater = Callable[[dict], dict]
+# slug -> updater, or (slug, updater) pairs when a slug needs several updaters
+PackUpdaters = Mapping[str, PackUpdater] | Iterable[tuple[str, PackUpdater]]
+
+
+class PackStoreConflictError(RuntimeError):
+    """Raised when a compare-and-swap update keeps losing to concurrent writers."""
+
+
+def clone_json(value: Any) -> Any:
+    """
+    Deep-copy a JSON-compatible value (dicts, lists and scalars).
+    
+    Considerably faster than copy.deepcopy for parsed JSON because it skips
+    the memo bookkeeping and only handles the types json can produce.
+    
+    Args:
+        value: JSON-compatible value
+        
+    Returns:
+        Independent copy of value
+    """
+    if isinstance(value, dict):
+        return {key: clone_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [clone_json(item) for item in value]
+    return value
+
+
+def render_pack_doc(pack: dict) -> str:
+    """
+    Serialize one pack exactly as it appears at the top level of packs.json.
+    
+    Args:
+        pack: Pack dictionary
+        
+    Returns:
+        indent=2 JSON text for the pack (not yet nested inside the array)
+    """
+    # indent=2 / ensure_ascii=False / sort_keys=False keeps the file
+    # byte-compatible with what pack-crm and the TS side expect
+    return jsonio.dumps(pack, indent=2)
+
+
+def render_packs_json(docs: Iterable[str]) -> str:
+    """
+    Assemble packs.json text from per-pack documents produced by render_pack_doc.
+    
+    The result is byte-identical to json.dumps(packs, indent=2,
+    ensure_ascii=False) plus a trailing newline, but only needs string
+    concatenation, so backends that store pre-rendered docs can export
+    without re-encoding every pack.
+    
+    Args:
+        docs: Per-pack JSON documents, in file order
+        
+    Returns:
+        Full packs.json text
+    """
+    # JSON strings never contain raw newlines, so re-indenting line by line
+    # is safe
+    items = ["  " + doc.replace("\n", "\n  ") for doc in docs]
+    if not items:
+        return "[]\n"
+    return "[\n" + ",\n".join(items) + "\n]\n"
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """
+    Write text to path via write-to-temp + fsync + rename.
+    
+    Readers (including the TS side) only ever see a complete file.
+    
+    Args:
+        path: Destination path
+        text: File contents
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp.{os.getpid()}.{threading.get_ident()}")
+    
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class BatchUpdateResult:
+    """
+    Outcome of PackStore.update_many.
+    
+    Attributes:
+        updated: slug -> independent copy of the updated pack
+        errors: slug -> exception that kept that pack from being updated
+    """
+    
+    updated: dict[str, dict] = field(default_factory=dict)
+    errors: dict[str, Exception] = field(default_factory=dict)
+    
+    @property
+    def ok(self) -> bool:
+        """True if every requested pack was updated."""
+        return not self.errors
+
+
+def group_updaters(updaters: PackUpdaters) -> dict[str, list[PackUpdater]]:
+    """
+    Group updaters by slug, keeping first-seen slug order and call order.
+    
+    Args:
+        updaters: slug -> updater mapping or (slug, updater) pairs
+    
+    Returns:
+        slug -> updaters to apply to that pack, in order
+    """
+    items = updaters.items() if isinstance(updaters, Mapping) else updaters
+    grouped: dict[str, list[PackUpdater]] = {}
+    for slug, updater_fn in items:
+        grouped.setdefault(slug, []).append(updater_fn)
+    return grouped
+
+
+def apply_updaters(pack: dict, updater_fns: list[PackUpdater]) -> dict:
+    """Run updater_fns over pack in order and return the result."""
+    for updater_fn in updater_fns:
+        pack = updater_fn(pack)
+    return pack
+
+
+class FileLock:
+    """
+    Advisory cross-process lock (fcntl.flock) on a sidecar lock file.
+    
+    Also serializes threads within the process, and is re-entrant within a
+    thread: nested exclusive() calls reuse the outer lock.
+    """
+    
+    def __init__(self, path: str | Path):
+        """
+        Initialize lock.
+        
+        Args:
+            path: Path to the lock file (created on first use)
+        """
+        self.path = Path(path)
+        # In-process half of the lock; on its own it is enough for read-only
+        # critical sections that only touch in-memory state
+        self.thread_lock = threading.RLock()
+        self._local = threading.local()
+    
+    @contextmanager
+    def exclusive(self) -> Iterator[int]:
+        """
+        Hold the lock.
+        
+        Yields:
+            File descriptor of the lock file
+        """
+        with self.thread_lock:
+            fd = getattr(self._local, "fd", None)
+            if fd is not None:
+                yield fd
+                return
+            
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                self._local.fd = fd
+                try:
+                    yield fd
+                finally:
+                    self._local.fd = None
+                    if fcntl is not None:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+            finally:
+                os.close(fd)
+
+
+class DebouncedExporter:
+    """
+    Coalesces bursts of export requests into one export per delay window.
+    """
+    
+    def __init__(self, export_fn: Callable[[], None], delay: float):
+        """
+        Initialize exporter.
+        
+        Args:
+            export_fn: Function that performs the export
+            delay: Seconds to wait after the first request before exporting
+                   (0 exports synchronously on every request)
+        """
+        self.export_fn = export_fn
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+    
+    def schedule(self) -> None:
+        """Request an export; no-op if one is already pending."""
+        if self.delay <= 0:
+            self.export_fn()
+            return
+        
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def _run(self) -> None:
+        """Timer callback."""
+        with self._lock:
+            self._timer = None
+        try:
+            self.export_fn()
+        except Exception as e:
+            print(f"⚠️  Warning: Failed to export packs.json: {e}")
+    
+    def flush(self) -> None:
+        """Cancel any pending timer and export now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self.export_fn()
+
+
+class PackStore(ABC):
+    """
+    Interface for pack lifecycle stores.
+    
+    All reads hand out independent copies so callers can mutate what they get
+    back. All writes are atomic and safe across processes, and bump a
+    monotonically increasing store version.
+    """
+    
+    path: Path
+    
+    @property
+    @abstractmethod
+    def version(self) -> int:
+        """Current store version (increases by one per committed write)."""
+    
+    @abstractmethod
+    def load_all(self) -> list[dict]:
+        """Get all packs, in packs.json order."""
+    
+    @abstractmethod
+    def get(self, slug: str) -> Optional[dict]:
+        """Get a single pack by slug, or None if not found."""
+    
+    @abstractmethod
+    def save_all(self, packs: list[dict]) -> None:
+        """Replace the full pack list."""
+    
+    @abstractmethod
+    def update(self, slug: str, updater_fn: Callable[[dict], dict]) -> dict:
+        """
+        Apply updater_fn to one pack under the store's write lock and persist it.
+        
+        Raises:
+            ValueError: If pack with slug not found
+        """
+    
+    @abstractmethod
+    def _commit_if_unchanged(self, slug: str, base_pack: dict, updated_pack: dict) -> bool:
+        """
+        Atomically replace a pack if it still equals base_pack.
+        
+        Returns:
+            True if committed, False if the pack changed concurrently
+            
+        Raises:
+            ValueError: If pack with slug not found
+        """
+    
+    def snapshot(self, slug: str) -> Optional[FrozenDict]:
+        """
+        Get an immutable snapshot of one pack.
+        
+        Unlike get(), the result may be shared with other readers instead of
+        being copied; it can't be modified (see orchestrator.store.snapshot).
+        This default freezes a fresh copy; backends with an in-process cache
+        hand out the same snapshot until the pack changes.
+        
+        Args:
+            slug: Pack slug identifier
+        
+        Returns:
+            FrozenDict snapshot if found, None otherwise
+        """
+        pack = self.get(slug)
+        return freeze(pack) if pack is not None else None
+    
+    def snapshot_all(self) -> list[FrozenDict]:
+        """
+        Get immutable snapshots of all packs, in packs.json order.
+        
+        Returns:
+            New list of (possibly shared) FrozenDict snapshots
+        """
+        return [freeze(pack) for pack in self.iter_packs()]
+    
+    def update_many(self, updaters: PackUpdaters) -> BatchUpdateResult:
+        """
+        Apply updaters to several packs, reporting failures per slug.
+        
+        A pack whose updater raises (or that doesn't exist) is left untouched
+        and reported in errors; the rest of the batch is still committed.
+        When a slug has several updaters they run in order, and the pack is
+        only updated if all of them succeed.
+        
+        This default commits each pack with update(); backends that rewrite
+        a whole file per write override it to load and save once per batch.
+        
+        Args:
+            updaters: slug -> updater mapping or (slug, updater) pairs
+        
+        Returns:
+            BatchUpdateResult with the updated packs and per-slug errors
+        """
+        result = BatchUpdateResult()
+        for slug, updater_fns in group_updaters(updaters).items():
+            try:
+                result.updated[slug] = self.update(
+                    slug, lambda pack, fns=updater_fns: apply_updaters(pack, fns)
+                )
+            except Exception as e:
+                result.errors[slug] = e
+        return result
+    
+    @contextmanager
+    def transaction(self) -> Iterator["PackTransaction"]:
+        """
+        Collect pack updates and commit them together with update_many.
+        
+        Updaters queued with tx.update() run when the with block exits, under
+        the store's write lock, so the batch is still a consistent
+        read-modify-write. If the block raises, nothing is written. The
+        outcome is available as tx.result afterwards.
+        
+        Example:
+            with store.transaction() as tx:
+                for slug in slugs:
+                    tx.update(slug, mark_reviewed)
+            failed = tx.result.errors
+        """
+        tx = PackTransaction()
+        yield tx
+        tx.result = self.update_many(tx.updates)
+    
+    def iter_packs(self) -> Iterator[dict]:
+        """
+        Iterate over all packs in packs.json order.
+        
+        Backends that store packs separately override this to load lazily,
+        one pack at a time.
+        """
+        return iter(self.load_all())
+    
+    def list_by_stage(self, stage: str) -> list[dict]:
+        """
+        Get all packs whose currentStage equals stage.
+        
+        Args:
+            stage: Lifecycle stage name (e.g. "idea")
+            
+        Returns:
+            Matching pack dicts, in packs.json order
+        """
+        return [pack for pack in self.iter_packs() if pack.get("currentStage") == stage]
+    
+    def watch_paths(self) -> list[Path]:
+        """
+        Files (or directories) whose changes can change the pack list.
+        
+        Used by orchestrator.store.watch to notice writes from other
+        processes. Backends that keep packs outside packs.json add their
+        own storage here.
+        """
+        return [self.path]
+    
+    def invalidate(self) -> None:
+        """Drop any in-process cache so the next read goes to storage."""
+    
+    def flush(self) -> None:
+        """Write any pending packs.json export now."""
+    
+    def close(self) -> None:
+        """Flush pending work and release resources."""
+    
+    def compare_and_swap(
+        self,
+        slug: str,
+        updater_fn: Callable[[dict], dict],
+        max_retries: int = 10,
+    ) -> dict:
+        """
+        Optimistically update one pack, retrying updater_fn on conflict.
+        
+        updater_fn runs WITHOUT the write lock held, against a snapshot of the
+        pack. The result is only committed if the pack is still unchanged when
+        the lock is taken; otherwise updater_fn is re-run against the fresh
+        pack. Use this when the updater is slow (e.g. it calls out to other
+        services) so other writers aren't blocked on it. updater_fn must
+        therefore be safe to call more than once.
+        
+        Args:
+            slug: Pack slug identifier
+            updater_fn: Function that takes a pack dict and returns the updated dict
+            max_retries: Maximum number of attempts before giving up
+            
+        Returns:
+            Independent copy of the updated pack dict
+            
+        Raises:
+            ValueError: If pack with slug not found
+            PackStoreConflictError: If every attempt lost to a concurrent writer
+        """
+        for attempt in range(max_retries):
+            base_pack = self.get(slug)
+            if base_pack is None:
+                raise ValueError(f"Pack with slug '{slug}' not found in packs.json")
+            
+            updated_pack = updater_fn(clone_json(base_pack))
+            
+            if self._commit_if_unchanged(slug, base_pack, updated_pack):
+                return clone_json(updated_pack)
+            
+            # Lost the race: back off briefly (with jitter) and retry
+            time.sleep(min(0.001 * (2 ** attempt), 0.1) * random.random())
+        
+        raise PackStoreConflictError(
+            f"Could not update pack '{slug}' after {max_retries} attempts "
+            "due to concurrent modifications"
+        )
+
+
+class PackTransaction:
+    """Pack updates queued inside a PackStore.transaction() block."""
+    
+    def __init__(self):
+        self.updates: list[tuple[str, PackUpdater]] = []
+        self.result: Optional[BatchUpdateResult] = None
+    
+    def update(self, slug: str, updater_fn: PackUpdater) -> None:
+        """
+        Queue updater_fn for the pack with slug.
+        
+        Args:
+            slug: Pack slug identifier
+            updater_fn: Function that takes a pack dict and returns the updated dict
+        """
+        self.updates.append((slug, updater_fn))
+
+
+def make_pack_store(
+    backend: PackStoreBackend,
+    path: str | Path,
+    options: dict | None = None,
+) -> PackStore:
+    """
+    Factory function to create a pack store.
+    
+    Args:
+        backend: Store backend ("json", "sqlite", "sharded" or "journal")
+        path: Path to pack-crm/data/packs.json
+        options: Optional backend-specific options (e.g. {"db_path": ...})
+        
+    Returns:
+        PackStore instance
+        
+    Raises:
+        ValueError: If backend is not recognized
+    """
+    options = options or {}
+    if backend == "json":
+        from orchestrator.store.json_store import JsonPackStore
+        return JsonPackStore(path)
+    elif backend == "sqlite":
+        from orchestrator.store.sqlite_store import SqlitePackStore
+        return SqlitePackStore(path, **options)
+    elif backend == "sharded":
+        from orchestrator.store.sharded_store import ShardedPackStore
+        return ShardedPackStore(path, **options)
+    elif backend == "journal":
+        from orchestrator.store.journal_store import JournalPackStore
+        return JournalPackStore(path, **options)
+    else:
+        raise ValueError(f"Unknown pack store backend: {backend}")
@@ -0,0 +1,538 @@
+"""
+Journal pack store: packs.json snapshot plus an append-only patch journal.
+
+Instead of rewriting packs.json on every update, each write appends one RFC
+6902 JSON Patch record to pack-crm/data/packs.journal.jsonl:
+
+    {"v": 42, "slug": "tax-assist", "ts": "...Z", "patch": [{"op": ...}]}
+
+so write cost is O(change) and the journal doubles as an audit trail of
+what each update changed. The in-memory view is the packs.json snapshot
+with the journal replayed on top; readers replay only the records appended
+since their last read.
+
+A compactor folds the journal back into packs.json once it grows past a
+size threshold, a debounce delay after the first uncompacted write, and on
+clean shutdown. Compaction writes packs.journal.base.json (the snapshot's
+version and SHA-256, plus the previous snapshot's) before swapping
+packs.json in, so a crash at any point replays exactly the records the
+snapshot on disk is missing. A partially written final journal line from a
+crashed writer is ignored by readers and truncated by the next writer.
+
+If packs.json is edited by another tool, journal records not yet compacted
+are replayed on top of the edited file on a best-effort basis (records that
+no longer apply are dropped with a warning) and the result is compacted.
+"""
+
+import atexit
+import hashlib
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from orchestrator import jsonio
+from orchestrator.store.base import (
+    BatchUpdateResult,
+    DebouncedExporter,
+    PackUpdaters,
+    apply_updaters,
+    atomic_write_text,
+    clone_json,
+    group_updaters,
+    render_pack_doc,
+    render_packs_json,
+)
+from orchestrator.store.json_store import JsonPackStore
+from orchestrator.store.jsonpatch import apply_json_patch, make_json_patch
+
+# Readers retry loading the snapshot if a compaction swaps it out mid-read
+_SNAPSHOT_RETRIES = 5
+
+
+class JournalPackStore(JsonPackStore):
+    """
+    packs.json snapshot + append-only JSON Patch journal, with compaction.
+    
+    Shares the lock file and store version counter with JsonPackStore.
+    """
+    
+    def __init__(
+        self,
+        path: str | Path,
+        journal_path: str | Path | None = None,
+        compact_bytes: int = 1024 * 1024,
+        compact_delay: float = 5.0,
+    ):
+        """
+        Initialize store.
+        
+        Args:
+            path: Path to pack-crm/data/packs.json (the snapshot)
+            journal_path: Path to the journal (default: packs.journal.jsonl next to packs.json)
+            compact_bytes: Compact as soon as the journal reaches this many bytes
+            compact_delay: Compact this many seconds after the first uncompacted write
+        """
+        super().__init__(path)
+        self.journal_path = (
+            Path(journal_path) if journal_path else self.path.with_name("packs.journal.jsonl")
+        )
+        self.base_path = self.journal_path.with_name(
+            self.journal_path.name.replace(".jsonl", "") + ".base.json"
+        )
+        self.compact_bytes = compact_bytes
+        self._compactor = DebouncedExporter(self.compact, compact_delay)
+        self._closed = False
+        
+        # Snapshot bookkeeping (the packs.json signature itself is
+        # JsonPackStore._signature)
+        self._snapshot_sha: Optional[str] = None
+        self._base_version = 0
+        # True while the snapshot was edited externally and has journal
+        # records merged on top that packs.json doesn't reflect
+        self._merged_external = False
+        self._journal_inode: Optional[int] = None
+        self._journal_offset = 0
+        
+        with self._file_lock.exclusive():
+            self._recover_journal()
+            if self.path.exists() and not self.base_path.exists() and self._journal_size() == 0:
+                raw = self.path.read_bytes()
+                self._write_base(self._read_version(), hashlib.sha256(raw).hexdigest())
+        
+        atexit.register(self.close)
+    
+    # ------------------------------------------------------------------
+    # Journal file helpers
+    # ------------------------------------------------------------------
+    
+    def _journal_size(self) -> int:
+        """Size of the journal in bytes (0 if missing)."""
+        try:
+            return os.stat(self.journal_path).st_size
+        except FileNotFoundError:
+            return 0
+    
+    def _recover_journal(self) -> None:
+        """
+        Truncate a partially written final record left by a crashed writer.
+        
+        Caller must hold the exclusive lock.
+        """
+        try:
+            fd = os.open(self.journal_path, os.O_RDWR)
+        except FileNotFoundError:
+            return
+        
+        try:
+            size = os.fstat(fd).st_size
+            if size == 0 or os.pread(fd, 1, size - 1) == b"\n":
+                return
+            
+            # Scan backwards for the end of the last complete record
+            cut = 0
+            pos = size
+            while pos > 0:
+                start = max(0, pos - 65536)
+                newline = os.pread(fd, pos - start, start).rfind(b"\n")
+                if newline >= 0:
+                    cut = start + newline + 1
+                    break
+                pos = start
+            
+            print(
+                f"⚠️  Warning: Discarding partially written journal record "
+                f"({size - cut} bytes) in {self.journal_path}"
+            )
+            os.ftruncate(fd, cut)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    def _read_base(self) -> dict:
+        """Read the snapshot base record ({} if missing or unreadable)."""
+        try:
+            with open(self.base_path, "r", encoding="utf-8") as f:
+                return jsonio.load(f)
+        except (FileNotFoundError, jsonio.JSONDecodeError):
+            return {}
+    
+    def _write_base(self, version: int, sha: str) -> None:
+        """Record which version the packs.json snapshot with hash sha contains."""
+        previous = None
+        if self._snapshot_sha is not None:
+            previous = {"version": self._base_version, "sha256": self._snapshot_sha}
+        base = {"version": version, "sha256": sha, "previous": previous}
+        atomic_write_text(self.base_path, jsonio.dumps(base, indent=2) + "\n")
+    
+    def read_journal(self) -> list[dict]:
+        """
+        Get the journal records that have not been compacted yet.
+        
+        Returns:
+            Records in commit order ({"v", "slug", "ts", "patch"})
+        """
+        try:
+            with open(self.journal_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        
+        # Ignore a trailing partial record from an in-flight append
+        end = data.rfind(b"\n") + 1
+        return [jsonio.loads(line) for line in data[:end].splitlines() if line.strip()]
+    
+    # ------------------------------------------------------------------
+    # Cache management
+    # ------------------------------------------------------------------
+    
+    def _load_snapshot(self) -> None:
+        """
+        Load packs.json and work out which journal records it already contains.
+        
+        Raises:
+            FileNotFoundError: If packs.json doesn't exist
+            json.JSONDecodeError: If JSON is invalid
+            ValueError: If the top-level value is not a list
+        """
+        for _ in range(_SNAPSHOT_RETRIES):
+            self._file_signature()  # Raises a helpful FileNotFoundError
+            with open(self.path, "rb") as f:
+                raw = f.read()
+                stat = os.fstat(f.fileno())
+            base = self._read_base()
+            signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            # The base record is written before packs.json is swapped in, so
+            # if packs.json is still the file we read, base describes it (or
+            # its successor, via "previous")
+            if self._file_signature() == signature:
+                break
+        
+        data = jsonio.loads(raw.decode("utf-8"))
+        if not isinstance(data, list):
+            raise ValueError(f"Expected list in packs.json, got {type(data)}")
+        
+        sha = hashlib.sha256(raw).hexdigest()
+        previous = base.get("previous") or {}
+        if base.get("sha256") == sha:
+            base_version = base["version"]
+            external = False
+        elif previous.get("sha256") == sha:
+            # Crashed (or is still running) between writing the base
+            # record and swapping packs.json in
+            base_version = previous["version"]
+            external = False
+        else:
+            # Edited by another tool: replay whatever we haven't compacted
+            base_version = base.get("version", 0)
+            external = True
+        
+        self._set_cache(data, signature)
+        self._snapshot_sha = sha
+        self._base_version = base_version
+        self._merged_external = external
+        self._journal_inode = None
+        self._journal_offset = 0
+    
+    def _replay(self) -> None:
+        """Apply journal records appended since the last replay."""
+        try:
+            f = open(self.journal_path, "rb")
+        except FileNotFoundError:
+            return
+        
+        with f:
+            inode = os.fstat(f.fileno()).st_ino
+            if inode != self._journal_inode:
+                self._journal_inode = inode
+                self._journal_offset = 0
+            f.seek(self._journal_offset)
+            data = f.read()
+        
+        # Stop before a trailing partial record (an append still in flight,
+        # or a crashed writer's leftovers)
+        end = data.rfind(b"\n") + 1
+        applied = False
+        for line in data[:end].splitlines():
+            if line.strip():
+                applied = self._apply_record(jsonio.loads(line)) or applied
+        self._journal_offset += end
+        
+        if applied and self._merged_external:
+            self._compactor.schedule()
+    
+    def _apply_record(self, record: dict) -> bool:
+        """
+        Apply one journal record to the cached packs.
+        
+        Returns:
+            True if the record changed the cache
+        """
+        if record["v"] <= self._base_version:
+            return False
+        
+        slug = record["slug"]
+        index = self._index.get(slug)
+        try:
+            if index is None:
+                raise ValueError(f"pack '{slug}' not found")
+            pack = apply_json_patch(clone_json(self._packs[index]), record["patch"])
+        except ValueError as e:
+            if not self._merged_external:
+                raise
+            print(f"⚠️  Warning: Dropping journal record v{record['v']} for '{slug}': {e}")
+            return False
+        
+        self._packs[index] = pack
+        if pack.get("slug") != slug:
+            self._set_cache(self._packs, self._signature)
+        return True
+    
+    def _refresh(self) -> None:
+        """
+        Bring the cache up to date with packs.json and the journal.
+        
+        Costs two stat() calls when nothing changed.
+        """
+        signature = self._file_signature()
+        try:
+            journal_stat = os.stat(self.journal_path)
+        except FileNotFoundError:
+            journal_stat = None
+        
+        journal_replaced = journal_stat is not None and (
+            (self._journal_inode is not None and journal_stat.st_ino != self._journal_inode)
+            or journal_stat.st_size < self._journal_offset
+        )
+        if signature != self._signature or journal_replaced:
+            self._load_snapshot()
+        elif journal_stat is None or journal_stat.st_size == self._journal_offset:
+            return
+        
+        self._replay()
+    
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    
+    def _make_record(self, fd: int, slug: str, old_pack: dict, new_pack: dict) -> Optional[bytes]:
+        """
+        Build the journal line for the change from old_pack to new_pack.
+        
+        Bumps the version; caller must hold the exclusive lock.
+        
+        Returns:
+            Encoded journal line, or None if the pack didn't change
+        """
+        patch = make_json_patch(old_pack, new_pack)
+        if not patch:
+            return None
+        
+        version = self._bump_version(fd)
+        record = {
+            "v": version,
+            "slug": slug,
+            "ts": datetime.utcnow().isoformat() + "Z",
+            "patch": patch,
+        }
+        return (jsonio.dumps(record) + "\n").encode("utf-8")
+    
+    def _write_records(self, data: bytes) -> None:
+        """
+        Append journal lines with a single write and fsync.
+        
+        Caller must hold the exclusive lock and have just refreshed.
+        """
+        journal_fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(journal_fd, view):]
+            os.fsync(journal_fd)
+            stat = os.fstat(journal_fd)
+        finally:
+            os.close(journal_fd)
+        
+        # Everything before our records was replayed by the caller's refresh
+        self._journal_inode = stat.st_ino
+        self._journal_offset = stat.st_size
+    
+    def _append(self, fd: int, slug: str, old_pack: dict, new_pack: dict) -> bool:
+        """
+        Journal the change from old_pack to new_pack and bump the version.
+        
+        Caller must hold the exclusive lock and have just refreshed.
+        
+        Returns:
+            False if the pack didn't change (nothing is written)
+        """
+        self._recover_journal()
+        line = self._make_record(fd, slug, old_pack, new_pack)
+        if line is None:
+            return False
+        
+        self._write_records(line)
+        return True
+    
+    def _write_snapshot(self, packs: list[dict], version: int) -> None:
+        """
+        Publish packs as the new snapshot and start an empty journal.
+        
+        Caller must hold the exclusive lock. packs becomes the cached list.
+        """
+        text = render_packs_json(render_pack_doc(pack) for pack in packs)
+        sha = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        
+        # Order matters for crash recovery: base record, then snapshot, then
+        # journal (see _load_snapshot)
+        self._write_base(version, sha)
+        atomic_write_text(self.path, text)
+        atomic_write_text(self.journal_path, "")
+        
+        self._set_cache(packs, self._file_signature())
+        self._snapshot_sha = sha
+        self._base_version = version
+        self._merged_external = False
+        self._journal_inode = os.stat(self.journal_path).st_ino
+        self._journal_offset = 0
+    
+    def _after_append(self) -> None:
+        """Compact now if the journal is over the size threshold, else schedule it."""
+        if self._journal_offset >= self.compact_bytes:
+            self.compact()
+        else:
+            self._compactor.schedule()
+    
+    def compact(self) -> None:
+        """Fold the journal into packs.json if there is anything to fold."""
+        with self._file_lock.exclusive():
+            self._refresh()
+            if self._journal_size() == 0 and not self._merged_external:
+                return
+            self._write_snapshot(self._packs, self._read_version())
+    
+    def save_all(self, packs: list[dict]) -> None:
+        """
+        Replace the full pack list (writes a new snapshot directly).
+        
+        Args:
+            packs: List of pack dictionaries to save
+        """
+        with self._file_lock.exclusive() as fd:
+            # Load the current snapshot so the base record can point back at it
+            try:
+                self._refresh()
+            except FileNotFoundError:
+                pass
+            self._write_snapshot(clone_json(packs), self._bump_version(fd))
+    
+    def update(self, slug: str, updater_fn: Callable[[dict], dict]) -> dict:
+        """
+        Apply updater_fn to one pack and journal the change.
+        
+        Args:
+            slug: Pack slug identifier
+            updater_fn: Function that takes a pack dict and returns the updated dict
+        
+        Returns:
+            Independent copy of the updated pack dict
+        
+        Raises:
+            ValueError: If pack with slug not found
+        """
+        with self._file_lock.exclusive() as fd:
+            self._refresh()
+            index = self._index.get(slug)
+            if index is None:
+                raise ValueError(f"Pack with slug '{slug}' not found in packs.json")
+            
+            current = self._packs[index]
+            updated_pack = updater_fn(clone_json(current))
+            if self._append(fd, slug, current, updated_pack):
+                self._packs[index] = clone_json(updated_pack)
+                if updated_pack.get("slug") != slug:
+                    self._set_cache(self._packs, self._signature)
+                self._after_append()
+            
+            return clone_json(updated_pack)
+    
+    def update_many(self, updaters: PackUpdaters) -> BatchUpdateResult:
+        """
+        Apply updaters to several packs and journal them in one append.
+        
+        Each changed pack still gets its own journal record and version, but
+        the batch is written with a single write and fsync. Failing packs are
+        reported per slug and left untouched (see PackStore.update_many).
+        
+        Args:
+            updaters: slug -> updater mapping or (slug, updater) pairs
+        
+        Returns:
+            BatchUpdateResult with the updated packs and per-slug errors
+        """
+        result = BatchUpdateResult()
+        with self._file_lock.exclusive() as fd:
+            self._refresh()
+            self._recover_journal()
+            packs = list(self._packs)
+            lines = []
+            for slug, updater_fns in group_updaters(updaters).items():
+                index = self._index.get(slug)
+                if index is None:
+                    result.errors[slug] = ValueError(f"Pack with slug '{slug}' not found in packs.json")
+                    continue
+                
+                current = packs[index]
+                try:
+                    updated_pack = apply_updaters(clone_json(current), updater_fns)
+                    line = self._make_record(fd, slug, current, updated_pack)
+                except Exception as e:
+                    result.errors[slug] = e
+                    continue
+                
+                if line is not None:
+                    lines.append(line)
+                    packs[index] = clone_json(updated_pack)
+                result.updated[slug] = clone_json(updated_pack)
+            
+            if lines:
+                self._write_records(b"".join(lines))
+                self._set_cache(packs, self._signature)
+                self._after_append()
+        
+        return result
+    
+    def _commit_if_unchanged(self, slug: str, base_pack: dict, updated_pack: dict) -> bool:
+        """Journal a pack change under the lock if the pack still equals base_pack."""
+        with self._file_lock.exclusive() as fd:
+            self._refresh()
+            index = self._index.get(slug)
+            if index is None:
+                raise ValueError(f"Pack with slug '{slug}' not found in packs.json")
+            
+            current = self._packs[index]
+            if current != base_pack:
+                return False
+            
+            if self._append(fd, slug, current, updated_pack):
+                self._packs[index] = clone_json(updated_pack)
+                if updated_pack.get("slug") != slug:
+                    self._set_cache(self._packs, self._signature)
+                self._after_append()
+            return True
+    
+    def watch_paths(self) -> list[Path]:
+        """The packs.json snapshot plus the journal."""
+        return [self.path, self.journal_path]
+    
+    def flush(self) -> None:
+        """Compact the journal into packs.json now."""
+        self._compactor.flush()
+    
+    def close(self) -> None:
+        """Compact on clean shutdown."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.path.exists():
+            self._compactor.flush()
@@ -0,0 +1,336 @@
+"""
+JSON file pack store: in-process indexed cache over pack-crm/data/packs.json.
+
+Keeps the parsed pack list plus a slug -> index map in memory and only
+re-parses the file when its (mtime, size, inode) signature changes, so
+repeated lookups cost a stat() and a dict lookup instead of a full parse.
+
+Writes are serialized across processes with an advisory fcntl lock on a
+sidecar packs.json.lock file, which also holds a monotonically increasing
+store version that is bumped on every committed write.
+"""
+
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
+from orchestrator import jsonio
+from orchestrator.store.base import (
+    BatchUpdateResult,
+    FileLock,
+    PackStore,
+    PackUpdaters,
+    apply_updaters,
+    atomic_write_text,
+    clone_json,
+    group_updaters,
+    render_pack_doc,
+    render_packs_json,
+)
+from orchestrator.store.snapshot import FrozenDict, SnapshotCache, freeze
+
+# Width of the zero-padded version counter stored in the lock file. A fixed
+# width lets us overwrite it with a single pwrite so unlocked readers never
+# observe a truncated value.
+VERSION_WIDTH = 20
+
+
+class JsonPackStore(PackStore):
+    """
+    Process-wide cache of packs.json with slug index and stat-based invalidation.
+    
+    All reads hand out independent copies so callers can mutate what they get
+    back without corrupting the shared cache. All writes run under an
+    exclusive cross-process lock and are published with an atomic rename.
+    """
+    
+    def __init__(self, path: str | Path):
+        """
+        Initialize store for a packs.json file.
+        
+        Args:
+            path: Path to packs.json
+        """
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._file_lock = FileLock(self.lock_path)
+        self._packs: list[dict] = []
+        self._index: dict[str, int] = {}
+        self._signature: Optional[tuple[int, int, int]] = None
+        self._snapshots = SnapshotCache()
+    
+    # ------------------------------------------------------------------
+    # Versioning
+    # ------------------------------------------------------------------
+    
+    def _read_version(self) -> int:
+        """Read the store version from the lock file (0 if never written)."""
+        try:
+            with open(self.lock_path, "rb") as f:
+                raw = f.read(VERSION_WIDTH)
+        except FileNotFoundError:
+            return 0
+        
+        try:
+            return int(raw) if raw.strip() else 0
+        except ValueError:
+            return 0
+    
+    def _bump_version(self, fd: int) -> int:
+        """Increment the store version; caller must hold the exclusive lock."""
+        version = self._read_version() + 1
+        os.pwrite(fd, str(version).zfill(VERSION_WIDTH).encode("ascii"), 0)
+        return version
+    
+    @property
+    def version(self) -> int:
+        """
+        Current store version.
+        
+        Increases by one on every write committed through any JsonPackStore
+        sharing this file, in any process.
+        """
+        return self._read_version()
+    
+    # ------------------------------------------------------------------
+    # Cache management
+    # ------------------------------------------------------------------
+    
+    def _file_signature(self) -> tuple[int, int, int]:
+        """
+        Get the (mtime, size, inode) signature of the backing file.
+        
+        Raises:
+            FileNotFoundError: If packs.json doesn't exist
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Pack CRM file not found: {self.path}\n"
+                "Please ensure pack-crm/data/packs.json exists."
+            )
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    
+    def _set_cache(self, packs: list[dict], signature: tuple[int, int, int]) -> None:
+        """Replace cached packs and rebuild the slug index."""
+        index: dict[str, int] = {}
+        for i, pack in enumerate(packs):
+            slug = pack.get("slug")
+            # First occurrence wins, matching the old linear scan
+            if slug is not None and slug not in index:
+                index[slug] = i
+        
+        self._packs = packs
+        self._index = index
+        self._signature = signature
+        self._snapshots.retain(index)
+    
+    def _refresh(self) -> None:
+        """
+        Re-parse packs.json if it changed on disk since the last load.
+        
+        Raises:
+            FileNotFoundError: If packs.json doesn't exist
+            json.JSONDecodeError: If JSON is invalid
+            ValueError: If the top-level value is not a list
+        """
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+        
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = jsonio.load(f)
+        
+        if not isinstance(data, list):
+            raise ValueError(f"Expected list in packs.json, got {type(data)}")
+        
+        self._set_cache(data, signature)
+    
+    def invalidate(self) -> None:
+        """Drop the cached copy so the next read re-parses packs.json."""
+        with self._file_lock.thread_lock:
+            self._signature = None
+    
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    
+    def load_all(self) -> list[dict]:
+        """
+        Get all packs.
+        
+        Returns:
+            List of independent pack dict copies, in file order
+        """
+        with self._file_lock.thread_lock:
+            self._refresh()
+            return clone_json(self._packs)
+    
+    def get(self, slug: str) -> Optional[dict]:
+        """
+        Get a single pack by slug.
+        
+        Args:
+            slug: Pack slug identifier
+            
+        Returns:
+            Independent copy of the pack dict if found, None otherwise
+        """
+        with self._file_lock.thread_lock:
+            self._refresh()
+            index = self._index.get(slug)
+            if index is None:
+                return None
+            return clone_json(self._packs[index])
+    
+    def snapshot(self, slug: str) -> Optional[FrozenDict]:
+        """
+        Get an immutable snapshot of one pack, shared until the pack changes.
+        
+        Args:
+            slug: Pack slug identifier
+        
+        Returns:
+            FrozenDict snapshot if found, None otherwise
+        """
+        with self._file_lock.thread_lock:
+            self._refresh()
+            index = self._index.get(slug)
+            if index is None:
+                return None
+            return self._snapshots.get(slug, self._packs[index])
+    
+    def snapshot_all(self) -> list[FrozenDict]:
+        """
+        Get immutable snapshots of all packs, in file order.
+        
+        Only packs that changed since the last call are frozen again.
+        """
+        with self._file_lock.thread_lock:
+            self._refresh()
+            snapshots = []
+            for i, pack in enumerate(self._packs):
+                slug = pack.get("slug")
+                if slug is not None and self._index.get(slug) == i:
+                    snapshots.append(self._snapshots.get(slug, pack))
+                else:
+                    # Shadowed duplicate or missing slug: not cacheable by slug
+                    snapshots.append(freeze(pack))
+            return snapshots
+    
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    
+    def _commit(self, packs: list[dict], fd: int) -> int:
+        """
+        Write packs, refresh the cache and bump the version.
+        
+        Caller must hold the exclusive lock. packs becomes the cached list.
+        
+        Returns:
+            New store version
+        """
+        atomic_write_text(self.path, render_packs_json(render_pack_doc(pack) for pack in packs))
+        self._set_cache(packs, self._file_signature())
+        return self._bump_version(fd)
+    
+    def save_all(self, packs: list[dict]) -> None:
+        """
+        Write the full pack list to packs.json and refresh the cache.
+        
+        Args:
+            packs: List of pack dictionaries to save
+        """
+        with self._file_lock.exclusive() as fd:
+            # The caller keeps its list, so cache our own copy
+            self._commit(clone_json(packs), fd)
+    
+    def update(self, slug: str, updater_fn: Callable[[dict], dict]) -> dict:
+        """
+        Apply updater_fn to one pack and persist the result.
+        
+        The whole read-modify-write runs under the exclusive cross-process
+        lock, so concurrent updates from other processes are never lost.
+        
+        Args:
+            slug: Pack slug identifier
+            updater_fn: Function that takes a pack dict and returns the updated dict
+            
+        Returns:
+            Independent copy of the updated pack dict
+            
+        Raises:
+            ValueError: If pack with slug not found
+        """
+        with self._file_lock.exclusive() as fd:
+            self._refresh()
+            index = self._index.get(slug)
+            if index is None:
+                raise ValueError(f"Pack with slug '{slug}' not found in packs.json")
+            
+            # updater_fn works on a private copy, so only that pack needs
+            # copying; the rest of the cached list is reused as-is
+            updated_pack = updater_fn(clone_json(self._packs[index]))
+            
+            packs = list(self._packs)
+            packs[index] = updated_pack
+            self._commit(packs, fd)
+            
+            return clone_json(updated_pack)
+    
+    def update_many(self, updaters: PackUpdaters) -> BatchUpdateResult:
+        """
+        Apply updaters to several packs with one load and one packs.json write.
+        
+        Failing packs are reported per slug and left untouched (see
+        PackStore.update_many); the version is bumped once per batch.
+        
+        Args:
+            updaters: slug -> updater mapping or (slug, updater) pairs
+        
+        Returns:
+            BatchUpdateResult with the updated packs and per-slug errors
+        """
+        result = BatchUpdateResult()
+        with self._file_lock.exclusive() as fd:
+            self._refresh()
+            packs = list(self._packs)
+            for slug, updater_fns in group_updaters(updaters).items():
+                index = self._index.get(slug)
+                if index is None:
+                    result.errors[slug] = ValueError(f"Pack with slug '{slug}' not found in packs.json")
+                    continue
+                
+                try:
+                    updated_pack = apply_updaters(clone_json(packs[index]), updater_fns)
+                    # Fail this pack now rather than the whole write later
+                    render_pack_doc(updated_pack)
+                except Exception as e:
+                    result.errors[slug] = e
+                    continue
+                
+                packs[index] = updated_pack
+                result.updated[slug] = clone_json(updated_pack)
+            
+            if result.updated:
+                self._commit(packs, fd)
+        
+        return result
+    
+    def _commit_if_unchanged(self, slug: str, base_pack: dict, updated_pack: dict) -> bool:
+        """Replace a pack under the lock if it still equals base_pack."""
+        with self._file_lock.exclusive() as fd:
+            self._refresh()
+            index = self._index.get(slug)
+            if index is None:
+                raise ValueError(f"Pack with slug '{slug}' not found in packs.json")
+            
+            if self._packs[index] != base_pack:
+                return False
+            
+            packs = list(self._packs)
+            packs[index] = updated_pack
+            self._commit(packs, fd)
+            return True
@@ -0,0 +1,169 @@
+"""
+Minimal RFC 6902 JSON Patch support for pack documents.
+
+make_json_patch() diffs two packs into add/remove/replace operations, and
+apply_json_patch() replays them. Replaying a generated patch reproduces the
+new document exactly, including key order, so packs.json stays
+byte-compatible when it is rebuilt from a snapshot plus patches.
+"""
+
+from typing import Any
+
+from orchestrator.store.base import clone_json
+
+
+def _escape(token: str) -> str:
+    """Escape a key for use in a JSON Pointer (RFC 6901)."""
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    """Reverse _escape."""
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def json_equal(a: Any, b: Any) -> bool:
+    """
+    Compare JSON values strictly.
+    
+    Unlike ==, 1, 1.0 and True are different values here, and dicts with
+    the same items in a different order are different documents.
+    """
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(json_equal(a[key], b[key]) for key in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(json_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def _diff(old: Any, new: Any, path: str, ops: list[dict]) -> None:
+    """Append the operations turning old into new at path to ops."""
+    if json_equal(old, new):
+        return
+    
+    if isinstance(old, dict) and isinstance(new, dict):
+        common_old = [key for key in old if key in new]
+        common_new = [key for key in new if key in old]
+        added = [key for key in new if key not in old]
+        # "add" appends new keys at the end, so only patch member by member
+        # if that reproduces new's key order
+        if common_old == common_new and list(new) == common_new + added:
+            for key in old:
+                if key not in new:
+                    ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+            for key in common_new:
+                _diff(old[key], new[key], f"{path}/{_escape(key)}", ops)
+            for key in added:
+                ops.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": clone_json(new[key])})
+            return
+    
+    if isinstance(old, list) and isinstance(new, list):
+        # Appending to a list (e.g. append_unique_op) is the common case
+        if len(new) > len(old) and json_equal(old, new[: len(old)]):
+            for item in new[len(old):]:
+                ops.append({"op": "add", "path": f"{path}/-", "value": clone_json(item)})
+            return
+    
+    ops.append({"op": "replace", "path": path, "value": clone_json(new)})
+
+
+def make_json_patch(old: Any, new: Any) -> list[dict]:
+    """
+    Diff two JSON documents into an RFC 6902 patch.
+    
+    Args:
+        old: Original document
+        new: Updated document
+    
+    Returns:
+        List of patch operations (empty if the documents are identical)
+    """
+    ops: list[dict] = []
+    _diff(old, new, "", ops)
+    return ops
+
+
+def _resolve(doc: Any, path: str) -> tuple[Any, str]:
+    """
+    Walk to the parent of the location a JSON Pointer refers to.
+    
+    Returns:
+        (parent container, final unescaped token)
+    """
+    tokens = [_unescape(token) for token in path.split("/")[1:]]
+    parent = doc
+    for token in tokens[:-1]:
+        parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+    return parent, tokens[-1]
+
+
+def apply_json_patch(doc: Any, patch: list[dict]) -> Any:
+    """
+    Apply an RFC 6902 patch (add, remove, replace and test operations).
+    
+    doc is modified in place where possible; always use the return value,
+    since a patch on the root path replaces the document.
+    
+    Args:
+        doc: Document to patch
+        patch: List of patch operations
+    
+    Returns:
+        Patched document
+    
+    Raises:
+        ValueError: If an operation is unsupported or doesn't apply to doc
+    """
+    for op in patch:
+        kind = op.get("op")
+        path = op.get("path", "")
+        
+        if path == "":
+            if kind in ("add", "replace"):
+                doc = clone_json(op["value"])
+                continue
+            if kind == "test":
+                if not json_equal(doc, op["value"]):
+                    raise ValueError("JSON patch test failed at document root")
+                continue
+            raise ValueError(f"Unsupported JSON patch operation on document root: {kind}")
+        
+        try:
+            parent, token = _resolve(doc, path)
+            if isinstance(parent, list):
+                if kind == "add":
+                    index = len(parent) if token == "-" else int(token)
+                    if index > len(parent):
+                        raise IndexError(index)
+                    parent.insert(index, clone_json(op["value"]))
+                elif kind == "remove":
+                    del parent[int(token)]
+                elif kind == "replace":
+                    parent[int(token)] = clone_json(op["value"])
+                elif kind == "test":
+                    if not json_equal(parent[int(token)], op["value"]):
+                        raise ValueError(f"JSON patch test failed at {path}")
+                else:
+                    raise ValueError(f"Unsupported JSON patch operation: {kind}")
+            elif isinstance(parent, dict):
+                if kind == "add":
+                    parent[token] = clone_json(op["value"])
+                elif kind == "remove":
+                    del parent[token]
+                elif kind == "replace":
+                    if token not in parent:
+                        raise KeyError(token)
+                    parent[token] = clone_json(op["value"])
+                elif kind == "test":
+                    if not json_equal(parent[token], op["value"]):
+                        raise ValueError(f"JSON patch test failed at {path}")
+                else:
+                    raise ValueError(f"Unsupported JSON patch operation: {kind}")
+            else:
+                raise TypeError(f"cannot index into {type(parent).__name__}")
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"JSON patch operation {kind} does not apply at {path}: {e}")
+    
+    return doc
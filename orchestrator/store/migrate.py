@@ -0,0 +1,32 @@
+"""
+Copy pack lifecycles between pack store backends.
+"""
+
+from orchestrator.store.base import PackStore
+
+
+def migrate_pack_store(source: PackStore, target: PackStore) -> int:
+    """
+    Replace target's packs with source's, preserving packs.json order.
+    
+    Any pending packs.json export on target is flushed, so once this returns
+    packs.json reflects the migrated data.
+    
+    Args:
+        source: Store to read packs from
+        target: Store to write packs to
+        
+    Returns:
+        Number of packs migrated
+        
+    Raises:
+        ValueError: If the packs don't round-trip through target unchanged
+    """
+    packs = source.load_all()
+    target.save_all(packs)
+    target.flush()
+    
+    if target.load_all() != packs:
+        raise ValueError("Migrated packs differ from the source store")
+    
+    return len(packs)
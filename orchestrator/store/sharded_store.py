@@ -0,0 +1,549 @@
+"""
+Sharded pack store: one JSON file per pack plus an ordering manifest.
+
+Layout (next to packs.json by default):
+
+    pack-crm/data/packs/
+        <slug>.json          one pack, rendered exactly as in packs.json
+        _manifest.json       {"format": 1, "slugs": [...]} in packs.json order
+        .store/              lock files, the store version counter and the
+                             version / packs.json signature of the last sync
+
+A single-pack update only reads, rewrites and locks its own shard, so
+writers touching different packs never contend and write cost no longer
+grows with the size of the CRM. Adding, removing or reordering packs goes
+through save_all(), which rewrites the manifest under its own lock.
+
+pack-crm/data/packs.json stays what the TypeScript side reads and writes: a
+debounced exporter reassembles it byte-compatibly from the shards after
+writes, and, as with the SQLite backend, changes made to packs.json by other
+tools (e.g. pack-crm/src/store.ts) are imported back into the shards
+whenever the store has no unexported writes of its own.
+"""
+
+import atexit
+import os
+import re
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from orchestrator import jsonio
+from orchestrator.store.base import (
+    DebouncedExporter,
+    FileLock,
+    PackStore,
+    atomic_write_text,
+    clone_json,
+    render_pack_doc,
+    render_packs_json,
+)
+from orchestrator.store.json_store import VERSION_WIDTH
+from orchestrator.store.snapshot import FrozenDict, SnapshotCache
+
+MANIFEST_NAME = "_manifest.json"
+MANIFEST_FORMAT = 1
+
+# Slugs become file names, so only allow kebab/snake-case style names. They
+# can't start with "_" or "." and so never collide with the manifest or the
+# .store directory.
+_SLUG_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+Signature = tuple[int, int, int]
+
+
+def _signature(path: Path) -> Optional[Signature]:
+    """(mtime, size, inode) of path, or None if it doesn't exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _shard_text(pack: dict) -> str:
+    """Render a pack as its shard file contents."""
+    return render_pack_doc(pack) + "\n"
+
+
+class ShardedPackStore(PackStore):
+    """
+    Per-pack file store with per-pack locks and lazily assembled pack lists.
+    
+    Requires every pack to have a unique, filename-safe slug.
+    """
+    
+    def __init__(
+        self,
+        path: str | Path,
+        shard_dir: str | Path | None = None,
+        export_delay: float = 0.5,
+    ):
+        """
+        Initialize store.
+        
+        Args:
+            path: Path to pack-crm/data/packs.json (export target / initial import source)
+            shard_dir: Directory holding the per-pack files (default: packs/ next to packs.json)
+            export_delay: Debounce window in seconds for regenerating packs.json
+        """
+        self.path = Path(path)
+        self.shard_dir = Path(shard_dir) if shard_dir else self.path.with_name("packs")
+        self.manifest_path = self.shard_dir / MANIFEST_NAME
+        self.meta_dir = self.shard_dir / ".store"
+        self.version_path = self.meta_dir / "version"
+        # {"version": ..., "signature": ...} of packs.json as last exported or imported
+        self.sync_path = self.meta_dir / "sync.json"
+        
+        self._manifest_lock = FileLock(self.meta_dir / "manifest.lock")
+        self._version_lock = FileLock(self.version_path)
+        # Same lock file as JsonPackStore, so exports never interleave with
+        # writes from processes still on the JSON backend
+        self._export_lock = FileLock(self.path.with_name(self.path.name + ".lock"))
+        self._pack_locks: dict[str, FileLock] = {}
+        
+        # Parsed-file caches keyed by (mtime, size, inode), as in JsonPackStore
+        self._manifest_cache: Optional[tuple[Signature, list[str]]] = None
+        self._pack_cache: dict[str, tuple[Signature, dict]] = {}
+        self._sync_cache: Optional[tuple[Signature, dict]] = None
+        self._snapshots = SnapshotCache()
+        
+        self._exporter = DebouncedExporter(self.flush_export, export_delay)
+        # Set when this instance has written something packs.json doesn't
+        # reflect yet
+        self._export_pending = False
+        self._closed = False
+        
+        if self.path.exists():
+            self._ensure_initialized()
+        
+        atexit.register(self.close)
+    
+    # ------------------------------------------------------------------
+    # Paths and locks
+    # ------------------------------------------------------------------
+    
+    def _shard_path(self, slug: str) -> Path:
+        """
+        Get the shard file path for slug.
+        
+        Raises:
+            ValueError: If slug can't be used as a file name
+        """
+        if not isinstance(slug, str) or not _SLUG_PATTERN.match(slug):
+            raise ValueError(f"Pack slug {slug!r} is not valid for the sharded pack store")
+        return self.shard_dir / f"{slug}.json"
+    
+    def _pack_lock(self, slug: str) -> FileLock:
+        """Get the (process-wide) lock object for one pack."""
+        lock = self._pack_locks.get(slug)
+        if lock is None:
+            lock = self._pack_locks.setdefault(
+                slug, FileLock(self.meta_dir / "locks" / f"{slug}.lock")
+            )
+        return lock
+    
+    # ------------------------------------------------------------------
+    # Versioning
+    # ------------------------------------------------------------------
+    
+    def _read_version(self) -> int:
+        """Read the store version (0 if never written)."""
+        try:
+            with open(self.version_path, "rb") as f:
+                raw = f.read(VERSION_WIDTH)
+        except FileNotFoundError:
+            return 0
+        
+        try:
+            return int(raw) if raw.strip() else 0
+        except ValueError:
+            return 0
+    
+    def _bump_version(self) -> int:
+        """Increment the store version."""
+        with self._version_lock.exclusive() as fd:
+            version = self._read_version() + 1
+            os.pwrite(fd, str(version).zfill(VERSION_WIDTH).encode("ascii"), 0)
+            return version
+    
+    @property
+    def version(self) -> int:
+        """Current store version (increases by one per committed write)."""
+        return self._read_version()
+    
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+    
+    def _ensure_initialized(self) -> None:
+        """
+        Create the shard directory from packs.json on first use.
+        
+        Raises:
+            FileNotFoundError: If neither the manifest nor packs.json exists
+        """
+        if self._manifest_cache is not None or self.manifest_path.exists():
+            return
+        
+        with self._manifest_lock.exclusive():
+            if self.manifest_path.exists():
+                return
+            if not self.path.exists():
+                raise FileNotFoundError(
+                    f"Pack CRM file not found: {self.path}\n"
+                    "Please ensure pack-crm/data/packs.json exists."
+                )
+            
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = jsonio.load(f)
+            if not isinstance(data, list):
+                raise ValueError(f"Expected list in packs.json, got {type(data)}")
+            
+            print(f"📦 Sharding {len(data)} packs from {self.path} into {self.shard_dir}")
+            signature = self._json_signature()
+            self._replace_all(data)
+            self._write_sync(self._read_version(), signature)
+    
+    def _slugs(self) -> list[str]:
+        """Get the ordered slug list from the manifest (cached by file signature)."""
+        self._ensure_initialized()
+        
+        signature = _signature(self.manifest_path)
+        cached = self._manifest_cache
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            manifest = jsonio.load(f)
+        slugs = manifest.get("slugs", [])
+        self._manifest_cache = (signature, slugs)
+        return slugs
+    
+    def _write_manifest(self, slugs: list[str]) -> None:
+        """Write the manifest; caller must hold the manifest lock."""
+        manifest = {"format": MANIFEST_FORMAT, "slugs": slugs}
+        atomic_write_text(self.manifest_path, jsonio.dumps(manifest, indent=2) + "\n")
+        self._manifest_cache = (_signature(self.manifest_path), list(slugs))
+    
+    # ------------------------------------------------------------------
+    # Shards
+    # ------------------------------------------------------------------
+    
+    def _cached_shard(self, slug: str) -> Optional[dict]:
+        """
+        Get the cached parse of one pack's shard, or None if missing.
+        
+        Only re-parses the shard when its file signature changed. The result
+        is the cached object itself: never mutate it.
+        """
+        path = self._shard_path(slug)
+        signature = _signature(path)
+        if signature is None:
+            return None
+        
+        cached = self._pack_cache.get(slug)
+        if cached is None or cached[0] != signature:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    pack = jsonio.load(f)
+            except FileNotFoundError:
+                # Removed between the stat and the open
+                return None
+            cached = (signature, pack)
+            self._pack_cache[slug] = cached
+        
+        return cached[1]
+    
+    def _read_shard(self, slug: str) -> Optional[dict]:
+        """Get an independent copy of one pack from its shard, or None if missing."""
+        pack = self._cached_shard(slug)
+        return clone_json(pack) if pack is not None else None
+    
+    def _read_shard_text(self, slug: str) -> Optional[str]:
+        """Get the raw text of one shard, or None if missing."""
+        try:
+            with open(self._shard_path(slug), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+    
+    def _write_shard(self, slug: str, pack: dict, text: Optional[str] = None) -> None:
+        """
+        Write one pack's shard; caller must hold that pack's lock.
+        
+        pack becomes the cached copy.
+        """
+        path = self._shard_path(slug)
+        atomic_write_text(path, text if text is not None else _shard_text(pack))
+        self._pack_cache[slug] = (_signature(path), pack)
+    
+    @staticmethod
+    def _check_slug_unchanged(slug: str, pack: dict) -> None:
+        """Shards are keyed by slug, so single-pack updates can't rename a pack."""
+        if pack.get("slug") != slug:
+            raise ValueError(
+                f"Cannot change slug of pack '{slug}' to {pack.get('slug')!r} with an "
+                "update on the sharded pack store; use save_all() instead"
+            )
+    
+    def _replace_all(self, packs: list[dict]) -> None:
+        """
+        Replace the full pack list; caller must hold the manifest lock.
+        
+        Each shard is swapped atomically under its own pack lock, and only
+        shards whose contents changed are rewritten.
+        
+        Raises:
+            ValueError: If a slug is missing, invalid or duplicated
+        """
+        slugs: list[str] = []
+        seen: set[str] = set()
+        for pack in packs:
+            slug = pack.get("slug")
+            self._shard_path(slug)
+            if slug in seen:
+                raise ValueError(f"Duplicate pack slug '{slug}' is not supported by the sharded pack store")
+            seen.add(slug)
+            slugs.append(slug)
+        
+        old_slugs = set(self._slugs()) if self.manifest_path.exists() else set()
+        
+        for slug, pack in zip(slugs, packs):
+            text = _shard_text(pack)
+            with self._pack_lock(slug).exclusive():
+                if self._read_shard_text(slug) != text:
+                    self._write_shard(slug, clone_json(pack), text)
+        
+        self._write_manifest(slugs)
+        
+        for slug in old_slugs - seen:
+            with self._pack_lock(slug).exclusive():
+                try:
+                    os.remove(self._shard_path(slug))
+                except FileNotFoundError:
+                    pass
+                self._pack_cache.pop(slug, None)
+                self._snapshots.discard(slug)
+        
+        self._bump_version()
+    
+    # ------------------------------------------------------------------
+    # packs.json import / export
+    # ------------------------------------------------------------------
+    
+    def _json_signature(self) -> Optional[str]:
+        """(mtime, size, inode) of packs.json as a string, or None if missing."""
+        signature = _signature(self.path)
+        return ":".join(map(str, signature)) if signature is not None else None
+    
+    def _read_sync(self) -> Optional[dict]:
+        """Get the last sync record (cached by file signature), or None if never synced."""
+        signature = _signature(self.sync_path)
+        if signature is None:
+            return None
+        cached = self._sync_cache
+        if cached is None or cached[0] != signature:
+            with open(self.sync_path, "r", encoding="utf-8") as f:
+                cached = (signature, jsonio.load(f))
+            self._sync_cache = cached
+        return cached[1]
+    
+    def _write_sync(self, version: int, signature: Optional[str]) -> None:
+        """Record that packs.json (with signature) reflects the store at version."""
+        atomic_write_text(self.sync_path, jsonio.dumps({"version": version, "signature": signature}) + "\n")
+        self._sync_cache = None
+    
+    def _maybe_import(self) -> None:
+        """
+        Import packs.json into the shards if another tool changed it since our last sync.
+        
+        Costs two stat() calls on the fast path. If the store has writes that
+        are not exported yet, the shards win and the external change is
+        overwritten by the next export (with a warning).
+        """
+        self._ensure_initialized()
+        signature = self._json_signature()
+        if signature is None:
+            return
+        sync = self._read_sync()
+        if sync is not None and sync.get("signature") == signature:
+            return
+        
+        # Slow path: re-check under the export lock so we never mistake our
+        # own in-flight export for an external edit
+        with self._export_lock.exclusive():
+            signature = self._json_signature()
+            sync = self._read_sync()
+            if signature is None or (sync is not None and sync.get("signature") == signature):
+                return
+            
+            version = self._read_version()
+            if sync is None:
+                # Shards written before sync records existed: adopt packs.json as exported
+                self._write_sync(version, signature)
+                return
+            if sync.get("version", 0) < version:
+                print(
+                    f"⚠️  Warning: {self.path} changed externally while the sharded "
+                    "pack store has unexported writes; keeping the shard copies"
+                )
+                self._write_sync(sync.get("version", 0), signature)
+                return
+            
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = jsonio.load(f)
+            if not isinstance(data, list):
+                raise ValueError(f"Expected list in packs.json, got {type(data)}")
+            
+            print(f"📦 Importing external changes to {self.path} into {self.shard_dir}")
+            with self._manifest_lock.exclusive():
+                self._replace_all(data)
+            self._write_sync(self._read_version(), signature)
+    
+    def flush_export(self) -> None:
+        """
+        Reassemble packs.json from the shards if this store wrote since the last export.
+        
+        Output is byte-identical to json.dumps(packs, indent=2,
+        ensure_ascii=False) plus a trailing newline.
+        """
+        with self._export_lock.exclusive():
+            if not self._export_pending:
+                return
+            # Cleared before reading the shards, so a write landing mid-export
+            # schedules another one (and leaves the recorded version behind)
+            self._export_pending = False
+            version = self._read_version()
+            
+            docs = []
+            for slug in self._slugs():
+                text = self._read_shard_text(slug)
+                if text is not None:
+                    docs.append(text[:-1] if text.endswith("\n") else text)
+            
+            atomic_write_text(self.path, render_packs_json(docs))
+            self._write_sync(version, self._json_signature())
+    
+    # ------------------------------------------------------------------
+    # PackStore interface
+    # ------------------------------------------------------------------
+    
+    def iter_packs(self) -> Iterator[dict]:
+        """
+        Iterate over all packs in packs.json order, loading one shard at a time.
+        
+        Yields:
+            Independent pack dict copies
+        """
+        self._maybe_import()
+        for slug in list(self._slugs()):
+            pack = self._read_shard(slug)
+            if pack is not None:
+                yield pack
+    
+    def load_all(self) -> list[dict]:
+        """Get all packs, in packs.json order."""
+        return list(self.iter_packs())
+    
+    def get(self, slug: str) -> Optional[dict]:
+        """Get a single pack by slug (reads only its shard)."""
+        self._maybe_import()
+        try:
+            return self._read_shard(slug)
+        except ValueError:
+            # Not a valid shard name, so it can't be stored here
+            return None
+    
+    def snapshot(self, slug: str) -> Optional[FrozenDict]:
+        """Get an immutable snapshot of one pack, shared until its shard changes."""
+        self._maybe_import()
+        try:
+            pack = self._cached_shard(slug)
+        except ValueError:
+            return None
+        return self._snapshots.get(slug, pack) if pack is not None else None
+    
+    def snapshot_all(self) -> list[FrozenDict]:
+        """Get immutable snapshots of all packs, re-freezing only changed shards."""
+        self._maybe_import()
+        snapshots = []
+        for slug in list(self._slugs()):
+            pack = self._cached_shard(slug)
+            if pack is not None:
+                snapshots.append(self._snapshots.get(slug, pack))
+        return snapshots
+    
+    def save_all(self, packs: list[dict]) -> None:
+        """
+        Replace the full pack list.
+        
+        Raises:
+            ValueError: If a slug is missing, invalid or duplicated
+        """
+        with self._manifest_lock.exclusive():
+            self._replace_all(packs)
+        self._export_pending = True
+        self._exporter.schedule()
+    
+    def update(self, slug: str, updater_fn: Callable[[dict], dict]) -> dict:
+        """
+        Apply updater_fn to one pack under that pack's lock.
+        
+        Writers to other packs are not blocked.
+        
+        Raises:
+            ValueError: If pack with slug not found, or updater_fn changes the slug
+        """
+        self._maybe_import()
+        self._shard_path(slug)
+        with self._pack_lock(slug).exclusive():
+            pack = self.get(slug)
+            if pack is None:
+                raise ValueError(f"Pack with slug '{slug}' not found in packs.json")
+            
+            updated_pack = updater_fn(pack)
+            self._check_slug_unchanged(slug, updated_pack)
+            self._write_shard(slug, clone_json(updated_pack))
+            self._bump_version()
+        
+        self._export_pending = True
+        self._exporter.schedule()
+        return updated_pack
+    
+    def _commit_if_unchanged(self, slug: str, base_pack: dict, updated_pack: dict) -> bool:
+        """Replace a pack if its shard still matches base_pack."""
+        with self._pack_lock(slug).exclusive():
+            text = self._read_shard_text(slug)
+            if text is None:
+                raise ValueError(f"Pack with slug '{slug}' not found in packs.json")
+            if text != _shard_text(base_pack):
+                return False
+            
+            self._check_slug_unchanged(slug, updated_pack)
+            self._write_shard(slug, clone_json(updated_pack))
+            self._bump_version()
+        
+        self._export_pending = True
+        self._exporter.schedule()
+        return True
+    
+    def watch_paths(self) -> list[Path]:
+        """packs.json plus the shard directory (shards and manifest)."""
+        return [self.path, self.shard_dir]
+    
+    def invalidate(self) -> None:
+        """Drop cached manifest and shards so the next read goes to disk."""
+        self._manifest_cache = None
+        self._pack_cache.clear()
+        self._snapshots.clear()
+    
+    def flush(self) -> None:
+        """Export any pending changes to packs.json now."""
+        self._exporter.flush()
+    
+    def close(self) -> None:
+        """Export any pending changes."""
+        if self._closed:
+            return
+        self._closed = True
+        self._exporter.flush()
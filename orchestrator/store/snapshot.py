@@ -0,0 +1,271 @@
+"""
+Immutable pack snapshots with copy-on-write updates.
+
+freeze() turns a parsed pack into a FrozenDict whose nested dicts and lists
+are FrozenDict and FrozenList too. They subclass dict and list, so readers,
+jsonio, json and FastAPI treat them exactly like parsed JSON, but every
+mutating method raises TypeError. One snapshot can therefore be handed to
+any number of readers without copying, and none of them can change what the
+others see.
+
+Changes go through PackBuilder, which copies only the containers along the
+edited paths and shares every other subtree with the original snapshot.
+thaw() returns an independent, mutable plain-JSON copy (e.g. for updaters).
+"""
+
+from typing import Any, Mapping, Optional, Sequence
+
+from orchestrator import jsonio
+
+PackPath = Sequence[str | int]
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(
+        f"{type(self).__name__} is immutable; use PackBuilder or thaw() to change it"
+    )
+
+
+class FrozenDict(dict):
+    """Read-only dict produced by freeze()."""
+    
+    __slots__ = ()
+    
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    
+    def __copy__(self) -> "FrozenDict":
+        return self
+    
+    def __deepcopy__(self, memo: dict) -> "FrozenDict":
+        return self
+    
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list produced by freeze()."""
+    
+    __slots__ = ()
+    
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+    
+    def __copy__(self) -> "FrozenList":
+        return self
+    
+    def __deepcopy__(self, memo: dict) -> "FrozenList":
+        return self
+    
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+# Read-only views over plain dict/list storage: the fast JSON encoders can
+# serialize them directly
+jsonio.register_container_types(FrozenDict, FrozenList)
+
+
+def freeze(value: Any) -> Any:
+    """
+    Make an immutable copy of a JSON-compatible value.
+    
+    Already frozen subtrees are reused as-is, so freezing a value that is
+    mostly made of existing snapshots only copies the new parts.
+    
+    Args:
+        value: JSON-compatible value (dicts, lists, tuples and scalars)
+    
+    Returns:
+        FrozenDict / FrozenList for containers, value itself for scalars
+    """
+    kind = type(value)
+    if kind is FrozenDict or kind is FrozenList:
+        return value
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return FrozenList([freeze(item) for item in value])
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """
+    Make an independent, mutable plain-JSON copy of a (possibly frozen) value.
+    
+    Args:
+        value: JSON-compatible value
+    
+    Returns:
+        Deep copy built from plain dicts and lists
+    """
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+class PackBuilder:
+    """
+    Copy-on-write editor that produces a new snapshot from an existing one.
+    
+    Paths are sequences of dict keys and list indexes. Missing intermediate
+    dicts are created. Only the containers along edited paths are copied;
+    build() shares everything else with the base snapshot.
+    
+    Example:
+        published = (
+            PackBuilder(snapshot)
+            .set(("stages", "published", "status"), "completed")
+            .set("currentStage", "published")
+            .build()
+        )
+    """
+    
+    def __init__(self, base: Mapping):
+        """
+        Start from base (a snapshot or any pack mapping; base is never modified).
+        
+        Args:
+            base: Pack to derive the new version from
+        """
+        self._root = dict(base)
+        # Containers this builder copied and may therefore edit in place,
+        # by id (the list keeps them alive so ids stay unique)
+        self._owned_objects = [self._root]
+        self._owned = {id(self._root)}
+    
+    def _own(self, container: Any) -> Any:
+        """Shallow-copy container and remember that the copy is ours."""
+        if isinstance(container, dict):
+            copy: Any = dict(container)
+        elif isinstance(container, list):
+            copy = list(container)
+        else:
+            raise TypeError(f"cannot edit inside {type(container).__name__}")
+        self._owned_objects.append(copy)
+        self._owned.add(id(copy))
+        return copy
+    
+    def _parent(self, path: PackPath, create: bool) -> Optional[Any]:
+        """
+        Get an editable copy of the container holding path's last element.
+        
+        Returns:
+            The container, or None if it doesn't exist and create is False
+        """
+        node = self._root
+        for key in path[:-1]:
+            if isinstance(node, list):
+                child = node[key]
+            else:
+                child = node.get(key)
+                if child is None:
+                    if not create:
+                        return None
+                    child = self._own({})
+                    node[key] = child
+                    node = child
+                    continue
+            
+            if id(child) not in self._owned:
+                child = self._own(child)
+                node[key] = child
+            node = child
+        return node
+    
+    @staticmethod
+    def _path(path: PackPath | str) -> PackPath:
+        """Accept a bare key as a one-element path."""
+        if isinstance(path, str):
+            return (path,)
+        if not path:
+            raise ValueError("path must not be empty")
+        return path
+    
+    def set(self, path: PackPath | str, value: Any) -> "PackBuilder":
+        """
+        Set the value at path, creating missing parent dicts.
+        
+        Args:
+            path: Key path, e.g. ("metadata", "tests_run")
+            value: New value (frozen on build)
+        
+        Returns:
+            self, for chaining
+        """
+        path = self._path(path)
+        self._parent(path, create=True)[path[-1]] = value
+        return self
+    
+    def merge(self, path: PackPath | str, values: Mapping) -> "PackBuilder":
+        """
+        Set several keys of the dict at path (created if missing).
+        
+        Returns:
+            self, for chaining
+        """
+        path = self._path(path)
+        for key, value in values.items():
+            self.set((*path, key), value)
+        return self
+    
+    def delete(self, path: PackPath | str) -> "PackBuilder":
+        """
+        Remove the value at path (no-op if it doesn't exist).
+        
+        Returns:
+            self, for chaining
+        """
+        path = self._path(path)
+        parent = self._parent(path, create=False)
+        if isinstance(parent, dict):
+            parent.pop(path[-1], None)
+        elif isinstance(parent, list) and -len(parent) <= path[-1] < len(parent):
+            del parent[path[-1]]
+        return self
+    
+    def build(self) -> FrozenDict:
+        """
+        Produce the new snapshot (the builder stays usable afterwards).
+        
+        Returns:
+            FrozenDict sharing all unedited subtrees with the base
+        """
+        return freeze(self._root)
+
+
+class SnapshotCache:
+    """
+    Frozen copies of a store's cached packs, keyed by slug.
+    
+    An entry is reused while the store still caches the very same pack dict
+    object, so stores must replace cached packs on write rather than mutate
+    them in place (which all backends do).
+    """
+    
+    def __init__(self):
+        self._entries: dict[str, tuple[dict, FrozenDict]] = {}
+    
+    def get(self, slug: str, pack: dict) -> FrozenDict:
+        """Get the snapshot of pack, freezing it if it changed since last time."""
+        entry = self._entries.get(slug)
+        if entry is None or entry[0] is not pack:
+            entry = (pack, freeze(pack))
+            self._entries[slug] = entry
+        return entry[1]
+    
+    def discard(self, slug: str) -> None:
+        """Drop the entry for slug, if any."""
+        self._entries.pop(slug, None)
+    
+    def retain(self, slugs: Mapping | set) -> None:
+        """Drop entries for slugs that are no longer in the store."""
+        for slug in [slug for slug in self._entries if slug not in slugs]:
+            del self._entries[slug]
+    
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
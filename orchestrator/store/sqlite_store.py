@@ -0,0 +1,401 @@
+"""
+SQLite pack store: WAL-mode database as the Python-side system of record.
+
+Each pack is stored as its packs.json document text, with indexed columns for
+slug, packNumber, currentStage and metadata.updatedAt, so reads and writes
+cost O(packs touched) instead of O(whole CRM).
+
+pack-crm/data/packs.json stays the TypeScript side's source of truth: a
+debounced exporter regenerates it byte-compatibly after writes, and changes
+made to packs.json by other tools are imported back whenever the database
+has no unexported writes of its own.
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from orchestrator import jsonio
+from orchestrator.store.base import (
+    BatchUpdateResult,
+    DebouncedExporter,
+    FileLock,
+    PackStore,
+    PackUpdaters,
+    apply_updaters,
+    atomic_write_text,
+    group_updaters,
+    render_pack_doc,
+    render_packs_json,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS packs (
+    position INTEGER PRIMARY KEY,
+    slug TEXT,
+    pack_number INTEGER,
+    current_stage TEXT,
+    updated_at TEXT,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_packs_slug ON packs (slug);
+CREATE INDEX IF NOT EXISTS idx_packs_pack_number ON packs (pack_number);
+CREATE INDEX IF NOT EXISTS idx_packs_current_stage ON packs (current_stage);
+CREATE INDEX IF NOT EXISTS idx_packs_updated_at ON packs (updated_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _pack_columns(pack: dict) -> tuple:
+    """Extract the indexed column values for a pack."""
+    metadata = pack.get("metadata")
+    updated_at = metadata.get("updatedAt") if isinstance(metadata, dict) else None
+    return (pack.get("slug"), pack.get("packNumber"), pack.get("currentStage"), updated_at)
+
+
+class SqlitePackStore(PackStore):
+    """
+    SQLite-backed pack store with debounced packs.json export.
+    """
+    
+    def __init__(
+        self,
+        path: str | Path,
+        db_path: str | Path | None = None,
+        export_delay: float = 0.5,
+    ):
+        """
+        Initialize store.
+        
+        Args:
+            path: Path to pack-crm/data/packs.json (export target / import source)
+            db_path: Path to the SQLite database (default: packs.sqlite3 next to packs.json)
+            export_delay: Debounce window in seconds for regenerating packs.json
+        """
+        self.path = Path(path)
+        self.db_path = Path(db_path) if db_path else self.path.with_suffix(".sqlite3")
+        # Same lock file as JsonPackStore, so exports never interleave with
+        # writes from processes still on the JSON backend
+        self._export_lock = FileLock(self.path.with_name(self.path.name + ".lock"))
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._exporter = DebouncedExporter(self.flush_export, export_delay)
+        self._closed = False
+        
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn().executescript(SCHEMA)
+        self._maybe_import()
+        
+        atexit.register(self.close)
+    
+    # ------------------------------------------------------------------
+    # Connections and transactions
+    # ------------------------------------------------------------------
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's connection (sqlite3 connections are per-thread)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: we issue BEGIN/COMMIT ourselves
+            conn = sqlite3.connect(
+                self.db_path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    @contextmanager
+    def _transaction(self, write: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Run a transaction on this thread's connection.
+        
+        Write transactions use BEGIN IMMEDIATE, which takes SQLite's write
+        lock up front and so serializes writers across processes.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    @staticmethod
+    def _get_meta(conn: sqlite3.Connection, key: str, default: str | None = None) -> str | None:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+    
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+    
+    def _bump_version(self, conn: sqlite3.Connection) -> int:
+        """Increment the store version inside a write transaction."""
+        version = int(self._get_meta(conn, "version", "0")) + 1
+        self._set_meta(conn, "version", str(version))
+        return version
+    
+    @property
+    def version(self) -> int:
+        """Current store version (increases by one per committed write)."""
+        return int(self._get_meta(self._conn(), "version", "0"))
+    
+    # ------------------------------------------------------------------
+    # packs.json import / export
+    # ------------------------------------------------------------------
+    
+    def _json_signature(self) -> Optional[str]:
+        """(mtime, size, inode) of packs.json as a string, or None if missing."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}:{stat.st_ino}"
+    
+    def _maybe_import(self) -> None:
+        """
+        Import packs.json if another tool changed it since our last sync.
+        
+        Costs one stat() on the fast path. If this store has writes that are
+        not exported yet, the database wins and the external change is
+        overwritten by the next export (with a warning).
+        """
+        signature = self._json_signature()
+        if signature is None:
+            return
+        if signature == self._get_meta(self._conn(), "json_signature"):
+            return
+        
+        # Slow path: re-check under the export lock so we never mistake our
+        # own in-flight export for an external edit
+        with self._export_lock.exclusive():
+            signature = self._json_signature()
+            with self._transaction(write=True) as conn:
+                if signature is None or signature == self._get_meta(conn, "json_signature"):
+                    return
+                
+                version = int(self._get_meta(conn, "version", "0"))
+                exported_version = int(self._get_meta(conn, "exported_version", "0"))
+                has_rows = conn.execute("SELECT 1 FROM packs LIMIT 1").fetchone() is not None
+                
+                if has_rows and exported_version < version:
+                    print(
+                        f"⚠️  Warning: {self.path} changed externally while the SQLite "
+                        "pack store has unexported writes; keeping the database copy"
+                    )
+                    self._set_meta(conn, "json_signature", signature)
+                    return
+                
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = jsonio.load(f)
+                if not isinstance(data, list):
+                    raise ValueError(f"Expected list in packs.json, got {type(data)}")
+                
+                self._replace_all(conn, data)
+                version = self._bump_version(conn)
+                self._set_meta(conn, "exported_version", str(version))
+                self._set_meta(conn, "json_signature", signature)
+    
+    def flush_export(self) -> None:
+        """
+        Regenerate packs.json from the database if it is behind.
+        
+        Output is byte-identical to json.dumps(packs, indent=2,
+        ensure_ascii=False) plus a trailing newline.
+        """
+        with self._export_lock.exclusive():
+            with self._transaction() as conn:
+                version = int(self._get_meta(conn, "version", "0"))
+                exported_version = int(self._get_meta(conn, "exported_version", "0"))
+                if exported_version >= version:
+                    return
+                docs = [row[0] for row in conn.execute("SELECT doc FROM packs ORDER BY position")]
+            
+            atomic_write_text(self.path, render_packs_json(docs))
+            
+            with self._transaction(write=True) as conn:
+                self._set_meta(conn, "exported_version", str(version))
+                self._set_meta(conn, "json_signature", self._json_signature() or "")
+    
+    # ------------------------------------------------------------------
+    # Row helpers
+    # ------------------------------------------------------------------
+    
+    def _replace_all(self, conn: sqlite3.Connection, packs: list[dict]) -> None:
+        """Replace every row with packs, preserving list order."""
+        conn.execute("DELETE FROM packs")
+        conn.executemany(
+            "INSERT INTO packs (position, slug, pack_number, current_stage, updated_at, doc) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (position, *_pack_columns(pack), render_pack_doc(pack))
+                for position, pack in enumerate(packs)
+            ],
+        )
+    
+    def _put(self, conn: sqlite3.Connection, position: int, pack: dict) -> None:
+        """Overwrite the row at position with pack."""
+        conn.execute(
+            "UPDATE packs SET slug = ?, pack_number = ?, current_stage = ?, updated_at = ?, doc = ? "
+            "WHERE position = ?",
+            (*_pack_columns(pack), render_pack_doc(pack), position),
+        )
+    
+    @staticmethod
+    def _find(conn: sqlite3.Connection, slug: str) -> Optional[tuple[int, str]]:
+        """Get (position, doc) of the first pack with slug."""
+        return conn.execute(
+            "SELECT position, doc FROM packs WHERE slug = ? ORDER BY position LIMIT 1",
+            (slug,),
+        ).fetchone()
+    
+    # ------------------------------------------------------------------
+    # PackStore interface
+    # ------------------------------------------------------------------
+    
+    def load_all(self) -> list[dict]:
+        """Get all packs, in packs.json order."""
+        self._maybe_import()
+        rows = self._conn().execute("SELECT doc FROM packs ORDER BY position")
+        return [jsonio.loads(row[0]) for row in rows]
+    
+    def get(self, slug: str) -> Optional[dict]:
+        """Get a single pack by slug (indexed lookup)."""
+        self._maybe_import()
+        row = self._find(self._conn(), slug)
+        return jsonio.loads(row[1]) if row else None
+    
+    def list_by_stage(self, stage: str) -> list[dict]:
+        """Get all packs whose currentStage equals stage (indexed lookup)."""
+        self._maybe_import()
+        rows = self._conn().execute(
+            "SELECT doc FROM packs WHERE current_stage = ? ORDER BY position",
+            (stage,),
+        )
+        return [jsonio.loads(row[0]) for row in rows]
+    
+    def save_all(self, packs: list[dict]) -> None:
+        """Replace the full pack list."""
+        with self._transaction(write=True) as conn:
+            self._replace_all(conn, packs)
+            self._bump_version(conn)
+        self._exporter.schedule()
+    
+    def update(self, slug: str, updater_fn: Callable[[dict], dict]) -> dict:
+        """
+        Apply updater_fn to one pack inside a write transaction.
+        
+        Raises:
+            ValueError: If pack with slug not found
+        """
+        self._maybe_import()
+        with self._transaction(write=True) as conn:
+            row = self._find(conn, slug)
+            if row is None:
+                raise ValueError(f"Pack with slug '{slug}' not found in packs.json")
+            
+            position, doc = row
+            updated_pack = updater_fn(jsonio.loads(doc))
+            self._put(conn, position, updated_pack)
+            self._bump_version(conn)
+        
+        self._exporter.schedule()
+        return updated_pack
+    
+    def update_many(self, updaters: PackUpdaters) -> BatchUpdateResult:
+        """
+        Apply updaters to several packs inside one write transaction.
+        
+        Failing packs are reported per slug and left untouched (see
+        PackStore.update_many); the version is bumped once per batch.
+        
+        Args:
+            updaters: slug -> updater mapping or (slug, updater) pairs
+        
+        Returns:
+            BatchUpdateResult with the updated packs and per-slug errors
+        """
+        self._maybe_import()
+        result = BatchUpdateResult()
+        with self._transaction(write=True) as conn:
+            for slug, updater_fns in group_updaters(updaters).items():
+                row = self._find(conn, slug)
+                if row is None:
+                    result.errors[slug] = ValueError(f"Pack with slug '{slug}' not found in packs.json")
+                    continue
+                
+                position, doc = row
+                try:
+                    updated_pack = apply_updaters(jsonio.loads(doc), updater_fns)
+                    # Rendering happens before the UPDATE runs, so a pack that
+                    # can't be serialized fails on its own
+                    self._put(conn, position, updated_pack)
+                except Exception as e:
+                    result.errors[slug] = e
+                    continue
+                
+                result.updated[slug] = updated_pack
+            
+            if result.updated:
+                self._bump_version(conn)
+        
+        if result.updated:
+            self._exporter.schedule()
+        return result
+    
+    def _commit_if_unchanged(self, slug: str, base_pack: dict, updated_pack: dict) -> bool:
+        """Replace a pack if its stored document still matches base_pack."""
+        with self._transaction(write=True) as conn:
+            row = self._find(conn, slug)
+            if row is None:
+                raise ValueError(f"Pack with slug '{slug}' not found in packs.json")
+            
+            position, doc = row
+            if doc != render_pack_doc(base_pack):
+                return False
+            
+            self._put(conn, position, updated_pack)
+            self._bump_version(conn)
+        
+        self._exporter.schedule()
+        return True
+    
+    def watch_paths(self) -> list[Path]:
+        """packs.json plus the database and its write-ahead log."""
+        return [self.path, self.db_path, self.db_path.with_name(self.db_path.name + "-wal")]
+    
+    def flush(self) -> None:
+        """Export any pending changes to packs.json now."""
+        self._exporter.flush()
+    
+    def close(self) -> None:
+        """Export any pending changes and close connections."""
+        if self._closed:
+            return
+        self._exporter.flush()
+        self._closed = True
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.ProgrammingError:
+                    # Connection belongs to another (possibly finished) thread
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
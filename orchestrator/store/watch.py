@@ -0,0 +1,434 @@
+"""
+Change feed for the pack store.
+
+PackWatcher follows the files behind a pack store (packs.json plus whatever
+the backend keeps next to it, see PackStore.watch_paths), reloads the pack
+list whenever one of them changes and diffs it against the previous list to
+publish per-slug "created", "updated" and "deleted" events. Changes are
+picked up with inotify on Linux and by polling file signatures elsewhere (or
+when PACK_WATCH_MODE=poll).
+
+Events go into a ChangeFeed: a bounded in-memory ring buffer with increasing
+sequence numbers, so API clients can ask for "everything after N" and only
+re-fetch the packs that changed.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Literal, Optional
+
+from orchestrator.store.base import PackStore
+
+WatchMode = Literal["auto", "inotify", "poll"]
+
+# inotify(7) event bits
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+# struct inotify_event header: wd, mask, cookie, len (name follows)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def diff_packs(old: list[dict], new: list[dict]) -> list[tuple[str, str]]:
+    """
+    Diff two pack lists by slug.
+    
+    Packs are compared by value; as in the store's slug index, the first
+    pack with a given slug wins and packs without a slug are ignored.
+    
+    Args:
+        old: Previous pack list
+        new: Current pack list
+    
+    Returns:
+        (slug, change type) pairs: "created" and "updated" in new's order,
+        followed by "deleted" in old's order
+    """
+    old_by_slug = _index_by_slug(old)
+    new_by_slug = _index_by_slug(new)
+    
+    changes = []
+    for slug, pack in new_by_slug.items():
+        previous = old_by_slug.get(slug)
+        if previous is None:
+            changes.append((slug, "created"))
+        elif previous != pack:
+            changes.append((slug, "updated"))
+    for slug in old_by_slug:
+        if slug not in new_by_slug:
+            changes.append((slug, "deleted"))
+    return changes
+
+
+def _index_by_slug(packs: list[dict]) -> dict[str, dict]:
+    """Map slug -> pack, first occurrence wins."""
+    index: dict[str, dict] = {}
+    for pack in packs:
+        slug = pack.get("slug")
+        if slug is not None and slug not in index:
+            index[slug] = pack
+    return index
+
+
+class ChangeFeed:
+    """
+    Bounded, thread-safe buffer of pack change events.
+    
+    Every event gets the next sequence number. Readers keep the last
+    sequence number they saw and ask for newer events; if those already fell
+    out of the buffer (or the number comes from an earlier process), they
+    are told to reset and re-fetch everything instead.
+    """
+    
+    def __init__(self, capacity: int = 1000):
+        """
+        Initialize feed.
+        
+        Args:
+            capacity: Number of most recent events to keep
+        """
+        self._events: deque[dict] = deque(maxlen=capacity)
+        self._seq = 0
+        self._cond = threading.Condition()
+    
+    @property
+    def latest(self) -> int:
+        """Sequence number of the most recent event (0 if none yet)."""
+        with self._cond:
+            return self._seq
+    
+    def publish(self, changes: list[tuple[str, str]], version: int) -> list[dict]:
+        """
+        Append events for a batch of changes and wake up waiting readers.
+        
+        Args:
+            changes: (slug, change type) pairs as returned by diff_packs
+            version: Store version the changes were observed at
+        
+        Returns:
+            The new events
+        """
+        at = datetime.utcnow().isoformat() + "Z"
+        events = []
+        with self._cond:
+            for slug, change_type in changes:
+                self._seq += 1
+                event = {
+                    "seq": self._seq,
+                    "slug": slug,
+                    "type": change_type,
+                    "version": version,
+                    "at": at,
+                }
+                self._events.append(event)
+                events.append(event)
+            self._cond.notify_all()
+        return events
+    
+    def since(self, seq: int) -> tuple[list[dict], bool]:
+        """
+        Get the events after sequence number seq.
+        
+        Args:
+            seq: Last sequence number the reader has seen
+        
+        Returns:
+            (events, reset). reset is True if events after seq are no longer
+            available, in which case the reader should re-fetch all packs and
+            continue from latest.
+        """
+        with self._cond:
+            oldest = self._events[0]["seq"] if self._events else self._seq + 1
+            if seq > self._seq or seq < oldest - 1:
+                return [], True
+            return [event for event in self._events if event["seq"] > seq], False
+    
+    def wait(self, seq: int, timeout: float) -> tuple[list[dict], bool]:
+        """
+        Like since(), but block up to timeout seconds for new events.
+        
+        Returns:
+            (events, reset), with no events if the timeout expired
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq != seq, timeout)
+            return self.since(seq)
+
+
+class _InotifySource:
+    """Blocking change source backed by inotify watches on parent directories."""
+    
+    def __init__(self, paths: list[Path]):
+        """
+        Raises:
+            OSError: If inotify is unavailable or a watch can't be added
+        """
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc not found")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+        
+        # Watched directory -> file names we care about (None: any entry)
+        directories: dict[Path, Optional[set[str]]] = {}
+        for path in paths:
+            if path.is_dir():
+                directories[path] = None
+            else:
+                names = directories.setdefault(path.parent, set())
+                if names is not None:
+                    names.add(path.name)
+        
+        self._names: dict[int, Optional[set[str]]] = {}
+        for directory, names in directories.items():
+            if not directory.is_dir():
+                continue
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                self.close()
+                raise OSError(errno, f"inotify_add_watch failed for {directory}: {os.strerror(errno)}")
+            self._names[wd] = names
+    
+    def wait(self, timeout: float) -> bool:
+        """Wait up to timeout seconds; True if a watched file changed."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+        
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        
+        changed = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            start = offset + _EVENT_HEADER.size
+            name = data[start : start + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+            offset = start + length
+            
+            if mask & IN_Q_OVERFLOW:
+                changed = True
+                continue
+            names = self._names.get(wd, set())
+            if names is None or name in names:
+                changed = True
+        return changed
+    
+    def close(self) -> None:
+        """Release the inotify descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class _PollingSource:
+    """Change source that compares (mtime, size, inode) signatures on a timer."""
+    
+    def __init__(self, paths: list[Path], interval: float):
+        self._paths = paths
+        self._interval = interval
+        self._signatures = self._scan()
+    
+    def _scan(self) -> list[Optional[tuple[int, int, int]]]:
+        """Current signature of every watched path (None if missing)."""
+        signatures = []
+        for path in self._paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                signatures.append(None)
+            else:
+                signatures.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+        return signatures
+    
+    def wait(self, timeout: float) -> bool:
+        """Wait up to timeout seconds; True if a watched path changed."""
+        deadline = time.monotonic() + timeout
+        while True:
+            signatures = self._scan()
+            if signatures != self._signatures:
+                self._signatures = signatures
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self._interval, remaining))
+    
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class PackWatcher:
+    """
+    Background thread that turns pack store file changes into change events.
+    
+    On every change it drops the store's in-process cache, reloads the pack
+    list, diffs it against the last one and publishes the differences to its
+    ChangeFeed, then calls any registered listeners with the new events.
+    Writes made through this process's store are picked up the same way as
+    writes from other processes.
+    """
+    
+    def __init__(
+        self,
+        store: PackStore,
+        feed: Optional[ChangeFeed] = None,
+        mode: WatchMode = "auto",
+        poll_interval: float = 1.0,
+        settle_delay: float = 0.05,
+    ):
+        """
+        Initialize watcher (call start() to begin watching).
+        
+        Args:
+            store: Pack store to watch
+            feed: Feed to publish to (default: a new ChangeFeed)
+            mode: "inotify", "poll", or "auto" (inotify if available, else poll)
+            poll_interval: Seconds between checks in polling mode
+            settle_delay: Quiet period that ends a burst of file events before
+                          the pack list is reloaded
+        """
+        self.store = store
+        self.feed = feed if feed is not None else ChangeFeed()
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.settle_delay = settle_delay
+        self.active_mode: Optional[str] = None
+        
+        self._listeners: list[Callable[[list[dict]], None]] = []
+        self._packs: list[dict] = []
+        self._check_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def add_listener(self, listener: Callable[[list[dict]], None]) -> None:
+        """
+        Register a callback for new events.
+        
+        Listeners run on the watcher thread with the list of new events and
+        must not block for long.
+        """
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[list[dict]], None]) -> None:
+        """Unregister a callback added with add_listener (no-op if absent)."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def _load(self) -> list[dict]:
+        """Reload the pack list from storage."""
+        self.store.invalidate()
+        try:
+            return self.store.load_all()
+        except FileNotFoundError:
+            return []
+    
+    def check(self) -> list[dict]:
+        """
+        Reload the pack list now and publish any differences.
+        
+        Returns:
+            Newly published events (empty if nothing changed)
+        """
+        with self._check_lock:
+            packs = self._load()
+            changes = diff_packs(self._packs, packs)
+            self._packs = packs
+            if not changes:
+                return []
+            events = self.feed.publish(changes, version=self.store.version)
+        
+        for listener in list(self._listeners):
+            try:
+                listener(events)
+            except Exception as e:
+                print(f"⚠️  Pack change listener failed: {e}")
+        return events
+    
+    def _open_source(self) -> _InotifySource | _PollingSource:
+        """Create the change source for the configured mode."""
+        paths = [Path(path) for path in self.store.watch_paths()]
+        if self.mode in ("auto", "inotify"):
+            try:
+                source = _InotifySource(paths)
+                self.active_mode = "inotify"
+                return source
+            except OSError as e:
+                if self.mode == "inotify":
+                    raise
+                print(f"⚠️  inotify unavailable ({e}), polling pack store every {self.poll_interval}s")
+        elif self.mode != "poll":
+            raise ValueError(f"Unknown pack watch mode: {self.mode}")
+        
+        self.active_mode = "poll"
+        return _PollingSource(paths, self.poll_interval)
+    
+    def start(self) -> None:
+        """
+        Take the initial snapshot and start the watcher thread.
+        
+        Raises:
+            OSError: If mode is "inotify" and inotify can't be used
+            ValueError: If mode is unknown
+        """
+        if self._thread is not None:
+            return
+        
+        source = self._open_source()
+        with self._check_lock:
+            self._packs = self._load()
+        
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(source,), name="pack-watcher", daemon=True
+        )
+        self._thread.start()
+    
+    def _run(self, source: _InotifySource | _PollingSource) -> None:
+        """Watcher thread: wait for changes, let bursts settle, then check."""
+        try:
+            while not self._stop.is_set():
+                if not source.wait(0.5):
+                    continue
+                # A single write touches several files (temp file, rename,
+                # lock, export); reload once after it settles
+                while not self._stop.is_set() and source.wait(self.settle_delay):
+                    pass
+                try:
+                    self.check()
+                except Exception as e:
+                    print(f"⚠️  Pack watcher could not reload packs: {e}")
+        finally:
+            source.close()
+    
+    def stop(self) -> None:
+        """Stop the watcher thread and wait for it to exit."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join(timeout=5)
+        self._thread = None
@@ -10,6 +10,7 @@ from orchestrator.telemetry.reward import (
     default_reward_config,
     compute_step_reward,
     compute_episode_reward,
+    usage_penalty,
 )
 from orchestrator.telemetry.rl_trainer import SimpleRLTrainer
 
@@ -19,6 +20,7 @@ __all__ = [
     "default_reward_config",
     "compute_step_reward",
     "compute_episode_reward",
+    "usage_penalty",
     "SimpleRLTrainer",
 ]
 
@@ -85,7 +85,9 @@ class OrchestratorLogger:
         action: "AgentAction",
         state: "TaskState",
         tokens_used: int,
-        local_reward: float
+        local_reward: float,
+        llm_usage: dict[str, Any] | None = None,
+        duration_seconds: float | None = None,
     ) -> None:
         """
         Log a step execution.
@@ -97,6 +99,9 @@ class OrchestratorLogger:
             state: State after action
             tokens_used: Tokens used in this step
             local_reward: Reward for this step
+            llm_usage: The step's LLM usage totals (calls, prompt / completion /
+                       cached / total tokens, seconds)
+            duration_seconds: Wall time of the step
         """
         # Import here to avoid circular dependency
         from orchestrator.puppeteer.actions import AgentAction
@@ -116,6 +121,8 @@ class OrchestratorLogger:
                 "tokens_used": state.tokens_used,
             },
             "tokens_used": tokens_used,
+            "llm_usage": llm_usage or {},
+            "duration_seconds": duration_seconds,
             "local_reward": local_reward,
             "timestamp": datetime.utcnow().isoformat() + "Z",
         }
@@ -160,7 +167,9 @@ class OrchestratorLogger:
             path: Path to JSONL file
             record: Record dict to append
         """
+        # stdlib default separators (", " / ": "), as the existing logs use;
+        # jsonio's compact encoders would change the line format
+        line = json.dumps(record, ensure_ascii=False) + "\n"
         with open(path, "a", encoding="utf-8") as f:
-            json.dump(record, f, ensure_ascii=False)
-            f.write("\n")
+            f.write(line)
 
@@ -4,9 +4,10 @@ Reward shaping functions for Puppeteer orchestration.
 Defines reward computation for steps and episodes to guide RL training.
 """
 
-import json
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
+from orchestrator import jsonio
 from orchestrator.puppeteer.state_adapter import TaskState
 
 
@@ -15,6 +16,11 @@ class RewardConfig:
     """Configuration for reward computation."""
     success_weight: float = 1.0
     token_penalty: float = 0.0001
+    # Share of the token penalty waived for prompt tokens OpenAI served from
+    # its prompt cache (billed at a discount), and penalty per second of LLM
+    # wall time
+    cached_token_discount: float = 0.5
+    latency_penalty: float = 0.0
     step_penalty: float = 0.01
     gate_bonus: float = 0.1
     crm_sale_bonus: float = 0.5
@@ -31,11 +37,37 @@ def default_reward_config() -> RewardConfig:
     return RewardConfig()
 
 
+def usage_penalty(tokens_used: int, llm_usage: Optional[dict], config: RewardConfig) -> float:
+    """
+    Penalty for the tokens and LLM time spent.
+    
+    Args:
+        tokens_used: Tokens used (ignored when llm_usage is given)
+        llm_usage: Real usage totals (orchestrator.llm.summarize_llm_calls), if known
+        config: Reward configuration
+    
+    Returns:
+        Penalty to subtract from the reward
+    """
+    if llm_usage is None:
+        return config.token_penalty * tokens_used
+    
+    billable_tokens = (
+        llm_usage.get("total_tokens", 0)
+        - config.cached_token_discount * llm_usage.get("cached_tokens", 0)
+    )
+    return (
+        config.token_penalty * billable_tokens
+        + config.latency_penalty * llm_usage.get("seconds", 0.0)
+    )
+
+
 def compute_step_reward(
     state_before: TaskState,
     state_after: TaskState,
     tokens_used: int,
-    config: RewardConfig
+    config: RewardConfig,
+    llm_usage: Optional[dict] = None,
 ) -> float:
     """
     Compute reward for a single step.
@@ -45,14 +77,16 @@ def compute_step_reward(
         state_after: State after action
         tokens_used: Tokens used in this step
         config: Reward configuration
+        llm_usage: The step's real LLM usage totals (tokens, cached tokens,
+                   seconds); when given, it is penalised instead of tokens_used
         
     Returns:
         Step reward (float)
     """
     reward = 0.0
     
-    # Penalty for token usage
-    reward -= config.token_penalty * tokens_used
+    # Penalty for token usage (and LLM latency)
+    reward -= usage_penalty(tokens_used, llm_usage, config)
     
     # Small penalty for each step
     reward -= config.step_penalty
@@ -91,7 +125,7 @@ def load_sales_for_pack(pack_slug: str) -> int:
     
     try:
         with open(sales_json, "r", encoding="utf-8") as f:
-            data = json.load(f)
+            data = jsonio.load(f)
         
         # Handle both {"sales": [...]} and just a list
         sales_list = data.get("sales", []) if isinstance(data, dict) else data
@@ -109,7 +143,7 @@ def load_sales_for_pack(pack_slug: str) -> int:
                     count += 1
         
         return count
-    except (json.JSONDecodeError, FileNotFoundError, KeyError, AttributeError):
+    except (jsonio.JSONDecodeError, FileNotFoundError, KeyError, AttributeError):
         # Fail gracefully - treat as 0 sales
         return 0
 
@@ -134,7 +168,7 @@ def load_pipeline_stage_for_pack(pack_slug: str) -> str | None:
     
     try:
         with open(leads_json, "r", encoding="utf-8") as f:
-            data = json.load(f)
+            data = jsonio.load(f)
         
         # Handle both {"leads": [...]} and just a list
         leads_list = data.get("leads", []) if isinstance(data, dict) else data
@@ -194,7 +228,7 @@ def load_pipeline_stage_for_pack(pack_slug: str) -> str | None:
                     break
         
         return most_advanced_stage
-    except (json.JSONDecodeError, FileNotFoundError, KeyError, AttributeError):
+    except (jsonio.JSONDecodeError, FileNotFoundError, KeyError, AttributeError):
         # Fail gracefully - treat as None
         return None
 
@@ -211,6 +245,7 @@ def compute_episode_reward(
             - pack_slug: str
             - steps_taken: int
             - tokens_used: int
+            - llm_usage: dict (optional; real usage totals, penalised instead of tokens_used)
             - final_state: dict with current_stage, has_research, has_icp, gates_passed
         config: Reward configuration
         
@@ -228,7 +263,7 @@ def compute_episode_reward(
     
     # Penalties
     tokens_used = run_summary.get("tokens_used", 0)
-    reward -= config.token_penalty * tokens_used
+    reward -= usage_penalty(tokens_used, run_summary.get("llm_usage"), config)
     
     steps_taken = run_summary.get("steps_taken", 0)
     reward -= config.step_penalty * steps_taken
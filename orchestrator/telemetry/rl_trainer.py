@@ -4,9 +4,9 @@ Simple REINFORCE-style RL trainer for Puppeteer policies.
 Loads logs, computes returns, and updates policy weights.
 """
 
-import json
 from pathlib import Path
 from typing import Any
+from orchestrator import jsonio
 from orchestrator.telemetry.logger import OrchestratorLogger
 from orchestrator.telemetry.reward import compute_episode_reward, default_reward_config
 from orchestrator.puppeteer.policy_rl import RLPolicy, featurize_state, state_to_bucket_key
@@ -36,6 +36,8 @@ class StepRecord:
         self.action = data.get("action")
         self.state = data.get("state", {})
         self.tokens_used = data.get("tokens_used", 0)
+        self.llm_usage = data.get("llm_usage", {})
+        self.duration_seconds = data.get("duration_seconds")
         self.local_reward = data.get("local_reward", 0.0)
         self.timestamp = data.get("timestamp")
 
@@ -76,9 +78,9 @@ def load_run_and_step_logs(
                 line = line.strip()
                 if line:
                     try:
-                        data = json.loads(line)
+                        data = jsonio.loads(line)
                         run_records.append(RunRecord(data))
-                    except json.JSONDecodeError:
+                    except jsonio.JSONDecodeError:
                         continue
     
     # Load steps
@@ -88,9 +90,9 @@ def load_run_and_step_logs(
                 line = line.strip()
                 if line:
                     try:
-                        data = json.loads(line)
+                        data = jsonio.loads(line)
                         step_records.append(StepRecord(data))
-                    except json.JSONDecodeError:
+                    except jsonio.JSONDecodeError:
                         continue
     
     return run_records, step_records
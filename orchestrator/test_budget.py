@@ -0,0 +1,192 @@
+"""
+Tests for LLM spend budgets.
+
+Covers parsing budget files and overrides, admitting calls against the
+run / pack / day limits (as is, downgraded, with a smaller max_tokens, or
+refused), reservations for calls in flight, the shared spend ledger, and
+a dynamic run ending with stop_reason "budget_exhausted".
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.conftest import ScriptedClient, validation_reply
+from orchestrator.llm import (
+    Budget,
+    BudgetConfig,
+    BudgetExhausted,
+    CompletionResult,
+    SpendLedger,
+    estimate_prompt_tokens,
+    load_budget_config,
+    parse_budget_overrides,
+)
+
+MESSAGES = [{"role": "user", "content": "x" * 400}]  # ~107 prompt tokens
+REQUEST = {"model": "gpt-4", "messages": MESSAGES, "max_tokens": 1000}
+
+
+def test_budget_config():
+    """Budget files and overrides are parsed and validated; prices match by prefix."""
+    assert parse_budget_overrides("run.usd=2, day.tokens=500000,pack.usd=none,") == {
+        "run": {"usd": 2.0},
+        "day": {"tokens": 500000.0},
+        "pack": {"usd": None},
+    }
+    for bad in ("run=2", "week.usd=1", "run.dollars=1", "run.usd=lots"):
+        try:
+            parse_budget_overrides(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"accepted {bad!r}")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "budget.json"
+        assert not load_budget_config(path).limited
+        path.write_text(json.dumps({
+            "limits": {"run": {"usd": 5}, "day": {"tokens": 100000, "usd": None}},
+            "downgrade": {"gpt-4": "gpt-4o-mini"},
+            "prices": {"my-model": [1, 2]},
+        }), encoding="utf-8")
+        config = load_budget_config(path)
+    assert config.limited and config.limits["run"].usd == 5.0 and config.limits["day"].tokens == 100000
+    
+    # Overrides replace single limits; None removes one
+    overridden = config.with_overrides({"run": {"usd": None}, "pack": {"tokens": 10}})
+    assert overridden.limits["run"].usd is None and overridden.limits["pack"].tokens == 10
+    assert config.limits["run"].usd == 5.0
+    assert not BudgetConfig().with_overrides({"run": {"usd": None}}).limited
+    
+    assert config.price("gpt-4-0613") == (30.0, 60.0)
+    assert config.price("gpt-4o-mini-2024-07-18") == (0.15, 0.6)
+    assert config.price("my-model") == (1.0, 2.0)
+    assert config.price("unknown") == (30.0, 60.0)
+    # Cached prompt tokens are half price
+    assert abs(config.cost("gpt-4", 1000, 100, cached_tokens=1000) - 0.021) < 1e-12
+    assert estimate_prompt_tokens(MESSAGES) == 107
+
+
+def test_admit_downgrade_and_refuse():
+    """Calls run as is, downgraded, shortened or refused as the budget shrinks."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ledger = SpendLedger(Path(tmp_dir) / "ledger.jsonl")
+        config = BudgetConfig(downgrade={"gpt-4": "gpt-4o-mini"}).with_overrides({"run": {"tokens": 3000, "usd": 0.05}})
+        budget = Budget(config, ledger)
+        
+        # gpt-4: ~107 * $30/M + 1000 * $60/M = $0.063 > $0.05, so the cheaper model is used
+        admitted, reservation = budget.admit("run", "alpha", REQUEST)
+        assert admitted["model"] == "gpt-4o-mini" and admitted["max_tokens"] == 1000
+        assert REQUEST["model"] == "gpt-4"
+        # In flight, the call counts against the budget
+        assert ledger.spent("run", "alpha")["run"][0] == 1107
+        ledger.release(reservation)
+        
+        # Without a downgrade the completion is shortened to what the USD room allows
+        budget = Budget(config.with_overrides({"run": {"usd": 0.03}}), ledger)
+        admitted, reservation = budget.admit("run", "alpha", {**REQUEST, "model": "gpt-4-turbo"})
+        assert admitted["model"] == "gpt-4-turbo" and admitted["max_tokens"] == int((0.03 * 1e6 - 107 * 10) / 30)
+        ledger.release(reservation)
+        
+        # Two in-flight calls fill the token limit, so a third is refused
+        budget = Budget(BudgetConfig().with_overrides({"run": {"tokens": 2500}}), ledger)
+        first = budget.admit("run", "alpha", REQUEST)[1]
+        second = budget.admit("run", "alpha", REQUEST)[1]
+        # ...for this run only
+        admitted, other = budget.admit("other-run", "alpha", REQUEST)
+        assert admitted is REQUEST
+        ledger.release(other)
+        try:
+            budget.admit("run", "alpha", REQUEST)
+        except BudgetExhausted as e:
+            assert e.scope == "run"
+        else:
+            raise AssertionError("over-budget call was admitted")
+        
+        # Settling records real usage in the ledger, which other processes read too
+        guard = budget.guard("run", "alpha", "validation")
+        guard._reservation = first
+        entry = guard.settle("gpt-4", CompletionResult(content="x", model="gpt-4-0613", usage={
+            "prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150, "cached_tokens": 0,
+        }))
+        assert entry["usd"] == 0.006 and entry["model"] == "gpt-4-0613" and entry["node"] == "validation"
+        other_process = SpendLedger(ledger.path)
+        assert other_process.spent("run", "alpha") == {
+            "run": (150, 0.006),
+            "pack": (150, 0.006),
+            "day": (150, 0.006),
+        }
+        assert other_process.spent("other-run", "alpha")["run"] == (0, 0.0)
+        ledger.release(second)
+        assert ledger.spent("run", "alpha")["run"][0] == 150
+        
+        # A pack limit counts spend from every run on the pack
+        budget = Budget(BudgetConfig().with_overrides({"pack": {"tokens": 500}}), ledger)
+        try:
+            budget.admit("new-run", "alpha", REQUEST)
+        except BudgetExhausted as e:
+            assert e.scope == "pack"
+        else:
+            raise AssertionError("over-budget call was admitted")
+
+
+def test_dynamic_run_stops_when_budget_exhausted(monkeypatch, tmp_path, llm_backend, pack_store):
+    """Re-evaluating a pack that never passes the gate stops at the run budget, not max_steps."""
+    from orchestrator import config
+    from orchestrator.puppeteer import loop
+    from orchestrator.telemetry import OrchestratorLogger
+    
+    pack_store([{
+        "slug": "alpha",
+        "currentStage": "idea",
+        "metadata": {"regulationName": "GDPR", "targetAudience": ["Engineers"]},
+        "crm": {"ideaNotes": "notes", "icpSummary": "icp"},
+        "research": {"researchCompleted": True},
+        "stages": {},
+    }])
+    # A low-scoring validation reply, so the pack never passes the gate
+    client = llm_backend(ScriptedClient(
+        lambda request: validation_reply(20, 20, 20, "weak"),
+        usage={"prompt_tokens": 1200, "completion_tokens": 80},
+    ))
+    monkeypatch.setattr(config, "_budget_config", BudgetConfig())
+    monkeypatch.setattr(config, "_spend_ledger", SpendLedger(tmp_path / "ledger.jsonl"))
+    monkeypatch.setattr(
+        loop, "OrchestratorLogger", lambda: OrchestratorLogger(tmp_path / "runs.jsonl", tmp_path / "steps.jsonl")
+    )
+    
+    result = loop.run_dynamic_orchestration(
+        "alpha",
+        "rule",
+        max_steps=20,
+        options={"llm_cache": False, "budget": {"run": {"tokens": 3000}}},
+    )
+    # Each evaluation uses 1280 tokens: the second is shortened, the third refused
+    assert result["stop_reason"] == "budget_exhausted", result
+    assert result["budget_exhausted"]["scope"] == "run"
+    assert result["actions"] == ["EVALUATE"] * 3
+    assert "max_tokens" in client.requests[0] and len(client.requests) == 2
+    assert client.requests[1]["max_tokens"] < client.requests[0]["max_tokens"]
+    
+    entries = [json.loads(line) for line in config._spend_ledger.path.read_text(encoding="utf-8").splitlines()]
+    assert [entry["run_id"] for entry in entries] == [result["run_id"]] * 2
+    assert sum(entry["total_tokens"] for entry in entries) == 2560
+    
+    run_end = json.loads((tmp_path / "runs.jsonl").read_text(encoding="utf-8").splitlines()[-1])
+    assert run_end["metadata"]["stop_reason"] == "budget_exhausted"
+    
+    # Without a budget nothing is checked or recorded
+    result = loop.run_dynamic_orchestration("alpha", "rule", max_steps=2, options={"llm_cache": False})
+    assert result["stop_reason"] == "max_steps" and len(entries) == 2
+    assert len(config._spend_ledger.path.read_text(encoding="utf-8").splitlines()) == 2
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,52 @@
+"""
+Tests for the compiled-graph cache (orchestrator.graph.get_compiled_graph).
+
+Covers one compiled graph being shared by every run, warming it ahead of
+the first run, and recompiling only when the node set changes.
+"""
+
+import sys
+from pathlib import Path
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def test_compiled_graph_is_reused():
+    """Repeated lookups return the same compiled graph; warming an existing one is nearly free."""
+    from orchestrator.graph import get_compiled_graph, graph_nodes, warm_compiled_graph
+    
+    warm_compiled_graph()
+    app = get_compiled_graph()
+    assert get_compiled_graph() is app
+    assert warm_compiled_graph() < 0.01
+    assert set(app.get_graph().nodes) >= set(graph_nodes())
+
+
+def test_node_change_recompiles():
+    """Swapping a node function recompiles the graph with the new node; restoring it recompiles again."""
+    from orchestrator import graph
+    
+    app = graph.get_compiled_graph()
+    original = graph.validation_node
+    
+    def wrapped_validation(state):
+        return original(state)
+    
+    graph.validation_node = wrapped_validation
+    try:
+        patched = graph.get_compiled_graph()
+        assert patched is not app
+        assert graph.get_compiled_graph() is patched
+        assert graph.graph_nodes()["validation"] is wrapped_validation
+    finally:
+        graph.validation_node = original
+    restored = graph.get_compiled_graph()
+    assert restored is not patched
+    assert graph.get_compiled_graph() is restored
+
+
+if __name__ == "__main__":
+    test_compiled_graph_is_reused()
+    test_node_change_recompiles()
+    print("✅ PASS: compiled graph cache")
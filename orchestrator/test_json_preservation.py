@@ -10,7 +10,7 @@ This script:
 
 import json
 from pathlib import Path
-from orchestrator.config import load_packs_json, save_packs_json, update_pack_lifecycle
+from orchestrator.config import get_pack_store, load_packs_json, save_packs_json, update_pack_lifecycle
 
 # Path to packs.json
 PACKS_JSON_PATH = Path(__file__).resolve().parent.parent / "pack-crm" / "data" / "packs.json"
@@ -52,6 +52,8 @@ def test_json_preservation():
     
     try:
         updated_pack = update_pack_lifecycle("tax-assist", no_op_updater)
+        # Non-JSON backends export packs.json asynchronously
+        get_pack_store().flush()
         print("   ✅ update_pack_lifecycle completed")
     except Exception as e:
         print(f"   ❌ Error: {e}")
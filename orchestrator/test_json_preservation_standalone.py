@@ -5,9 +5,15 @@ This simulates what update_pack_lifecycle does and checks for preservation.
 """
 
 import json
+import sys
 from pathlib import Path
 from copy import deepcopy
 
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator import jsonio
+
 # Path to packs.json
 PACKS_JSON_PATH = Path(__file__).resolve().parent.parent / "pack-crm" / "data" / "packs.json"
 
@@ -23,7 +29,7 @@ def test_json_preservation():
     print("1. Loading original packs.json...")
     original_json_bytes = PACKS_JSON_PATH.read_bytes()
     original_json_str = original_json_bytes.decode('utf-8')
-    original_data = json.loads(original_json_str)
+    original_data = jsonio.loads(original_json_str)
     
     # Find tax-assist pack
     tax_assist_original = None
@@ -59,7 +65,7 @@ def test_json_preservation():
     packs[pack_index] = updated_pack
     
     # 5. Save back (this is what save_packs_json does)
-    updated_json_str = json.dumps(packs, indent=2, ensure_ascii=False)
+    updated_json_str = jsonio.dumps(packs, indent=2) + "\n"
     
     print("   ✅ Simulated update completed")
     print()
@@ -79,7 +85,7 @@ def test_json_preservation():
     print()
     
     # Reload to get parsed data
-    updated_data = json.loads(updated_json_str)
+    updated_data = jsonio.loads(updated_json_str)
     tax_assist_updated = updated_data[tax_assist_index]
     
     # Compare keys order
@@ -0,0 +1,128 @@
+"""
+Byte-identity tests for orchestrator.jsonio.
+
+Every available backend must produce exactly what the stdlib json calls it
+replaces produce, including for the values the fast encoders format
+differently (which must fall back to stdlib).
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator import jsonio
+
+PACKS_JSON_PATH = Path(__file__).resolve().parent.parent / "pack-crm" / "data" / "packs.json"
+
+ENCODERS = ["stdlib"] + [
+    name for name, module in (("orjson", jsonio.orjson), ("msgspec", jsonio.msgspec)) if module
+]
+DECODERS = ["stdlib"] + (["msgspec"] if jsonio.msgspec else [])
+
+TRICKY_DOCS = [
+    {},
+    [],
+    [[], {}, [{}]],
+    {"a": 1, "b": [1, 2.5, None, True, False], "c": {"d": "e"}},
+    {"unicode": "é 😀   ", "controls": "\x00\x1f\x7f\t\n\"\\/"},
+    {"floats": [0.0, -0.0, 0.1, 1e-4, 9999999999999998.0, 123456.789]},
+    {"small": 2.5e-05, "tiny": 1e-07, "big": 1e16, "huge": 1e22},
+    {"nan": float("nan"), "inf": float("inf"), "-inf": float("-inf")},
+    {"ints": [2 ** 63 - 1, -(2 ** 63), 2 ** 64 - 1, 2 ** 64, -(2 ** 63) - 1, 10 ** 30]},
+    {1: "int key", "b": "str key"},
+    {"tuple": (1, 2, (3,))},
+    {"surrogate": "\ud800"},
+]
+
+
+def _with_backend(name: str, fn):
+    """Run fn with jsonio's encoder (and decoder, if it has one) forced to name."""
+    previous = (jsonio.ENCODER, jsonio.DECODER)
+    jsonio.ENCODER = name
+    jsonio.DECODER = name if name in DECODERS else "stdlib"
+    try:
+        return fn()
+    finally:
+        jsonio.ENCODER, jsonio.DECODER = previous
+
+
+def test_encoding_is_byte_identical_to_stdlib():
+    """dumps matches the documented stdlib call on every backend."""
+    docs = TRICKY_DOCS + [json.loads(PACKS_JSON_PATH.read_text(encoding="utf-8"))]
+    for backend in ENCODERS:
+        for doc in docs:
+            pretty = json.dumps(doc, indent=2, ensure_ascii=False)
+            compact = json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+            assert _with_backend(backend, lambda: jsonio.dumps(doc, indent=2)) == pretty, (backend, doc)
+            assert _with_backend(backend, lambda: jsonio.dumps(doc)) == compact, (backend, doc)
+
+
+def test_packs_json_round_trip():
+    """Decoding and re-encoding packs.json reproduces the file exactly."""
+    original = PACKS_JSON_PATH.read_text(encoding="utf-8")
+    for backend in ENCODERS:
+        data = _with_backend(backend, lambda: jsonio.loads(original))
+        assert _with_backend(backend, lambda: jsonio.dumps(data, indent=2)) + "\n" == original, backend
+
+
+def test_decoding_matches_stdlib():
+    """loads accepts what json.loads accepts and returns the same values."""
+    texts = [
+        '{"a": [1, 2.5, null, true], "b": {"c": "é"}}',
+        '[NaN, Infinity, -Infinity]',
+        '{"big": 123456789012345678901234567890}',
+        '"\\ud800"',
+        '{"dup": 1, "dup": 2}',
+    ]
+    for backend in DECODERS:
+        for text in texts:
+            expected = json.loads(text)
+            decoded = _with_backend(backend, lambda: jsonio.loads(text))
+            # NaN != NaN, so compare re-encoded forms
+            assert json.dumps(decoded) == json.dumps(expected), (backend, text)
+        try:
+            _with_backend(backend, lambda: jsonio.loads("{not json"))
+        except json.JSONDecodeError:
+            pass
+        else:
+            raise AssertionError(f"{backend}: invalid JSON was accepted")
+
+
+def test_allow_nan_false_raises():
+    """allow_nan=False keeps stdlib's ValueError on every backend."""
+    for backend in ENCODERS:
+        try:
+            _with_backend(backend, lambda: jsonio.dumps({"x": float("nan")}, allow_nan=False))
+        except ValueError:
+            continue
+        raise AssertionError(f"{backend}: NaN was serialized")
+
+
+def test_jsonl_logs_keep_stdlib_format():
+    """Telemetry JSONL lines are byte-identical to json.dump(record, f, ensure_ascii=False)."""
+    import io
+    import tempfile
+    
+    from orchestrator.telemetry.logger import OrchestratorLogger
+    
+    record = {"event": "run_start", "run_id": "r1", "task": "é 😀", "metadata": {"steps": [1, 2.5, None]}}
+    expected = io.StringIO()
+    json.dump(record, expected, ensure_ascii=False)
+    for backend in ENCODERS:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "runs.jsonl"
+            logger = OrchestratorLogger(path, Path(tmp_dir) / "steps.jsonl")
+            _with_backend(backend, lambda: logger._append_jsonl(path, record))
+            assert path.read_text(encoding="utf-8") == expected.getvalue() + "\n", backend
+
+
+if __name__ == "__main__":
+    test_encoding_is_byte_identical_to_stdlib()
+    test_packs_json_round_trip()
+    test_decoding_matches_stdlib()
+    test_allow_nan_false_raises()
+    test_jsonl_logs_keep_stdlib_format()
+    print(f"✅ PASS: jsonio byte-identical on encoders: {', '.join(ENCODERS)}")
@@ -0,0 +1,199 @@
+"""
+Tests for pluggable LLM backends (orchestrator.llm.backends / orchestrator.llm.fake).
+
+Covers the backend factory, parsing latency and token count distributions,
+and the fake backend: deterministic schema-valid validation replies,
+template-shaped research reports (section by section and streamed in one
+piece), simulated latency, token usage, and Whisper transcriptions.
+"""
+
+import asyncio
+import io
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.llm import (
+    ClientRegistry,
+    Distribution,
+    FakeBackend,
+    LLMBackend,
+    make_llm_backend,
+    parse_distribution,
+    stream_chat_completion,
+)
+
+TEMPLATE = """# ChatGPT Research Template
+
+## 1. Overview
+Describe [REGULATION].
+
+## 2. Audience
+Who buys, with an example:
+```markdown
+## Not a section
+```
+
+## 3. Controls
+List the controls."""
+
+INPUTS = {
+    "packSlug": "alpha",
+    "packName": "Alpha Pack",
+    "packNumber": 1,
+    "regulationName": "GDPR",
+    "targetAudience": ["Engineering leads"],
+    "price": 4900,
+    "icpSummary": "Startups handling EU personal data",
+}
+
+PACK = {
+    "slug": "alpha",
+    "currentStage": "idea",
+    "metadata": {"regulationName": "GDPR", "targetAudience": ["Engineers"]},
+    "crm": {"ideaNotes": "notes", "icpSummary": "icp"},
+    "stages": {},
+}
+
+
+def test_factory_and_distributions():
+    """Backends are chosen by name; distributions parse and never sample below zero."""
+    assert isinstance(make_llm_backend("fake"), FakeBackend)
+    registry = make_llm_backend("openai", {"api_key": "test"})
+    assert isinstance(registry, ClientRegistry) and isinstance(registry, LLMBackend)
+    assert registry.name == "openai" and registry.rate_limiter is not None
+    try:
+        make_llm_backend("anthropic")  # type: ignore[arg-type]
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown backend accepted")
+    
+    assert parse_distribution("0.2") == Distribution("fixed", 0.2)
+    assert parse_distribution("uniform: 0.1 : 0.5") == Distribution("uniform", 0.1, 0.5)
+    assert parse_distribution("lognormal:0.8:0.5") == Distribution("lognormal", 0.8, 0.5)
+    for bad in ("uniform:1", "gamma:1:2", "fixed:fast", "normal:1:2:3"):
+        try:
+            parse_distribution(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad!r}")
+    
+    import random
+    rng = random.Random(0)
+    samples = [parse_distribution("normal:0.01:1").sample(rng) for _ in range(200)]
+    assert min(samples) == 0.0 and max(samples) > 0
+    assert all(0.1 <= Distribution("uniform", 0.1, 0.5).sample(rng) <= 0.5 for _ in range(50))
+
+
+def test_fake_validation_is_deterministic(llm_backend):
+    """Validation gets schema-valid scores, the same for the same request and seed, after the latency."""
+    from orchestrator.nodes.validation import validation_node
+    from orchestrator.state import new_run_state
+    
+    backend = llm_backend(FakeBackend(latency="fixed:0.05", seed=1))
+    runs = []
+    for _ in range(2):
+        started = time.monotonic()
+        state = validation_node(new_run_state("alpha", PACK, {"llm_cache": False}))
+        assert time.monotonic() - started >= 0.05
+        runs.append(state)
+    first, second = runs
+    assert first["scores"] == second["scores"]
+    assert set(first["scores"]) == {"viability", "data_availability", "icp_clarity"}
+    assert all(0 <= score <= 100 for score in first["scores"].values())
+    assert first["notes"]["validation_rationale"].endswith(".")
+    call = first["llm_calls"][0]
+    assert call["model"] == "gpt-4" and call["prompt_tokens"] > 0 and call["completion_tokens"] > 0
+    assert backend.calls == 2
+    
+    # Another seed gives other scores
+    llm_backend(FakeBackend(seed=2))
+    other = validation_node(new_run_state("alpha", PACK, {"llm_cache": False}))
+    assert other["scores"] != first["scores"]
+
+
+def test_fake_research_reports(tmp_path, llm_backend):
+    """Research replies follow the template: one section at a time, or the whole report streamed."""
+    from orchestrator.nodes.deep_research import (
+        SummaryScanner,
+        report_request,
+        split_template,
+        write_report,
+        write_section_report,
+    )
+    from orchestrator.state import new_run_state
+    
+    _, sections = split_template(TEMPLATE)
+    llm_backend(FakeBackend(completion_tokens="fixed:300", model_limits={"gpt-4": 2}))
+    state = new_run_state("alpha", {"slug": "alpha"}, {"llm_cache": False})
+    report_path = tmp_path / "sections.md"
+    scanner = SummaryScanner()
+    completions, summary = write_section_report(
+        state, INPUTS, "# Alpha Deep Dive", sections, report_path, scanner, concurrency=3
+    )
+    report = report_path.read_text(encoding="utf-8")
+    headings = [line for line in report.splitlines() if line.startswith("## ")]
+    assert headings == ["## 1. Overview", "## 2. Audience", "## 3. Controls", "## Executive Summary"]
+    assert all(completion.usage["completion_tokens"] == 300 for completion in completions)
+    assert scanner.finish()
+    
+    # One streamed completion for the whole template ends with an executive summary
+    state = new_run_state("alpha", {"slug": "alpha"}, {"llm_cache": False})
+    report_path = tmp_path / "single.md"
+    scanner = SummaryScanner()
+    completion = write_report(state, report_request(INPUTS, TEMPLATE, "idea"), report_path, scanner, True)
+    report = report_path.read_text(encoding="utf-8")
+    headings = [line for line in report.splitlines() if line.startswith("## ")]
+    assert headings == ["## 1. Overview", "## 2. Audience", "## 3. Controls", "## Executive Summary"]
+    assert scanner.finish() and completion.first_token_seconds is not None
+    assert completion.usage["completion_tokens"] == 300 and completion.finish_reason == "stop"
+    
+    # Streamed and plain replies match; max_tokens cuts the reply short
+    backend = FakeBackend(latency="fixed:0.04", completion_tokens="fixed:500")
+    request = {"model": "gpt-4", "messages": [{"role": "user", "content": "Tell me about GDPR."}], "max_tokens": 100}
+    plain = backend.client.chat.completions.create(**request)
+    deltas: list[str] = []
+    streamed = stream_chat_completion(backend.client, deltas.append, **request)
+    assert "".join(deltas) == plain.choices[0].message.content
+    assert streamed.finish_reason == plain.choices[0].finish_reason == "length"
+    assert streamed.usage == {"prompt_tokens": 11, "completion_tokens": 100, "total_tokens": 111, "cached_tokens": 0}
+    assert 0.0 < streamed.first_token_seconds < streamed.total_seconds
+
+
+def test_fake_async_client():
+    """The async client serves completions and Whisper transcriptions."""
+    backend = FakeBackend(latency="fixed:0.02")
+    request = {
+        "model": "gpt-4",
+        "messages": [{"role": "user", "content": 'Reply as {"score": <0-100 integer>}'}],
+        "response_format": {"type": "json_object"},
+    }
+    
+    async def main():
+        client = backend.async_client()
+        completion = await client.chat.completions.create(**request)
+        first = await client.audio.transcriptions.create(model="whisper-1", file=io.BytesIO(b"audio"))
+        second = await client.audio.transcriptions.create(model="whisper-1", file=io.BytesIO(b"audio"))
+        return completion, first, second
+    
+    completion, first, second = asyncio.run(main())
+    assert completion.choices[0].message.content == backend.client.chat.completions.create(
+        **request
+    ).choices[0].message.content
+    assert first.text == second.text and first.text
+    try:
+        backend.async_client()
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("async client handed out outside an event loop")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
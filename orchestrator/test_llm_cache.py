@@ -0,0 +1,133 @@
+"""
+Tests for the LLM response cache (orchestrator.llm).
+
+Covers cache keys, hit/miss behaviour of chat_completion, TTL expiry, LRU
+size eviction, and validation_node serving a repeated request from the cache
+with counts recorded in run state, plus the per-run and per-node opt-outs.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.conftest import ScriptedClient, validation_reply
+from orchestrator.llm import ResponseCache, cache_key, chat_completion
+
+REQUEST = {
+    "model": "gpt-4",
+    "messages": [{"role": "user", "content": "Rate this pack"}],
+    "temperature": 0.7,
+    "response_format": {"type": "json_object"},
+}
+
+
+def _fixed_client(content: str = "reply") -> ScriptedClient:
+    """A client answering every request with content."""
+    return ScriptedClient(lambda request: content, usage={"prompt_tokens": 12, "completion_tokens": 5})
+
+
+def test_cache_key():
+    """Keys depend on the response-determining fields only, not their order."""
+    key = cache_key(REQUEST)
+    assert key == cache_key(dict(reversed(list(REQUEST.items()))))
+    assert key == cache_key({**REQUEST, "timeout": 30})
+    assert key != cache_key({**REQUEST, "temperature": 0.2})
+    assert key != cache_key({**REQUEST, "max_tokens": 100})
+    assert key != cache_key({**REQUEST, "messages": [{"role": "user", "content": "Rate this one"}]})
+
+
+def test_chat_completion_hits_and_misses():
+    """The second identical request is served from disk without an API call."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ResponseCache(Path(tmp_dir))
+        client = _fixed_client()
+        
+        first = chat_completion(client, cache, **REQUEST)
+        second = chat_completion(client, cache, **REQUEST)
+        assert client.calls == 1
+        assert not first.cached and second.cached
+        assert second.content == "reply" and second.usage == first.usage
+        assert cache.stats() == {"hits": 1, "misses": 1}
+        
+        # A fresh cache object (another process) reads the same entry
+        assert chat_completion(client, ResponseCache(Path(tmp_dir)), **REQUEST).cached
+        
+        # No cache: always calls; empty replies are never cached
+        chat_completion(client, None, **REQUEST)
+        empty = _fixed_client("")
+        chat_completion(empty, cache, **{**REQUEST, "temperature": 0})
+        chat_completion(empty, cache, **{**REQUEST, "temperature": 0})
+        assert client.calls == 2 and empty.calls == 2
+
+
+def test_ttl_expiry():
+    """Entries past the TTL are misses and are removed."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ResponseCache(Path(tmp_dir), ttl_seconds=0.05)
+        key = cache_key(REQUEST)
+        cache.put(key, {"content": "old"})
+        assert cache.get(key) == {"content": "old"}
+        time.sleep(0.1)
+        assert cache.get(key) is None
+        assert not list(Path(tmp_dir).glob("*/*.json"))
+
+
+def test_lru_eviction():
+    """Going over max_bytes evicts the least recently used entries."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        keys = [cache_key({**REQUEST, "temperature": t}) for t in (0.1, 0.2, 0.3)]
+        probe = ResponseCache(Path(tmp_dir))
+        probe.put(keys[0], {"content": "x" * 500})
+        entry_size = next(Path(tmp_dir).glob("*/*.json")).stat().st_size
+        probe.clear()
+        
+        # Room for two entries (plus slack: timestamps vary in length), not three
+        cache = ResponseCache(Path(tmp_dir), max_bytes=entry_size * 2 + 100)
+        cache.put(keys[0], {"content": "x" * 500})
+        time.sleep(0.01)
+        cache.put(keys[1], {"content": "x" * 500})
+        time.sleep(0.01)
+        assert cache.get(keys[0]) is not None  # keys[0] is now the most recent
+        time.sleep(0.01)
+        cache.put(keys[2], {"content": "x" * 500})
+        
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+        assert len(list(Path(tmp_dir).glob("*/*.json"))) == 2
+
+
+def test_validation_node_uses_cache(llm_backend, llm_cache):
+    """validation_node reuses responses and records hits/misses in run state."""
+    from orchestrator.nodes import validation
+    from orchestrator.state import new_run_state
+    
+    pack = {"slug": "alpha", "crm": {"ideaNotes": "notes"}, "metadata": {"regulationName": "GDPR"}}
+    client = llm_backend(_fixed_client(validation_reply(80, 70, 60)))
+    
+    first = validation.validation_node(new_run_state("alpha", pack))
+    second = validation.validation_node(new_run_state("alpha", pack))
+    assert client.calls == 1
+    assert first["llm_cache"]["misses"] == 1 and first["llm_cache"]["hits"] == 0
+    assert second["llm_cache"]["hits"] == 1
+    assert second["llm_cache"]["nodes"]["validation"] == {"hits": 1, "misses": 0}
+    assert second["scores"] == first["scores"] == {
+        "viability": 80,
+        "data_availability": 70,
+        "icp_clarity": 60,
+    }
+    
+    # --no-cache and per-node opt-out both go to the API, uncounted
+    for options in ({"llm_cache": False}, {"llm_cache_skip_nodes": ["validation"]}):
+        state = validation.validation_node(new_run_state("alpha", pack, options))
+        assert state["llm_cache"]["hits"] == state["llm_cache"]["misses"] == 0
+    assert client.calls == 3
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,106 @@
+"""
+Tests for the shared OpenAI client registry (orchestrator.llm.clients).
+
+Covers parsing per-model limits, the in-flight cap holding across threads
+and async callers, and the registry's sync and async clients reusing pooled
+connections against a local fake OpenAI server.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.bench_openai_clients import REQUEST, FakeOpenAIServer
+from orchestrator.llm import ClientRegistry, ModelConcurrencyLimiter, parse_model_limits
+
+
+def test_parse_model_limits():
+    """model=N pairs, blanks ignored, bad entries rejected."""
+    assert parse_model_limits("") == {}
+    assert parse_model_limits(" gpt-4=4, whisper-1=2 ,") == {"gpt-4": 4, "whisper-1": 2}
+    for bad in ("gpt-4", "gpt-4=0", "=3", "gpt-4=x"):
+        try:
+            parse_model_limits(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad!r}")
+
+
+def test_limiter_caps_in_flight_requests():
+    """No more than the model's limit run at once, across threads and async callers."""
+    limiter = ModelConcurrencyLimiter({"gpt-4": 2}, default_limit=None)
+    peak = {"gpt-4": 0, "other": 0}
+    lock = threading.Lock()
+    
+    def call(model: str):
+        with limiter.slot(model):
+            with lock:
+                peak[model] = max(peak[model], limiter.in_flight(model))
+            time.sleep(0.05)
+    
+    threads = [threading.Thread(target=call, args=(model,)) for model in ["gpt-4"] * 6 + ["other"] * 4]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak == {"gpt-4": 2, "other": 4}
+    assert limiter.in_flight("gpt-4") == 0
+    
+    # An async caller waits for a slot held by a sync caller without blocking the loop
+    limiter = ModelConcurrencyLimiter({"whisper-1": 1})
+    limiter.acquire("whisper-1")
+    threading.Timer(0.1, limiter.release, args=("whisper-1",)).start()
+    
+    async def main():
+        ticks = 0
+        
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+        
+        ticker = asyncio.create_task(tick())
+        async with limiter.async_slot("whisper-1"):
+            assert limiter.in_flight("whisper-1") == 1
+        ticker.cancel()
+        return ticks
+    
+    assert asyncio.run(main()) >= 3
+    assert limiter.in_flight("whisper-1") == 0
+
+
+def test_registry_reuses_connections():
+    """Sequential calls through the registry share one keep-alive connection."""
+    with FakeOpenAIServer() as server:
+        registry = ClientRegistry("test", base_url=server.base_url, model_limits={"gpt-4": 1})
+        assert registry.client is registry.client
+        for _ in range(5):
+            with registry.slot("gpt-4"):
+                response = registry.client.chat.completions.create(**REQUEST)
+            assert response.choices[0].message.content == "ok"
+        assert server.requests == 5 and server.connections == 1
+        
+        async def main():
+            client = registry.async_client()
+            assert registry.async_client() is client
+            for _ in range(3):
+                async with registry.async_slot("gpt-4"):
+                    await client.chat.completions.create(**REQUEST)
+            await registry.aclose()
+        
+        asyncio.run(main())
+        assert server.requests == 8 and server.connections == 2
+        registry.close()
+
+
+if __name__ == "__main__":
+    test_parse_model_limits()
+    test_limiter_caps_in_flight_requests()
+    test_registry_reuses_connections()
+    print("✅ PASS: OpenAI client registry")
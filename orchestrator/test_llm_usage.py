@@ -0,0 +1,110 @@
+"""
+Tests for real LLM token and latency accounting.
+
+Covers extracting usage (including cached prompt tokens) from OpenAI
+responses, the per-call llm_calls records in run state, StepExecutor
+reporting the tokens a step actually used, and the reward and step log
+using those numbers.
+"""
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.conftest import ScriptedClient, validation_reply
+from orchestrator.llm import CompletionResult, record_llm_call, summarize_llm_calls, usage_dict
+
+USAGE = SimpleNamespace(
+    prompt_tokens=1200,
+    completion_tokens=80,
+    total_tokens=1280,
+    prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+)
+
+
+def test_usage_records():
+    """Calls are recorded with their usage; cache hits cost nothing."""
+    assert usage_dict(None) == {}
+    assert usage_dict(USAGE) == {
+        "prompt_tokens": 1200,
+        "completion_tokens": 80,
+        "total_tokens": 1280,
+        "cached_tokens": 1024,
+    }
+    # Older responses have no prompt_tokens_details
+    assert usage_dict(SimpleNamespace(prompt_tokens=1, completion_tokens=2, total_tokens=3))["cached_tokens"] == 0
+    
+    state: dict = {}
+    miss = CompletionResult(content="x", model="gpt-4", usage=usage_dict(USAGE), total_seconds=1.23456)
+    hit = CompletionResult(content="x", model="gpt-4", usage=usage_dict(USAGE), cached=True, total_seconds=0.001)
+    record = record_llm_call(state, "validation", miss)
+    record_llm_call(state, "validation", hit)
+    assert record["total_tokens"] == 1280 and record["cached_tokens"] == 1024 and record["seconds"] == 1.235
+    assert state["llm_calls"][1]["total_tokens"] == 0 and state["llm_calls"][1]["cached"]
+    
+    summary = summarize_llm_calls(state["llm_calls"])
+    assert summary == {
+        "calls": 2,
+        "cache_hits": 1,
+        "prompt_tokens": 1200,
+        "completion_tokens": 80,
+        "cached_tokens": 1024,
+        "total_tokens": 1280,
+        "seconds": 1.236,
+    }
+
+
+def test_executor_and_reward_use_real_usage(tmp_path, llm_backend, pack_store):
+    """EVALUATE reports the tokens OpenAI billed; reward and steps.jsonl use them."""
+    from orchestrator.puppeteer.actions import AgentAction
+    from orchestrator.puppeteer.executor import StepExecutor
+    from orchestrator.puppeteer.state_adapter import TaskState
+    from orchestrator.telemetry import OrchestratorLogger, RewardConfig, compute_step_reward
+    
+    pack = {
+        "slug": "alpha",
+        "currentStage": "idea",
+        "metadata": {"regulationName": "GDPR", "targetAudience": ["Engineers"]},
+        "crm": {"ideaNotes": "notes", "icpSummary": "icp"},
+        "stages": {},
+    }
+    pack_store([pack])
+    llm_backend(ScriptedClient(
+        lambda request: validation_reply(80, 70, 75),
+        usage={"prompt_tokens": 1200, "completion_tokens": 80, "cached_tokens": 1024},
+        model="gpt-4-0613",
+    ))
+    
+    context = {"run_id": "run", "options": {"llm_cache": False}, "llm_calls": []}
+    _, context, tokens_used = StepExecutor().execute(AgentAction.EVALUATE, pack, context)
+    assert tokens_used == 1280 and context["tokens_used"] == 1280
+    assert [call["node"] for call in context["llm_calls"]] == ["validation"]
+    assert context["llm_calls"][0]["model"] == "gpt-4-0613"
+    
+    # No LLM calls, no tokens
+    _, context, tokens_used = StepExecutor().execute(AgentAction.DESIGN_SPEC, pack, context)
+    assert tokens_used == 0 and context["tokens_used"] == 1280
+    
+    state = TaskState(run_id="run", pack_slug="alpha", current_stage="idea")
+    step_usage = summarize_llm_calls(context["llm_calls"])
+    reward_config = RewardConfig(token_penalty=0.001, step_penalty=0.0, latency_penalty=0.1)
+    estimated = compute_step_reward(state, state, 1280, reward_config)
+    real = compute_step_reward(state, state, 1280, reward_config, step_usage)
+    # Cached prompt tokens are half price; LLM time is penalised too
+    expected = -(0.001 * (1280 - 0.5 * 1024) + 0.1 * step_usage["seconds"])
+    assert abs(estimated + 1.28) < 1e-9 and abs(real - expected) < 1e-9
+    
+    logger = OrchestratorLogger(tmp_path / "runs.jsonl", tmp_path / "steps.jsonl")
+    logger.log_step("run", 0, AgentAction.EVALUATE, state, 1280, real, llm_usage=step_usage, duration_seconds=0.5)
+    record = json.loads((tmp_path / "steps.jsonl").read_text(encoding="utf-8"))
+    assert record["llm_usage"] == step_usage and record["duration_seconds"] == 0.5
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
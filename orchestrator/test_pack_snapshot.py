@@ -0,0 +1,213 @@
+"""
+Tests for immutable pack snapshots (orchestrator.store.snapshot).
+
+Covers read-only enforcement, JSON/pickle compatibility, copy-on-write
+structural sharing in PackBuilder, snapshot reuse in every pack store
+backend, and the puppeteer executor deriving new versions without touching
+the snapshot it was given.
+"""
+
+import copy
+import json
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator import jsonio
+from orchestrator.store import FrozenDict, FrozenList, PackBuilder, freeze, make_pack_store, thaw
+
+BACKENDS = ["json", "sqlite", "sharded", "journal"]
+
+PACK = {
+    "slug": "alpha",
+    "name": "Älpha",
+    "stages": {"idea": {"status": "completed"}, "research": {"status": "pending"}},
+    "crm": {"primaryPainPoints": ["slow", "manual"], "score": 0.5},
+    "metadata": {"targetAudience": ["ops"]},
+}
+
+
+def _raises(fn) -> bool:
+    """True if fn() raises TypeError."""
+    try:
+        fn()
+    except TypeError:
+        return True
+    return False
+
+
+def test_frozen_values_are_read_only():
+    """Every mutating method raises; reads and equality behave like plain JSON."""
+    snapshot = freeze(PACK)
+    assert snapshot == PACK and PACK == snapshot
+    assert isinstance(snapshot["stages"], FrozenDict)
+    assert isinstance(snapshot["crm"]["primaryPainPoints"], FrozenList)
+    
+    pains = snapshot["crm"]["primaryPainPoints"]
+    mutations = [
+        lambda: snapshot.__setitem__("name", "x"),
+        lambda: snapshot.__delitem__("name"),
+        lambda: snapshot.update(name="x"),
+        lambda: snapshot.setdefault("new", 1),
+        lambda: snapshot.pop("name"),
+        lambda: snapshot.popitem(),
+        lambda: snapshot.clear(),
+        lambda: snapshot["stages"]["idea"].__setitem__("status", "x"),
+        lambda: pains.append("x"),
+        lambda: pains.extend(["x"]),
+        lambda: pains.__setitem__(0, "x"),
+        lambda: pains.sort(),
+        lambda: pains.pop(),
+    ]
+    for mutate in mutations:
+        assert _raises(mutate)
+    assert snapshot == PACK
+    
+    # In-place operators raise too
+    def ior():
+        value = snapshot
+        value |= {"x": 1}
+    assert _raises(ior)
+    
+    # .copy() gives a shallow mutable dict; thaw() a fully independent one
+    shallow = snapshot.copy()
+    shallow["name"] = "changed"
+    assert snapshot["name"] == "Älpha"
+    thawed = thaw(snapshot)
+    thawed["stages"]["idea"]["status"] = "x"
+    assert type(thawed["stages"]) is dict and snapshot["stages"]["idea"]["status"] == "completed"
+    
+    # Formats like plain JSON values (nodes interpolate packs into prompts)
+    assert str(snapshot) == str(PACK) and f"{snapshot['crm']}" == f"{PACK['crm']}"
+    
+    # freeze() reuses frozen values, copying never duplicates them
+    assert freeze(snapshot) is snapshot
+    assert copy.deepcopy(snapshot) is snapshot
+    restored = pickle.loads(pickle.dumps(snapshot))
+    assert restored == snapshot and isinstance(restored["stages"], FrozenDict)
+
+
+def test_frozen_values_encode_like_plain_json():
+    """Snapshots serialize byte-identically with every JSON backend."""
+    snapshot = freeze(PACK)
+    configured = jsonio.ENCODER
+    try:
+        for encoder in ["stdlib"] + [name for name in ("orjson", "msgspec") if getattr(jsonio, name)]:
+            jsonio.ENCODER = encoder
+            assert jsonio.dumps(snapshot, indent=2) == json.dumps(PACK, indent=2, ensure_ascii=False)
+            assert jsonio.dumps(snapshot) == jsonio.dumps(PACK)
+    finally:
+        jsonio.ENCODER = configured
+
+
+def test_builder_shares_unchanged_subtrees():
+    """PackBuilder copies only edited paths and never touches its inputs."""
+    base = freeze(PACK)
+    updated = (
+        PackBuilder(base)
+        .set(("stages", "research", "status"), "completed")
+        .set(("deployment", "frontendDeployed"), True)
+        .merge("metadata", {"tests_run": True})
+        .delete(("crm", "score"))
+        .build()
+    )
+    
+    assert base == PACK
+    assert updated["stages"]["research"] == {"status": "completed"}
+    assert updated["deployment"] == {"frontendDeployed": True}
+    assert updated["metadata"] == {"targetAudience": ["ops"], "tests_run": True}
+    assert "score" not in updated["crm"]
+    assert isinstance(updated["deployment"], FrozenDict)
+    
+    # Untouched subtrees are the very same objects
+    assert updated["stages"]["idea"] is base["stages"]["idea"]
+    assert updated["crm"]["primaryPainPoints"] is base["crm"]["primaryPainPoints"]
+    assert updated["metadata"]["targetAudience"] is base["metadata"]["targetAudience"]
+    assert updated["stages"] is not base["stages"]
+    
+    # Values handed to the builder are frozen copies, not aliases
+    notes = {"text": "hello"}
+    with_notes = PackBuilder(base).set("notes", notes).set(("notes", "extra"), 1).build()
+    assert notes == {"text": "hello"}
+    assert with_notes["notes"] == {"text": "hello", "extra": 1}
+    
+    # Plain dicts work as a base too and are left alone
+    plain = thaw(PACK)
+    PackBuilder(plain).set(("stages", "idea", "status"), "reopened").build()
+    assert plain == PACK
+
+
+def _options(backend: str, tmp: Path) -> dict:
+    """Backend options that keep all state inside the temp dir."""
+    if backend == "sqlite":
+        return {"db_path": tmp / "packs.sqlite3", "export_delay": 0.05}
+    if backend == "sharded":
+        return {"shard_dir": tmp / "packs", "export_delay": 0.05}
+    if backend == "journal":
+        return {"compact_bytes": 1 << 30, "compact_delay": 3600}
+    return {}
+
+
+def test_store_snapshots_are_shared_until_changed():
+    """Stores hand out snapshots matching get(), reusing them until a write."""
+    beta = {**thaw(PACK), "slug": "beta", "name": "Beta"}
+    for backend in BACKENDS:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp = Path(tmp_dir)
+            path = tmp / "packs.json"
+            path.write_text(json.dumps([PACK, beta], indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+            store = make_pack_store(backend, path, _options(backend, tmp))
+            
+            alpha = store.snapshot("alpha")
+            assert alpha == store.get("alpha") and isinstance(alpha, FrozenDict), backend
+            assert store.snapshot("missing") is None
+            assert [pack["slug"] for pack in store.snapshot_all()] == ["alpha", "beta"], backend
+            
+            if backend == "sqlite":
+                # No in-process cache to share from: fresh snapshot per call
+                store.close()
+                continue
+            
+            assert store.snapshot("alpha") is alpha, backend
+            assert store.snapshot_all()[0] is alpha, backend
+            
+            def rename(pack: dict) -> dict:
+                pack["name"] = "Beta 2"
+                return pack
+            store.update("beta", rename)
+            assert store.snapshot("beta")["name"] == "Beta 2", backend
+            # Packs the write didn't touch keep their snapshot
+            assert store.snapshot("alpha") is alpha, backend
+            store.close()
+
+
+def test_executor_derives_new_versions():
+    """Stub steps return new snapshots and leave the input snapshot unchanged."""
+    from orchestrator.puppeteer.actions import AgentAction
+    from orchestrator.puppeteer.executor import StepExecutor
+    
+    snapshot = freeze(PACK)
+    executor = StepExecutor()
+    context = {"run_id": "test", "tokens_used": 0}
+    
+    published, _, _ = executor.execute(AgentAction.PUBLISH, snapshot, context)
+    assert published["currentStage"] == "published"
+    assert published["stages"]["published"] == {"status": "completed"}
+    assert published["stages"]["idea"] is snapshot["stages"]["idea"]
+    assert snapshot == PACK
+    
+    unchanged, _, _ = executor.execute(AgentAction.DESIGN_SPEC, published, context)
+    assert unchanged is published
+
+
+if __name__ == "__main__":
+    test_frozen_values_are_read_only()
+    test_frozen_values_encode_like_plain_json()
+    test_builder_shares_unchanged_subtrees()
+    test_store_snapshots_are_shared_until_changed()
+    test_executor_derives_new_versions()
+    print("✅ PASS: immutable pack snapshots")
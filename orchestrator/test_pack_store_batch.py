@@ -0,0 +1,131 @@
+"""
+Tests for batch pack updates (PackStore.update_many and transaction()).
+
+Checks that a batch applies every good update, reports missing packs and
+failing updaters per slug without aborting the rest, writes packs.json once
+for the whole-file backends, and writes nothing when a transaction block
+raises. Runs against every pack store backend.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.store import make_pack_store
+
+BACKENDS = ["json", "sqlite", "sharded", "journal"]
+SLUGS = ["alpha", "beta", "gamma", "delta"]
+
+
+def _options(backend: str, tmp: Path) -> dict:
+    """Backend options that keep all state inside the temp dir."""
+    if backend == "sqlite":
+        return {"db_path": tmp / "packs.sqlite3", "export_delay": 0.05}
+    if backend == "sharded":
+        return {"shard_dir": tmp / "packs", "export_delay": 0.05}
+    if backend == "journal":
+        return {"compact_bytes": 1 << 30, "compact_delay": 3600}
+    return {}
+
+
+def _make_store(backend: str, tmp: Path):
+    """Seed packs.json with counters at zero and open a store on it."""
+    path = tmp / "packs.json"
+    initial = [{"slug": slug, "crm": {"counter": 0}, "unknownKey": [1, 2]} for slug in SLUGS]
+    path.write_text(json.dumps(initial, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return make_pack_store(backend, path, _options(backend, tmp))
+
+
+def _increment(pack: dict) -> dict:
+    """Bump the test counter, keeping all other keys intact."""
+    pack["crm"]["counter"] += 1
+    return pack
+
+
+def _explode(pack: dict) -> dict:
+    """Updater that always fails."""
+    raise RuntimeError("updater failed")
+
+
+def _counters(store) -> dict[str, int]:
+    """slug -> counter for every pack in the store."""
+    return {pack["slug"]: pack["crm"]["counter"] for pack in store.load_all()}
+
+
+def test_update_many_reports_failures_per_slug():
+    """Good updates land, bad ones are reported and leave their pack untouched."""
+    for backend in BACKENDS:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = _make_store(backend, Path(tmp_dir))
+            version = store.version
+            
+            result = store.update_many(
+                [
+                    ("alpha", _increment),
+                    ("beta", _increment),
+                    ("alpha", _increment),
+                    ("gamma", _increment),
+                    ("gamma", _explode),
+                    ("missing", _increment),
+                ]
+            )
+            
+            assert sorted(result.updated) == ["alpha", "beta"], backend
+            assert result.updated["alpha"]["crm"]["counter"] == 2, backend
+            assert sorted(result.errors) == ["gamma", "missing"], backend
+            assert isinstance(result.errors["gamma"], RuntimeError), backend
+            assert isinstance(result.errors["missing"], ValueError), backend
+            assert not result.ok
+            assert _counters(store) == {"alpha": 2, "beta": 1, "gamma": 0, "delta": 0}, backend
+            assert store.get("beta")["unknownKey"] == [1, 2], backend
+            if backend in ("json", "sqlite"):
+                # One load, one save: a single committed write for the batch
+                assert store.version == version + 1, backend
+            
+            # Returned packs are copies
+            result.updated["beta"]["crm"]["counter"] = 99
+            assert store.get("beta")["crm"]["counter"] == 1, backend
+            
+            # packs.json reflects the batch once exported
+            store.flush()
+            on_disk = json.loads((Path(tmp_dir) / "packs.json").read_text(encoding="utf-8"))
+            assert [pack["crm"]["counter"] for pack in on_disk] == [2, 1, 0, 0], backend
+            store.close()
+
+
+def test_transaction_commits_on_exit():
+    """Updates queued in a transaction are committed together, or not at all."""
+    for backend in BACKENDS:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = _make_store(backend, Path(tmp_dir))
+            
+            with store.transaction() as tx:
+                for slug in SLUGS:
+                    tx.update(slug, _increment)
+                tx.update("delta", _explode)
+                assert tx.result is None
+            
+            assert tx.result.errors.keys() == {"delta"}, backend
+            assert _counters(store) == {"alpha": 1, "beta": 1, "gamma": 1, "delta": 0}, backend
+            
+            version = store.version
+            try:
+                with store.transaction() as tx:
+                    tx.update("alpha", _increment)
+                    raise KeyError("abort")
+            except KeyError:
+                pass
+            assert tx.result is None
+            assert store.version == version, backend
+            assert _counters(store)["alpha"] == 1, backend
+            store.close()
+
+
+if __name__ == "__main__":
+    test_update_many_reports_failures_per_slug()
+    test_transaction_commits_on_exit()
+    print("✅ PASS: batch pack updates")
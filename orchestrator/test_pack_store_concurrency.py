@@ -0,0 +1,137 @@
+"""
+Stress test for cross-process pack store updates.
+
+Spawns N worker processes that all increment counters on the same pack store
+through update and compare_and_swap, then checks that no increment was lost
+and that the store version advanced once per write. Runs against every
+pack store backend.
+"""
+
+import json
+import multiprocessing
+import sys
+import tempfile
+from pathlib import Path
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.store import make_pack_store
+
+BACKENDS = ["json", "sqlite", "sharded", "journal"]
+NUM_PROCESSES = 8
+UPDATES_PER_PROCESS = 25
+SLUGS = ["alpha", "beta", "gamma"]
+
+
+def _options(backend: str, tmp: Path) -> dict:
+    """Backend options that keep all state inside the temp dir."""
+    if backend == "sqlite":
+        return {"db_path": tmp / "packs.sqlite3", "export_delay": 0.05}
+    if backend == "sharded":
+        return {"shard_dir": tmp / "packs", "export_delay": 0.05}
+    if backend == "journal":
+        return {"compact_bytes": 4096, "compact_delay": 0.05}
+    return {}
+
+
+def _write_initial(path: Path) -> list[dict]:
+    """Seed packs.json with counters at zero."""
+    initial = [
+        {"slug": slug, "name": slug.title(), "crm": {"counter": 0}, "unknownKey": [1, 2]}
+        for slug in SLUGS
+    ]
+    path.write_text(json.dumps(initial, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return initial
+
+
+def _increment(pack: dict) -> dict:
+    """Bump the test counter, keeping all other keys intact."""
+    crm = pack.get("crm", {})
+    crm["counter"] = crm.get("counter", 0) + 1
+    pack["crm"] = crm
+    return pack
+
+
+def _worker(backend: str, tmp: str, worker_index: int) -> None:
+    """Hammer the store with a mix of locked and optimistic updates."""
+    store = make_pack_store(backend, Path(tmp) / "packs.json", _options(backend, Path(tmp)))
+    for i in range(UPDATES_PER_PROCESS):
+        slug = SLUGS[(worker_index + i) % len(SLUGS)]
+        if i % 2 == 0:
+            store.update(slug, _increment)
+        else:
+            store.compare_and_swap(slug, _increment, max_retries=1000)
+    store.close()
+
+
+def test_no_lost_updates_across_processes():
+    """Concurrent updates from many processes must all be preserved."""
+    for backend in BACKENDS:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "packs.json"
+            _write_initial(path)
+            
+            # Create the store (and, for SQLite/sharded, import packs.json) up front
+            store = make_pack_store(backend, path, _options(backend, Path(tmp)))
+            base_version = store.version
+            
+            ctx = multiprocessing.get_context("spawn")
+            workers = [
+                ctx.Process(target=_worker, args=(backend, tmp, n))
+                for n in range(NUM_PROCESSES)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join(timeout=120)
+                assert worker.exitcode == 0, f"{backend}: worker exited with {worker.exitcode}"
+            
+            packs = store.load_all()
+            total = sum(pack["crm"]["counter"] for pack in packs)
+            expected = NUM_PROCESSES * UPDATES_PER_PROCESS
+            
+            assert total == expected, f"{backend}: lost updates: {total} != {expected}"
+            assert store.version == base_version + expected
+            assert [pack["slug"] for pack in packs] == SLUGS
+            assert all(pack["unknownKey"] == [1, 2] for pack in packs)
+            
+            # packs.json on disk must reflect every update too
+            store.close()
+            on_disk = json.loads(path.read_text(encoding="utf-8"))
+            assert on_disk == packs, f"{backend}: packs.json out of date"
+
+
+def test_compare_and_swap_retries_on_conflict():
+    """A concurrent write between snapshot and commit forces a retry."""
+    for backend in BACKENDS:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "packs.json"
+            _write_initial(path)
+            
+            store = make_pack_store(backend, path, _options(backend, Path(tmp)))
+            other = make_pack_store(backend, path, _options(backend, Path(tmp)))
+            base_version = store.version
+            calls = []
+            
+            def racing_updater(pack: dict) -> dict:
+                calls.append(pack["crm"]["counter"])
+                if len(calls) == 1:
+                    # Simulate another process committing in the meantime
+                    other.update("alpha", _increment)
+                return _increment(pack)
+            
+            updated = store.compare_and_swap("alpha", racing_updater)
+            
+            assert calls == [0, 1], backend
+            assert updated["crm"]["counter"] == 2
+            assert store.get("alpha")["crm"]["counter"] == 2
+            assert store.version == base_version + 2
+            store.close()
+            other.close()
+
+
+if __name__ == "__main__":
+    test_no_lost_updates_across_processes()
+    test_compare_and_swap_retries_on_conflict()
+    print("✅ PASS: no lost updates")
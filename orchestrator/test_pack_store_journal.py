@@ -0,0 +1,128 @@
+"""
+Tests for the journal pack store and its JSON Patch helpers.
+
+Covers patch round trips (including key order), recovery from a partially
+written final journal record, and crash recovery around compaction.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.store import apply_json_patch, make_json_patch, make_pack_store
+from orchestrator.store.base import clone_json
+from orchestrator.store.jsonpatch import json_equal
+
+PACKS = [
+    {"slug": "alpha", "name": "Alpha", "crm": {"counter": 0, "tags": ["a"]}, "extra": {"x/y": 1}},
+    {"slug": "beta", "name": "Beta", "crm": {"counter": 0, "tags": []}},
+]
+
+
+def _make_store(tmp: Path, **options):
+    """Seed packs.json and open a journal store that never compacts on its own."""
+    path = tmp / "packs.json"
+    if not path.exists():
+        path.write_text(json.dumps(PACKS, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    options = {"compact_bytes": 1 << 30, "compact_delay": 3600, **options}
+    return make_pack_store("journal", path, options)
+
+
+def _bump(pack: dict) -> dict:
+    """Increment the counter and tag the pack with it."""
+    pack["crm"]["counter"] += 1
+    pack["crm"]["tags"].append(f"t{pack['crm']['counter']}")
+    return pack
+
+
+def test_patch_round_trip_preserves_key_order():
+    """Applying make_json_patch(old, new) to old must reproduce new exactly."""
+    old = clone_json(PACKS[0])
+    cases = [
+        {**old, "crm": {"counter": 1, "tags": ["a", "b"]}},
+        {"name": "Alpha", "slug": "alpha", "crm": old["crm"], "extra": old["extra"]},
+        {"slug": "alpha", "crm": {"tags": ["b"], "counter": True}, "new~key": None},
+        {**old, "extra": {"x/y": 1.0}},
+    ]
+    for new in cases:
+        patched = apply_json_patch(clone_json(old), make_json_patch(old, new))
+        assert json_equal(patched, new), (new, patched)
+        assert json.dumps(patched) == json.dumps(new)
+    assert make_json_patch(old, clone_json(old)) == []
+
+
+def test_updates_are_journaled_and_compacted():
+    """Updates append records; compaction folds them into packs.json."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        store = _make_store(tmp)
+        snapshot = (tmp / "packs.json").read_bytes()
+        
+        store.update("alpha", _bump)
+        store.compare_and_swap("alpha", _bump)
+        
+        # packs.json untouched until compaction; a fresh reader still sees both
+        assert (tmp / "packs.json").read_bytes() == snapshot
+        records = store.read_journal()
+        assert [record["slug"] for record in records] == ["alpha", "alpha"]
+        assert all(op["path"].startswith("/crm/") for record in records for op in record["patch"])
+        other = _make_store(tmp)
+        assert other.get("alpha")["crm"] == {"counter": 2, "tags": ["a", "t1", "t2"]}
+        
+        store.flush()
+        assert store.read_journal() == []
+        expected = clone_json(PACKS)
+        expected[0]["crm"] = {"counter": 2, "tags": ["a", "t1", "t2"]}
+        assert (tmp / "packs.json").read_text(encoding="utf-8") == (
+            json.dumps(expected, indent=2, ensure_ascii=False) + "\n"
+        )
+        assert other.load_all() == expected
+        store.close()
+        other.close()
+
+
+def test_recovers_from_partial_final_record():
+    """A torn last line is ignored by readers and truncated by the next writer."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        store = _make_store(tmp)
+        store.update("beta", _bump)
+        journal = store.journal_path
+        with open(journal, "ab") as f:
+            f.write(b'{"v": 999, "slug": "beta", "patch": [{"op": "repl')
+        
+        # Simulated restart after the crash
+        restarted = _make_store(tmp)
+        assert restarted.get("beta")["crm"]["counter"] == 1
+        assert journal.read_bytes().endswith(b"\n")
+        restarted.update("beta", _bump)
+        assert [record["slug"] for record in restarted.read_journal()] == ["beta", "beta"]
+        assert _make_store(tmp).get("beta")["crm"]["counter"] == 2
+
+
+def test_crash_between_snapshot_and_journal_reset():
+    """Records already folded into packs.json must not be replayed twice."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        store = _make_store(tmp)
+        store.update("alpha", _bump)
+        leftover = store.journal_path.read_bytes()
+        store.flush()
+        
+        # Pretend the compactor died before it could reset the journal
+        store.journal_path.write_bytes(leftover)
+        restarted = _make_store(tmp)
+        assert restarted.get("alpha")["crm"]["counter"] == 1
+        assert restarted.get("alpha")["crm"]["tags"] == ["a", "t1"]
+
+
+if __name__ == "__main__":
+    test_patch_round_trip_preserves_key_order()
+    test_updates_are_journaled_and_compacted()
+    test_recovers_from_partial_final_record()
+    test_crash_between_snapshot_and_journal_reset()
+    print("✅ PASS: journal pack store")
@@ -0,0 +1,160 @@
+"""
+Tests for the pack change feed (orchestrator.store.watch).
+
+Covers the pack list diff, ChangeFeed cursor semantics, the watcher picking
+up writes made by another store instance (as another process would) in
+both inotify and polling mode, and the /api/packs/changes long-poll.
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.store import ChangeFeed, PackWatcher, diff_packs, make_pack_store
+
+PACKS = [
+    {"slug": "alpha", "name": "Alpha", "crm": {"counter": 0}},
+    {"slug": "beta", "name": "Beta", "crm": {"counter": 0}},
+]
+
+
+def _seed(tmp: Path) -> Path:
+    """Write the test packs.json and return its path."""
+    path = tmp / "packs.json"
+    path.write_text(json.dumps(PACKS, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return path
+
+
+def _bump(pack: dict) -> dict:
+    """Increment the pack's CRM counter."""
+    pack["crm"]["counter"] += 1
+    return pack
+
+
+def _wait_for_events(feed: ChangeFeed, since: int, count: int, timeout: float = 5.0) -> list[dict]:
+    """Collect events after since until there are at least count of them."""
+    deadline = time.monotonic() + timeout
+    events: list[dict] = []
+    while len(events) < count and time.monotonic() < deadline:
+        batch, reset = feed.wait(since, deadline - time.monotonic())
+        assert not reset
+        events.extend(batch)
+        if batch:
+            since = batch[-1]["seq"]
+    return events
+
+
+def test_diff_packs():
+    """Per-slug created/updated/deleted events, first occurrence of a slug wins."""
+    old = [PACKS[0], PACKS[1], {"slug": "alpha", "name": "shadowed"}, {"name": "no slug"}]
+    new = [
+        {"slug": "beta", "name": "Beta", "crm": {"counter": 1}},
+        {"slug": "gamma", "name": "Gamma"},
+        {"name": "still no slug"},
+    ]
+    assert diff_packs(old, new) == [("beta", "updated"), ("gamma", "created"), ("alpha", "deleted")]
+    assert diff_packs(PACKS, json.loads(json.dumps(PACKS))) == []
+
+
+def test_change_feed_cursor():
+    """Readers get events after their cursor, or a reset once they fall behind."""
+    feed = ChangeFeed(capacity=3)
+    assert feed.since(0) == ([], False)
+    
+    events = feed.publish([("alpha", "updated"), ("beta", "created")], version=7)
+    assert [(e["seq"], e["slug"], e["type"], e["version"]) for e in events] == [
+        (1, "alpha", "updated", 7),
+        (2, "beta", "created", 7),
+    ]
+    assert [e["seq"] for e in feed.since(0)[0]] == [1, 2]
+    assert feed.since(2) == ([], False)
+    # A cursor from the future (e.g. an earlier process) must resync
+    assert feed.since(9) == ([], True)
+    
+    feed.publish([("gamma", "created"), ("delta", "created")], version=8)
+    assert feed.since(0) == ([], True)
+    assert [e["slug"] for e in feed.since(1)[0]] == ["beta", "gamma", "delta"]
+    
+    # wait() returns as soon as something is published
+    threading.Timer(0.05, feed.publish, args=([("alpha", "deleted")], 9)).start()
+    started = time.monotonic()
+    events, reset = feed.wait(feed.latest, timeout=5)
+    assert not reset and [e["type"] for e in events] == ["deleted"]
+    assert time.monotonic() - started < 4
+    assert feed.wait(feed.latest, timeout=0.01) == ([], False)
+
+
+def test_watcher_sees_other_writers():
+    """Writes through another store instance show up as per-slug events."""
+    for backend, mode in [("json", "inotify"), ("json", "poll"), ("sharded", "poll"), ("journal", "auto")]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = _seed(Path(tmp_dir))
+            options = {"compact_delay": 3600} if backend == "journal" else {}
+            watched = make_pack_store(backend, path, options)
+            writer = make_pack_store(backend, path, options)
+            
+            watcher = PackWatcher(watched, mode=mode, poll_interval=0.02, settle_delay=0.02)
+            seen: list[dict] = []
+            watcher.add_listener(seen.extend)
+            watcher.start()
+            try:
+                cursor = watcher.feed.latest
+                writer.update("beta", _bump)
+                events = _wait_for_events(watcher.feed, cursor, 1)
+                assert [(e["slug"], e["type"]) for e in events] == [("beta", "updated")], (backend, mode, events)
+                
+                cursor = events[-1]["seq"]
+                packs = writer.load_all()
+                writer.save_all([packs[1], {"slug": "gamma", "name": "Gamma"}])
+                events = _wait_for_events(watcher.feed, cursor, 2)
+                assert sorted((e["slug"], e["type"]) for e in events) == [
+                    ("alpha", "deleted"),
+                    ("gamma", "created"),
+                ], (backend, mode, events)
+                assert [e["seq"] for e in seen] == list(range(1, 4))
+                # The watched store's own reads see the other writer's data
+                assert watched.get("beta")["crm"]["counter"] == 1
+            finally:
+                watcher.stop()
+                writer.close()
+                watched.close()
+
+
+def test_long_poll_endpoint():
+    """GET /api/packs/changes hands out a cursor and returns new events."""
+    from fastapi.testclient import TestClient
+    
+    from orchestrator.api import app
+    from orchestrator.config import get_pack_watcher
+    
+    with TestClient(app) as client:
+        feed = get_pack_watcher().feed
+        cursor = client.get("/api/packs/changes").json()["cursor"]
+        assert cursor == feed.latest
+        
+        assert client.get(f"/api/packs/changes?since={cursor}&timeout=0").json() == {
+            "cursor": cursor,
+            "events": [],
+            "reset": False,
+        }
+        assert client.get(f"/api/packs/changes?since={cursor + 100}&timeout=0").json()["reset"]
+        
+        # Synthetic events stand in for a write to the real packs.json
+        threading.Timer(0.1, feed.publish, args=([("some-pack", "updated")], 0)).start()
+        body = client.get(f"/api/packs/changes?since={cursor}&timeout=5").json()
+        assert [(e["slug"], e["type"]) for e in body["events"]] == [("some-pack", "updated")]
+        assert body["cursor"] == cursor + 1 and not body["reset"]
+
+
+if __name__ == "__main__":
+    test_diff_packs()
+    test_change_feed_cursor()
+    test_watcher_sees_other_writers()
+    test_long_poll_endpoint()
+    print("✅ PASS: pack change feed")
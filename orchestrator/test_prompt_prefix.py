@@ -0,0 +1,129 @@
+"""
+Tests for the prompt-prefix layout of the validation and deep research prompts.
+
+The provider's automatic prompt caching only reuses an identical leading
+prefix, so every prompt must put its static instructions (and the research
+template) first and the pack-specific context last. These tests build the
+requests for very different packs and check that everything before the
+pack context is byte-identical and free of pack data, and that cached
+prompt tokens reported in usage are recorded per call.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.conftest import ScriptedClient, validation_reply
+
+TEMPLATE = "# ChatGPT Research Template\n\nFill in every section for [REGULATION].\n\n" + "\n\n".join(
+    f"## {number}. {title}\n" + f"Describe the {title.lower()} of [REGULATION] in detail.\n" * 20
+    for number, title in enumerate(
+        ["Overview", "Scope", "Controls", "Evidence", "Audience and Buyers", "Pricing", "Tooling", "Risks"],
+        start=1,
+    )
+)
+
+PACKS = [
+    {
+        "slug": "gdpr-pack",
+        "name": "GDPR Pack",
+        "packNumber": 1,
+        "currentStage": "idea",
+        "metadata": {"regulationName": "GDPR", "targetAudience": ["Engineers"], "price": 4900},
+        "crm": {"ideaNotes": "EU personal data", "icpSummary": "EU startups"},
+    },
+    {
+        "slug": "hipaa-pack",
+        "name": "HIPAA Pack",
+        "packNumber": 27,
+        "currentStage": "validated",
+        "metadata": {"regulationName": "HIPAA Security Rule", "targetAudience": ["CISOs", "Founders"]},
+        "crm": {"ideaNotes": "Health records", "icpSummary": "US health tech"},
+    },
+]
+
+
+def _shared_prefix(requests: list[dict]) -> str:
+    """Longest common prefix of the requests' messages as sent (JSON)."""
+    return os.path.commonprefix([json.dumps(request["messages"]) for request in requests])
+
+
+def _assert_static_prefix(requests: list[dict], context_marker: str, packs: list[dict]) -> str:
+    """Everything up to context_marker is shared by all requests and holds no pack data."""
+    shared = _shared_prefix(requests)
+    for request in requests:
+        sent = json.dumps(request["messages"])
+        assert sent.index(context_marker) <= len(shared), "pack context leaks into the prefix"
+    for pack in packs:
+        for value in (pack["slug"], pack["name"], pack["metadata"]["regulationName"], pack["crm"]["icpSummary"]):
+            assert value not in shared, f"{value!r} is in the shared prefix"
+    return shared
+
+
+def test_validation_prefix_is_stable():
+    """Validation prompts share the system prompt and evaluation instructions byte for byte."""
+    from orchestrator.nodes.validation import INSTRUCTIONS, validation_request
+    
+    requests = [validation_request(pack) for pack in PACKS]
+    shared = _assert_static_prefix(requests, "Pack Information:", PACKS)
+    assert json.dumps(INSTRUCTIONS)[1:-1] in shared
+    assert requests[0]["messages"][0] == requests[1]["messages"][0]
+
+
+def test_research_prefix_is_stable():
+    """The whole template leads the single-report prompt; each section's prompt has a stable prefix too."""
+    from orchestrator.nodes.deep_research import (
+        pack_inputs,
+        report_request,
+        section_request,
+        split_template,
+        summary_request,
+    )
+    
+    inputs = [pack_inputs(pack["slug"], pack) for pack in PACKS]
+    requests = [report_request(pack_input, TEMPLATE, pack["currentStage"]) for pack_input, pack in zip(inputs, PACKS)]
+    shared = _assert_static_prefix(requests, "# Pack Metadata", PACKS)
+    assert json.dumps(TEMPLATE)[1:-1] in shared
+    
+    _, sections = split_template(TEMPLATE)
+    for index, section in enumerate(sections):
+        requests = [section_request(pack_input, sections, index) for pack_input in inputs]
+        shared = _assert_static_prefix(requests, "# Pack Metadata", PACKS)
+        assert json.dumps(section.text)[1:-1] in shared
+    
+    # Sections share the instructions and outline up to their own title
+    requests = [section_request(inputs[0], sections, index) for index in range(len(sections))]
+    assert json.dumps("- 8. Risks")[1:-1] in _shared_prefix(requests)
+    
+    contents = [f"## {section.title}\n\nText." for section in sections]
+    requests = [summary_request(pack_input, sections, contents) for pack_input in inputs]
+    _assert_static_prefix(requests, "# Pack Metadata", PACKS)
+
+
+def test_cached_tokens_recorded_per_call(llm_backend):
+    """Cached prompt tokens from usage land in each call's llm_calls record."""
+    from orchestrator.nodes.validation import validation_node
+    from orchestrator.state import new_run_state
+    
+    cached = iter([0, 1024])
+    llm_backend(ScriptedClient(
+        lambda request: validation_reply(70, 60, 50),
+        usage=lambda request: {"prompt_tokens": 1300, "completion_tokens": 40, "cached_tokens": next(cached)},
+        model="gpt-4o",
+    ))
+    calls = []
+    for pack in PACKS:
+        state = validation_node(new_run_state(pack["slug"], pack, {"llm_cache": False}))
+        calls.extend(state["llm_calls"])
+    assert [call["cached_tokens"] for call in calls] == [0, 1024]
+    assert all(call["prompt_tokens"] == 1300 for call in calls)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,169 @@
+"""
+Tests for OpenAI rate limiting and retries (orchestrator.llm.ratelimit).
+
+Covers parsing the retry-after and x-ratelimit-* headers, which errors are
+retried and how long to wait, the request and token buckets pacing calls
+once the headers say a limit is used up, and chat completions against a
+local fake OpenAI server surviving 429s and 5xx responses.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import openai
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.bench_openai_clients import REQUEST, FakeOpenAIServer
+from orchestrator.llm import (
+    ClientRegistry,
+    RateLimiter,
+    RetryPolicy,
+    async_raw_create,
+    chat_completion,
+    is_retryable,
+    retry_after_seconds,
+)
+from orchestrator.llm.ratelimit import exhausted_reset_seconds, parse_reset_duration
+
+RATE_HEADERS = {
+    "x-ratelimit-limit-requests": "500",
+    "x-ratelimit-remaining-requests": "499",
+    "x-ratelimit-limit-tokens": "30000",
+    "x-ratelimit-remaining-tokens": "29000",
+}
+
+
+def _status_error(status: int, headers: dict | None = None, body: dict | None = None) -> openai.APIStatusError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return openai.OpenAI(api_key="test")._make_status_error("failed", body=body, response=response)
+
+
+def test_headers_and_retry_decisions():
+    """Header values are parsed; only transient errors are retried, honouring retry-after."""
+    assert parse_reset_duration("6m0s") == 360.0
+    assert parse_reset_duration("1.5s") == 1.5
+    assert abs(parse_reset_duration("20ms") - 0.02) < 1e-12
+    assert parse_reset_duration("soon") is None and parse_reset_duration(None) is None
+    assert retry_after_seconds({"retry-after-ms": "250", "retry-after": "9"}) == 0.25
+    assert retry_after_seconds({"retry-after": "2"}) == 2.0
+    assert retry_after_seconds({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) is None
+    assert exhausted_reset_seconds({
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "2s",
+        "x-ratelimit-remaining-tokens": "10",
+        "x-ratelimit-reset-tokens": "30s",
+    }) == 2.0
+    
+    assert is_retryable(_status_error(429))
+    assert is_retryable(_status_error(503)) and is_retryable(_status_error(408))
+    assert not is_retryable(_status_error(400)) and not is_retryable(_status_error(401))
+    assert not is_retryable(_status_error(429, body={"code": "insufficient_quota"}))
+    assert is_retryable(openai.APITimeoutError(httpx.Request("POST", "https://api.openai.com")))
+    assert not is_retryable(ValueError("bad"))
+    
+    policy = RetryPolicy(max_retries=3, base_delay=1.0, max_delay=10.0)
+    assert policy.delay(0, _status_error(429, {"retry-after": "4"})) == 4.0
+    assert policy.delay(0, _status_error(429, {"retry-after": "400"})) == 10.0
+    assert 3.0 <= policy.delay(0, _status_error(429, {
+        "x-ratelimit-remaining-tokens": "0",
+        "x-ratelimit-reset-tokens": "3s",
+    })) <= 4.0
+    for attempt in range(6):
+        assert 0 <= policy.delay(attempt, _status_error(500)) <= min(10.0, 2 ** attempt)
+
+
+def test_buckets_pace_calls_from_headers():
+    """Once the headers say a limit is used up, calls wait for the bucket to refill."""
+    limiter = RateLimiter()
+    # Unknown models are not throttled
+    assert limiter.acquire("gpt-4", 10_000) == 0.0
+    
+    # 600 requests/minute with none left: one request every 0.1s
+    limiter.observe("gpt-4", {"x-ratelimit-limit-requests": "600", "x-ratelimit-remaining-requests": "0"})
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.acquire("gpt-4")
+    assert 0.25 <= time.monotonic() - started < 1.0
+    
+    # 60000 tokens/minute with none left: 200 tokens take ~0.2s
+    limiter = RateLimiter(tokens_per_minute={"gpt-4": 60_000})
+    assert limiter.acquire("gpt-4", 1000) == 0.0
+    limiter.observe("gpt-4", {"x-ratelimit-remaining-tokens": "0"})
+    started = time.monotonic()
+    limiter.acquire("gpt-4", 200)
+    assert 0.15 <= time.monotonic() - started < 1.0
+    # Other models keep their own buckets
+    assert limiter.acquire("gpt-4o-mini", 200) == 0.0
+    
+    # A pause holds every caller of the model, async ones included
+    limiter.pause("gpt-4o-mini", 0.2)
+    started = time.monotonic()
+    asyncio.run(limiter.async_acquire("gpt-4o-mini"))
+    assert time.monotonic() - started >= 0.15
+
+
+def test_completion_retries_rate_limits_and_server_errors():
+    """A 429 and a 500 are retried through to a result; client errors and exhausted retries are raised."""
+    failures = [(429, {"retry-after-ms": "200", **RATE_HEADERS}), (500, {})]
+    with FakeOpenAIServer(failures=failures, headers=RATE_HEADERS) as server:
+        registry = ClientRegistry(
+            "test", base_url=server.base_url, retry_policy=RetryPolicy(max_retries=3, base_delay=0.01)
+        )
+        started = time.monotonic()
+        result = chat_completion(registry.client, rate_limiter=registry.rate_limiter, **REQUEST)
+        assert result.content == "ok" and server.requests == 3
+        assert time.monotonic() - started >= 0.2
+        # The buckets follow the response headers
+        limiter = registry.rate_limiter
+        assert limiter._requests["gpt-4"].capacity == 500 and limiter._tokens["gpt-4"].capacity == 30000
+        
+        # Whisper and other async calls go through the same limiter
+        server.failures = [(503, {})]
+        
+        async def main():
+            client = registry.async_client()
+            return await registry.rate_limiter.async_call(
+                "gpt-4",
+                0,
+                lambda: async_raw_create(client.chat.completions, registry.rate_limiter, **REQUEST),
+            )
+        
+        assert asyncio.run(main()).choices[0].message.content == "ok" and server.requests == 5
+        
+        server.failures = [(400, {})]
+        try:
+            chat_completion(registry.client, rate_limiter=registry.rate_limiter, **REQUEST)
+        except openai.BadRequestError:
+            assert server.requests == 6
+        else:
+            raise AssertionError("400 was not raised")
+        
+        server.failures = [(500, {})] * 4
+        try:
+            chat_completion(registry.client, rate_limiter=registry.rate_limiter, **REQUEST)
+        except openai.InternalServerError:
+            assert server.requests == 10
+        else:
+            raise AssertionError("retries did not run out")
+        
+        # Without a rate limiter the call is made once, as before
+        server.failures = [(500, {})]
+        try:
+            chat_completion(registry.client, **REQUEST)
+        except openai.InternalServerError:
+            assert server.requests == 11
+        else:
+            raise AssertionError("500 was not raised")
+
+
+if __name__ == "__main__":
+    test_headers_and_retry_decisions()
+    test_buckets_pace_calls_from_headers()
+    test_completion_retries_rate_limits_and_server_errors()
+    print("✅ PASS: OpenAI rate limiting and retries")
@@ -0,0 +1,243 @@
+"""
+Tests for section-parallel deep research.
+
+Covers splitting the research template on its "## " headings, generating
+sections concurrently (bounded, assembled in template order, cached per
+section) with a final executive summary call, a failed section leaving
+the sections written so far in the .partial file and stopping the ones in
+flight (their usage still recorded), and refresh mode reusing the sections
+whose input fingerprints are unchanged.
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.conftest import ScriptedClient
+
+TEMPLATE = """# ChatGPT Research Template
+
+Intro text for the whole template.
+
+## 1. Overview
+Describe [REGULATION].
+
+## 2. Audience
+Who buys, with an example:
+```markdown
+## Not a section
+```
+
+## 3. Controls
+List the controls."""
+
+INPUTS = {
+    "packSlug": "alpha",
+    "packName": "Alpha Pack",
+    "packNumber": 1,
+    "regulationName": "GDPR",
+    "targetAudience": ["Engineering leads"],
+    "price": 4900,
+    "icpSummary": "Startups handling EU personal data",
+}
+
+
+def section_client(delay: float = 0.1, fail_title: str | None = None) -> ScriptedClient:
+    """
+    A client answering each section prompt, slowest for the first sections.
+    
+    Sections are streamed word by word, spreading their delay over the words
+    (the fail_title section drops after its last word); the (non-streamed)
+    summary answers at once.
+    """
+    def stream_section(title: str):
+        number = int(title.split(".")[0])
+        content = f"## {title}\n\nResearch for {title}."
+        if number == 3:
+            content = f"Research for {title} without a heading."
+        words = content.split(" ")
+        for i, word in enumerate(words):
+            # Earlier sections finish last, so completion order != template order
+            time.sleep(delay * (4 - number) / len(words))
+            yield word if i == 0 else f" {word}"
+        if title == fail_title:
+            raise ConnectionError("section failed")
+    
+    def reply(request):
+        match = re.search(r"Write only the \*\*(.+?)\*\* section", request["messages"][-1]["content"])
+        if match is None:
+            return "First summary line.\nSecond summary line."
+        assert request.get("stream"), "sections must be streamed so they can be stopped"
+        return stream_section(match.group(1))
+    
+    return ScriptedClient(reply)
+
+
+def test_split_template():
+    """Sections split on "## " headings outside code fences."""
+    from orchestrator.nodes.deep_research import split_template
+    
+    preamble, sections = split_template(TEMPLATE)
+    assert preamble == "# ChatGPT Research Template\n\nIntro text for the whole template."
+    assert [section.title for section in sections] == ["1. Overview", "2. Audience", "3. Controls"]
+    assert sections[0].text == "## 1. Overview\nDescribe [REGULATION]."
+    assert "## Not a section" in sections[1].text
+    assert split_template("No sections at all.") == ("No sections at all.", [])
+    assert [section.uses_audience for section in sections] == [False, True, False]
+
+
+def test_write_section_report(tmp_path, llm_backend, llm_cache):
+    """Sections run concurrently and land in template order, followed by the summary."""
+    from orchestrator.nodes.deep_research import SummaryScanner, split_template, write_section_report
+    from orchestrator.state import new_run_state
+    
+    _, sections = split_template(TEMPLATE)
+    report_path = tmp_path / "alpha-run-deep-dive.md"
+    client = llm_backend(section_client())
+    state = new_run_state("alpha", {"slug": "alpha"}, {"llm_cache": True})
+    scanner = SummaryScanner()
+    started = time.monotonic()
+    completions, summary = write_section_report(
+        state, INPUTS, "# Alpha Deep Dive", sections, report_path, scanner, concurrency=3
+    )
+    elapsed = time.monotonic() - started
+    
+    # Roughly the slowest section (0.3s), not the sum of all three (0.6s)
+    assert client.peak == 3 and elapsed < 0.5
+    assert report_path.read_text(encoding="utf-8") == (
+        "# Alpha Deep Dive\n"
+        "\n## 1. Overview\n\nResearch for 1. Overview.\n"
+        "\n## 2. Audience\n\nResearch for 2. Audience.\n"
+        "\n## 3. Controls\n\nResearch for 3. Controls without a heading.\n"
+        "\n## Executive Summary\n\nFirst summary line.\nSecond summary line.\n"
+    )
+    assert not report_path.with_name(report_path.name + ".partial").exists()
+    assert scanner.finish() == "First summary line. Second summary line."
+    assert len(completions) == 3 and not summary.cached
+    assert state["llm_cache"]["misses"] == 4
+    
+    # Each section is its own cache entry; concurrency 1 runs them one at a time
+    client.peak = 0
+    state = new_run_state("alpha", {"slug": "alpha"}, {"llm_cache": True})
+    completions, summary = write_section_report(
+        state, INPUTS, "# Alpha Deep Dive", sections, report_path, SummaryScanner(), concurrency=1
+    )
+    assert all(completion.cached for completion in completions) and summary.cached
+    assert state["llm_cache"]["nodes"]["deep_research"] == {"hits": 4, "misses": 0}
+    assert client.calls == 4
+
+
+def test_failed_section_keeps_partial_report(tmp_path, llm_backend):
+    """Sections before the failed one stay in the .partial file and the error propagates."""
+    from orchestrator.nodes.deep_research import SummaryScanner, split_template, write_section_report
+    from orchestrator.state import new_run_state
+    
+    _, sections = split_template(TEMPLATE)
+    report_path = tmp_path / "alpha-run-deep-dive.md"
+    llm_backend(section_client(delay=0.01, fail_title="2. Audience"))
+    state = new_run_state("alpha", {"slug": "alpha"}, {"llm_cache": False})
+    try:
+        write_section_report(
+            state, INPUTS, "# Alpha Deep Dive", sections, report_path, SummaryScanner(), concurrency=1
+        )
+    except ConnectionError:
+        pass
+    else:
+        raise AssertionError("section failure was swallowed")
+    assert not report_path.exists()
+    partial = report_path.with_name(report_path.name + ".partial").read_text(encoding="utf-8")
+    assert partial == "# Alpha Deep Dive\n\n## 1. Overview\n\nResearch for 1. Overview.\n"
+
+
+def test_failed_section_stops_sections_in_flight(tmp_path, llm_backend):
+    """A failing section stops the slower ones still streaming and their usage is merged."""
+    from orchestrator.nodes.deep_research import SummaryScanner, split_template, write_section_report
+    from orchestrator.state import new_run_state
+    
+    _, sections = split_template(TEMPLATE)
+    report_path = tmp_path / "alpha-run-deep-dive.md"
+    client = llm_backend(section_client(delay=0.5, fail_title="3. Controls"))
+    state = new_run_state("alpha", {"slug": "alpha"}, {"llm_cache": False})
+    started = time.monotonic()
+    try:
+        write_section_report(
+            state, INPUTS, "# Alpha Deep Dive", sections, report_path, SummaryScanner(), concurrency=3
+        )
+    except ConnectionError:
+        pass
+    else:
+        raise AssertionError("section failure was swallowed")
+    elapsed = time.monotonic() - started
+    
+    # Section 3 fails after 0.5s; sections 1 and 2 would take 1.5s and 1s to finish
+    assert elapsed < 0.9, elapsed
+    assert client.in_flight == 0
+    stopped = [call for call in state["llm_calls"] if call["finish_reason"] == "cancelled"]
+    assert len(stopped) == 2 and all(call["total_tokens"] > 0 for call in stopped)
+    partial = report_path.with_name(report_path.name + ".partial").read_text(encoding="utf-8")
+    assert partial == "# Alpha Deep Dive\n"
+
+
+def test_refresh_reuses_unchanged_sections(tmp_path, llm_backend):
+    """Only sections whose inputs changed are regenerated; the rest are copied verbatim."""
+    from orchestrator.nodes.deep_research import (
+        SummaryScanner,
+        latest_section_report,
+        load_report_sections,
+        section_manifest_path,
+        split_template,
+        write_section_report,
+    )
+    from orchestrator.state import new_run_state
+    
+    _, sections = split_template(TEMPLATE)
+    first_path = tmp_path / "alpha-run1-deep-dive.md"
+    second_path = tmp_path / "alpha-run2-deep-dive.md"
+    client = llm_backend(section_client(delay=0.01))
+    state = new_run_state("alpha", {"slug": "alpha"}, {"llm_cache": False})
+    write_section_report(state, INPUTS, "# Alpha Deep Dive", sections, first_path, SummaryScanner(), 3)
+    assert client.calls == 4
+    assert section_manifest_path(first_path).exists()
+    previous = load_report_sections(first_path)
+    assert len(previous) == 4
+    
+    lifecycle = {"research": {"researchArtifacts": [str(first_path), str(tmp_path / "missing.md")]}}
+    assert latest_section_report(lifecycle) == first_path
+    assert latest_section_report({}) is None
+    
+    # An ICP change only regenerates the audience section and the summary
+    scanner = SummaryScanner()
+    completions, summary = write_section_report(
+        state, {**INPUTS, "icpSummary": "Scale-ups"}, "# Alpha Deep Dive",
+        sections, second_path, scanner, 3, previous,
+    )
+    assert client.calls == 6
+    assert [completion is None for completion in completions] == [True, False, True]
+    assert summary is not None
+    assert scanner.finish() == "First summary line. Second summary line."
+    assert second_path.read_text(encoding="utf-8") == first_path.read_text(encoding="utf-8")
+    
+    # Refreshing again with the same inputs reuses everything, summary included
+    third_path = tmp_path / "alpha-run3-deep-dive.md"
+    completions, summary = write_section_report(
+        state, {**INPUTS, "icpSummary": "Scale-ups"}, "# Alpha Deep Dive",
+        sections, third_path, SummaryScanner(), 3, load_report_sections(second_path),
+    )
+    assert client.calls == 6 and completions == [None, None, None] and summary is None
+    assert third_path.read_text(encoding="utf-8") == first_path.read_text(encoding="utf-8")
+    
+    # A part edited by hand no longer matches its hash and is regenerated
+    report = third_path.read_text(encoding="utf-8")
+    third_path.write_text(report.replace("First summary line.", "Edited."), encoding="utf-8")
+    reusable = load_report_sections(third_path)
+    assert len(reusable) == 3 and "Edited." not in "".join(reusable.values())
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,212 @@
+"""
+Tests for speculative deep research (orchestrator.speculation).
+
+Covers predicting a scoring pass from the pack lifecycle, cancelling a
+speculative report mid-stream (section by section or in one piece) with the
+tokens already spent recorded, and the graph starting deep research
+alongside validation: adopting the report when the scoring gate passes,
+faster than running the two one after the other, and discarding it with
+its wasted tokens in the run state when the gate fails or the run fails.
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from orchestrator.conftest import ScriptedClient, validation_reply
+from orchestrator.llm import FakeBackend
+from orchestrator.speculation import SpeculationCancelled, predict_scoring_pass
+
+TEMPLATE = """# ChatGPT Research Template
+
+## 1. Overview
+Describe [REGULATION].
+
+## 2. Audience
+Who buys it.
+
+## 3. Controls
+List the controls."""
+
+INPUTS = {
+    "packSlug": "alpha",
+    "packName": "Alpha Pack",
+    "packNumber": 1,
+    "regulationName": "GDPR",
+    "targetAudience": ["Engineering leads"],
+    "price": 4900,
+    "icpSummary": "Startups handling EU personal data",
+}
+
+
+def validating_client(research: FakeBackend, viability: int, delay: float) -> ScriptedClient:
+    """A client answering validation with fixed scores after a delay; research goes to a fake backend."""
+    def reply(request):
+        if "response_format" not in request:
+            return None
+        time.sleep(delay)
+        return validation_reply(viability, 80, 70)
+    
+    return ScriptedClient(reply, usage={"prompt_tokens": 300, "completion_tokens": 40}, fallback=research.client)
+
+
+def _pack(scoring: dict) -> dict:
+    return {
+        "slug": "alpha",
+        "name": "Alpha Pack",
+        "packNumber": 1,
+        "currentStage": "validation",
+        "metadata": {"regulationName": "GDPR", "targetAudience": ["Engineers"]},
+        "crm": {"ideaNotes": "notes", "icpSummary": "icp"},
+        "research": {},
+        "stages": {"scoring": scoring},
+    }
+
+
+def test_predict_scoring_pass():
+    """A past scoring pass or a high enough past score predicts a pass."""
+    assert predict_scoring_pass(_pack({"gate": "pass", "score": 72})) == "stages.scoring.gate is pass"
+    assert predict_scoring_pass(_pack({"gate": "fail", "score": 85}), min_score=80) is not None
+    assert predict_scoring_pass(_pack({"gate": "fail", "score": 65}), min_score=80) is None
+    assert predict_scoring_pass(_pack({})) is None
+    assert predict_scoring_pass({"slug": "new"}) is None
+
+
+def test_cancel_stops_streams_and_counts_tokens(tmp_path, llm_backend):
+    """Cancelling stops every streaming call at its next delta and records what it had spent."""
+    from orchestrator.nodes.deep_research import (
+        SummaryScanner,
+        report_request,
+        split_template,
+        write_report,
+        write_section_report,
+    )
+    from orchestrator.state import new_run_state
+    
+    _, sections = split_template(TEMPLATE)
+    llm_backend(FakeBackend(latency="fixed:1.0", completion_tokens="fixed:400"))
+    for mode in ("sections", "single"):
+        state = new_run_state("alpha", {"slug": "alpha"}, {"llm_cache": False})
+        report_path = tmp_path / f"{mode}.md"
+        cancel = threading.Event()
+        threading.Timer(0.5, cancel.set).start()
+        started = time.monotonic()
+        with pytest.raises(SpeculationCancelled):
+            if mode == "sections":
+                write_section_report(
+                    state, INPUTS, "# Alpha", sections, report_path, SummaryScanner(), 3, cancel=cancel
+                )
+            else:
+                request = report_request(INPUTS, TEMPLATE, "idea")
+                write_report(state, request, report_path, SummaryScanner(), True, cancel)
+        assert time.monotonic() - started < 0.9
+        assert not report_path.exists()
+        
+        calls = state["llm_calls"]
+        assert len(calls) == (3 if mode == "sections" else 1)
+        assert all(call["finish_reason"] == "cancelled" for call in calls)
+        assert all(0 < call["completion_tokens"] < 400 and call["prompt_tokens"] > 0 for call in calls)
+
+
+def _run_graph(llm_backend, pack_store, viability: int, speculate: bool) -> tuple[dict, float]:
+    """Run the research graph for the "alpha" pack; returns (final state, seconds)."""
+    from orchestrator import config
+    from orchestrator.graph import get_compiled_graph, run_config
+    from orchestrator.state import new_run_state
+    
+    pack_store([_pack({"gate": "pass", "score": 85})])
+    research = FakeBackend(latency="fixed:0.4", completion_tokens="fixed:300")
+    llm_backend(validating_client(research, viability, delay=0.4))
+    
+    state = new_run_state("alpha", {}, {"llm_cache": False, "research_speculation": speculate})
+    started = time.monotonic()
+    try:
+        final_state = get_compiled_graph().invoke(state, run_config(state["run_id"]))
+    finally:
+        (Path(config.__file__).resolve().parent / "data" / "runs" / f"{state['run_id']}.json").unlink(missing_ok=True)
+    return final_state, time.monotonic() - started
+
+
+def test_graph_adopts_or_discards_speculation(monkeypatch, llm_backend, pack_store, research_paths):
+    """A passing pack's report overlaps validation; a failing one's is discarded with its waste recorded."""
+    from orchestrator import config
+    
+    monkeypatch.setattr(config, "_run_checkpointer", SqliteSaver(sqlite3.connect(":memory:", check_same_thread=False)))
+    research_dir = research_paths(TEMPLATE)
+    serial_state, serial = _run_graph(llm_backend, pack_store, viability=85, speculate=False)
+    assert "speculation" not in serial_state["metrics"]
+    
+    # Passing: the speculative report is adopted, hiding validation's latency
+    state, speculative = _run_graph(llm_backend, pack_store, viability=85, speculate=True)
+    assert speculative < serial - 0.25, (speculative, serial)
+    speculation = state["metrics"]["speculation"]
+    assert speculation["started"] and speculation["outcome"] == "adopted"
+    assert speculation["head_start_seconds"] >= 0.35
+    report_path = Path(state["artifacts"]["deep_dive_report_path"])
+    assert report_path.exists() and report_path.parent == research_dir
+    headings = [line for line in report_path.read_text(encoding="utf-8").splitlines() if line.startswith("## ")]
+    assert headings == ["## 1. Overview", "## 2. Audience", "## 3. Controls", "## Executive Summary"]
+    assert state["metrics"]["deep_research"]["mode"] == "sections"
+    research_calls = [call for call in state["llm_calls"] if call["node"] == "deep_research"]
+    assert len(research_calls) == 4 and state["llm_cache"]["nodes"] == {}
+    saved = config.get_pack_store().get("alpha")
+    assert saved["currentStage"] == "deep_dive" and str(report_path) in saved["research"]["researchArtifacts"]
+    
+    # Failing: the report is cancelled and deleted, its tokens counted as wasted
+    state, _ = _run_graph(llm_backend, pack_store, viability=30, speculate=True)
+    assert state["gate"]["scoring"] == "hard_fail"
+    speculation = state["metrics"]["speculation"]
+    assert speculation["outcome"] == "discarded"
+    assert speculation["wasted"]["total_tokens"] > 0
+    assert state["artifacts"]["deep_dive_report_path"] is None
+    assert not list(research_dir.glob(f"alpha-{state['run_id']}-*"))
+    wasted = [call for call in state["llm_calls"] if call["node"] == "deep_research"]
+    assert sum(call["total_tokens"] for call in wasted) == speculation["wasted"]["total_tokens"]
+    saved = config.get_pack_store().get("alpha")
+    assert saved["stages"]["scoring"]["gate"] == "fail"
+
+
+
+def test_failed_run_keeps_wasted_speculation(monkeypatch, tmp_path, llm_backend, pack_store, research_paths):
+    """A run that fails in validation discards its speculative report and checkpoints the waste."""
+    from orchestrator import config
+    from orchestrator.graph import get_compiled_graph, run_config, run_pack_research
+    from orchestrator.nodes import deep_research
+    
+    checkpointer = SqliteSaver(sqlite3.connect(str(tmp_path / "checkpoints.sqlite3"), check_same_thread=False))
+    monkeypatch.setattr(config, "_run_checkpointer", checkpointer)
+    monkeypatch.setattr(deep_research, "RESEARCH_SPECULATION", True)
+    research_dir = research_paths(TEMPLATE)
+    pack_store([_pack({"gate": "pass", "score": 85})])
+    research = FakeBackend(latency="fixed:0.4", completion_tokens="fixed:300")
+    
+    def reply(request):
+        if "response_format" not in request:
+            return None
+        time.sleep(0.6)
+        raise RuntimeError("connection reset by peer")
+    
+    llm_backend(ScriptedClient(reply, fallback=research.client))
+    with pytest.raises(RuntimeError):
+        run_pack_research("alpha", use_cache=False)
+    
+    (run_id,) = {row[0] for row in checkpointer.conn.execute("SELECT thread_id FROM checkpoints")}
+    state = get_compiled_graph().get_state(run_config(run_id)).values
+    speculation = state["metrics"]["speculation"]
+    assert speculation["outcome"] == "discarded" and speculation["wasted"]["total_tokens"] > 0
+    wasted = [call for call in state["llm_calls"] if call["node"] == "deep_research"]
+    assert sum(call["total_tokens"] for call in wasted) == speculation["wasted"]["total_tokens"]
+    assert not list(research_dir.glob(f"alpha-{run_id}-*"))
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
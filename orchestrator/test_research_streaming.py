@@ -0,0 +1,146 @@
+"""
+Tests for streaming deep-research generation.
+
+Covers stream_chat_completion (deltas, usage, timings, cache interplay), the
+incremental summary scanner matching the old whole-report extraction, and
+write_report streaming into a .partial file that is renamed on completion
+and left behind when generation fails partway.
+"""
+
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.conftest import ScriptedClient
+from orchestrator.llm import ResponseCache, chat_completion, stream_chat_completion
+
+REPORT = """# GDPR Readiness Pack
+
+## 1. Overview
+Body text mentioning a summary of findings.
+
+## Executive Summary
+
+First summary line.
+Second summary line.
+
+Third summary line.
+Fourth summary line.
+Fifth summary line.
+Sixth line is past the limit."""
+
+REQUEST = {"model": "gpt-4", "messages": [{"role": "user", "content": "research"}], "max_tokens": 8000}
+
+
+def streaming_client(chunk_size: int = 7, fail_after: int | None = None) -> ScriptedClient:
+    """A client streaming REPORT in chunks, optionally dropping the stream before chunk fail_after."""
+    def pieces():
+        for index, start in enumerate(range(0, len(REPORT), chunk_size)):
+            if index == fail_after:
+                raise ConnectionError("stream dropped")
+            yield REPORT[start:start + chunk_size]
+    
+    def reply(request):
+        if request.get("stream"):
+            assert request["stream_options"] == {"include_usage": True}
+        return pieces()
+    
+    return ScriptedClient(reply, usage={"prompt_tokens": 100, "completion_tokens": 50, "cached_tokens": 64})
+
+
+def test_stream_chat_completion():
+    """Deltas arrive in order; the result carries usage and timings, not the text."""
+    client = streaming_client()
+    deltas: list[str] = []
+    result = stream_chat_completion(client, deltas.append, **REQUEST)
+    assert "".join(deltas) == REPORT and len(deltas) > 1
+    assert result.content is None and not result.cached
+    assert result.finish_reason == "stop"
+    assert result.usage == {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150, "cached_tokens": 64}
+    assert 0 <= result.first_token_seconds <= result.total_seconds
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ResponseCache(Path(tmp_dir))
+        stream_chat_completion(client, lambda text: None, cache, **REQUEST)
+        
+        # A hit is delivered in one piece, and non-streamed calls share the entry
+        deltas = []
+        hit = stream_chat_completion(client, deltas.append, cache, **REQUEST)
+        assert hit.cached and deltas == [REPORT]
+        assert chat_completion(client, cache, **REQUEST).content == REPORT
+        assert client.calls == 2
+
+
+def _old_summary(report_content: str):
+    """The whole-report summary extraction the scanner replaces."""
+    summary_lines = []
+    in_summary = False
+    for line in report_content.split("\n"):
+        if "summary" in line.lower() and ("executive" in line.lower() or "deep_dive" in line.lower()):
+            in_summary = True
+            continue
+        if in_summary and line.strip():
+            summary_lines.append(line.strip())
+            if len(summary_lines) >= 5:
+                break
+    return " ".join(summary_lines) or None
+
+
+def test_summary_scanner_matches_old_extraction():
+    """Feeding the report in arbitrary pieces finds the same summary."""
+    from orchestrator.nodes.deep_research import SummaryScanner
+    
+    rng = random.Random(13)
+    reports = [REPORT, "No summary heading here.", "## deep_dive summary\nOnly line", "Executive summary\n\n"]
+    for report in reports:
+        for _ in range(20):
+            scanner = SummaryScanner()
+            position = 0
+            while position < len(report):
+                step = rng.randint(1, 12)
+                scanner.feed(report[position:position + step])
+                position += step
+            assert scanner.finish() == _old_summary(report), report
+
+
+def test_write_report_streams_to_partial_file(tmp_path, llm_backend):
+    """The report goes through a .partial file; a failed stream leaves it behind."""
+    from orchestrator.nodes.deep_research import SummaryScanner, write_report
+    from orchestrator.state import new_run_state
+    
+    state = new_run_state("alpha", {"slug": "alpha"}, {"llm_cache": False})
+    report_path = tmp_path / "alpha-run-deep-dive.md"
+    partial_path = tmp_path / "alpha-run-deep-dive.md.partial"
+    llm_backend(streaming_client())
+    scanner = SummaryScanner()
+    completion = write_report(state, REQUEST, report_path, scanner, streaming=True)
+    assert report_path.read_text(encoding="utf-8") == REPORT
+    assert not partial_path.exists()
+    assert scanner.finish().startswith("First summary line.")
+    assert completion.first_token_seconds is not None
+    
+    report_path.unlink()
+    llm_backend(streaming_client(fail_after=10))
+    try:
+        write_report(state, REQUEST, report_path, SummaryScanner(), streaming=True)
+    except ConnectionError:
+        pass
+    else:
+        raise AssertionError("stream failure was swallowed")
+    assert not report_path.exists()
+    assert partial_path.read_text(encoding="utf-8") == REPORT[:70]
+    
+    # Non-streaming mode writes the final file directly
+    llm_backend(streaming_client())
+    write_report(state, REQUEST, report_path, SummaryScanner(), streaming=False)
+    assert report_path.read_text(encoding="utf-8") == REPORT
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,159 @@
+"""
+Tests for checkpointed, resumable research runs (orchestrator.graph.resume_pack_research).
+
+Covers a run that fails in deep research keeping its checkpoints, resuming
+it from a fresh checkpointer on the same database (as a restarted process
+would) without repeating validation's LLM call, and the checkpoints being
+deleted once the run completes. Without checkpoints, a failed run commits
+the lifecycle updates of the nodes that completed.
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from orchestrator.conftest import ScriptedClient, validation_reply
+from orchestrator.llm import FakeBackend
+
+TEMPLATE = """# ChatGPT Research Template
+
+## 1. Overview
+Describe [REGULATION].
+
+## 2. Audience
+Who buys it."""
+
+PACK = {
+    "slug": "alpha",
+    "name": "Alpha Pack",
+    "packNumber": 1,
+    "currentStage": "idea",
+    "metadata": {"regulationName": "GDPR", "targetAudience": ["Engineers"]},
+    "crm": {"ideaNotes": "notes", "icpSummary": "icp"},
+    "research": {},
+    "stages": {},
+}
+
+
+def flaky_client(research_up: threading.Event) -> ScriptedClient:
+    """A client answering validation with passing scores; research calls fail until research_up is set."""
+    def reply(request):
+        if "response_format" in request:
+            return validation_reply(85, 80, 70)
+        if not research_up.is_set():
+            raise RuntimeError("connection reset by peer")
+        return None
+    
+    research = FakeBackend(latency="fixed:0", completion_tokens="fixed:100")
+    return ScriptedClient(reply, usage={"prompt_tokens": 300, "completion_tokens": 40}, fallback=research.client)
+
+
+def _validations(client: ScriptedClient) -> int:
+    """Validation calls made so far."""
+    return sum("response_format" in request for request in client.requests)
+
+
+def _checkpointer(path: Path) -> SqliteSaver:
+    return SqliteSaver(sqlite3.connect(str(path), check_same_thread=False))
+
+
+def test_failed_run_resumes_from_checkpoint(monkeypatch, tmp_path, llm_backend, pack_store, research_paths):
+    """A run that fails in deep research resumes there; validation is not paid for twice."""
+    from orchestrator import config
+    from orchestrator.graph import get_compiled_graph, resume_pack_research, run_config, run_pack_research
+    
+    packs_path = pack_store([PACK])
+    research_dir = research_paths(TEMPLATE)
+    research_up = threading.Event()
+    client = llm_backend(flaky_client(research_up))
+    checkpoints_path = tmp_path / "checkpoints.sqlite3"
+    monkeypatch.setattr(config, "_run_checkpointer", _checkpointer(checkpoints_path))
+    
+    with pytest.raises(RuntimeError):
+        run_pack_research("alpha", use_cache=False)
+    assert _validations(client) == 1
+    
+    # A restarted process: a new checkpointer on the same database, a recompiled graph
+    config._run_checkpointer = _checkpointer(checkpoints_path)
+    (run_id,) = {row[0] for row in config._run_checkpointer.conn.execute("SELECT thread_id FROM checkpoints")}
+    checkpoint = get_compiled_graph().get_state(run_config(run_id))
+    assert checkpoint.next == ("deep_research",)
+    assert checkpoint.values["gate"]["scoring"] == "pass"
+    # The completed nodes' updates are already in packs.json and no longer buffered
+    assert json.loads(packs_path.read_text(encoding="utf-8"))[0]["stages"]["scoring"]["gate"] == "pass"
+    assert not checkpoint.values["lifecycle_patches"]
+    
+    research_up.set()
+    try:
+        final_state = resume_pack_research(run_id)
+    finally:
+        (Path(config.__file__).resolve().parent / "data" / "runs" / f"{run_id}.json").unlink(missing_ok=True)
+    assert _validations(client) == 1
+    assert final_state["run_id"] == run_id and final_state["scores"]["viability"] == 85
+    nodes = [call["node"] for call in final_state["llm_calls"]]
+    assert nodes.count("validation") == 1 and nodes.count("deep_research") == 3
+    report_path = Path(final_state["artifacts"]["deep_dive_report_path"])
+    assert report_path.exists() and report_path.parent == research_dir
+    assert not report_path.with_name(f"{report_path.name}.partial").exists()
+    saved = json.loads(packs_path.read_text(encoding="utf-8"))[0]
+    assert saved["stages"]["scoring"]["gate"] == "pass" and saved["currentStage"] == "deep_dive"
+    committed = [patch["node"] for patch in final_state["committed_lifecycle_patches"]]
+    assert committed.count("validation") == 1 and committed.count("scoring_gate") == 1
+    
+    # Completed runs drop their checkpoints and cannot be resumed again
+    assert not config._run_checkpointer.conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+    for unknown in (run_id, "no-such-run"):
+        with pytest.raises(ValueError):
+            resume_pack_research(unknown)
+
+
+def test_failed_run_with_checkpoints_commits_completed_nodes(monkeypatch, tmp_path, llm_backend, pack_store, research_paths):
+    """A checkpointed run that fails in deep research and is never resumed still saves its scores."""
+    from orchestrator import config
+    from orchestrator.graph import get_compiled_graph, run_config, run_pack_research
+    
+    packs_path = pack_store([PACK])
+    research_paths(TEMPLATE)
+    llm_backend(flaky_client(threading.Event()))
+    monkeypatch.setattr(config, "_run_checkpointer", _checkpointer(tmp_path / "checkpoints.sqlite3"))
+    
+    with pytest.raises(RuntimeError):
+        run_pack_research("alpha", use_cache=False)
+    saved = json.loads(packs_path.read_text(encoding="utf-8"))[0]
+    assert saved["stages"]["validation"]["status"] and saved["stages"]["scoring"]["gate"] == "pass"
+    assert saved["currentStage"] != "deep_dive"
+    
+    (run_id,) = {row[0] for row in config._run_checkpointer.conn.execute("SELECT thread_id FROM checkpoints")}
+    checkpoint = get_compiled_graph().get_state(run_config(run_id))
+    assert checkpoint.next == ("deep_research",)
+    assert not checkpoint.values["lifecycle_patches"] and checkpoint.values["committed_lifecycle_patches"]
+
+
+def test_failed_run_without_checkpoints_commits_completed_nodes(monkeypatch, llm_backend, pack_store, research_paths):
+    """With checkpoints off, validation and scoring results still reach packs.json when deep research fails."""
+    from orchestrator import config
+    from orchestrator.graph import run_pack_research
+    
+    packs_path = pack_store([PACK])
+    research_paths(TEMPLATE)
+    llm_backend(flaky_client(threading.Event()))
+    monkeypatch.setattr(config, "RUN_CHECKPOINTS", False)
+    
+    with pytest.raises(RuntimeError):
+        run_pack_research("alpha", use_cache=False)
+    saved = json.loads(packs_path.read_text(encoding="utf-8"))[0]
+    assert saved["stages"]["validation"]["status"] and saved["stages"]["scoring"]["gate"] == "pass"
+    assert saved["currentStage"] != "deep_dive"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
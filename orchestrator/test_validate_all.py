@@ -0,0 +1,127 @@
+"""
+Tests for validate-all bulk validation.
+
+Covers selecting packs by currentStage, validating them concurrently
+(faster than one at a time), committing every lifecycle update in a single
+store write, reporting a failing pack without losing the others, and
+sorting and rendering the score table.
+"""
+
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.conftest import ScriptedClient, validation_reply
+
+SCORES = {
+    "alpha": (80, 75, 70),
+    "beta": (55, 40, 60),
+    "gamma": (30, 90, 20),
+    "delta": (90, 65, 85),
+}
+
+
+def validation_client(delay: float = 0.1, fail_regulation: str | None = None) -> ScriptedClient:
+    """A client scoring each pack after a delay, failing one if asked."""
+    def reply(request):
+        regulation = re.search(r"Regulation/Standard: (\w+)", request["messages"][-1]["content"]).group(1)
+        time.sleep(delay)
+        if regulation == fail_regulation:
+            raise ConnectionError("validation failed")
+        return validation_reply(*SCORES[regulation])
+    
+    return ScriptedClient(reply, usage={"prompt_tokens": 300, "completion_tokens": 40})
+
+
+def _pack(slug: str, stage: str = "idea") -> dict:
+    return {
+        "slug": slug,
+        "name": f"{slug.title()} Pack",
+        "currentStage": stage,
+        "metadata": {"regulationName": slug, "targetAudience": ["Engineers"], "custom": [1, 2]},
+        "crm": {"ideaNotes": "notes", "icpSummary": "icp"},
+        "stages": {},
+    }
+
+
+def test_validate_all_concurrent_single_write(llm_backend, pack_store):
+    """Idea-stage packs are validated concurrently and saved in one write."""
+    from orchestrator.config import get_pack_store
+    from orchestrator.validate_all import format_validation_table, run_validate_all
+    
+    packs_path = pack_store([_pack(slug) for slug in SCORES] + [_pack("published", "published")])
+    store = get_pack_store()
+    writes = []
+    update_many = store.update_many
+    store.update_many = lambda updaters: writes.append(updaters) or update_many(updaters)
+    store.update = lambda *args, **kwargs: writes.append(args) or None
+    
+    # Serial baseline: four packs one at a time
+    client = llm_backend(validation_client(delay=0.1))
+    started = time.monotonic()
+    run_validate_all(concurrency=1, options={"llm_cache": False})
+    serial = time.monotonic() - started
+    assert client.peak == 1
+    
+    writes.clear()
+    client = llm_backend(validation_client(delay=0.1))
+    started = time.monotonic()
+    result = run_validate_all(concurrency=4, options={"llm_cache": False})
+    concurrent = time.monotonic() - started
+    assert client.peak == 4 and concurrent < serial / 2
+    
+    # Sorted by viability, highest first; the published pack was not selected
+    assert [row["slug"] for row in result["results"]] == ["delta", "alpha", "beta", "gamma"]
+    assert [row["scoring"] for row in result["results"]] == ["pass", "pass", "soft_fail_retry", "hard_fail"]
+    assert result["results"][0]["tokens"] == 340 and result["llm_usage"]["total_tokens"] == 4 * 340
+    assert sorted(result["updated"]) == sorted(SCORES)
+    
+    # Every pack's lifecycle update went out in one write, keeping unknown keys
+    assert len(writes) == 1
+    saved = {pack["slug"]: pack for pack in json.loads(packs_path.read_text(encoding="utf-8"))}
+    assert saved["delta"]["stages"]["scoring"]["gate"] == "pass"
+    assert saved["gamma"]["stages"]["validation"]["status"] == "completed"
+    assert saved["alpha"]["metadata"]["custom"] == [1, 2]
+    assert "validation" not in saved["published"]["stages"]
+    
+    table = format_validation_table(result["results"]).splitlines()
+    assert table[0].split() == ["Pack", "Viability", "Data", "ICP", "Validation", "Scoring", "Tokens"]
+    assert table[1].split() == ["delta", "90", "65", "85", "pass", "pass", "340"]
+
+
+def test_validate_all_reports_failures_and_sorts(llm_backend, pack_store):
+    """A failing pack is reported (and left unchanged) while the rest are saved."""
+    from orchestrator.validate_all import format_validation_table, run_validate_all, sort_rows
+    
+    packs_path = pack_store([_pack(slug) for slug in SCORES])
+    llm_backend(validation_client(delay=0.01, fail_regulation="beta"))
+    result = run_validate_all(concurrency=2, options={"llm_cache": False}, sort_by="icp_clarity", reverse=True)
+    assert [row["slug"] for row in result["results"]] == ["gamma", "alpha", "delta", "beta"]
+    assert result["results"][-1]["error"] == "validation failed"
+    assert "beta" not in result["updated"]
+    saved = {pack["slug"]: pack for pack in json.loads(packs_path.read_text(encoding="utf-8"))}
+    assert saved["beta"]["stages"] == {} and saved["alpha"]["stages"]["scoring"]["status"] == "completed"
+    assert format_validation_table(result["results"]).splitlines()[-1].split() == [
+        "beta", "error:", "validation", "failed"
+    ]
+    
+    rows = result["results"]
+    assert [row["slug"] for row in sort_rows(rows, "slug")] == ["alpha", "beta", "delta", "gamma"]
+    assert [row["slug"] for row in sort_rows(rows, "scoring")] == ["alpha", "delta", "gamma", "beta"]
+    try:
+        sort_rows(rows, "price")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("invalid sort column accepted")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
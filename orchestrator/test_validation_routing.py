@@ -0,0 +1,145 @@
+"""
+Tests for tiered validation routing (orchestrator.nodes.validation).
+
+Covers parsing the escalation band, the triage model answering clearly
+strong and clearly weak packs alone, borderline viability scores escalating
+to the validation model (whose scores are used), recording both tiers'
+scores, gates, latency and cost in metrics.validation, and validate-all
+totalling escalations, agreement and savings.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Allow running as a script from the orchestrator folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.conftest import ScriptedClient, validation_reply
+
+# (viability, data_availability, icp_clarity) per regulation and model
+SCORES = {
+    "strong": {"gpt-4o-mini": (90, 80, 70), "gpt-4": (88, 75, 70)},
+    "weak": {"gpt-4o-mini": (20, 30, 40), "gpt-4": (25, 30, 40)},
+    "edge": {"gpt-4o-mini": (72, 65, 60), "gpt-4": (58, 65, 60)},
+    "close": {"gpt-4o-mini": (50, 40, 60), "gpt-4": (55, 45, 60)},
+}
+
+
+def tiered_client() -> ScriptedClient:
+    """A client where each model gives its own scores for each pack (rationale: the model)."""
+    def reply(request):
+        regulation = re.search(r"Regulation/Standard: (\w+)", request["messages"][-1]["content"]).group(1)
+        return validation_reply(*SCORES[regulation][request["model"]], rationale=request["model"])
+    
+    return ScriptedClient(reply, usage={"prompt_tokens": 1000, "completion_tokens": 100})
+
+
+def _models(client: ScriptedClient) -> list[str]:
+    """Models requested so far, in order."""
+    return [request["model"] for request in client.requests]
+
+
+def _pack(slug: str) -> dict:
+    return {
+        "slug": slug,
+        "name": f"{slug.title()} Pack",
+        "currentStage": "idea",
+        "metadata": {"regulationName": slug, "targetAudience": ["Engineers"]},
+        "crm": {"ideaNotes": "notes", "icpSummary": "icp"},
+        "stages": {},
+    }
+
+
+def test_parse_score_band():
+    """Bands parse from "low-high" or a pair and must lie within 0-100."""
+    from orchestrator.nodes.validation import parse_score_band
+    
+    assert parse_score_band("45-75") == (45, 75)
+    assert parse_score_band(" 50 - 70 ") == (50, 70)
+    assert parse_score_band([40, 60]) == (40, 60)
+    for bad in ("75-45", "45", "0-101", "low-high", [1, 2, 3]):
+        try:
+            parse_score_band(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad!r}")
+
+
+def test_borderline_scores_escalate(llm_backend):
+    """Clear cases stop at triage; borderline viability escalates and both replies are recorded."""
+    from orchestrator.nodes.scoring_gate import scoring_gate_node
+    from orchestrator.nodes.validation import summarize_routing, validation_node
+    from orchestrator.state import new_run_state
+    
+    client = llm_backend(tiered_client())
+    options = {"llm_cache": False, "validation_routing": True, "validation_escalation_band": "45-75"}
+    states = {}
+    for slug in ("strong", "weak", "edge"):
+        client.requests.clear()
+        states[slug] = scoring_gate_node(validation_node(new_run_state(slug, _pack(slug), options)))
+        states[slug]["models"] = _models(client)
+    
+    # Clear cases: one cheap call, its scores are used
+    strong = states["strong"]
+    assert strong["models"] == ["gpt-4o-mini"]
+    assert strong["scores"]["viability"] == 90 and strong["gate"]["scoring"] == "pass"
+    metrics = strong["metrics"]["validation"]
+    assert metrics["escalated"] is False and metrics["escalation"] is None and metrics["agreed"] is None
+    assert metrics["triage"]["model"] == "gpt-4o-mini" and metrics["triage"]["scoring"] == "pass"
+    # gpt-4 at $30/$60 vs gpt-4o-mini at $0.15/$0.60 per million tokens
+    assert abs(metrics["triage"]["usd"] - 0.00021) < 1e-9
+    assert abs(metrics["saved_usd"] - (0.036 - 0.00021)) < 1e-9
+    assert states["weak"]["models"] == ["gpt-4o-mini"] and states["weak"]["gate"]["scoring"] == "hard_fail"
+    
+    # Borderline: escalated, the validation model's scores decide, the disagreement is recorded
+    edge = states["edge"]
+    assert edge["models"] == ["gpt-4o-mini", "gpt-4"]
+    assert edge["scores"]["viability"] == 58 and edge["notes"]["validation_rationale"] == "gpt-4"
+    assert edge["gate"]["validation"] == "fail" and edge["gate"]["scoring"] == "soft_fail_retry"
+    metrics = edge["metrics"]["validation"]
+    assert metrics["escalated"] is True and metrics["band"] == [45, 75]
+    assert metrics["triage"]["scoring"] == "pass" and metrics["escalation"]["scoring"] == "soft_fail_retry"
+    assert metrics["agreed"] is False and metrics["saved_usd"] == 0.0
+    assert [call["model"] for call in edge["llm_calls"]] == ["gpt-4o-mini", "gpt-4"]
+    
+    summary = summarize_routing([state["metrics"]["validation"] for state in states.values()])
+    assert summary["routed"] == 3 and summary["escalated"] == 1
+    assert summary["compared"] == 1 and summary["agreed"] == 0 and summary["agreement_rate"] == 0.0
+    assert summary["saved_usd"] > 0.07
+    
+    # Routing off: one call to the validation model, as before
+    client.requests.clear()
+    state = validation_node(new_run_state("strong", _pack("strong"), {"llm_cache": False}))
+    assert _models(client) == ["gpt-4"] and "validation" not in state["metrics"]
+    assert summarize_routing([state["metrics"].get("validation")])["routed"] == 0
+
+
+def test_validate_all_routing_summary(llm_backend, pack_store):
+    """validate-all totals escalations and agreement over every routed pack."""
+    from orchestrator.validate_all import run_validate_all
+    
+    pack_store([_pack(slug) for slug in SCORES])
+    client = llm_backend(tiered_client())
+    result = run_validate_all(
+        concurrency=2,
+        options={"llm_cache": False, "validation_routing": True, "validation_escalation_band": [45, 75]},
+    )
+    
+    routing = result["routing"]
+    assert routing["routed"] == 4 and routing["escalated"] == 2
+    # "close" stays a soft fail on both tiers; "edge" flips from pass to soft fail
+    assert routing["compared"] == 2 and routing["agreed"] == 1 and routing["agreement_rate"] == 0.5
+    assert sorted(_models(client)) == ["gpt-4", "gpt-4"] + ["gpt-4o-mini"] * 4
+    assert {row["slug"]: row["viability"] for row in result["results"]} == {
+        "strong": 90,
+        "weak": 20,
+        "edge": 58,
+        "close": 55,
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
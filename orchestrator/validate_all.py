@@ -0,0 +1,229 @@
+"""
+Bulk validation of packs by lifecycle stage.
+
+run_validate_all() selects the packs in the given stages (by default every
+idea-stage pack), runs the validation and scoring gate nodes for each one
+concurrently, at most `concurrency` packs at a time (the shared client
+registry's per-model limits still apply), and then commits every pack's
+lifecycle updates in a single packs.json write. The result rows form a
+score table that can be sorted by any score column.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence
+
+from orchestrator.config import VALIDATE_ALL_CONCURRENCY, load_pack_snapshots
+from orchestrator.lifecycle import commit_many_lifecycle_patches
+from orchestrator.llm import merge_llm_stats, new_cache_stats, summarize_llm_calls
+from orchestrator.nodes.scoring_gate import scoring_gate_node
+from orchestrator.nodes.validation import summarize_routing, validation_node
+from orchestrator.state import State, new_run_state
+
+# Columns the table can be sorted by; scores sort highest first, slugs A-Z
+SORT_KEYS = ("viability", "data_availability", "icp_clarity", "scoring", "slug")
+
+# Scoring gate outcomes from best to worst
+SCORING_ORDER = {"pass": 0, "soft_fail_retry": 1, "hard_fail": 2}
+
+
+def select_packs(stages: Sequence[str]) -> list[dict]:
+    """
+    Snapshots of the packs whose currentStage is one of stages.
+    
+    Args:
+        stages: Lifecycle stages, e.g. ["idea"]
+    
+    Returns:
+        Pack snapshots in packs.json order
+    """
+    return [pack for pack in load_pack_snapshots() if pack.get("currentStage") in stages]
+
+
+def validate_pack(pack_snapshot: dict, options: Optional[dict] = None) -> State:
+    """
+    Run the validation and scoring gate nodes for one pack.
+    
+    Lifecycle patches are left buffered on the returned state for the
+    caller to commit.
+    
+    Args:
+        pack_snapshot: Pack lifecycle snapshot
+        options: Run options (lifecycle write-through is always off here)
+    
+    Returns:
+        Run state with scores, gate and buffered lifecycle_patches
+    """
+    state = new_run_state(
+        pack_snapshot["slug"],
+        pack_snapshot,
+        {**(options or {}), "lifecycle_write_through": False},
+    )
+    state = validation_node(state)
+    return scoring_gate_node(state)
+
+
+def validation_row(state: State) -> dict:
+    """One score table row for a validated pack."""
+    pack = state["pack_snapshot"]
+    scores = state["scores"]
+    return {
+        "slug": state["pack_slug"],
+        "name": pack.get("name"),
+        "currentStage": pack.get("currentStage"),
+        "viability": scores.get("viability"),
+        "data_availability": scores.get("data_availability"),
+        "icp_clarity": scores.get("icp_clarity"),
+        "validation": state["gate"].get("validation"),
+        "scoring": state["gate"].get("scoring"),
+        "tokens": summarize_llm_calls(state.get("llm_calls", []))["total_tokens"],
+        "error": None,
+    }
+
+
+def sort_rows(rows: list[dict], sort_by: str = "viability", reverse: bool = False) -> list[dict]:
+    """
+    Sort score table rows.
+    
+    Args:
+        rows: Rows from run_validate_all
+        sort_by: One of SORT_KEYS; scores sort highest first, the scoring
+                 gate best first and slugs alphabetically, with failed packs last
+        reverse: Flip the order (failed packs stay last)
+    
+    Returns:
+        New sorted list
+    
+    Raises:
+        ValueError: If sort_by is not a SORT_KEYS column
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"Invalid sort column '{sort_by}'. Must be one of: {', '.join(SORT_KEYS)}")
+    
+    def key(row: dict):
+        value = row.get(sort_by)
+        if sort_by == "slug":
+            return value
+        if sort_by == "scoring":
+            return SCORING_ORDER.get(value, len(SCORING_ORDER))
+        return -value
+    
+    scored = [row for row in rows if row.get(sort_by) is not None]
+    missing = [row for row in rows if row.get(sort_by) is None]
+    return sorted(scored, key=key, reverse=reverse) + missing
+
+
+def run_validate_all(
+    stages: Sequence[str] = ("idea",),
+    concurrency: Optional[int] = None,
+    options: Optional[dict] = None,
+    sort_by: str = "viability",
+    reverse: bool = False,
+) -> dict:
+    """
+    Validate and score every pack in the given stages concurrently.
+    
+    A pack whose validation fails is reported in its row's error and left
+    unchanged; the others are committed together in one write.
+    
+    Args:
+        stages: Lifecycle stages to select packs from
+        concurrency: Packs validated at once (defaults to VALIDATE_ALL_CONCURRENCY)
+        options: Run options for every pack (e.g. {"llm_cache": False})
+        sort_by: Score table column to sort by (see sort_rows)
+        reverse: Flip the sort order
+    
+    Returns:
+        Summary dict with:
+        - stages, concurrency
+        - results: score table rows (slug, name, currentStage, viability,
+          data_availability, icp_clarity, validation, scoring, tokens, error)
+        - updated: slugs whose lifecycle updates were committed
+        - llm_cache, llm_usage: totals over all packs
+        - routing: tiered validation totals (see summarize_routing)
+        - seconds: wall time
+    
+    Raises:
+        ValueError: If sort_by is invalid
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"Invalid sort column '{sort_by}'. Must be one of: {', '.join(SORT_KEYS)}")
+    
+    started = time.monotonic()
+    packs = select_packs(stages)
+    concurrency = max(1, min(concurrency or VALIDATE_ALL_CONCURRENCY, len(packs) or 1))
+    print(f"🤖 Validate All: Validating {len(packs)} packs in {', '.join(stages)} ({concurrency} at a time)...")
+    
+    rows: list[dict] = []
+    states: list[State] = []
+    totals: dict = {"llm_cache": new_cache_stats(), "llm_calls": []}
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="validate-all") as pool:
+        futures = [(pack, pool.submit(validate_pack, pack, options)) for pack in packs]
+        for pack, future in futures:
+            try:
+                state = future.result()
+            except Exception as e:
+                print(f"⚠️  Validate All: Could not validate '{pack['slug']}': {e}")
+                rows.append({
+                    "slug": pack["slug"],
+                    "name": pack.get("name"),
+                    "currentStage": pack.get("currentStage"),
+                    "error": str(e),
+                })
+                continue
+            states.append(state)
+            rows.append(validation_row(state))
+            merge_llm_stats(totals, state)
+    
+    # One packs.json write for every validated pack
+    result = commit_many_lifecycle_patches(states)
+    for row in rows:
+        if row["slug"] in result.errors:
+            row["error"] = f"Could not save: {result.errors[row['slug']]}"
+    
+    return {
+        "stages": list(stages),
+        "concurrency": concurrency,
+        "results": sort_rows(rows, sort_by, reverse),
+        "updated": list(result.updated),
+        "llm_cache": totals["llm_cache"],
+        "llm_usage": summarize_llm_calls(totals["llm_calls"]),
+        "routing": summarize_routing([state["metrics"].get("validation") for state in states]),
+        "seconds": round(time.monotonic() - started, 3),
+    }
+
+
+def format_validation_table(rows: list[dict]) -> str:
+    """
+    Render score table rows as an aligned text table.
+    
+    Args:
+        rows: Rows from run_validate_all (already sorted)
+    
+    Returns:
+        Table text, one line per pack under a header
+    """
+    columns = [
+        ("Pack", "slug"),
+        ("Viability", "viability"),
+        ("Data", "data_availability"),
+        ("ICP", "icp_clarity"),
+        ("Validation", "validation"),
+        ("Scoring", "scoring"),
+        ("Tokens", "tokens"),
+    ]
+    cells = [[title for title, _ in columns]]
+    for row in rows:
+        if row.get("error"):
+            cells.append([row["slug"], f"error: {row['error']}"])
+            continue
+        cells.append(["" if row.get(name) is None else str(row[name]) for _, name in columns])
+    full = [line for line in cells if len(line) == len(columns)]
+    widths = [max(len(line[i]) for line in full) for i in range(len(columns))]
+    lines = []
+    for line in cells:
+        if len(line) != len(columns):
+            lines.append(f"{line[0].ljust(widths[0])}  {line[1]}")
+            continue
+        lines.append("  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip())
+    return "\n".join(lines)
@@ -13,7 +13,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from orchestrator.config import update_pack_lifecycle
+from orchestrator.config import get_pack_store, update_pack_lifecycle
 
 def main():
     """Run verification test."""
@@ -53,6 +53,8 @@ def main():
     
     try:
         result = update_pack_lifecycle("tax-assist", no_op_updater)
+        # Non-JSON backends export packs.json asynchronously
+        get_pack_store().flush()
         print("   ✅ Completed")
     except Exception as e:
         print(f"   ❌ Error: {e}")